@@ -27,10 +27,13 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
@@ -46,7 +49,6 @@ from lib.compartments import add_compartment
 option = []
 
 copywrite()
-sleep(2)
 # end check_for_duplicates
 
 # We require the parent compartment name for this tool. An option can be passed as the second
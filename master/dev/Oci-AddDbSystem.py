@@ -27,6 +27,10 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
@@ -37,7 +41,7 @@ from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import return_availability_domain
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import is_int
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
@@ -83,7 +87,6 @@ virtual_db_system_properties = {
 }
 
 copywrite()
-sleep(2)
 if not len(sys.argv) > 22:
     print(
         "\n\nOci-AddDbSystem.py : Usage\n\n" +
@@ -204,11 +207,7 @@ virtual_db_system_properties["license_model"]           = sys.argv[21]
 print("\n\nFetching and verifying tenant resource data to DB System creation values. Please wait......\n")
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     warning_beep(1)
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
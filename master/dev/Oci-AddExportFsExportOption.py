@@ -27,10 +27,13 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required built-in modules
 import os.path
 import sys
-from time import sleep
 from tabulate import tabulate
 
 # required DKC modules
@@ -38,7 +41,7 @@ from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
 from lib.general import GetInputOptions
 from lib.general import get_availability_domains
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import is_int
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
@@ -57,7 +60,6 @@ from oci.file_storage.models import ClientOptions
 from oci.file_storage.models import UpdateExportDetails
 
 copywrite()
-sleep(2)
 
 # check to see if help was requested
 if len(sys.argv) == 2 and sys.argv[1].upper() == "--HELP":
@@ -174,11 +176,7 @@ else:
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -28,10 +28,13 @@ https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-try
 
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
-from time import sleep
 from tabulate import tabulate
 
 # required DKC modules
@@ -39,7 +42,7 @@ from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import is_int
 from lib.general import return_availability_domain
 from lib.compartments import GetParentCompartments
@@ -58,7 +61,6 @@ from oci.file_storage import FileStorageClientCompositeOperations
 from oci.file_storage.models import CreateFileSystemDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 6:
     print(
         "\n\nOci-AddFileSystem.py : Usage\n\n" +
@@ -85,11 +87,7 @@ region                              = sys.argv[5]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
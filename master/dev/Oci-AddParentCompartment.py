@@ -27,10 +27,13 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
@@ -42,7 +45,6 @@ import oci
 
 option = []
 copywrite()
-sleep(2)
 if len(sys.argv) != 3: # ARGS PLUS COMMAND
     print(
         "Oci-AddParentCompartment.py : Correct Usage\n\n" +
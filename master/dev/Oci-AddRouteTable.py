@@ -27,14 +27,17 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
 from lib.routetables import add_route_table
@@ -54,7 +57,6 @@ identity_client = IdentityClient(config) # builds the identity client method, re
 network_client = VirtualNetworkClient(config) # builds the network client method, required to manage network resources
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 6: # ARGS PLUS COMMAND
     print(
         "\n\nOci-AddRouteTable.py : Correct Usage\n\n" +
@@ -75,11 +77,7 @@ region                          = sys.argv[5]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
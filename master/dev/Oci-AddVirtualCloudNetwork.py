@@ -27,9 +27,12 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 import os.path
 import sys
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
@@ -39,7 +42,7 @@ from lib.compartments import GetChildCompartments
 # required OCI modules
 from oci import config
 import oci
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.vcns import GetVirtualCloudNetworks
 from lib.vcns import add_virtual_cloud_network
 
@@ -47,7 +50,6 @@ from lib.vcns import add_virtual_cloud_network
 # option = [] # must have a len() == 0 for subsequent logic to work
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 7: # ARGS PLUS COMMAND
     print(
         "\n\nOci-AddVirtualCloudNetwork.py : Correct Usage\n\n" +
@@ -72,11 +74,7 @@ region                          = sys.argv[6]
 # create the dict object config, which reads the ~./.oci/config file in this case
 config = oci.config.from_file()
 identity_client = oci.identity.IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -43,20 +43,23 @@ Be certain your libpaths are correct for python otherwise pandas will not import
 
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 from detect_delimiter import detect
 import pandas as pd
 import os.path
 import sys
 from datetime import datetime
-from time import sleep
 
 # required DKC modules
 from lib.general import get_availability_domains
 from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import return_availability_domain
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
@@ -85,7 +88,6 @@ from oci.core.models import LaunchInstanceShapeConfigDetails
 from oci.core.models import LaunchOptions
 
 copywrite()
-sleep(2)
 if len(sys.argv) < 14 or len(sys.argv) > 16:
     print(
         "\n\nOci-AddVm.py : Usage\n\n" +
@@ -132,11 +134,7 @@ else:
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -177,7 +175,7 @@ virtual_machines = GetInstance(
     child_compartment.id,
     virtual_machine_name
 )
-virtual_machines.populate_instances()
+virtual_machines.populate_instance()
 virtual_machine = virtual_machines.return_instance()
 
 error_trap_resource_found(
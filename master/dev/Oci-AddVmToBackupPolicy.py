@@ -27,11 +27,14 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 
 # required DKC modules
@@ -39,7 +42,7 @@ from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import warning_beep
 from lib.backups import add_volume_to_backup_policy
 from lib.backups import GetBackupPolicies
@@ -62,7 +65,6 @@ from oci.core import ComputeClient
 from oci.core.models import CreateVolumeBackupPolicyAssignmentDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 7:
     print(
         "\n\nOci-AddVmToBackupPolicy.py : Usage:\n\n" +
@@ -84,11 +86,7 @@ region                          = sys.argv[6]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -150,7 +148,7 @@ vm_instances = GetInstance(
     vm_compartment.id,
     virtual_machine_name
 )
-vm_instances.populate_instances()
+vm_instances.populate_instance()
 vm_instance = vm_instances.return_instance()
 error_trap_resource_not_found(
     vm_instance,
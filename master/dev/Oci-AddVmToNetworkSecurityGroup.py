@@ -27,6 +27,10 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
@@ -39,7 +43,7 @@ from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
 from lib.general import GetInputOptions
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import is_int
 from lib.general import return_availability_domain
 from lib.general import warning_beep
@@ -61,7 +65,6 @@ from oci.core import VirtualNetworkClient
 from oci.core.models import UpdateVnicDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 7:
     print(
         "\n\nOci-AddVmToNetworkSecurityGroup.py : Usage\n\n" +
@@ -87,11 +90,7 @@ region                                  = sys.argv[6]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -163,7 +162,7 @@ vm_instances = GetInstance(
     child_compartment.id,
     virtual_machine_name
 )
-vm_instances.populate_instances()
+vm_instances.populate_instance()
 vm_instance = vm_instances.return_instance()
 error_trap_resource_not_found(
     vm_instance,
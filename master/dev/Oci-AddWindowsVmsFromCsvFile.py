@@ -38,34 +38,35 @@ export PYTHONPATH=/Users/henrywojteczko/lib/oracle-cli/lib/python3.8/site-packag
 See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
-Package requirements: Python 3.8.5 or later, conda, pandas.
-Be certain your libpaths are correct for python otherwise pandas will not import.
+Package requirements: Python 3.8.5 or later, conda.
+The CSV file is read with lib/csvinput.py, so pandas and detect_delimiter are not required.
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
-from detect_delimiter import detect
-import pandas as pd
 import os.path
 import sys
+from copy import deepcopy
 from datetime import datetime
-from time import sleep
 
 # required DKC modules
+from lib.csvinput import iterate_csv_records
 from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
-from lib.general import return_availability_domain
+from lib.general import is_int
+from lib.general import validate_region
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
-from lib.compute import check_for_vm
-from lib.compute import GetImages
-from lib.compute import GetInstance
+from lib.compute import submit_vm_launches
+from lib.compute import wait_for_instance_states
+from lib.compute import GetVmLaunchResources
 from lib.compute import LaunchVmInstance
-from lib.vcns import GetVirtualCloudNetworks
-from lib.subnets import GetPrivateIP
-from lib.subnets import GetSubnet
+from lib.concurrency import DEFAULT_MAX_WORKERS
 from oci.config import from_file
 
 # required OCI modules
@@ -82,13 +83,15 @@ from oci.core.models import LaunchInstanceDetails
 from oci.core.models import LaunchInstanceShapeConfigDetails
 
 copywrite()
-sleep(2)
-if len(sys.argv) != 5:
+if len(sys.argv) < 5 or len(sys.argv) > 6:
     print(
         "\n\nOci-AddWindowsFromCsvFile.py : Usage\n\n" +
-        "Oci-AddWindowsFromCsvFile.py [parent compartment] [child compartment] [region] [csv import file]\n\n" +
+        "Oci-AddWindowsFromCsvFile.py [parent compartment] [child compartment] [region] [csv import file] [optional concurrent launches]\n\n" +
         "Use case example adds VM instances to the specified child compartment within the specified region:\n" +
         "\tOci-AddWindowsFromCsvFile.py admin_comp web_comp 'us-phoenix-1' drtest_vms_to_build.csv\n\n" +
+        "Every record in the CSV file is validated before any VM instance is launched. The launch requests\n" +
+        "are then submitted {} at a time unless a different number is supplied, as in:\n".format(DEFAULT_MAX_WORKERS) +
+        "\tOci-AddWindowsFromCsvFile.py admin_comp web_comp 'us-phoenix-1' drtest_vms_to_build.csv 16\n\n" +
         "WARNING! This program will not create duplicate VM instances. This means your CSV input file must\n" +
         "contain unique names for each instance within the specified compartment/region in order for each\n" +
         "respective VM instance to be launched.\n\n" +
@@ -100,6 +103,12 @@ parent_compartment_name         = sys.argv[1]
 child_compartment_name          = sys.argv[2]
 region                          = sys.argv[3]
 vm_import_csv_file_name         = sys.argv[4]
+if len(sys.argv) == 6:
+    if not is_int(sys.argv[5]) or int(sys.argv[5]) < 1:
+        raise RuntimeWarning("WARNING! The number of concurrent launches must be a whole number of 1 or more")
+    max_concurrent_launches     = int(sys.argv[5])
+else:
+    max_concurrent_launches     = DEFAULT_MAX_WORKERS
 
 # dictionary object that will be passed to the class LaunchVmInstance
 # image_id will be instiated after getting the image ID using 
@@ -116,7 +125,8 @@ host_details = {
         "private_ip"          : "",
         "display_name"        : "",
         "vcn_name"            : "",
-        "subnet_name"         : ""
+        "subnet_name"         : "",
+        "subnet_id"           : ""
     },
     "image_id"            : "",
     "boot_volume_size_in_gbs" : None,
@@ -134,66 +144,22 @@ def get_image_id(
             image_name):
     '''
     Function searches all compartment objects for image_compartment_name,
-    then instiates the class GetImages to retrieve the image object. It
-    returns the image OCID or None if no image is found. This function is
+    then looks up the image in the image catalog of that compartment held by
+    launch_resources. The catalog of each image compartment is only listed once.
+    It returns the image OCID or None if no image is found. This function is
     to be run in __main__
     '''
     for compartment in compartments:
         if compartment.name == image_compartment_name:
-            images = GetImages(
-                compute_client,
-                compartment.id)
-            images.populate_image_list()
-            image = images.return_image(image_name)
-            return image.id
+            return launch_resources.return_image_id(
+                compartment.id,
+                image_name)
+    return None
 
 
 # end function get_image_id()
 
-def import_csv_to_dataframe(
-    import_file):
-    '''
-    This function uses pandas to retrieve the data in the CSV rule export file into
-    a dataframe. It returns the dataframe to the calling code. For example, if the
-    a record contains:
-        Rule Description;Protocol (ICMP/ICMPv6/TCP/UDP);Is Stateless (False/True);Source;Source Type;Destination;Destination Type;ICMP Type;ICMP Code;Source TCP Maximum Port;Source TCP Minimum Port;Destination TCP Maximum Port;Destination TCP Minimum Port;Source UDP Maximum Port;Source UDP Minimum Port;Destination UDP Maximum Port;Destination UDP Minimum UDP Port
-        Sample rule permits all Inbound TCP traffic from tenancy;TCP;10.1.0.0/20;CIDR_BLOCK;;;;;;;;;;
-        Sample rule permits all Inbound TCP traffic from tenancy;TCP;10.1.0.0/20;CIDR_BLOCK;;;;;;;;;;
-
-    And you wish to read the second field in the 1st row, simply doing this will retrieve the data:
-    
-    my_data = rules.iloc[1,1]
-    
-    The contents of my_data now are "TCP"
-
-    WARNING!
-    This function must be called from __main__
-    pandas must be loaded
-
-    WARNING! This function requires the use of detect from the detect_delimiter module.
-    The module was developed during python2.x days but has been tested up to python
-    version 3.8.5. Versions after this should be tested during the codebase deployment.
-    See https://pypi.org/project/detect-delimiter/ 
-    
-    To later extract specific values from the datafrom, use the iloc method.
-    See the pandas user guide for more information at
-    https://pandas.pydata.org/docs/user_guide/10min.html#object-creation
-    '''
-    
-    # determine the delimiter with detect, see
-    # https://pypi.org/project/detect-delimiter/
-    with open(import_file) as myfile:
-        firstline = myfile.readline()
-    myfile.close()
-    delimiter = detect(firstline)
-    # start by opening the CSV import file for reading
-    records = pd.read_csv(import_file,
-                         sep = delimiter)
-    return records
-
-# end function import_csv_to_dataframe()
-
-def return_host_record(cntr):
+def return_host_record(vm_record):
     my_host_details     = None
     my_allowed_shapes   = [
         "VM.Standard2.1",
@@ -203,68 +169,58 @@ def return_host_record(cntr):
         "VM.Standard2.16",
         "VM.Standard2.24"]
 
-    # get virtual cloud network data for the VM
-    virtual_networks = GetVirtualCloudNetworks(
-        network_client,
-        child_compartment.id,
-        vm_list.iloc[cntr][1])
-    virtual_networks.populate_virtual_cloud_networks()
-    virtual_cloud_network = virtual_networks.return_virtual_cloud_network()
+    # get virtual cloud network data for the VM, all lookups are answered from launch_resources
+    virtual_cloud_network = launch_resources.return_virtual_cloud_network(vm_record[1])
     error_trap_resource_not_found(
         virtual_cloud_network,
-        "Virtual cloud network " + vm_list.iloc[cntr][1] + " not found in compartment " + child_compartment_name + " for VM creation."
+        "Virtual cloud network " + vm_record[1] + " not found in compartment " + child_compartment_name + " for VM creation."
     )
-    sleep(1)
     # get the subnet data
-    subnets = GetSubnet(
-        network_client,
-        child_compartment.id,
+    subnet = launch_resources.return_subnet(
         virtual_cloud_network.id,
-        vm_list.iloc[cntr][2])
-    subnets.populate_subnets()
-    subnet = subnets.return_subnet()
+        vm_record[2])
     error_trap_resource_not_found(
         subnet,
-        "Subnetwork " + vm_list.iloc[cntr][2] + " not found within virtual cloud network " + vm_list.iloc[cntr][1] + " for vm creation."
+        "Subnetwork " + vm_record[2] + " not found within virtual cloud network " + vm_record[1] + " for vm creation."
     )
     # check to see if the VM exists, if it does, print an error and do not return a record,
     # otherwise, return the data to the calling code.
-    vm_name = vm_list.iloc[cntr][0]
+    vm_name = vm_record[0]
     # print(vm_name)
-    if check_for_vm(
-        compute_client,
-        child_compartment.id,
-        vm_name):
+    if launch_resources.check_for_vm(vm_name):
         print("VM {} already present in compartment {} and will be skipped. Duplicate VMs not permitted.\n".format(
             vm_name,
             child_compartment_name))
     else:
-        # instiate the host dictionary object
-        my_host_details = host_details
-        my_host_details["instance_name"] = vm_list.iloc[cntr][0]
+        # instiate the host dictionary object, each record needs its own copy since all of
+        # the records are held in memory until they are launched
+        my_host_details = deepcopy(host_details)
+        my_host_details["instance_name"] = vm_record[0]
         my_host_details["instance_details"]["availability_domain"] = \
-            return_availability_domain(
-                identity_client,
-                child_compartment.id,
-                vm_list.iloc[cntr][3])
-        sleep(1) # necessary to make sure we do not send too many requests to REST API service at once
-        if str(vm_list.iloc[cntr][4]).upper() == "TRUE":
+            launch_resources.return_availability_domain(
+                vm_record[3])
+        if str(vm_record[4]).upper() == "TRUE":
             my_host_details["network_properties"]["assign_public_ip"] = True
         else:
             my_host_details["network_properties"]["assign_public_ip"] = False
-        my_host_details["network_properties"]["private_ip"] = vm_list.iloc[cntr][5]
+        my_host_details["network_properties"]["private_ip"] = vm_record[5]
         my_host_details["network_properties"]["display_name"] = vm_name + "_vnic_00"
-        my_host_details["network_properties"]["vcn_name"] = vm_list.iloc[cntr][1]
-        my_host_details["network_properties"]["subnet_name"] = vm_list.iloc[cntr][2]
+        my_host_details["network_properties"]["vcn_name"] = vm_record[1]
+        my_host_details["network_properties"]["subnet_name"] = vm_record[2]
+        my_host_details["network_properties"]["subnet_id"] = subnet.id
         my_host_details["image_id"] = get_image_id(
                 child_compartments.child_compartments,
-                vm_list.iloc[cntr][7],
-                vm_list.iloc[cntr][6])
-        if int(vm_list.iloc[cntr][8]) >=256:
-            my_host_details["boot_volume_size_in_gbs"] = int(vm_list.iloc[cntr][8])
+                vm_record[7],
+                vm_record[6])
+        error_trap_resource_not_found(
+            my_host_details["image_id"],
+            "Image " + vm_record[6] + " not found in compartment " + vm_record[7] + " for VM creation."
+        )
+        if vm_record[8] is not None and vm_record[8] >= 256:
+            my_host_details["boot_volume_size_in_gbs"] = vm_record[8]
         else:
             raise RuntimeWarning("WARNING! Image size specified in record is less than 256Gbyte in size. Disk size for a Windows image must be at least 256Gbyte in size.")
-        my_host_details["shape_properties"]["shape"] = vm_list.iloc[cntr][9]
+        my_host_details["shape_properties"]["shape"] = vm_record[9]
         my_host_details["instance_details"]["ssh_key_file"] = "NOT_USED_FOR_WINDOWS_IMAGES"
         if my_host_details["shape_properties"]["shape"] not in my_allowed_shapes:
             print(
@@ -295,11 +251,7 @@ if __name__ != "__main__":
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -340,123 +292,161 @@ error_trap_resource_not_found(
     "Child compartment " + child_compartment_name + " within parent compartment " + parent_compartment_name
 )
 
+# load the VCNs, availability domains and existing VM instance names of the child compartment
+# once. Subnets, private IP addresses and image catalogs are loaded the first time a CSV
+# record refers to them.
+launch_resources = GetVmLaunchResources(
+    compute_client,
+    identity_client,
+    network_client,
+    child_compartment.id)
+launch_resources.populate_launch_resources()
+
 # import the CSV file
 if not os.path.exists(vm_import_csv_file_name):
     raise RuntimeWarning("WARNING! Import file not found")
-vm_list = import_csv_to_dataframe(vm_import_csv_file_name)
 
-# start running through the logic to create the VM instances.
+# start running through the logic to create the VM instances. This takes place in three phases.
+# Every CSV record is validated before any instance is launched, the launch requests are then
+# submitted concurrently, and finally all of the instances are polled together until each one
+# is running or has failed. The CSV file is read one record at a time. Column 4 holds the
+# availability domain number and column 9 the boot volume size in Gbytes, both are read as ints.
 
-count = len(vm_list)
-cntr  = 0
 print("\n\nStarting the job to create VM instances from a CSV import file as of {}......\n\n".format(
     datetime.now()
 ))
-while cntr < count:
+
+# Phase 1 - validate every record and prepare the launch request data
+vm_instances_to_launch  = []
+vm_names_in_file        = []
+for line_number, vm_record in iterate_csv_records(vm_import_csv_file_name, converters = {3 : int, 8 : int}):
 
     # insert the host record into the dictionary object
-    print("Reading CSV record {} and checking for the VM instance and source VM image details......".format(
-        cntr+1
+    print("Reading CSV record on line {} and checking for the VM instance and source VM image details......".format(
+        line_number
     ))
-    my_host = return_host_record(cntr)
+    my_host = return_host_record(vm_record)
 
 #    print("Check completed")
     if my_host is None:
         # do nothing if the VM instance is already present
-        pass
-    else:
-        # # get the virtual cloud network and subnet data for creating the VM object
-        print("Getting the virtual cloud network and subnet details......")
-        virtual_clouud_networks = GetVirtualCloudNetworks(
-            network_client,
-            child_compartment.id,
-            my_host["network_properties"]["vcn_name"])
-        virtual_clouud_networks.populate_virtual_cloud_networks()
-        virtual_clouud_network = virtual_clouud_networks.return_virtual_cloud_network()
-        error_trap_resource_not_found(
-            virtual_clouud_network,
-            "Virtual cloud network requested in CSV record not found in compartment " + child_compartment_name
-        )
-        subnetworks = GetSubnet(
-            network_client,
-            child_compartment.id,
-            virtual_clouud_network.id,
-            my_host["network_properties"]["subnet_name"])
-        subnetworks.populate_subnets()
-        subnet = subnetworks.return_subnet()
-        error_trap_resource_not_found(
-            subnet,
-            "Subnetwork requested for in CSV record not found in compartment " + child_compartment_name
-        )
-    
-        # look for duplicate IP addresses, raise warning if found
-        private_ip_addresses = GetPrivateIP(
-            network_client,
-            subnet.id
-        )
-        private_ip_addresses.populate_ip_addresses()
-        if private_ip_addresses.is_dup_ip(my_host["network_properties"]["private_ip"]):
-            warning_beep(1)
-            print("\n\nWARNING! IP address {} already assigned to subnet {}.\n".format(
-               my_host["network_properties"]["private_ip"],
-               subnet.display_name 
-            ))
-            print("Please correct your entry for host {} in the CSV file and try again.\n".format(
-              my_host["network_properties"]["private_ip"]  
-            ))
-            raise RuntimeWarning("DUPLICATE IP ADDRESS FOUND.")
-
-        # # instiate the class for launching the VM and run the methods to prepare the class object data
-        # # for VM creation.
-        print("Recording the data to memory necessary to create the VM instance......\n\n")
-        vm_instance = LaunchVmInstance(
-            compute_composite_client,
-            CreateVnicDetails,
-            InstanceSourceDetails,
-            InstanceSourceViaImageDetails,
-            LaunchInstanceDetails,
-            LaunchInstanceShapeConfigDetails,
-            child_compartment.id,
-            subnet.id,
-            my_host)
-        vm_instance.build_vnic_details()
-        sleep(1)
-        vm_instance.build_instance_image_details()
-        sleep(1)
-        vm_instance.build_shape()
-        sleep(1)
-        vm_instance.build_launch_instance_details()
-        sleep(1)
-    
-        # # create the instance
-        print("######################################################################\n")
-        print("\n\nVM instance {} ready for launching on subnet {}\n\n".format(
-            my_host["instance_name"],
-            my_host["network_properties"]["subnet_name"]))
-        print("\n\nCreating the instance now. This will take several minutes based\n" +
-              "on the complexity of the source image and the VM instance size......\n\n")
-        results = vm_instance.launch_instance_and_wait_for_state()
-        print("Instance created, here are the results\n\n")
-        print(results)
-        print("\n\nEND OF RESULTS HERE\n\n")
-        print("######################################################################\n")
-
+        continue
+
+    # the same VM name may not appear twice within the CSV file
+    if my_host["instance_name"] in vm_names_in_file:
+        warning_beep(1)
+        print("\n\nWARNING! VM instance {} appears more than once in the CSV file.\n".format(
+            my_host["instance_name"]
+        ))
+        raise RuntimeWarning("DUPLICATE VM NAME FOUND IN CSV FILE.")
+    vm_names_in_file.append(my_host["instance_name"])
+
+    # look for duplicate IP addresses, raise warning if found. Addresses taken by earlier
+    # records in the CSV file are reserved, so they are reported as duplicates as well.
+    if launch_resources.is_dup_ip(
+        my_host["network_properties"]["subnet_id"],
+        my_host["network_properties"]["private_ip"]):
+        warning_beep(1)
+        print("\n\nWARNING! IP address {} already assigned to subnet {}.\n".format(
+           my_host["network_properties"]["private_ip"],
+           my_host["network_properties"]["subnet_name"]
+        ))
+        print("Please correct your entry for host {} in the CSV file and try again.\n".format(
+          my_host["network_properties"]["private_ip"]  
+        ))
+        raise RuntimeWarning("DUPLICATE IP ADDRESS FOUND.")
+    launch_resources.reserve_ip(
+        my_host["network_properties"]["subnet_id"],
+        my_host["network_properties"]["private_ip"])
+
+    # # instiate the class for launching the VM and run the methods to prepare the class object data
+    # # for VM creation.
+    print("Recording the data to memory necessary to create the VM instance......\n\n")
+    vm_instance = LaunchVmInstance(
+        compute_composite_client,
+        CreateVnicDetails,
+        InstanceSourceDetails,
+        InstanceSourceViaImageDetails,
+        LaunchInstanceDetails,
+        LaunchInstanceShapeConfigDetails,
+        child_compartment.id,
+        my_host["network_properties"]["subnet_id"],
+        my_host)
+    vm_instance.build_vnic_details()
+    vm_instance.build_instance_image_details()
+    vm_instance.build_shape()
+    vm_instance.build_launch_instance_details()
+    vm_instances_to_launch.append(vm_instance)
+
+# end for line_number, vm_record
+
+if len(vm_instances_to_launch) == 0:
+    print("\n\nThere are no new VM instances to create. Job ending as of {}\n\n".format(
+        datetime.now()
+    ))
+    exit(0)
 
+# Phase 2 - submit the launch requests concurrently
+print("######################################################################\n")
+print("\n\n{} VM instances validated and ready for launching, submitting up to {} launch requests at a time......\n\n".format(
+    len(vm_instances_to_launch),
+    max_concurrent_launches
+))
+launch_results = submit_vm_launches(
+    vm_instances_to_launch,
+    max_workers = max_concurrent_launches
+)
+launched_instances = {}
+for launch_result in launch_results:
+    if launch_result["error"] is not None:
+        warning_beep(1)
+        print("WARNING! The launch request for VM instance {} failed: {}\n".format(
+            launch_result["instance_name"],
+            launch_result["error"]
+        ))
+    else:
+        print("Launch request for VM instance {} submitted.".format(launch_result["instance_name"]))
+        launched_instances[launch_result["instance"].id] = launch_result["instance"]
+
+# Phase 3 - poll all of the instances together until each one is running or has failed
+print("\n\nWaiting for the VM instances to start. This will take several minutes based\n" +
+      "on the complexity of the source image and the VM instance size......\n\n")
+final_states = wait_for_instance_states(
+    compute_client,
+    list(launched_instances.keys()),
+    ["RUNNING"]
+)
 
-    cntr += 1
+vms_created = 0
+for instance_id, launched_instance in launched_instances.items():
+    instance = final_states.get(instance_id)
+    if instance is None:
+        # the instance was never fetched while waiting, so report it as it was launched
+        warning_beep(1)
+        print("\n\nWARNING! Timed out waiting on instance {} to start, it was last seen in a {} state\n\n".format(
+            launched_instance.display_name,
+            launched_instance.lifecycle_state
+        ))
+    elif instance.lifecycle_state == "RUNNING":
+        vms_created += 1
+        print("Instance {} created, here are the results\n\n".format(instance.display_name))
+        print(instance)
+        print("\n\nEND OF RESULTS HERE\n\n")
+    else:
+        warning_beep(1)
+        print("\n\nWARNING! Instance {} is in a {} state, here are the results\n\n".format(
+            instance.display_name,
+            instance.lifecycle_state
+        ))
+        print(instance)
+        print("\n\nEND OF RESULTS HERE\n\n")
+print("######################################################################\n")
 
-print("\n\nJob is completed and {} VMs have been successfully created. Please examine".format(cntr))
+print("\n\nJob is completed and {} of {} VMs have been successfully created. Please examine".format(
+    vms_created,
+    len(vm_instances_to_launch)
+))
 print("the job output for details and for any potential errors.\n\n")
 print("Job ending as of {}\n\n".format(
     datetime.now()
 ))
-
-# end while cntr < count
-
-
-
-
-
-
-
-
@@ -28,18 +28,21 @@ https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-try
 
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import return_availability_domain
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
@@ -64,7 +67,6 @@ from oci.core.models import CreateVolumeDetails
 from oci.core.models import AttachParavirtualizedVolumeDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 6:
     print(
         "\n\nOci-AttachVolume.py : Usage\n\n" +
@@ -84,11 +86,7 @@ region                          = sys.argv[5]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -130,7 +128,7 @@ vm_instances = GetInstance(
     child_compartment.id,
     virtual_machine_name
 )
-vm_instances.populate_instances()
+vm_instances.populate_instance()
 vm_instance = vm_instances.return_instance()
 error_trap_resource_not_found(
     vm_instance,
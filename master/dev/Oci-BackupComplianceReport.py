@@ -0,0 +1,329 @@
+#!/usr/bin/python3
+
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+The system env var PATHONPATH must be exported in the shell's profile. It must point to the location of the OCI
+libraries. This is typically in the same directory structure that the OCI CLI installs to, such as
+~./lib/oracle-cli/lib/python3.8/site-packages
+Below find a literal example:
+export PYTHONPATH=/Users/henrywojteczko/lib/oracle-cli/lib/python3.8/site-packages
+See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
+https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
+
+This program audits the VM backups of every compartment beneath a parent compartment, or of the whole tenancy
+when ALL_COMPARTMENTS is passed, within one region or within every subscribed region when ALL_REGIONS is passed.
+Each compartment and region pair is scanned concurrently. A VM instance is reported when it has no AVAILABLE
+backup, when its newest AVAILABLE backup is older than --stale-days, or when any of its backups are FAULTY. The
+backups are tallied with return_backup_state_counts(), the same counts that Oci-VmBackupReport.py prints
+with --summary-only.
+'''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
+# required system modules
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+import sys
+import time
+
+# required DKC modules
+from lib.general import copywrite
+from lib.general import error_trap_resource_not_found
+from lib.general import get_subscriber_regions
+from lib.general import GetInputOptions
+from lib.general import is_int
+from lib.general import validate_region
+from lib.general import validate_subscribed_region
+from lib.general import warning_beep
+from lib.backups import iterate_compartment_backup_data
+from lib.backups import return_backup_compliance_findings
+from lib.backups import return_backup_state_counts
+from lib.backupsnapshot import BackupSnapshot
+from lib.compartments import GetParentCompartments
+from lib.compartments import return_compartment_tree
+from lib.compute import get_block_vol_attachments
+from lib.compute import get_boot_vol_attachments
+from lib.compute import GetInstance
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.concurrency import EndpointLimits
+from lib.concurrency import iterate_in_parallel
+from lib.reportwriters import REPORT_FORMATS
+from lib.reportwriters import return_report_writer
+from lib.volumes import GetVolumeBackups
+
+# required OCI modules
+from oci.config import from_file
+from oci.identity import IdentityClient
+from oci.core import BlockstorageClient
+from oci.core import ComputeClient
+
+
+DEFAULT_STALE_DAYS = 7
+
+if len(sys.argv) < 3:
+    print(
+        "\n\nOci-BackupComplianceReport.py : Usage\n\n" +
+        "Oci-BackupComplianceReport.py [parent compartment | ALL_COMPARTMENTS] [region | ALL_REGIONS] [optional arguments]\n\n" +
+        "Use case example below audits the VM backups of every compartment beneath admin_comp within one region:\n" +
+        "\tOci-BackupComplianceReport.py admin_comp 'us-ashburn-1'\n\n" +
+        "Use case example below audits the whole tenancy within every subscribed region and writes the findings as CSV:\n" +
+        "\tOci-BackupComplianceReport.py ALL_COMPARTMENTS ALL_REGIONS --format csv > compliance.csv\n\n" +
+        "Optional arguments, which must be passed in pairs, are:\n" +
+        "\t--stale-days\t\tBackups older than this many days are stale, {} by default\n".format(DEFAULT_STALE_DAYS) +
+        "\t--max-concurrent\tNumber of compartment and region pairs scanned at once, {} by default\n".format(DEFAULT_MAX_WORKERS) +
+        "\t--format\t\tOne of table, csv or json, table by default\n" +
+        "\t--incremental\t\tPass true to read the backups from the local backup snapshot of each compartment\n\n" +
+        "Please see the online documentation at the David Kent Consulting GitHub repository for more information.\n\n"
+    )
+    raise RuntimeError("EXCEPTION! - Incorrect usage")
+
+parent_compartment_name             = sys.argv[1]
+region                              = sys.argv[2]
+
+# This program uses the class GetInputOptions to instiate variables from the argument vector.
+argument_list = GetInputOptions(
+    sys.argv
+)
+if not argument_list.populate_input_options(3):
+    warning_beep(1)
+    raise RuntimeError("SYNTAX ERROR! Invalid number of arguments provided by user")
+
+stale_days = DEFAULT_STALE_DAYS
+if argument_list.return_input_option_data("--stale-days") is not None:
+    stale_days = argument_list.return_input_option_data("--stale-days")
+    if not is_int(stale_days) or int(stale_days) < 1:
+        raise RuntimeWarning("INVALID OPTION VALUE! - Value for --stale-days must be a whole number of 1 or more")
+    stale_days = int(stale_days)
+
+max_concurrent_scans = DEFAULT_MAX_WORKERS
+if argument_list.return_input_option_data("--max-concurrent") is not None:
+    max_concurrent_scans = argument_list.return_input_option_data("--max-concurrent")
+    if not is_int(max_concurrent_scans) or int(max_concurrent_scans) < 1:
+        raise RuntimeWarning("INVALID OPTION VALUE! - Value for --max-concurrent must be a whole number of 1 or more")
+    max_concurrent_scans = int(max_concurrent_scans)
+
+report_format = "TABLE"
+if argument_list.return_input_option_data("--format") is not None:
+    report_format = argument_list.return_input_option_data("--format").upper()
+    if report_format not in REPORT_FORMATS:
+        raise RuntimeWarning("INVALID OPTION VALUE! - Value for --format must be one of table, csv or json")
+
+use_snapshot = False
+if argument_list.return_input_option_data("--incremental") is not None:
+    use_snapshot = argument_list.return_input_option_data("--incremental").upper() == "TRUE"
+
+# CSV and JSON reports are meant to be redirected to a file, so the progress messages go to stderr
+status_output = sys.stdout
+if report_format == "TABLE":
+    copywrite()
+else:
+    status_output = sys.stderr
+
+# instiate the environment and validate the region, or get every region the tenancy is subscribed to
+print("\n\nValidating the cloud tenancy and other resources are available.......\n", file = status_output)
+config = from_file() # gets ~./.oci/config and reads to the object
+identity_client = IdentityClient(config)
+if region.upper() == "ALL_REGIONS":
+    region_names = [
+        rg.region_name for rg in get_subscriber_regions(identity_client, config["tenancy"])
+        if rg.status == "READY"
+    ]
+else:
+    if not validate_region(identity_client, region):
+        print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
+            region
+        ), file = status_output)
+        raise RuntimeWarning("WARNING! INVALID REGION")
+    if not validate_subscribed_region(identity_client, config["tenancy"], region):
+        raise RuntimeWarning("WARNING! Region " + region + " not subscribed to")
+    region_names = [region]
+
+# get the compartment the audit starts from, the root compartment when the whole tenancy is audited
+if parent_compartment_name.upper() == "ALL_COMPARTMENTS":
+    root_compartment = identity_client.get_compartment(config["tenancy"]).data
+else:
+    parent_compartments = GetParentCompartments(parent_compartment_name, config, identity_client)
+    parent_compartments.populate_compartments()
+    root_compartment = parent_compartments.return_parent_compartment()
+    error_trap_resource_not_found(
+        root_compartment,
+        "Parent compartment " + parent_compartment_name + " not found within tenancy " + config["tenancy"]
+    )
+
+# compartments are global, so the tree is walked once and scanned within each region
+print("Fetching the compartments beneath compartment {}, please wait......\n".format(root_compartment.name), file = status_output)
+compartment_tree = return_compartment_tree(
+    identity_client,
+    root_compartment,
+    root_compartment.name,
+    max_workers = max_concurrent_scans
+)
+
+# one set of clients and endpoint limits per region is shared by every scan of that region
+region_clients = {}
+for region_name in region_names:
+    region_config = from_file()
+    region_config["region"] = region_name
+    region_clients[region_name] = {
+        "compute_client"    : ComputeClient(region_config),
+        "storage_client"    : BlockstorageClient(region_config),
+        "endpoint_limits"   : EndpointLimits()
+    }
+
+stale_before = datetime.now(timezone.utc) - timedelta(days = stale_days)
+
+def scan_compartment(scan_item):
+    '''
+    Scans the VM instances of one compartment within one region and returns the counts and findings.
+    Errors are kept with the result so that one inaccessible compartment does not end the audit.
+    '''
+    region_name, compartment_path, compartment = scan_item
+    clients = region_clients[region_name]
+    scan_result = {
+        "region"            : region_name,
+        "compartment_path"  : compartment_path,
+        "vms_checked"       : 0,
+        "findings"          : [],
+        "error"             : None
+    }
+    try:
+        vm_instances = GetInstance(
+            clients["compute_client"],
+            compartment.id,
+            None
+        )
+        vm_instances.populate_instances()
+        if vm_instances.return_all_instances() is None:
+            return scan_result
+
+        volume_backups = None
+        if use_snapshot:
+            backup_snapshot = BackupSnapshot(
+                clients["storage_client"],
+                compartment.id,
+                region_name
+            )
+            backup_snapshot.refresh()
+            volume_backups = GetVolumeBackups(
+                clients["storage_client"],
+                compartment.id
+            )
+            backup_snapshot.load_volume_backups(volume_backups)
+
+        for vm in iterate_compartment_backup_data(
+            clients["compute_client"],
+            get_block_vol_attachments,
+            get_boot_vol_attachments,
+            clients["storage_client"],
+            compartment,
+            vm_instances,
+            endpoint_limits = clients["endpoint_limits"],
+            volume_backups = volume_backups):
+            scan_result["vms_checked"] += 1
+            backup_state_counts = return_backup_state_counts(vm)
+            findings = return_backup_compliance_findings(backup_state_counts, stale_before)
+            if len(findings) != 0:
+                scan_result["findings"].append((vm["vm_name"], findings, backup_state_counts))
+    except Exception as error:
+        scan_result["error"] = str(getattr(error, "message", error))
+
+    return scan_result
+
+# end function scan_compartment()
+
+scan_items = [
+    (region_name, compartment_path, compartment)
+    for region_name in region_names
+    for compartment_path, compartment in compartment_tree
+]
+print("Scanning {} compartments within {} regions, {} at a time. Please wait......\n".format(
+    len(compartment_tree),
+    len(region_names),
+    max_concurrent_scans
+), file = status_output)
+
+report_writer = return_report_writer(
+    report_format,
+    [
+        "REGION",
+        "COMPARTMENT",
+        "VIRTUAL MACHINE",
+        "FINDINGS",
+        "NEWEST SUCCESSFUL BACKUP",
+        "SUCCESSFUL BACKUPS",
+        "FAULTY BACKUPS"
+    ],
+    column_widths = [16, 40, 32, 30, 24, 10, 7]
+)
+
+job_start_time = time.monotonic()
+finding_counts = {
+    "NO BACKUPS"        : 0,
+    "STALE BACKUPS"     : 0,
+    "FAULTY BACKUPS"    : 0
+}
+vms_checked = 0
+vms_not_compliant = 0
+failed_scans = []
+for scan_result in iterate_in_parallel(
+    scan_compartment,
+    scan_items,
+    max_workers = max_concurrent_scans):
+    vms_checked += scan_result["vms_checked"]
+    if scan_result["error"] is not None:
+        failed_scans.append(scan_result)
+    for vm_name, findings, backup_state_counts in scan_result["findings"]:
+        vms_not_compliant += 1
+        for finding in findings:
+            finding_counts[finding] += 1
+        newest_successful_backup = backup_state_counts["newest_successful_backup"]
+        report_writer.write_row([
+            scan_result["region"],
+            scan_result["compartment_path"],
+            vm_name,
+            ", ".join(findings),
+            newest_successful_backup.ctime() if newest_successful_backup is not None else "",
+            backup_state_counts["successful_backups"],
+            backup_state_counts["faulty_backups"]
+        ])
+report_writer.close()
+
+# print the summary of the audit
+print("\n\nScanned {} compartment and region pairs in {} seconds. {} of {} VM instances are not compliant:\n".format(
+    len(scan_items),
+    round(time.monotonic() - job_start_time, 1),
+    vms_not_compliant,
+    vms_checked
+), file = status_output)
+print("\tVM instances with no backups\t\t\t{}".format(finding_counts["NO BACKUPS"]), file = status_output)
+print("\tVM instances with backups older than {} days\t{}".format(stale_days, finding_counts["STALE BACKUPS"]), file = status_output)
+print("\tVM instances with FAULTY backups\t\t{}\n".format(finding_counts["FAULTY BACKUPS"]), file = status_output)
+if len(failed_scans) != 0:
+    if report_format == "TABLE":
+        warning_beep(1)
+    print("WARNING! {} compartment and region pairs could not be scanned and are not in the report:\n".format(
+        len(failed_scans)
+    ), file = status_output)
+    for scan_result in failed_scans:
+        print("\t{} within region {}: {}".format(
+            scan_result["compartment_path"],
+            scan_result["region"],
+            scan_result["error"]
+        ), file = status_output)
+    print("", file = status_output)
@@ -49,6 +49,10 @@ all program output except when an exception is raised.
 
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 from datetime import date
 import calendar
@@ -57,7 +61,6 @@ import platform
 import resource
 import sys
 from tabulate import tabulate
-from time import sleep
 
 
 # required DKC modules
@@ -65,19 +68,19 @@ from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
-from lib.general import get_regions
-from lib.general import test_free_mem_1gb
+from lib.general import validate_region
 from lib.general import warning_beep
 from lib.backups import create_bootvolume_backup
 from lib.backups import create_volume_backup
 from lib.backups import delete_bootvolume_backup
 from lib.backups import delete_volume_backup
-from lib.backups import get_compartment_backup_data
+from lib.backups import iterate_compartment_backup_data
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
 from lib.compute import get_block_vol_attachments
 from lib.compute import get_boot_vol_attachments
 from lib.compute import GetInstance
+from lib.concurrency import DEFAULT_MAX_WORKERS
 from lib.volumes import GetVolumes
 from lib.volumes import GetVolumeAttachment
 
@@ -120,11 +123,7 @@ if not option:
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -162,13 +161,13 @@ availability_domains = get_availability_domains(
     identity_client,
     child_compartment.id)
 
-# Get the VM data but do not pass a VM instance name, we do not need it in this use case
+# Get the VM data, only the backups of this VM instance are gathered
 vm_instances = GetInstance(
     compute_client,
     child_compartment.id,
     virtual_machine_name
 )
-vm_instances.populate_instances()
+vm_instances.populate_instance()
 
 '''
 those of you new to coding please make note of the codification standard below for
@@ -186,10 +185,10 @@ if not option:
 
 '''
 
-Fetch all compartment backup data. The underlying function uses the page method in the OCI REST APIs since
-the amount of data is copious. Your docker image instance must reserve 1GB RAM for this to work. Begin
-by checking this. The function get_compartment_backup_data is complex and required many methods and
-functions to run. We ensure this requirement is met by requiring you to pass them to the function.
+Fetch the backup data of the VM instance. iterate_compartment_backup_data() yields one compact record per
+VM instance, holding only the fields of each volume and backup that we use, so the memory required no
+longer grows with the size of the compartment. The function requires many methods and functions to run.
+We ensure this requirement is met by requiring you to pass them to the function.
 
 Explanation of required methods and where you can find them are:
 
@@ -200,22 +199,19 @@ Explanation of required methods and where you can find them are:
     child_compartment              You should instiate in accordance with KENT codification standards
     vm_instances                   You should instiate in accordance with KENT codification standards
     
-Be sure to read the function backups.get_compartment_backup_data() and get familiar with it before
+Be sure to read the function backups.iterate_compartment_backup_data() and get familiar with it before
 calling this function. There are comments in the code that explains what it does.
 
 '''
-if not test_free_mem_1gb():
-    raise RuntimeError("ERROR! INSUFFICENT MEMORY\n\n")
-else:
-    
-    all_compartment_backup_data = get_compartment_backup_data(
-        compute_client,
-        get_block_vol_attachments,
-        get_boot_vol_attachments,
-        storage_client,
-        child_compartment,
-        vm_instances
-        )
+all_compartment_backup_data = list(iterate_compartment_backup_data(
+    compute_client,
+    get_block_vol_attachments,
+    get_boot_vol_attachments,
+    storage_client,
+    child_compartment,
+    vm_instances,
+    max_workers = DEFAULT_MAX_WORKERS
+    ))
 
 # set today's backup set name, This will be used to remove old backups and create new ones
 # Yes, I could have collapsed the 3 lines into one line, but why make the code difficult
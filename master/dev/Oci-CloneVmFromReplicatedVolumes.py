@@ -30,11 +30,14 @@ https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-try
 
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
@@ -42,7 +45,8 @@ from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
 from lib.general import get_regions
-from lib.general import get_subscriber_regions
+from lib.general import validate_region
+from lib.general import validate_subscribed_region
 from lib.general import return_availability_domain
 from lib.general import warning_beep
 from lib.backups import add_volume_to_backup_policy
@@ -50,25 +54,22 @@ from lib.backups import GetBackupPolicies
 from lib.backups import delete_volume_backup_policy
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
+from lib.drclone import CloneVmFromReplicas
 from lib.compute import get_block_vol_attachments
 from lib.compute import get_boot_vol_attachments
 from lib.compute import GetInstance
-from lib.compute import launch_instance_from_boot_volume
-from lib.compute import stop_os_and_instance
 from lib.vcns    import GetVirtualCloudNetworks
 from lib.subnets import GetSubnet
 from lib.subnets import GetPrivateIP
 from lib.subnets import validate_ip_addr_is_in_subnet
-from lib.volumes import attach_paravirtualized_volume
 from lib.volumes import check_vm_replica_status
-from lib.volumes import create_boot_volume_from_replica
-from lib.volumes import create_volume_from_volume_replica
 from lib.volumes import create_bootvol_replica
 from lib.volumes import create_vol_replica
 from lib.volumes import delete_bootvol_replica
 from lib.volumes import delete_vol_replica
 from lib.volumes import GetVolumes
 from lib.volumes import GetVolumeAttachment
+from lib.waiters import ResourceWaiter
 
 # required OCI modules
 from oci.config import from_file
@@ -82,23 +83,8 @@ from oci.core import VirtualNetworkClient
 # required OCI modules for storage resource details
 from oci.core.models import UpdateBootVolumeDetails
 from oci.core.models import BootVolumeReplicaDetails
-from oci.core.models import CreateBootVolumeDetails
-from oci.core.models import BootVolumeSourceFromBootVolumeReplicaDetails
 from oci.core.models import UpdateVolumeDetails
 from oci.core.models import BlockVolumeReplicaDetails
-from oci.core.models import CreateVolumeDetails
-from oci.core.models import VolumeSourceFromBlockVolumeReplicaDetails
-from oci.core.models import AttachParavirtualizedVolumeDetails
-
-# required OCI modules for compute resource details
-from oci.core.models import CreateVnicDetails
-from oci.core.models import LaunchInstanceDetails
-from oci.core.models import InstanceSourceDetails
-from oci.core.models import CreateVnicDetails
-from oci.core.models import LaunchOptions
-from oci.core.models import LaunchInstanceShapeConfigDetails
-from oci.core.models import InstanceSourceDetails
-from oci.core.models import InstanceSourceViaBootVolumeDetails
 
 copywrite()
 if len(sys.argv) != 10:
@@ -129,10 +115,7 @@ dr_region                       = sys.argv[9]
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
 regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -170,11 +153,7 @@ config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
 
 # check primary and secondary region
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
         
 if not correct_region:
     print("\n\nWARNING! - Primary region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
@@ -182,11 +161,7 @@ if not correct_region:
     ))
     raise RuntimeWarning("WARNING! INVALID REGION")
 
-correct_region = False
-for rg in regions:
-    if rg.name == dr_region:
-        correct_region = True
-        replica_region = rg
+correct_region = validate_region(identity_client, dr_region)
         
 if not correct_region:
     print("\n\nWARNING! - Disaster recovery region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
@@ -221,15 +196,8 @@ target_child_compartments.populate_compartments()
 target_child_compartment = target_child_compartments.return_child_compartment()
 
 # Make sure regions are accessible to tenancy
-subscribed_regions = get_subscriber_regions(identity_client, parent_compartment.compartment_id)
-region_state = False
-dr_region_state = False
-for rg in subscribed_regions:
-    # rn = rg.region_name
-    if rg.region_name == region:
-        region_state = True
-    if rg.region_name == dr_region:
-        dr_region_state = True
+region_state = validate_subscribed_region(identity_client, parent_compartment.compartment_id, region)
+dr_region_state = validate_subscribed_region(identity_client, parent_compartment.compartment_id, dr_region)
         
 if not region_state:
     raise RuntimeError("EXCEPTION! Primary region not in supplied value for region")
@@ -290,7 +258,7 @@ target_vm_instances = GetInstance(
     dr_compute_client,
     target_child_compartment.id,
     virtual_machine_name)
-target_vm_instances.populate_instances()
+target_vm_instances.populate_instance()
 dr_vm_instance = target_vm_instances.return_instance()
 
 error_trap_resource_found(
@@ -306,7 +274,7 @@ vm_instances = GetInstance(
     
     
 )
-vm_instances.populate_instances()
+vm_instances.populate_instance()
 vm_instance = vm_instances.return_instance()
 
 error_trap_resource_not_found(
@@ -340,27 +308,6 @@ volumes = GetVolumes(
 volumes.populate_boot_volumes()
 volumes.populate_block_volumes()
 
-# get the boot and block voliume attachments
-boot_vol_attachments = get_boot_vol_attachments(
-    compute_client,
-    vm_instance.availability_domain,
-    child_compartment.id,
-    vm_instance.id
-    )
-
-block_vol_attachments = get_block_vol_attachments(
-    compute_client,
-    vm_instance.availability_domain,
-    child_compartment.id,
-    vm_instance.id)
-
-volumes = GetVolumes(
-    storage_client,
-    availability_domains,
-    child_compartment.id)
-volumes.populate_boot_volumes()
-volumes.populate_block_volumes()
-
 # get the boot and block volumes that are attached to the VM instance
 boot_volumes = []
 for boot_vol_attachment in boot_vol_attachments:
@@ -388,136 +335,45 @@ ad_number = boot_volume.availability_domain[-1]
 # we need to set the target AD, we get this by calling return_availability_domain and passing the AD number from the primary volume
 volume_target_availability_domain = return_availability_domain(dr_identity_client, target_child_compartment.id, int(boot_volume.availability_domain[-1]))
 
-print("Creating the disks for instance {} in target child compartment {} within region {}......\n".format(
+print("Cloning virtual machine {} to target child compartment {} within region {}. Every disk is created at once\n".format(
     virtual_machine_name,
     target_child_compartment_name,
     dr_region
-))
-
-# create the boot volume
-for bv in boot_volumes:
-    create_boot_volume_response = create_boot_volume_from_replica(
-        dr_storage_composite_client,
-        BootVolumeSourceFromBootVolumeReplicaDetails,
-        CreateBootVolumeDetails,
-        target_child_compartment.id,
-        volume_target_availability_domain,
-        bv.display_name,
-        bv.size_in_gbs,
-        bv.boot_volume_replicas[0].boot_volume_replica_id,
-        bv.vpus_per_gb
-    )
-    
-    if create_boot_volume_response is None:
-        print("Unable to create boot volume {} in target child compartment {} within region {}\n".format(
-            bv.display_name,
-            target_child_compartment_name,
-            dr_region
-        ))
-        raise RuntimeError("EXCEPTION! Unknown Error!")
-    else:
-        dr_boot_volume = create_boot_volume_response.data
-
-# create the block volumes
-
-bv_list = []
-for bv in block_volumes:
-    create_volume_from_volume_replica_response = create_volume_from_volume_replica(
-        dr_storage_composite_client,
-        CreateVolumeDetails,
-        VolumeSourceFromBlockVolumeReplicaDetails,
-        target_child_compartment.id,
-        volume_target_availability_domain,
-        bv.display_name,
-        bv.size_in_gbs,
-        bv.block_volume_replicas[0].block_volume_replica_id,
-        bv.vpus_per_gb
-    )
+) +
+"and the clone is launched and attached as each one becomes available, please wait......\n")
 
-    if create_volume_from_volume_replica_response.data.lifecycle_state not in ["CREATING", "AVAILABLE", "PROVISIONING"]:
-        print("Unable to create volume {} in target child compartment {} within region {}\n".format(
-            bv.display_name,
-            target_child_compartment_name,
-            dr_region
-        ))
-        raise RuntimeError("EXCEPTION! Unknown Error!")
-    else:
-        bv_list.append(create_volume_from_volume_replica_response.data)
-
-# create the VM instance from the cloned boot volume
-print("Launching virtual machine instance clone {} in target child compartment {} within region {}......\n".format(
-    virtual_machine_name,
-    target_child_compartment_name,
-    dr_region
-))
-
-shape_config = LaunchInstanceShapeConfigDetails(
-        ocpus = vm_instance.shape_config.ocpus,
-        vcpus = vm_instance.shape_config.vcpus,
-        memory_in_gbs = vm_instance.shape_config.memory_in_gbs,
-        baseline_ocpu_utilization = vm_instance.shape_config.baseline_ocpu_utilization
-)
-
-launch_instance_from_boot_volume_response = launch_instance_from_boot_volume(
-    dr_compute_composite_client,
-    LaunchInstanceDetails,
-    CreateVnicDetails,
-    LaunchOptions,
-    InstanceSourceDetails,
-    InstanceSourceViaBootVolumeDetails,
-    volume_target_availability_domain,
+clone_waiter = ResourceWaiter()
+dr_clone = CloneVmFromReplicas(
+    dr_compute_client,
+    dr_storage_client,
+    clone_waiter,
+    vm_instance,
+    boot_volumes[0],
+    block_volumes,
     target_child_compartment.id,
-    vm_instance.shape,
-    vm_instance.display_name,
-    target_vm_private_ip_address,
+    volume_target_availability_domain,
     virtual_cloud_subnetwork.id,
-    shape_config,
-    dr_boot_volume.id
-    )
+    target_vm_private_ip_address
+)
+dr_clone.start()
+clone_waiter.wait()
 
-if launch_instance_from_boot_volume_response.data.lifecycle_state in ["UNKNOWN_ENUM_VALUE", "TERMINATING", "TERMINATED"]:
-    print("Virtual Machine {} failed to launch to target child compartment {} in region {}.\nCheck the OCI Console for status and errors.\n".format(
+if dr_clone.status != "COMPLETED":
+    print("Virtual Machine {} failed to clone to target child compartment {} in region {}.\n{}\nCheck the OCI Console for status and errors.\n".format(
         virtual_machine_name,
         target_child_compartment_name,
-        dr_region
+        dr_region,
+        dr_clone.error if dr_clone.error is not None else "The clone timed out in a " + dr_clone.status + " state."
     ))
-    raise RuntimeWarning("WARNING! Virtual Machine Failed to Launch.\n\n")
-    
-print("Attaching data volumes to the target virtual machine......\n")
-
-for v in bv_list:
-    attach_volume_response = attach_paravirtualized_volume(
-        dr_compute_composite_client,
-        AttachParavirtualizedVolumeDetails,
-        launch_instance_from_boot_volume_response.data.id,
-        v.id,
-        v.display_name + "vol_attachment"
-    )
-    
-    if attach_volume_response is None:
-        raise RuntimeError("EXCEPTION! Unknown Error!")
-
-print("The target virtual machine " + virtual_machine_name + " must now be fully stopped and restarted, please wait......\n")
-
-stop_instance_response = stop_os_and_instance(
-    dr_compute_composite_client,
-    launch_instance_from_boot_volume_response.data.id
-)
-if stop_instance_response.lifecycle_state != "STOPPED":
-    raise RuntimeError("EXCEPTION! Unknown Error")
-
-dr_instance = GetInstance(
-    dr_compute_client,
-    target_child_compartment.id,
-    virtual_machine_name
-)
-dr_instance.populate_instances()
-
-start_instance_response = dr_instance.start_instance()
+    raise RuntimeError("EXCEPTION! Virtual Machine failed to clone.\n\n")
 
 print("The virtual machine {} has been cloned to target child compartment {} in region {}\n".format(
     virtual_machine_name,
     target_child_compartment_name,
     dr_region
 ))
-
+header = [
+    "STEP",
+    "SECONDS"
+]
+print(tabulate(dr_clone.return_timings().items(), headers = header, tablefmt = "simple"))
@@ -0,0 +1,662 @@
+#!/usr/bin/python3
+
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+'''
+The system env var PATHONPATH must be exported in the shell's profile. It must point to the location of the OCI
+libraries. This is typically in the same directory structure that the OCI CLI installs to, such as
+~./lib/oracle-cli/lib/python3.8/site-packages
+
+Below find a literal example:
+
+export PYTHONPATH=/Users/henrywojteczko/lib/oracle-cli/lib/python3.8/site-packages
+
+See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
+https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
+
+This program fails over every VM instance within a child compartment, or those selected by name, tag, a
+list file or a CSV file, to the disaster recovery region by cloning them from their volume replicas. It is
+Oci-CloneVmFromReplicatedVolumes.py for many VM instances at once.
+
+Every VM instance is checked before any clone starts. Its boot and block volume replicas must be AVAILABLE,
+its name must not exist within the target compartment, and its private IP address, if one is mapped, must be
+free and within the target subnet. The clones that pass are then run together, no more than --max-concurrent
+at once and no more than --max-per-ad within any one availability domain.
+
+The CSV file has a header row and the columns below, of which only the first is required. A VM instance
+without a subnet is cloned to the target subnet passed on the command line, and one without a private IP
+address is given one by OCI.
+
+    VM Name,Target Subnet,Private IP Address
+    kentjsubp01,dbs_sub02,172.16.129.4
+    kentjsubp02,,
+
+--report writes one JSON record per line for each pre-flight check, each step of each clone and a final
+summary, so that the failover may be tracked by other tools while it runs.
+'''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
+# required system modules
+import json
+import math
+import os.path
+import sys
+import time
+from datetime import datetime
+from tabulate import tabulate
+
+# required DKC modules
+from lib.general import copywrite
+from lib.general import error_trap_resource_not_found
+from lib.general import get_availability_domains
+from lib.general import GetInputOptions
+from lib.general import is_int
+from lib.general import validate_region
+from lib.general import validate_subscribed_region
+from lib.general import warning_beep
+from lib.compartments import GetParentCompartments
+from lib.compartments import GetChildCompartments
+from lib.compute import get_block_vol_attachments
+from lib.compute import get_boot_vol_attachments
+from lib.compute import GetInstance
+from lib.compute import select_instances
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.concurrency import run_in_parallel
+from lib.csvinput import iterate_csv_records
+from lib.drclone import CloneVmFromReplicas
+from lib.drclone import CloneVmScheduler
+from lib.subnets import GetPrivateIP
+from lib.subnets import GetSubnet
+from lib.subnets import validate_ip_addr_is_in_subnet
+from lib.vcns import GetVirtualCloudNetworks
+from lib.volumes import GetVolumes
+from lib.volumes import return_volume_replica_states
+from lib.waiters import DEFAULT_MAX_WAIT_SECONDS
+from lib.waiters import ResourceWaiter
+
+# required OCI modules
+from oci.config import from_file
+from oci.identity import IdentityClient
+from oci.core import BlockstorageClient
+from oci.core import ComputeClient
+from oci.core import VirtualNetworkClient
+
+def return_csv_value(vm_record, column):
+    # returns None for a column that is missing or blank
+    if column >= len(vm_record):
+        return None
+    return vm_record[column]
+
+# end function return_csv_value()
+
+def write_report_record(record):
+    # appends one JSON record to the report file, if one was requested
+    if report_file is None:
+        return None
+    record["time"] = datetime.now().isoformat()
+    report_file.write(json.dumps(record) + "\n")
+    report_file.flush()
+
+# end function write_report_record()
+
+copywrite()
+if len(sys.argv) < 8:
+    print(
+        "\n\nOci-CloneVmsFromReplicatedVolumes.py : Usage\n\n" +
+        "Oci-CloneVmsFromReplicatedVolumes.py [parent compartment] [child compartment] [source region]\n" +
+        "[target child compartment] [target virtual cloud network] [target subnetwork] [target region] [optional arguments]\n\n" +
+        "Use case example 1 fails over every VM instance within the child compartment to the target region:\n" +
+        "\tOci-CloneVmsFromReplicatedVolumes.py admin_comp tst_comp 'us-ashburn-1' dbs_comp dr_vcn dbs_sub02 'us-phoenix-1'\n\n" +
+        "Use case example 2 checks the VM instances mapped within a CSV file without cloning them:\n" +
+        "\tOci-CloneVmsFromReplicatedVolumes.py admin_comp tst_comp 'us-ashburn-1' dbs_comp dr_vcn dbs_sub02 'us-phoenix-1' \\\n" +
+        "\t--csv failover_map.csv --preflight-only true\n\n" +
+        "Use case example 3 fails over the tagged VM instances, 2 at a time per availability domain, with a JSON report:\n" +
+        "\tOci-CloneVmsFromReplicatedVolumes.py admin_comp tst_comp 'us-ashburn-1' dbs_comp dr_vcn dbs_sub02 'us-phoenix-1' \\\n" +
+        "\t--tag application=billing --max-per-ad 2 --report billing_failover.json --force true\n\n" +
+        "Optional arguments, which must be passed in pairs, are:\n" +
+        "\t--csv\t\t\tCSV file of VM Name, Target Subnet and Private IP Address, see the program notes\n" +
+        "\t--file\t\t\tText file that lists one VM instance name per line\n" +
+        "\t--name\t\t\tShell style pattern matched against the VM instance names, such as 'app-*'\n" +
+        "\t--tag\t\t\tFreeform tag as key=value or defined tag as namespace.key=value\n" +
+        "\t--max-concurrent\tNumber of VM instances cloned at once, {} by default\n".format(DEFAULT_MAX_WORKERS) +
+        "\t--max-per-ad\t\tNumber of VM instances cloned at once within each availability domain, no limit by default\n" +
+        "\t--report\t\tFile to write the JSON lines progress and timing report to\n" +
+        "\t--preflight-only\tPass true to run the pre-flight checks and stop\n" +
+        "\t--force\t\t\tPass true to skip the confirmation prompt\n\n" +
+        "Selections are combined, so only VM instances that match all of them are cloned. The VM instances are\n" +
+        "cloned to the target child compartment, which must be within the same parent compartment.\n\n" +
+        "Please see the online documentation at the David Kent Consulting GitHub repository for more information.\n\n"
+    )
+    raise RuntimeError("EXCEPTION! - Incorrect Usage")
+
+parent_compartment_name         = sys.argv[1]
+child_compartment_name          = sys.argv[2]
+region                          = sys.argv[3]
+target_child_compartment_name   = sys.argv[4]
+target_vcn_name                 = sys.argv[5]
+target_subnet_name              = sys.argv[6]
+dr_region                       = sys.argv[7]
+
+# This program uses the class GetInputOptions to instiate variables from the argument vector.
+argument_list = GetInputOptions(
+    sys.argv
+)
+if not argument_list.populate_input_options(8):
+    warning_beep(1)
+    raise RuntimeError("SYNTAX ERROR! Invalid number of arguments provided by user")
+
+csv_file_name = argument_list.return_input_option_data("--csv")
+vm_list_file_name = argument_list.return_input_option_data("--file")
+name_pattern = argument_list.return_input_option_data("--name")
+tag = argument_list.return_input_option_data("--tag")
+report_file_name = argument_list.return_input_option_data("--report")
+
+if csv_file_name is not None and vm_list_file_name is not None:
+    raise RuntimeWarning("INVALID OPTION VALUE! - Pass either --csv or --file, not both")
+
+max_concurrent_clones = DEFAULT_MAX_WORKERS
+if argument_list.return_input_option_data("--max-concurrent") is not None:
+    max_concurrent_clones = argument_list.return_input_option_data("--max-concurrent")
+    if not is_int(max_concurrent_clones) or int(max_concurrent_clones) < 1:
+        raise RuntimeWarning("INVALID OPTION VALUE! - Value for --max-concurrent must be a whole number of 1 or more")
+    max_concurrent_clones = int(max_concurrent_clones)
+
+max_clones_per_ad = None
+if argument_list.return_input_option_data("--max-per-ad") is not None:
+    max_clones_per_ad = argument_list.return_input_option_data("--max-per-ad")
+    if not is_int(max_clones_per_ad) or int(max_clones_per_ad) < 1:
+        raise RuntimeWarning("INVALID OPTION VALUE! - Value for --max-per-ad must be a whole number of 1 or more")
+    max_clones_per_ad = int(max_clones_per_ad)
+
+preflight_only = False
+if argument_list.return_input_option_data("--preflight-only") is not None:
+    preflight_only = argument_list.return_input_option_data("--preflight-only").upper() == "TRUE"
+
+force = False
+if argument_list.return_input_option_data("--force") is not None:
+    force = argument_list.return_input_option_data("--force").upper() == "TRUE"
+
+# read the VM instance names, and any subnet and private IP address mapped to them
+vm_names = None
+vm_mappings = {}
+if csv_file_name is not None:
+    if not os.path.isfile(csv_file_name):
+        raise RuntimeWarning("WARNING! File " + csv_file_name + " not found")
+    vm_names = []
+    for line_number, vm_record in iterate_csv_records(csv_file_name):
+        vm_name = return_csv_value(vm_record, 0)
+        if vm_name is None:
+            continue
+        vm_names.append(vm_name)
+        vm_mappings[vm_name] = {
+            "subnet_name"           : return_csv_value(vm_record, 1),
+            "private_ip_address"    : return_csv_value(vm_record, 2)
+        }
+elif vm_list_file_name is not None:
+    if not os.path.isfile(vm_list_file_name):
+        raise RuntimeWarning("WARNING! File " + vm_list_file_name + " not found")
+    vm_names = []
+    with open(vm_list_file_name, "r") as vm_list_file:
+        for line in vm_list_file:
+            line = line.strip()
+            if line != "" and not line.startswith("#"):
+                vm_names.append(line)
+
+report_file = None
+if report_file_name is not None:
+    report_file = open(report_file_name, "w")
+
+# instiate the environment and validate that the primary and DR regions exist
+config = from_file() # gets ~./.oci/config and reads to the object
+identity_client = IdentityClient(config)
+for region_name in [region, dr_region]:
+    if not validate_region(identity_client, region_name):
+        print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
+            region_name
+        ))
+        raise RuntimeWarning("WARNING! INVALID REGION")
+
+drconfig = from_file()
+config["region"] = region # Must set the cloud region
+drconfig["region"] = dr_region # Must set for the DR cloud region
+identity_client = IdentityClient(config) # builds the identity client method, required to manage compartments
+dr_identity_client = IdentityClient(drconfig) # builds identity client for DR region
+compute_client = ComputeClient(config) # builds the compute client method, required to manage compute resources
+dr_compute_client = ComputeClient(drconfig) # builds the DR compute methods
+storage_client = BlockstorageClient(config) # builds the volume client method, required to manage block volume resources
+dr_storage_client = BlockstorageClient(drconfig) # Builds storage methods
+dr_network_client = VirtualNetworkClient(drconfig) # Builds network methods
+
+print("\n\nFetching and validating tenancy resource data, please wait......\n")
+# get the parent, child and target child compartments
+parent_compartments = GetParentCompartments(parent_compartment_name, config, identity_client)
+parent_compartments.populate_compartments()
+parent_compartment = parent_compartments.return_parent_compartment()
+error_trap_resource_not_found(
+    parent_compartment,
+    "Parent compartment " + parent_compartment_name + " not found within tenancy " + config["tenancy"]
+)
+
+child_compartments = GetChildCompartments(
+    parent_compartment.id,
+    child_compartment_name,
+    identity_client)
+child_compartments.populate_compartments()
+child_compartment = child_compartments.return_child_compartment()
+error_trap_resource_not_found(
+    child_compartment,
+    "Child compartment " + child_compartment_name + " within parent compartment " + parent_compartment_name
+)
+
+target_child_compartments = GetChildCompartments(
+    parent_compartment.id,
+    target_child_compartment_name,
+    identity_client)
+target_child_compartments.populate_compartments()
+target_child_compartment = target_child_compartments.return_child_compartment()
+error_trap_resource_not_found(
+    target_child_compartment,
+    "Target child compartment " + target_child_compartment_name + " within parent compartment " + parent_compartment_name
+)
+
+# Make sure regions are accessible to tenancy
+if not validate_subscribed_region(identity_client, parent_compartment.compartment_id, region):
+    raise RuntimeError("EXCEPTION! Primary region not in supplied value for region")
+if not validate_subscribed_region(identity_client, parent_compartment.compartment_id, dr_region):
+    raise RuntimeWarning("WARNING! Disaster recovery region not subscribed to")
+
+virtual_networks = GetVirtualCloudNetworks(dr_network_client, target_child_compartment.id, target_vcn_name)
+virtual_networks.populate_virtual_cloud_networks()
+virtual_network = virtual_networks.return_virtual_cloud_network()
+error_trap_resource_not_found(
+    virtual_network,
+    "Virtual cloud network " + target_vcn_name + " not found in compartment " + target_child_compartment_name + " within region " + dr_region
+)
+
+# get every VM instance in the compartment, then select the ones we want
+vm_instances = GetInstance(
+    compute_client,
+    child_compartment.id,
+    None
+)
+vm_instances.populate_instances()
+selected_instances = select_instances(
+    vm_instances.instance_list,
+    name_pattern = name_pattern,
+    tag = tag,
+    instance_names = vm_names
+)
+
+if vm_names is not None:
+    for vm_name in vm_names:
+        if vm_instances.return_instance_by_name(vm_name) is None:
+            print("WARNING! VM instance {} not found in compartment {} within region {}".format(
+                vm_name,
+                child_compartment_name,
+                region
+            ))
+            write_report_record({
+                "event"     : "preflight",
+                "vm_name"   : vm_name,
+                "result"    : "FAILED",
+                "problems"  : ["VM instance not found within compartment " + child_compartment_name]
+            })
+
+if len(selected_instances) == 0:
+    print("\n\nNo VM instances in compartment {} within region {} match the selection.\n\n".format(
+        child_compartment_name,
+        region
+    ))
+    raise RuntimeWarning("WARNING! No VM instances selected")
+
+print("Running pre-flight checks against {} VM instances......\n".format(len(selected_instances)))
+
+# the subnets, and the private IP addresses in use within them, are fetched once per subnet
+target_subnets = {}
+allotted_ip_addresses = {}
+def return_target_subnet(subnet_name):
+    if subnet_name not in target_subnets:
+        subnets = GetSubnet(
+            dr_network_client,
+            target_child_compartment.id,
+            virtual_network.id,
+            subnet_name
+        )
+        subnets.populate_subnets()
+        target_subnets[subnet_name] = subnets.return_subnet()
+        if target_subnets[subnet_name] is not None:
+            private_ip_addresses = GetPrivateIP(
+                dr_network_client,
+                target_subnets[subnet_name].id
+            )
+            private_ip_addresses.populate_ip_addresses()
+            allotted_ip_addresses[subnet_name] = private_ip_addresses
+    return target_subnets[subnet_name]
+
+error_trap_resource_not_found(
+    return_target_subnet(target_subnet_name),
+    "Virtual cloud subnetwork " + target_subnet_name + " not found in compartment " + target_child_compartment_name + " within region " + dr_region
+)
+
+# every VM instance within the target compartment, to check for names already in use
+target_vm_instances = GetInstance(
+    dr_compute_client,
+    target_child_compartment.id,
+    None
+)
+target_vm_instances.populate_instances()
+
+# the volumes of the source compartment and the attachments of each VM instance
+availability_domains = get_availability_domains(
+    identity_client,
+    child_compartment.id)
+dr_availability_domains = get_availability_domains(
+    dr_identity_client,
+    target_child_compartment.id)
+volumes = GetVolumes(
+    storage_client,
+    availability_domains,
+    child_compartment.id)
+volumes.populate_boot_volumes()
+volumes.populate_block_volumes()
+
+def fetch_volume_attachments(vm_instance):
+    boot_vol_attachments = get_boot_vol_attachments(
+        compute_client,
+        vm_instance.availability_domain,
+        child_compartment.id,
+        vm_instance.id)
+    block_vol_attachments = get_block_vol_attachments(
+        compute_client,
+        vm_instance.availability_domain,
+        child_compartment.id,
+        vm_instance.id)
+    return boot_vol_attachments, block_vol_attachments
+
+volume_attachments = run_in_parallel(
+    fetch_volume_attachments,
+    selected_instances,
+    max_workers = DEFAULT_MAX_WORKERS
+)
+
+# build a clone plan for each VM instance, recording every problem found
+clone_plans = []
+planned_names = set()
+planned_ip_addresses = set()
+for vm_instance, (boot_vol_attachments, block_vol_attachments) in zip(selected_instances, volume_attachments):
+    mapping = vm_mappings.get(vm_instance.display_name, {})
+    clone_plan = {
+        "vm_instance"           : vm_instance,
+        "subnet_name"           : mapping.get("subnet_name") or target_subnet_name,
+        "subnet"                : None,
+        "private_ip_address"    : mapping.get("private_ip_address"),
+        "boot_volume"           : None,
+        "block_volumes"         : [],
+        "availability_domain"   : None,
+        "problems"              : []
+    }
+    problems = clone_plan["problems"]
+    clone_plans.append(clone_plan)
+
+    if vm_instance.display_name in planned_names:
+        problems.append("More than one VM instance is named " + vm_instance.display_name)
+    planned_names.add(vm_instance.display_name)
+    if target_vm_instances.return_instance_by_name(vm_instance.display_name) is not None:
+        problems.append("VM instance already exists within " + target_child_compartment_name + " in region " + dr_region)
+
+    subnet = return_target_subnet(clone_plan["subnet_name"])
+    clone_plan["subnet"] = subnet
+    if subnet is None:
+        problems.append("Subnet " + clone_plan["subnet_name"] + " not found within virtual cloud network " + target_vcn_name)
+    elif clone_plan["private_ip_address"] is not None:
+        private_ip_address = clone_plan["private_ip_address"]
+        try:
+            ip_address_in_subnet = validate_ip_addr_is_in_subnet(subnet.cidr_block, private_ip_address)
+        except RuntimeWarning:
+            ip_address_in_subnet = False
+        if not ip_address_in_subnet:
+            problems.append("IP address " + private_ip_address + " is not within subnet " + subnet.cidr_block)
+        elif allotted_ip_addresses[clone_plan["subnet_name"]].is_dup_ip(private_ip_address):
+            problems.append("IP address " + private_ip_address + " is already allotted within subnet " + clone_plan["subnet_name"])
+        elif private_ip_address in planned_ip_addresses:
+            problems.append("IP address " + private_ip_address + " is mapped to more than one VM instance")
+        planned_ip_addresses.add(private_ip_address)
+
+    if len(boot_vol_attachments) == 0:
+        problems.append("No boot volume is attached")
+    else:
+        clone_plan["boot_volume"] = volumes.return_boot_volume(boot_vol_attachments[0].boot_volume_id)
+        if clone_plan["boot_volume"] is None:
+            problems.append("Boot volume " + boot_vol_attachments[0].boot_volume_id + " not found")
+    for block_volume_attachment in block_vol_attachments:
+        block_volume = volumes.return_block_volume(block_volume_attachment.volume_id)
+        if block_volume is None:
+            problems.append("Volume " + block_volume_attachment.volume_id + " not found")
+        else:
+            clone_plan["block_volumes"].append(block_volume)
+
+    # the clone is created within the DR availability domain of the same number as the source
+    ad_number = int(vm_instance.availability_domain[-1])
+    if ad_number > len(dr_availability_domains):
+        problems.append("Region " + dr_region + " has no availability domain " + str(ad_number))
+    else:
+        clone_plan["availability_domain"] = dr_availability_domains[ad_number - 1].name
+
+# validate the replicas of every volume of every VM instance in one batch
+replica_states = return_volume_replica_states(
+    dr_storage_client,
+    [clone_plan["boot_volume"] for clone_plan in clone_plans if clone_plan["boot_volume"] is not None],
+    [block_volume for clone_plan in clone_plans for block_volume in clone_plan["block_volumes"]],
+    max_workers = DEFAULT_MAX_WORKERS
+)
+for clone_plan in clone_plans:
+    plan_volumes = clone_plan["block_volumes"]
+    if clone_plan["boot_volume"] is not None:
+        plan_volumes = [clone_plan["boot_volume"]] + plan_volumes
+    for volume in plan_volumes:
+        if replica_states[volume.id] is None:
+            clone_plan["problems"].append("Volume " + volume.display_name + " is not replicated")
+        elif replica_states[volume.id] != "AVAILABLE":
+            clone_plan["problems"].append("Replica of volume " + volume.display_name + " is in a " + replica_states[volume.id] + " state")
+
+# report the pre-flight results
+ready_plans = [clone_plan for clone_plan in clone_plans if len(clone_plan["problems"]) == 0]
+header = [
+    "VM NAME",
+    "AVAILABILITY\nDOMAIN",
+    "SUBNET",
+    "PRIVATE IP",
+    "VOLUMES",
+    "PRE-FLIGHT"
+]
+data_rows = []
+for clone_plan in clone_plans:
+    data_rows.append([
+        clone_plan["vm_instance"].display_name,
+        clone_plan["availability_domain"],
+        clone_plan["subnet_name"],
+        clone_plan["private_ip_address"] or "ASSIGNED BY OCI",
+        len(clone_plan["block_volumes"]) + (1 if clone_plan["boot_volume"] is not None else 0),
+        "READY" if len(clone_plan["problems"]) == 0 else "\n".join(clone_plan["problems"])
+    ])
+    write_report_record({
+        "event"                 : "preflight",
+        "vm_name"               : clone_plan["vm_instance"].display_name,
+        "availability_domain"   : clone_plan["availability_domain"],
+        "subnet_name"           : clone_plan["subnet_name"],
+        "private_ip_address"    : clone_plan["private_ip_address"],
+        "result"                : "READY" if len(clone_plan["problems"]) == 0 else "FAILED",
+        "problems"              : clone_plan["problems"]
+    })
+print(tabulate(data_rows, headers = header, tablefmt = "grid"))
+print("\n{} of {} VM instances passed the pre-flight checks.\n".format(
+    len(ready_plans),
+    len(clone_plans)
+))
+
+if preflight_only or len(ready_plans) == 0:
+    if report_file is not None:
+        report_file.close()
+    if len(ready_plans) == 0:
+        raise RuntimeWarning("WARNING! No VM instances passed the pre-flight checks")
+    exit(0)
+
+if not force:
+    warning_beep(6)
+    if len(ready_plans) != len(clone_plans):
+        print("WARNING! {} VM instances failed the pre-flight checks and will not be cloned.\n".format(
+            len(clone_plans) - len(ready_plans)
+        ))
+    print("Enter YES to clone {} VM instances to compartment {} within region {} or any other key to abort".format(
+        len(ready_plans),
+        target_child_compartment_name,
+        dr_region
+    ))
+    if "YES" != input():
+        print("\n\nFailover aborted per user request\n\n")
+        if report_file is not None:
+            report_file.close()
+        exit(0)
+
+# clone the VM instances, starting the next one as each finishes
+job_start_time = time.monotonic()
+
+def clone_progressed(dr_clone, step):
+    print("{:>8} seconds\t{}\t{}".format(
+        round(time.monotonic() - job_start_time, 1),
+        dr_clone.vm_instance.display_name,
+        step
+    ))
+    write_report_record({
+        "event"         : "progress",
+        "vm_name"       : dr_clone.vm_instance.display_name,
+        "step"          : step,
+        "status"        : dr_clone.status,
+        "job_seconds"   : round(time.monotonic() - job_start_time, 1)
+    })
+
+def clone_finished(dr_clone):
+    write_report_record({
+        "event"         : "finished",
+        "vm_name"       : dr_clone.vm_instance.display_name,
+        "status"        : dr_clone.status,
+        "error"         : None if dr_clone.error is None else str(getattr(dr_clone.error, "message", dr_clone.error)),
+        "timings"       : dr_clone.return_timings(),
+        "job_seconds"   : round(time.monotonic() - job_start_time, 1)
+    })
+
+clone_waiter = ResourceWaiter()
+clone_scheduler = CloneVmScheduler(
+    max_concurrent = max_concurrent_clones,
+    max_per_availability_domain = max_clones_per_ad,
+    callback = clone_finished
+)
+dr_clones = []
+for clone_plan in ready_plans:
+    dr_clone = CloneVmFromReplicas(
+        dr_compute_client,
+        dr_storage_client,
+        clone_waiter,
+        clone_plan["vm_instance"],
+        clone_plan["boot_volume"],
+        clone_plan["block_volumes"],
+        target_child_compartment.id,
+        clone_plan["availability_domain"],
+        clone_plan["subnet"].id,
+        clone_plan["private_ip_address"],
+        callback = clone_scheduler.clone_finished,
+        progress_callback = clone_progressed
+    )
+    dr_clones.append(dr_clone)
+    clone_scheduler.add(dr_clone)
+
+print("\n\nCloning {} VM instances to compartment {} within region {}, {} at a time{}, please wait......\n".format(
+    len(dr_clones),
+    target_child_compartment_name,
+    dr_region,
+    max_concurrent_clones,
+    "" if max_clones_per_ad is None else " and " + str(max_clones_per_ad) + " per availability domain"
+))
+clone_scheduler.start_clones()
+# allow the usual wait for each round of clones the limits permit
+clone_waiter.wait(
+    max_wait_time_in_seconds = DEFAULT_MAX_WAIT_SECONDS * math.ceil(len(dr_clones) / max_concurrent_clones)
+)
+
+# print the per VM instance timing summary
+header = [
+    "VM NAME",
+    "RESULT",
+    "BOOT VOLUME\nSECONDS",
+    "BLOCK VOLUMES\nSECONDS",
+    "RUNNING\nSECONDS",
+    "ATTACHED\nSECONDS",
+    "TOTAL\nSECONDS",
+    "ERROR"
+]
+data_rows = []
+vms_cloned = 0
+for dr_clone in dr_clones:
+    timings = dr_clone.return_timings()
+    if dr_clone.status == "COMPLETED":
+        vms_cloned += 1
+        result = "OK"
+    elif dr_clone.status == "FAILED":
+        result = "FAILED"
+    else:
+        result = "TIMED OUT " + dr_clone.status
+        clone_finished(dr_clone)
+    data_rows.append([
+        dr_clone.vm_instance.display_name,
+        result,
+        timings.get("boot_volume_available", ""),
+        timings.get("block_volumes_available", ""),
+        timings.get("instance_running", ""),
+        timings.get("block_volumes_attached", ""),
+        timings.get("completed", timings.get("failed", "")),
+        "" if dr_clone.error is None else str(getattr(dr_clone.error, "message", dr_clone.error))
+    ])
+
+print()
+print(tabulate(data_rows, headers = header, tablefmt = "simple"))
+job_seconds = round(time.monotonic() - job_start_time, 1)
+write_report_record({
+    "event"             : "summary",
+    "vm_instances"      : len(clone_plans),
+    "preflight_failed"  : len(clone_plans) - len(ready_plans),
+    "cloned"            : vms_cloned,
+    "failed"            : len([dr_clone for dr_clone in dr_clones if dr_clone.status == "FAILED"]),
+    "timed_out"         : len(dr_clones) - len(clone_scheduler.finished),
+    "job_seconds"       : job_seconds
+})
+if report_file is not None:
+    report_file.close()
+
+print("\n\n{} of {} VM instances were cloned to compartment {} within region {} in {} seconds.\n".format(
+    vms_cloned,
+    len(dr_clones),
+    target_child_compartment_name,
+    dr_region,
+    job_seconds
+))
+print("Job ending as of {}\n\n".format(
+    datetime.now()
+))
+if vms_cloned != len(dr_clones):
+    raise RuntimeError("EXCEPTION! {} VM instances failed to clone. Check the OCI Console for status and errors.\n\n".format(
+        len(dr_clones) - vms_cloned
+    ))
@@ -37,12 +37,15 @@ https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-try
 
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import imp
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required KCS modules
 from lib.general import copywrite
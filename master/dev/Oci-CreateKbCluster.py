@@ -32,6 +32,10 @@
 # file 'LICENSE.txt', which is part of this source code package.
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required bsystem modules
 import os.path
 import sys
@@ -41,7 +45,7 @@ from time import sleep
 from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.compute import GetImages
 from lib.container import create_cluster
 from lib.compartments import GetParentCompartments
@@ -74,7 +78,6 @@ from oci.container_engine.models import KubernetesNetworkConfig
 #     "directory /usr/local/bin/KENT/bin\n"
 # )
 copywrite()
-sleep(2)
 if len(sys.argv) != 8: # ARGS PLUS COMMAND
     print(
         "\n\nOci-CreateKbCluster.py : Usage\n" +
@@ -97,11 +100,7 @@ region                              = sys.argv[7]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -27,6 +27,10 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
@@ -34,7 +38,7 @@ from time import sleep
 
 # required OCI modules
 from lib.general import copywrite
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
 from lib.gateways import add_local_peering_gateway
@@ -52,7 +56,6 @@ from oci.core import VirtualNetworkClient
 from oci.core.models import ConnectLocalPeeringGatewaysDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 10:
     print(
         "\n\nOci-CreateLpgPeerConnection.py : Correct Usage\n\n" +
@@ -81,11 +84,7 @@ region          = sys.argv[9]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
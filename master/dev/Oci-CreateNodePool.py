@@ -32,10 +32,13 @@
 # file 'LICENSE.txt', which is part of this source code package.
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required built-in modules
 import os.path
 import sys
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
@@ -43,7 +46,7 @@ from lib.general import get_availability_domains
 from lib.general import return_availability_domain
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.compute import GetImages
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
@@ -73,7 +76,6 @@ from oci.container_engine.models import NodePoolPlacementConfigDetails
 from oci.container_engine.models import NodeSourceViaImageDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 13: # ARGS PLUS COMMAND
     print(
         "\n\nOci-CreateNodePool.py : Usage\n" +
@@ -103,11 +105,7 @@ if nodes_per_subnet % 3 != 0:
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -23,35 +23,45 @@ Below find a literal example:
 export PYTHONPATH=/Users/henrywojteczko/lib/oracle-cli/lib/python3.8/site-packages
 See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
+
+This program enables cross region replication of the boot and block volumes of one VM instance, or of every
+VM instance within a compartment when ALL_VMS is passed in place of the VM name. The bulk selection may be
+narrowed with --name and --tag. Volumes that already replicate are skipped, and the rest are enabled with
+concurrent requests. Pass --wait true to wait for every new replica to become AVAILABLE within the DR region
+and report the replication throughput.
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
+import time
+from datetime import datetime
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
-from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
 from lib.general import get_regions
-from lib.general import get_subscriber_regions
+from lib.general import GetInputOptions
+from lib.general import is_int
+from lib.general import validate_subscribed_region
 from lib.general import warning_beep
-from lib.backups import add_volume_to_backup_policy
-from lib.backups import GetBackupPolicies
-from lib.backups import delete_volume_backup_policy
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
 from lib.compute import get_block_vol_attachments
 from lib.compute import get_boot_vol_attachments
 from lib.compute import GetInstance
+from lib.compute import select_instances
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.concurrency import run_in_parallel
 from lib.volumes import create_bootvol_replica
 from lib.volumes import create_vol_replica
-from lib.volumes import delete_bootvol_replica
-from lib.volumes import delete_vol_replica
 from lib.volumes import GetVolumes
-from lib.volumes import GetVolumeAttachment
+from lib.waiters import ResourceWaiter
 
 # required OCI modules
 from oci.config import from_file
@@ -66,13 +76,20 @@ from oci.core.models import BlockVolumeReplicaDetails
 
 copywrite()
 
-if len(sys.argv) != 6:
+if len(sys.argv) < 6:
     print(
         "\n\nOci-CreateVmVolumeReplicas.py : Usage\n\n" +
-        "Oci-CreateVmVolumeReplicas.py [parent compartment] [child compartment] [VM] [region] [dr region]\n" +
-        "Usage example creates replica copies of the VM's boot and block volumes from the primary region\n" +
+        "Oci-CreateVmVolumeReplicas.py [parent compartment] [child compartment] [VM | ALL_VMS] [region] [dr region] [optional arguments]\n\n" +
+        "Usage example 1 creates replica copies of the VM's boot and block volumes from the primary region\n" +
         "to the disaster recovery region specified in the command arguments:\n" +
         "\tOci-CreateVmVolumeReplicas.py admin_comp auto_comp kentanst01 'us-ashburn-1' 'us-phoenix-1'\n\n" +
+        "Usage example 2 replicates the volumes of every VM instance tagged for DR and waits for the replicas:\n" +
+        "\tOci-CreateVmVolumeReplicas.py admin_comp auto_comp ALL_VMS 'us-ashburn-1' 'us-phoenix-1' --tag dr=true --wait true\n\n" +
+        "Optional arguments, which must be passed in pairs, are:\n" +
+        "\t--name\t\t\tShell style pattern matched against the VM instance names when ALL_VMS is passed\n" +
+        "\t--tag\t\t\tFreeform tag as key=value or defined tag as namespace.key=value when ALL_VMS is passed\n" +
+        "\t--max-concurrent\tNumber of replication requests submitted at once, {} by default\n".format(DEFAULT_MAX_WORKERS) +
+        "\t--wait\t\t\tPass true to wait for the replicas to become AVAILABLE and report the throughput\n\n" +
         "Please see the online documentation at the David Kent Consulting GitHub repository for more information.\n\n"
     )
     raise RuntimeError("EXCEPTION! - Incorrect usage")
@@ -83,27 +100,54 @@ virtual_machine_name                = sys.argv[3]
 region                              = sys.argv[4]
 dr_region                           = sys.argv[5]
 
-# instiate the environment and validate the regions
-
+# This program uses the class GetInputOptions to instiate variables from the argument vector.
+argument_list = GetInputOptions(
+    sys.argv
+)
+if not argument_list.populate_input_options(6):
+    warning_beep(1)
+    raise RuntimeError("SYNTAX ERROR! Invalid number of arguments provided by user")
+
+name_pattern = argument_list.return_input_option_data("--name")
+tag = argument_list.return_input_option_data("--tag")
+if virtual_machine_name != "ALL_VMS" and (name_pattern is not None or tag is not None):
+    raise RuntimeWarning("INVALID OPTION VALUE! - --name and --tag may only be passed with ALL_VMS")
+
+max_concurrent_requests = DEFAULT_MAX_WORKERS
+if argument_list.return_input_option_data("--max-concurrent") is not None:
+    max_concurrent_requests = argument_list.return_input_option_data("--max-concurrent")
+    if not is_int(max_concurrent_requests) or int(max_concurrent_requests) < 1:
+        raise RuntimeWarning("INVALID OPTION VALUE! - Value for --max-concurrent must be a whole number of 1 or more")
+    max_concurrent_requests = int(max_concurrent_requests)
+
+wait_for_replicas = False
+if argument_list.return_input_option_data("--wait") is not None:
+    wait_for_replicas = argument_list.return_input_option_data("--wait").upper() == "TRUE"
+
+# instiate the environment and validate the regions, which are fetched once per run
 print("\n\nValidating the cloud tenancy and other resources are available.......\n")
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
 regions = get_regions(identity_client)
-correct_region = False
-
+replica_region = None
 for rg in regions:
-    if rg.name == region:
-        correct_region = True
-if not correct_region:
-    print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
-        region
-    ))
-    raise RuntimeWarning("WARNING! INVALID REGION")
+    if rg.name == dr_region:
+        replica_region = rg
+for region_name, region_found in [(region, region in [rg.name for rg in regions]), (dr_region, replica_region is not None)]:
+    if not region_found:
+        print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
+            region_name
+        ))
+        raise RuntimeWarning("WARNING! INVALID REGION")
 
 config["region"] = region # Must set the cloud region
 identity_client = IdentityClient(config) # builds the identity client method, required to manage compartments
 compute_client = ComputeClient(config) # builds the compute client method, required to manage compute resources
 storage_client = BlockstorageClient(config) # builds the volume client method, required to manage block volume resources
+if wait_for_replicas:
+    drconfig = from_file()
+    drconfig["region"] = dr_region # Must set for the DR cloud region
+    dr_storage_client = BlockstorageClient(drconfig) # the replicas are polled within the DR region
 
 # validate the parent and child compartments
 parent_compartments = GetParentCompartments(parent_compartment_name, config, identity_client)
@@ -124,46 +168,10 @@ error_trap_resource_not_found(
     "Child compartment " + child_compartment_name + " within parent compartment " + parent_compartment_name
 )
 
-# Validate the subscribed regions
-config = from_file() # gets ~./.oci/config and reads to the object
-identity_client = IdentityClient(config)
-
-# check primary and secondary region
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
-if not correct_region:
-    print("\n\nWARNING! - Primary region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
-        region
-    ))
-    raise RuntimeWarning("WARNING! INVALID REGION")
-
-correct_region = False
-for rg in regions:
-    if rg.name == dr_region:
-        correct_region = True
-        replica_region = rg
-if not correct_region:
-    print("\n\nWARNING! - Disaster recovery region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
-        dr_region
-    ))
-    raise RuntimeWarning("WARNING! INVALID REGION")
-
 # Make sure regions are accessible to tenancy
-subscribed_regions = get_subscriber_regions(identity_client, parent_compartment.compartment_id)
-region_state = False
-dr_region_state = False
-for rg in subscribed_regions:
-    # rn = rg.region_name
-    if rg.region_name == region:
-        region_state = True
-    if rg.region_name == dr_region:
-        dr_region_state = True
-if not region_state:
+if not validate_subscribed_region(identity_client, parent_compartment.compartment_id, region):
     raise RuntimeError("EXCEPTION! Primary region not in supplied value for region")
-elif not dr_region_state:
+if not validate_subscribed_region(identity_client, parent_compartment.compartment_id, dr_region):
     raise RuntimeWarning("WARNING! Disaster recovery region not subscribed to")
 
 # Get the availability domains for the VM
@@ -173,35 +181,58 @@ availability_domains = get_availability_domains(
 
 print("Tenancy and regions verified, fetching VM and storage resource data......\n")
 
-# make sure the VM we are looking for exists
-vm_instances = GetInstance(
-    compute_client,
-    child_compartment.id,
-    virtual_machine_name,
-    
-    
-)
-vm_instances.populate_instances()
-vm_instance = vm_instances.return_instance()
-
-error_trap_resource_not_found(
-    vm_instance,
-    "Virtual machine instance " + virtual_machine_name + " not found within compartment " + child_compartment_name + " in region " + region
-)
-
-# get the boot and block voliume attachments
-boot_vol_attachments = get_boot_vol_attachments(
-    compute_client,
-    vm_instance.availability_domain,
-    child_compartment.id,
-    vm_instance.id
+# get the VM instance, or every VM instance that matches the selection
+if virtual_machine_name == "ALL_VMS":
+    vm_instances = GetInstance(
+        compute_client,
+        child_compartment.id,
+        None
     )
-
-block_vol_attachments = get_block_vol_attachments(
-    compute_client,
-    vm_instance.availability_domain,
-    child_compartment.id,
-    vm_instance.id)
+    vm_instances.populate_instances()
+    selected_instances = select_instances(
+        vm_instances.instance_list,
+        name_pattern = name_pattern,
+        tag = tag
+    )
+    if len(selected_instances) == 0:
+        print("\n\nNo VM instances in compartment {} within region {} match the selection.\n\n".format(
+            child_compartment_name,
+            region
+        ))
+        raise RuntimeWarning("WARNING! No VM instances selected")
+else:
+    vm_instances = GetInstance(
+        compute_client,
+        child_compartment.id,
+        virtual_machine_name
+    )
+    vm_instances.populate_instance()
+    vm_instance = vm_instances.return_instance()
+    error_trap_resource_not_found(
+        vm_instance,
+        "Virtual machine instance " + virtual_machine_name + " not found within compartment " + child_compartment_name + " in region " + region
+    )
+    selected_instances = [vm_instance]
+
+# get the boot and block volume attachments of every VM instance together
+def fetch_volume_attachments(vm_instance):
+    boot_vol_attachments = get_boot_vol_attachments(
+        compute_client,
+        vm_instance.availability_domain,
+        child_compartment.id,
+        vm_instance.id)
+    block_vol_attachments = get_block_vol_attachments(
+        compute_client,
+        vm_instance.availability_domain,
+        child_compartment.id,
+        vm_instance.id)
+    return boot_vol_attachments, block_vol_attachments
+
+volume_attachments = run_in_parallel(
+    fetch_volume_attachments,
+    selected_instances,
+    max_workers = max_concurrent_requests
+)
 
 # get the disk volumes
 volumes = GetVolumes(
@@ -211,100 +242,196 @@ volumes = GetVolumes(
 volumes.populate_boot_volumes()
 volumes.populate_block_volumes()
 
-# get the boot and block volumes that are attached to the VM instance
-boot_volumes = []
-for boot_vol_attachment in boot_vol_attachments:
-    boot_volume = volumes.return_boot_volume(boot_vol_attachment.boot_volume_id)
-    boot_volumes.append(boot_volume)
-
-block_volumes = []
-for block_volume_attachment in block_vol_attachments:
-    block_volume = volumes.return_block_volume(block_volume_attachment.volume_id)
-    block_volumes.append(block_volume)
-
-print("Creating the volume replicas for virtual machine {} from region {}\n to region {}......\n".format(
-          virtual_machine_name,
-          region,
-          dr_region
-      ))
-
-# Create replicas if they do not exist in dr_region
-
-for bv in boot_volumes:
-    if None == bv.boot_volume_replicas:
-        '''
-        we have to create the text string for the availability domain where the
-        replica is to be created. This consists of the availability domain
-        of the source domain, aka the first 4 chars of the volume's availability
-        domain, plus a :, (we get that from the 1st 5 chars of bv.availability_domain),
-        plus the region key (we get that from replica_region.key), plus the string
-        "-AD-", plus the last char of bv (bv.availability_domain[-1])
-        
-        This same logic will be applied for creating block volume replicas.
-        '''
-        create_bootvol_replica_response = create_bootvol_replica(
-            storage_client,
-            UpdateBootVolumeDetails,
-            BootVolumeReplicaDetails,
-            bv.id,
-            (bv.availability_domain[:5] + replica_region.key + "-AD-" + bv.availability_domain[-1]),
-            bv.display_name
-        )
-
-        if create_bootvol_replica_response.data is None:
-            raise RuntimeError("EXCEPTION! Unknown Error")
+'''
+we have to create the text string for the availability domain where the
+replica is to be created. This consists of the availability domain
+of the source domain, aka the first 4 chars of the volume's availability
+domain, plus a :, (we get that from the 1st 5 chars of the volume's availability_domain),
+plus the region key (we get that from replica_region.key), plus the string
+"-AD-", plus the last char of the volume's availability_domain.
+'''
+replica_requests = []
+skipped_volumes = []
+volume_ids = set()
+for vm_instance, (boot_vol_attachments, block_vol_attachments) in zip(selected_instances, volume_attachments):
+    vm_volumes = []
+    for boot_vol_attachment in boot_vol_attachments:
+        vm_volumes.append(("BOOT", volumes.return_boot_volume(boot_vol_attachment.boot_volume_id)))
+    for block_volume_attachment in block_vol_attachments:
+        vm_volumes.append(("BLOCK", volumes.return_block_volume(block_volume_attachment.volume_id)))
+    for volume_type, volume in vm_volumes:
+        # a volume attached to more than one VM instance is only replicated once
+        if volume is None or volume.id in volume_ids:
+            continue
+        volume_ids.add(volume.id)
+        replicas = volume.boot_volume_replicas if volume_type == "BOOT" else volume.block_volume_replicas
+        if replicas:
+            skipped_volumes.append((vm_instance, volume_type, volume))
+            continue
+        replica_requests.append({
+            "vm_instance"           : vm_instance,
+            "volume_type"           : volume_type,
+            "volume"                : volume,
+            "availability_domain"   : volume.availability_domain[:5] + replica_region.key + "-AD-" + volume.availability_domain[-1],
+            "replica_id"            : None,
+            "submitted"             : None,
+            "available"             : None,
+            "replica_state"         : None,
+            "error"                 : None
+        })
+
+print("Enabling replication for {} volumes of {} VM instances from region {} to region {}, {} at a time. {} volumes\n".format(
+    len(replica_requests),
+    len(selected_instances),
+    region,
+    dr_region,
+    max_concurrent_requests,
+    len(skipped_volumes)
+) + "already replicate and are skipped......\n")
+
+job_start_time = time.monotonic()
+
+def submit_replica_request(replica_request):
+    volume = replica_request["volume"]
+    try:
+        if replica_request["volume_type"] == "BOOT":
+            response = create_bootvol_replica(
+                storage_client,
+                UpdateBootVolumeDetails,
+                BootVolumeReplicaDetails,
+                volume.id,
+                replica_request["availability_domain"],
+                volume.display_name
+            )
+            replicas = response.data.boot_volume_replicas if response.data is not None else None
+            if replicas:
+                replica_request["replica_id"] = replicas[0].boot_volume_replica_id
         else:
-            print("Replication for boot volume {} enabled to DR region {}\n".format(
-                bv.display_name,
-                dr_region
-            ))
-    
-    else:
-
-        print("Boot volume {} already replicating to DR region {}, skipping\n".format(
-            bv.display_name,
-            dr_region
-        ))
-
-for v in block_volumes:
-    if None == v.block_volume_replicas:
-        '''
-        we have to create the text string for the availability domain where the
-        replica is to be created. This consists of the availability domain
-        of the source domain, aka the first 4 chars of the volume's availability
-        domain, plus a :, (we get that from the 1st 5 chars of bv.availability_domain),
-        plus the region key (we get that from replica_region.key), plus the string
-        "-AD-", plus the last char of bv (bv.availability_domain[-1])
-        
-        This same logic will be applied for creating boot volume replicas.
-        '''
-        create_vol_replica_response = create_vol_replica(
-            storage_client,
-            UpdateVolumeDetails,
-            BlockVolumeReplicaDetails,
-            v.id,
-            (v.availability_domain[:5] + replica_region.key + "-AD-" + v.availability_domain[-1]),
-            v.display_name
+            response = create_vol_replica(
+                storage_client,
+                UpdateVolumeDetails,
+                BlockVolumeReplicaDetails,
+                volume.id,
+                replica_request["availability_domain"],
+                volume.display_name
+            )
+            replicas = response.data.block_volume_replicas if response.data is not None else None
+            if replicas:
+                replica_request["replica_id"] = replicas[0].block_volume_replica_id
+        if response.data is None:
+            replica_request["error"] = "Unknown Error"
+    except Exception as error:
+        replica_request["error"] = str(getattr(error, "message", error))
+    replica_request["submitted"] = time.monotonic()
+    return replica_request
+
+run_in_parallel(
+    submit_replica_request,
+    replica_requests,
+    max_workers = max_concurrent_requests
+)
+submit_seconds = round(time.monotonic() - job_start_time, 1)
+
+# poll every new replica within the DR region together until it is AVAILABLE
+if wait_for_replicas:
+    replica_waiter = ResourceWaiter(max_workers = max_concurrent_requests)
+    def record_replica_state(replica_request):
+        def replica_ready(replica):
+            replica_request["replica_state"] = replica.lifecycle_state
+            replica_request["available"] = time.monotonic()
+        return replica_ready
+    for replica_request in replica_requests:
+        if replica_request["error"] is not None or replica_request["replica_id"] is None:
+            continue
+        replica_waiter.add(
+            replica_request["replica_id"],
+            "volume_replica",
+            dr_storage_client.get_boot_volume_replica if replica_request["volume_type"] == "BOOT" else dr_storage_client.get_block_volume_replica,
+            ["AVAILABLE"],
+            failed_states = ["FAULTY", "TERMINATING", "TERMINATED"],
+            callback = record_replica_state(replica_request)
         )
-        
-        if create_vol_replica_response.data is None:
-            raise RuntimeError("EXCEPTION! Unknown Error")
-        else:
-            print("Replication for volume {} enabled to DR region {}\n".format(
-                v.display_name,
-                dr_region
-            ))
-    
+    print("Waiting for {} replicas to become AVAILABLE within region {}, please wait......\n".format(
+        len(replica_waiter.return_pending_ids()),
+        dr_region
+    ))
+    replica_waiter.wait()
+
+# print the per volume summary and the throughput
+header = [
+    "VM NAME",
+    "VOLUME",
+    "TYPE",
+    "SIZE\nGB",
+    "SUBMIT\nSECONDS",
+    "AVAILABLE\nSECONDS" if wait_for_replicas else "REPLICA\nSTATE",
+    "RESULT"
+]
+data_rows = []
+replicas_enabled = 0
+gbs_enabled = 0
+gbs_available = 0
+for replica_request in replica_requests:
+    volume = replica_request["volume"]
+    if replica_request["error"] is None:
+        replicas_enabled += 1
+        gbs_enabled += volume.size_in_gbs
+        result = "ENABLED"
     else:
-
-        print("Volume {} already replicating to DR region {}, skipping\n".format(
-            bv.display_name,
-            dr_region
-        ))
-
-print("All volumes for virtual machine {} are now replicated between region {}\n and DR region {}.\n\n".format(
-    virtual_machine_name,
-    region,
-    dr_region
+        result = "FAILED: " + replica_request["error"]
+    available_seconds = ""
+    if wait_for_replicas and replica_request["error"] is None:
+        if replica_request["replica_state"] == "AVAILABLE":
+            gbs_available += volume.size_in_gbs
+            available_seconds = round(replica_request["available"] - job_start_time, 1)
+            result = "AVAILABLE"
+        elif replica_request["replica_state"] is not None:
+            result = replica_request["replica_state"]
+        else:
+            result = "TIMED OUT"
+    data_rows.append([
+        replica_request["vm_instance"].display_name,
+        volume.display_name,
+        replica_request["volume_type"],
+        volume.size_in_gbs,
+        round(replica_request["submitted"] - job_start_time, 1),
+        available_seconds if wait_for_replicas else "PROVISIONING" if replica_request["error"] is None else "",
+        result
+    ])
+for vm_instance, volume_type, volume in skipped_volumes:
+    data_rows.append([
+        vm_instance.display_name,
+        volume.display_name,
+        volume_type,
+        volume.size_in_gbs,
+        "",
+        "",
+        "ALREADY REPLICATING"
+    ])
+
+print(tabulate(data_rows, headers = header, tablefmt = "simple"))
+print("\n\nReplication enabled for {} of {} volumes, {} GB in total, within {} seconds, {} requests per second.".format(
+    replicas_enabled,
+    len(replica_requests),
+    gbs_enabled,
+    submit_seconds,
+    round(len(replica_requests) / submit_seconds, 1) if submit_seconds > 0 else len(replica_requests)
 ))
-
+if wait_for_replicas:
+    job_seconds = round(time.monotonic() - job_start_time, 1)
+    print("{} GB of replicas became AVAILABLE within region {} in {} seconds, {} GB per minute.".format(
+        gbs_available,
+        dr_region,
+        job_seconds,
+        round(gbs_available * 60 / job_seconds, 1) if job_seconds > 0 else gbs_available
+    ))
+print("{} volumes were skipped since they already replicate to a DR region.\n".format(
+    len(skipped_volumes)
+))
+print("Job ending as of {}\n\n".format(
+    datetime.now()
+))
+if replicas_enabled != len(replica_requests):
+    raise RuntimeError("EXCEPTION! Replication could not be enabled for {} volumes".format(
+        len(replica_requests) - replicas_enabled
+    ))
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+'''
+This program starts, stops and reports on the resident KENT daemon. While the daemon is
+running, the other Oci-*.py programs hand their work to it rather than importing the OCI
+SDK and the KENT libraries each time they run. See lib/daemon.py for details.
+
+The daemon runs in the foreground. Start it in the background from the shell or from an
+Ansible playbook before running a batch of programs, and stop it once the batch is done.
+'''
+# required system modules
+import sys
+from datetime import datetime
+
+# required DKC modules
+from lib.daemon import send_daemon_command
+from lib.daemon import serve
+
+
+if len(sys.argv) != 2: # ARGS PLUS COMMAND
+    print(
+        "\n\nOci-Daemon.py : Correct Usage\n\n" +
+        "Oci-Daemon.py [start | stop | status]\n\n" +
+        "Use case example 1 starts the daemon in the background:\n\n" +
+        "\tOci-Daemon.py start &\n\n" +
+        "Use case example 2 stops the daemon:\n\n" +
+        "\tOci-Daemon.py stop\n\n" +
+        "Use case example 3 reports on the running daemon:\n\n" +
+        "\tOci-Daemon.py status\n\n" +
+        "Set KENT_DAEMON=0 to run programs without the daemon while it is running.\n" +
+        "Please see the online documentation at the David Kent Consulting GitHub repository for more information.\n"
+    )
+    raise RuntimeError(
+        "EXCEPTION! Incorrect usage."
+    )
+
+command = sys.argv[1].lower()
+
+if command == "start":
+    serve()
+
+elif command == "stop":
+    reply = send_daemon_command("stop")
+    if reply is None:
+        raise RuntimeWarning("WARNING! The KENT daemon is not running")
+    print("The KENT daemon has been stopped.\n")
+
+elif command == "status":
+    reply = send_daemon_command("status")
+    if reply is None:
+        raise RuntimeWarning("WARNING! The KENT daemon is not running")
+    print(
+        "The KENT daemon is running with pid {} on socket {}\n".format(
+            reply["pid"],
+            reply["socket"]
+        ) +
+        "Started:\t{}\n".format(datetime.fromtimestamp(reply["started"]).strftime('%Y-%m-%d %H:%M:%S')) +
+        "Programs run:\t{}\n".format(reply["programs_run"]) +
+        "Codebase:\t{}\n".format(reply["codebase"])
+    )
+
+else:
+    print("\n\nInvalid command {}. Valid commands are start, stop or status.\n\n".format(command))
+    raise RuntimeError("EXCEPTION! - Invalid command")
@@ -38,18 +38,21 @@ https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-try
 9. Print the results
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import imp
 from logging.handlers import SysLogHandler
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required KCS modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
@@ -89,11 +92,7 @@ config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
 
 # 1. Verify regions
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -103,7 +102,6 @@ if not correct_region:
 config["region"] = region # Must set the cloud region
 identity_client = IdentityClient(config) # builds the identity client method, required to manage compartments
 database_client = DatabaseClient(config)
-regions         = get_regions(identity_client)
 
 print("Fetching data from OCI, please wait......\n\n")
 
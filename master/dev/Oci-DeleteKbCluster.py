@@ -32,6 +32,10 @@
 # file 'LICENSE.txt', which is part of this source code package.
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
@@ -41,7 +45,7 @@ from time import sleep
 from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import warning_beep
 from lib.compute import GetImages
 from lib.container import delete_cluster
@@ -61,7 +65,6 @@ from oci.container_engine import ContainerEngineClient
 from oci.container_engine import ContainerEngineClientCompositeOperations
 
 copywrite()
-sleep(2)
 if len(sys.argv) < 5 or len(sys.argv) > 6: # ARGS PLUS COMMAND
     print(
         "\n\nOci-DeleteKbCluster.py : Usage\n" +
@@ -86,11 +89,7 @@ else:
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -27,21 +27,23 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required system modules
 import os.path
 import sys
-from time import sleep
 
 # required KENT modules
 from lib.general import GetAlarms
 from lib.general import copywrite
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import error_trap_resource_not_found
 from lib.general import GetNotificationItems
 from lib.compartments import GetParentCompartments
@@ -87,11 +89,7 @@ identity_client     = IdentityClient(config) # builds the identity client method
 ons_client          = NotificationControlPlaneClient(config)
 monitoring_client   = MonitoringClient(config)
 
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
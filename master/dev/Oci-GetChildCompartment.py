@@ -27,11 +27,14 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 from datetime import date
 
 # required DKC modules
@@ -72,7 +75,6 @@ if len(sys.argv) == 4:
     option = sys.argv[3].upper()
 if option != "--JSON":
     copywrite()
-    sleep(2)
 
 parent_compartment_name = sys.argv[1]
 child_compartment_name = sys.argv[2]
@@ -32,16 +32,19 @@ Pagination must be used to fetch custom images. See
  
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.compute import GetImages
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
@@ -53,7 +56,6 @@ from oci.identity import IdentityClient
 from oci.core import ComputeClient
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 5:
     print(
         "\n\nOci-GetImage : Usage\n" +
@@ -75,11 +77,7 @@ region                      = sys.argv[4]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -17,11 +17,14 @@
 # This file is subject to the terms and conditions defined in
 # file 'LICENSE.txt', which is part of this source code package.
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
@@ -30,7 +33,7 @@ from lib.general import warning_beep
 from lib.compute import GetImages
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.container import GetCluster
 from lib.container import get_node_pool
 
@@ -67,16 +70,11 @@ else:
     option = [] # required for logic to work
 if option != "--JSON":
     copywrite()
-    sleep(2)
 
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
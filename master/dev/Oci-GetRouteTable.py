@@ -27,17 +27,20 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.routetables import add_route_table
 from lib.routetables import GetRouteTable
 from lib.vcns import GetVirtualCloudNetworks
@@ -67,7 +70,6 @@ else:
     option = [] # required for logic to work
 if option != "--JSON":
     copywrite()
-    sleep(2)
 
 parent_compartment_name         = sys.argv[1]
 child_compartment_name          = sys.argv[2]
@@ -78,11 +80,7 @@ region                          = sys.argv[5]
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -27,16 +27,19 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.vcns import GetVirtualCloudNetworks
 from lib.vcns import add_virtual_cloud_network
 from lib.compartments import GetParentCompartments
@@ -69,7 +72,6 @@ else:
     option = None
 if option != "--JSON":
     copywrite()
-    sleep(2)
 
 parent_compartment_name     = sys.argv[1]
 child_compartment_name      = sys.argv[2]
@@ -81,11 +83,7 @@ region                      = sys.argv[4]
 # create the dict object config, which reads the ~./.oci/config file in this case
 config = oci.config.from_file()
 identity_client = oci.identity.IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -27,20 +27,23 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import platform
 import resource
 import sys
 from tabulate import tabulate
-from time import sleep
 
 
 # required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import is_int
 from lib.general import test_free_mem_1gb
 from lib.general import warning_beep
@@ -130,20 +133,13 @@ header = [
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
     ))
     raise RuntimeWarning("WARNING! INVALID REGION")
-correct_region = False
-for rg in regions:
-    if rg.name == dr_region:
-        correct_region = True
+correct_region = validate_region(identity_client, dr_region)
 if not correct_region:
     print("\n\nWARNING! - Disaster Recovery Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -152,7 +148,6 @@ if not correct_region:
 
 if option != "--JSON":
     copywrite()
-    sleep(2)
     print("\n\nFetching and validating tenancy resource data......\n")
 
 config["region"] = region # Must set the cloud region
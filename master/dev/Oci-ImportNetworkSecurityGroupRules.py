@@ -38,27 +38,41 @@ export PYTHONPATH=/Users/henrywojteczko/lib/oracle-cli/lib/python3.8/site-packag
 See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
-Package requirements: Python 3.8.5 or later, conda, pandas.
-Be certain your libpaths are correct for python otherwise pandas will not import.
+Package requirements: Python 3.8.5 or later, conda, tabulate.
+The CSV file is read with lib/csvinput.py, so pandas and detect_delimiter are not required.
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
+# check the CSV file and exit if --validate-only was passed, before the OCI SDK is imported, see lib/rulecompiler.py
+from lib.rulecompiler import exit_if_validate_only
+exit_if_validate_only()
+
 # required system modules
-from detect_delimiter import detect
-import pandas as pd
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
+import time
 
 # required DKC modules
+from lib.csvinput import iterate_csv_records
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
 from lib.general import GetInputOptions
-from lib.general import get_regions
+from lib.general import validate_region
+from lib.ratelimit import default_rate_limiter
+from lib.rulecompiler import build_security_group_rules
+from lib.rulecompiler import compile_rule_rows
+from lib.rulesync import diff_security_rules
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
+from lib.securitygroups import add_security_group_rules
 from lib.securitygroups import GetNetworkSecurityGroup
-from lib.securitylists import prepare_csv_record
+from lib.securitygroups import prepare_csv_record
+from lib.securitygroups import remove_security_group_rules
+from lib.securitygroups import update_security_group_rules
 from lib.vcns import GetVirtualCloudNetworks
 
 # required OCI modules
@@ -69,19 +83,27 @@ from oci.core.models import AddSecurityRuleDetails
 from oci.core.models import AddNetworkSecurityGroupSecurityRulesDetails
 from oci.core.models import PortRange
 from oci.core.models import RemoveNetworkSecurityGroupSecurityRulesDetails
+from oci.core.models import UpdateNetworkSecurityGroupSecurityRulesDetails
+from oci.core.models import UpdateSecurityRuleDetails
 from oci.core.models import IcmpOptions
 from oci.core.models import TcpOptions
 from oci.core.models import UdpOptions
 
 copywrite()
-sleep(2)
-if len(sys.argv) != 7:
+if len(sys.argv) not in [7, 8]:
     print(
         "\n\nOci-ImportNetworkSecurityGroupRules : Correct Usage\n\n" +
         "Oci-ImportNetworkSecurityGroupRules.py [parent compartment] [child_compartment] [virtual_network] " +
-        "[network security group] [region] [csv file]\n\n" +
+        "[network security group] [region] [csv file] [--sync | --validate-only]\n\n" +
         "Use case example imports all network security group rules into the specified security group from the CSV input file.\n" +
         "\tOci-ImportNetworkSecurityGroupRules.py admin_comp auto_comp auto_vcn dmzt01_grp 'us-ashburn-1' dmzt01_grp.csv\n\n" +
+        "Pass --sync to only add, update and remove the rules that differ from the CSV input file, rather than\n" +
+        "purging every rule and importing the file again. The security group is never left without its rules.\n" +
+        "\tOci-ImportNetworkSecurityGroupRules.py admin_comp auto_comp auto_vcn dmzt01_grp 'us-ashburn-1' dmzt01_grp.csv --sync\n\n" +
+        "Pass --validate-only with the CSV input file alone to check it without connecting to OCI or importing the OCI SDK.\n" +
+        "Every bad row, duplicate rule and rule shadowed by a broader rule is reported with its line number, and the\n" +
+        "program exits with status 1 if any are found.\n" +
+        "\tOci-ImportNetworkSecurityGroupRules.py --validate-only dmzt01_grp.csv\n\n" +
         "The format of the CSV is <field1>;<field2>;.......<last field><CR>\n" +
         "The CSV file is named <security group name>_rules.csv and includes a header file that describes each field.\n" +
         "The import program expects this header and ignores it as input.\n\n" +
@@ -96,739 +118,18 @@ security_group_name             = sys.argv[4]
 region                          = sys.argv[5]
 security_rule_export_file       = sys.argv[6]
 
+sync_rules = False
+if len(sys.argv) == 8:
+    if sys.argv[7].upper() == "--SYNC":
+        sync_rules = True
+    else:
+        raise RuntimeWarning("INVALID OPTION! - The only valid options are --sync and --validate-only")
+
 if not os.path.isfile(security_rule_export_file):
     raise RuntimeWarning("WARNING! - File not found")
 
 # functions
 
-def import_csv_to_dataframe(
-    security_rule_export_file):
-    '''
-    This function uses pandas to retrieve the data in the CSV rule export file into
-    a dataframe. It returns the dataframe to the calling code. For example, if the
-    a record contains:
-        Rule Description;Protocol (ICMP/ICMPv6/TCP/UDP);Is Stateless (False/True);Source;Source Type;Destination;Destination Type;ICMP Type;ICMP Code;Source TCP Maximum Port;Source TCP Minimum Port;Destination TCP Maximum Port;Destination TCP Minimum Port;Source UDP Maximum Port;Source UDP Minimum Port;Destination UDP Maximum Port;Destination UDP Minimum UDP Port
-        Sample rule permits all Inbound TCP traffic from tenancy;TCP;10.1.0.0/20;CIDR_BLOCK;;;;;;;;;;
-        Sample rule permits all Inbound TCP traffic from tenancy;TCP;10.1.0.0/20;CIDR_BLOCK;;;;;;;;;;
-
-    And you wish to read the second field in the 1st row, simply doing this will retrieve the data:
-    
-    my_data = rules.iloc[1,1]
-    
-    The contents of my_data now are "TCP"
-
-    WARNING!
-    This function must be called from __main__
-    pandas must be loaded
-
-    WARNING! This function requires the use of detect from the detect_delimiter module.
-    The module was developed during python2.x days but has been tested up to python
-    version 3.8.5. Versions after this should be tested during the codebase deployment.
-    See https://pypi.org/project/detect-delimiter/ 
-    
-    To later extract specific values from the datafrom, use the iloc method.
-    See the pandas user guide for more information at
-    https://pandas.pydata.org/docs/user_guide/10min.html#object-creation
-    '''
-    
-    # determine the delimiter with detect, see
-    # https://pypi.org/project/detect-delimiter/
-    with open(security_rule_export_file) as myfile:
-        firstline = myfile.readline()
-    myfile.close()
-    delimiter = detect(firstline)
-
-        # start by opening the CSV import file for reading
-    records = pd.read_csv(security_rule_export_file,
-                         sep = delimiter)
-    return records
-
-# end function import_csv_to_dataframe()
-
-def create_ruleset(
-    AddSecurityRuleDetails,
-    AddNetworkSecurityGroupSecurityRulesDetails,
-    IcmpOptions,
-    TcpOptions,
-    UdpOptions,
-    PortRange,
-    network_client,
-    network_security_group_id,
-    rules):
-    '''
-
-    The purpose of this function is to import network security group rules created within a correctly
-    formatted csv file into the security list. The OCI APIs for managing security groups are complex
-    and have some stability issues. For example, calling APIs for building security rules as stand-alone
-    code yields undefined type casting of classes and decorators. The sole means of avoiding these
-    defects is to call the APIs recursively within the code block that calls oci.core.VirtualNetworkClient
-
-    This function presumes the security group rules are purged prior to being called. A failure to purge
-    the rules will result in duplicates. Duplicates are not enforced by OCI.
-
-    '''
-    
-    count = len(rules)
-    cntr = 0 # we skip the header since pandas is used
-    rule_set = []   # Unlike security lists, security rules do not require calls for either
-                    # engress or ingress rules. So we only define one list and append as each
-                    # rule is defined, regardless of type.
-    while cntr < count:
-        # we'll test for the protocol type and take action based on the string values "TCP", "UDP", and "ICMP"
-        # This release does not support ICMPv6
-        if "TCP" == rules.iloc[cntr, 1]:
-            
-            protocol = "6" # set the RFC protocol acronym to its numeric equivalent, required by the OCI API
-
-            # is_stateless as a boolean False. OCI API requires this.
-            if str(rules.iloc[cntr, 2]) == "True":
-                is_stateless = True
-            else:
-                is_stateless = False
-
-            # There is a defect in oci.core.VirtualNetworkClient.list_network_secuirty_group_rules
-            # The API returns null instead of a boolean value. Since stateless is a rarely used
-            # rule type, we presume a string value of "True" will specify stateless, otherwise
-            # we set to False. In either case, we are setting to boolean per API requirements.
-            # This defect was reported on 31-dec-2021 via SR 3-24851209151.
-            source_max = None
-            destination_max = None
-            if str(rules.iloc[cntr, 9]) != "nan":
-                source_max = int(rules.iloc[cntr, 9])
-                source_min = int(rules.iloc[cntr, 10])
-            if str(rules.iloc[cntr, 11]) != "nan":
-                destination_max = int(rules.iloc[cntr, 11])
-                destination_min = int(rules.iloc[cntr, 12])
-
-            # Testing to see if the field for source is empty, we are using pandas
-            if str(rules.iloc[cntr,3]) != "nan":
-
-                '''
-
-                In all code below, we must apply each rule individually. This is due to the
-                API stability issues previously discussed at the top of this function. In each case,
-                we determine how to build the protocol options object based on the presence of vars
-                instiated and then set with values when said values are present. This strategy is
-                repeated throughout the function.
-
-                '''
-                if source_max is not None and destination_max is None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4],
-                                    tcp_options = TcpOptions(
-                                        source_port_range = PortRange(
-                                            max = source_max,
-                                            min = source_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif source_max is None and destination_max is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4],
-                                    tcp_options = TcpOptions(
-                                        destination_port_range = PortRange(
-                                            max = destination_max,
-                                            min = destination_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif source_max is not None and destination_max is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4],
-                                    tcp_options = TcpOptions(
-                                        source_port_range = PortRange(
-                                            max = source_max,
-                                            min = source_min
-                                        ),
-                                        destination_port_range = PortRange(
-                                            max = destination_max,
-                                            min = destination_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                else:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4]
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-            # Test for the destination
-            if str(rules.iloc[cntr, 5]) != "nan":
-
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-
-                if source_max is not None and destination_max is None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6],
-                                    tcp_options = TcpOptions(
-                                        source_port_range = PortRange(
-                                            max = source_max,
-                                            min = source_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif source_max is None and destination_max is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6],
-                                    tcp_options = TcpOptions(
-                                        destination_port_range = PortRange(
-                                            max = destination_max,
-                                            min = destination_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif source_max is not None and destination_max is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6],
-                                    tcp_options = TcpOptions(
-                                        source_port_range = PortRange(
-                                            max = source_max,
-                                            min = source_min
-                                        ),
-                                        destination_port_range = PortRange(
-                                            max = destination_max,
-                                            min = destination_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                else:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6]
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-        # end if "TCP" == rules.iloc[cntr, 1]:
-        if "UDP" == rules.iloc[cntr, 1]:
-            
-            protocol = "17"
-
-            if str(rules.iloc[cntr, 2]) == "True":
-                is_stateless = True
-            else:
-                is_stateless = False
-            source_max = None
-            destination_max = None
-            if str(rules.iloc[cntr, 13]) != "nan":
-                source_max = int(rules.iloc[cntr, 13])
-                source_min = int(rules.iloc[cntr, 14])
-            if str(rules.iloc[cntr, 15]) != "nan":
-                destination_max = int(rules.iloc[cntr, 15])
-                destination_min = int(rules.iloc[cntr, 16])
-            
-            # test for the source
-            if str(rules.iloc[cntr,3]) != "nan":
-                
-                if source_max is not None and destination_max is None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4],
-                                    udp_options = UdpOptions(
-                                        source_port_range = PortRange(
-                                            max = source_max,
-                                            min = source_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif source_max is None and destination_max is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4],
-                                    udp_options = UdpOptions(
-                                        destination_port_range = PortRange(
-                                            max = destination_max,
-                                            min = destination_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif source_max is not None and destination_max is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4],
-                                    udp_options = UdpOptions(
-                                        source_port_range = PortRange(
-                                            max = source_max,
-                                            min = source_min
-                                        ),
-                                        destination_port_range = PortRange(
-                                            max = destination_max,
-                                            min = destination_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                else:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4]
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-            # test for the destination    
-            if str(rules.iloc[cntr, 5]) != "nan":
-                
-                if source_max is not None and destination_max is None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6],
-                                    udp_options = UdpOptions(
-                                        source_port_range = PortRange(
-                                            max = source_max,
-                                            min = source_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif source_max is None and destination_max is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6],
-                                    udp_options = UdpOptions(
-                                        destination_port_range = PortRange(
-                                            max = destination_max,
-                                            min = destination_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif source_max is not None and destination_max is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6],
-                                    udp_options = UdpOptions(
-                                        source_port_range = PortRange(
-                                            max = source_max,
-                                            min = source_min
-                                        ),
-                                        destination_port_range = PortRange(
-                                            max = destination_max,
-                                            min = destination_min
-                                        )
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                else:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6]
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-
-        # end if "UDP" == rules.iloc[cntr, 1]:
-        
-        if "ICMP" == rules.iloc[cntr, 1]:
-            
-            protocol = "1"
-
-            icmp_type = None
-            icmp_code = None
-            if str(rules.iloc[cntr, 7]) != "nan":
-                icmp_type = int(rules.iloc[cntr, 7])
-            if str(rules.iloc[cntr, 8]) != "nan":
-                icmp_code = int(rules.iloc[cntr, 8])
-                
-            if str(rules.iloc[cntr, 2]) == "True":
-                is_stateless = True
-            else:
-                is_stateless = False
-            
-            if str(rules.iloc[cntr,3]) != "nan":
-                
-                if icmp_type is not None and icmp_code is None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4],
-                                    icmp_options = IcmpOptions(
-                                        type = icmp_type
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif icmp_type is not None and icmp_code is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4],
-                                    icmp_options = IcmpOptions(
-                                        type = icmp_type,
-                                        code = icmp_code
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif icmp_type is None and icmp_code is None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "INGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    source = rules.iloc[cntr, 3],
-                                    source_type = rules.iloc[cntr, 4]
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-
-            if str(rules.iloc[cntr,5]) != "nan":
-
-                if icmp_type is not None and icmp_code is None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6],
-                                    icmp_options = IcmpOptions(
-                                        type = icmp_type
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif icmp_type is not None and icmp_code is not None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6],
-                                    icmp_options = IcmpOptions(
-                                        type = icmp_type,
-                                        code = icmp_code
-                                    )
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-                elif icmp_type is None and icmp_code is None:
-                    results = network_client.add_network_security_group_security_rules(
-                        network_security_group_id = network_security_group_id,
-                        add_network_security_group_security_rules_details = \
-                        AddNetworkSecurityGroupSecurityRulesDetails(
-                            security_rules = [
-                                AddSecurityRuleDetails(
-                                    direction = "EGRESS",
-                                    protocol = protocol,
-                                    description = rules.iloc[cntr, 0],
-                                    destination = rules.iloc[cntr, 5],
-                                    destination_type = rules.iloc[cntr, 6]
-                                )
-                            ]
-                        )
-                    ).data
-                    rule_set.append(results)
-                    sleep(1)
-        # end if "ICMP" == rules.iloc[cntr, 1]:
-
-        if "ALL" == rules.iloc[cntr, 1]:
-
-            protocol = "all"
-
-            if str(rules.iloc[cntr, 2]) == "True":
-                is_stateless = True
-            else:
-                is_stateless = False
-            
-            if str(rules.iloc[cntr,3]) != "nan":
-
-                results = network_client.add_network_security_group_security_rules(
-                    network_security_group_id = network_security_group_id,
-                    add_network_security_group_security_rules_details = \
-                    AddNetworkSecurityGroupSecurityRulesDetails(
-                        security_rules = [
-                            AddSecurityRuleDetails(
-                                direction = "INGRESS",
-                                protocol = protocol,
-                                description = rules.iloc[cntr, 0],
-                                source = rules.iloc[cntr, 3],
-                                source_type = rules.iloc[cntr, 4]
-                            )
-                        ]
-                    )
-                ).data
-                rule_set.append(results)
-                sleep(1)
-        
-            if str(rules.iloc[cntr,5]) != "nan":
-
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-
-                results = network_client.add_network_security_group_security_rules(
-                    network_security_group_id = network_security_group_id,
-                    add_network_security_group_security_rules_details = \
-                    AddNetworkSecurityGroupSecurityRulesDetails(
-                        security_rules = [
-                            AddSecurityRuleDetails(
-                                direction = "EGRESS",
-                                protocol = protocol,
-                                description = rules.iloc[cntr, 0],
-                                destination = rules.iloc[cntr, 5],
-                                destination_type = rules.iloc[cntr, 6]
-                            )
-                        ]
-                    )
-                ).data
-                rule_set.append(results)
-                sleep(1)
-
-        cntr += 1
-        # end while cntr < count
-
-    # now return the rulesets that were created
-    return rule_set
-# end function create_ruleset()
-
 def purge_rules_from_network_security_group(
     network_client,
     my_security_group):
@@ -839,26 +140,22 @@ def purge_rules_from_network_security_group(
     for rule in ruleset:
         security_rule_ids.append(rule.id)
     # call remove_network_security_group_security_rules and remove the rules supplied
-    # in the list. API returns result regardless of presence of rules, which is desirable
-    # logic. We must sleep for 1 cycle in order to avoid API stability issues.
-    results = network_client.remove_network_security_group_security_rules(
-        security_group.id,
-        remove_network_security_group_security_rules_details = RemoveNetworkSecurityGroupSecurityRulesDetails(
-            security_rule_ids = security_rule_ids
-        )
+    # in the list, 25 at a time. API returns result regardless of presence of rules, which is desirable
+    # logic. The calls are paced through the shared rate limiter in order to avoid API stability issues.
+    rest_calls = remove_security_group_rules(
+        network_client,
+        RemoveNetworkSecurityGroupSecurityRulesDetails,
+        my_security_group.id,
+        security_rule_ids
     )
-    sleep(1)
+    return len(security_rule_ids), rest_calls
 
 # end function purge_rules_from_network_security_group()
 
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -916,35 +213,127 @@ error_trap_resource_not_found(
     "Security group " + security_group_name + " not found within virtual cloud network " + virtual_cloud_network_name
 )
 
-# We start by importing the correctly formatted CSV file.
-my_rules = import_csv_to_dataframe(security_rule_export_file,)
+# We start by importing the correctly formatted CSV file and compiling every rule before any REST call is made.
+job_start_time = time.monotonic()
+my_rules = list(iterate_csv_records(security_rule_export_file))
 print("\n\n{} records imported from CSV file {}\n".format(
     len(my_rules),
     security_rule_export_file))
-
-# We continue by purging any existing rules from the security group. This is to enforce avoidence of duplicate records
-print("Purging existing security rules from network security group {}\n".format(security_group_name))
-purge_rules_from_network_security_group(
-    network_client,
-    security_group
-)
-
-# Proceed with the record import.
-print("Importing rules from CSV file {} into network security list {}\n".format(
-    security_rule_export_file,
-    security_group_name
-))
-ruleset = create_ruleset(
+rule_records, rule_errors = compile_rule_rows(my_rules)
+if len(rule_errors) != 0:
+    for rule_error in rule_errors:
+        print("WARNING! - {}".format(rule_error))
+    raise RuntimeWarning("WARNING! - {} bad rows found in CSV file {}, no rules were changed\n".format(
+        len(rule_errors),
+        security_rule_export_file
+    ))
+# The OCI APIs for managing security groups are complex and have some stability issues. For example, calling
+# APIs for building security rules as stand-alone code yields undefined type casting of classes and decorators.
+# The sole means of avoiding these defects is to build the rule objects within the program that calls
+# oci.core.VirtualNetworkClient, so the model classes are passed to the rule compiler.
+security_rules = build_security_group_rules(
+    rule_records,
     AddSecurityRuleDetails,
-    AddNetworkSecurityGroupSecurityRulesDetails,
     IcmpOptions,
     TcpOptions,
     UdpOptions,
-    PortRange,
-    network_client,
-    security_group.id,
-    my_rules)
-print("Import of new security rules successful. Printing rules below and exiting normally.\n\n")
-sleep(3)
-print(ruleset)
+    PortRange)
+compile_seconds = time.monotonic() - job_start_time
+
+throttled_calls = default_rate_limiter.throttled_calls
+import_start_time = time.monotonic()
+if sync_rules:
+    # compare the compiled rules with the live rules and only send the difference. New rules are added
+    # before the stale rules are removed so that the security group is never without its rules.
+    rule_diff = diff_security_rules(
+        security_groups.return_security_group_rules(security_group.id),
+        security_rules,
+        prepare_csv_record
+    )
+    print("Synchronizing network security group {} with CSV file {}. {} rules to add, {} to update, {} to remove and {} unchanged\n".format(
+        security_group_name,
+        security_rule_export_file,
+        len(rule_diff["add"]),
+        len(rule_diff["update"]),
+        len(rule_diff["remove"]),
+        rule_diff["unchanged"]
+    ))
+    added_rules, rest_calls = add_security_group_rules(
+        network_client,
+        AddNetworkSecurityGroupSecurityRulesDetails,
+        security_group.id,
+        rule_diff["add"])
+    update_rules = []
+    for live_rule, new_rule in rule_diff["update"]:
+        update_rules.append(
+            UpdateSecurityRuleDetails(
+                id = live_rule.id,
+                direction = new_rule.direction,
+                protocol = new_rule.protocol,
+                description = new_rule.description,
+                source = new_rule.source,
+                source_type = new_rule.source_type,
+                destination = new_rule.destination,
+                destination_type = new_rule.destination_type,
+                icmp_options = new_rule.icmp_options,
+                tcp_options = new_rule.tcp_options,
+                udp_options = new_rule.udp_options
+            )
+        )
+    updated_rules, update_calls = update_security_group_rules(
+        network_client,
+        UpdateNetworkSecurityGroupSecurityRulesDetails,
+        security_group.id,
+        update_rules)
+    rest_calls += update_calls
+    rest_calls += remove_security_group_rules(
+        network_client,
+        RemoveNetworkSecurityGroupSecurityRulesDetails,
+        security_group.id,
+        [live_rule.id for live_rule in rule_diff["remove"]])
+    summary_rows = [
+        ["RULES ADDED", len(added_rules)],
+        ["RULES UPDATED", len(updated_rules)],
+        ["RULES REMOVED", len(rule_diff["remove"])],
+        ["RULES UNCHANGED", rule_diff["unchanged"]]
+    ]
+else:
+    # We continue by purging any existing rules from the security group. This is to enforce avoidence of duplicate records
+    print("Purging existing security rules from network security group {}\n".format(security_group_name))
+    rules_purged, rest_calls = purge_rules_from_network_security_group(
+        network_client,
+        security_group
+    )
 
+    # Proceed with the record import, which sends the compiled rules in batches
+    print("Importing {} rules from CSV file {} into network security group {}\n".format(
+        len(security_rules),
+        security_rule_export_file,
+        security_group_name
+    ))
+    added_rules, add_calls = add_security_group_rules(
+        network_client,
+        AddNetworkSecurityGroupSecurityRulesDetails,
+        security_group.id,
+        security_rules)
+    rest_calls += add_calls
+    summary_rows = [
+        ["RULES PURGED", rules_purged],
+        ["RULES IMPORTED", len(added_rules)]
+    ]
+import_seconds = time.monotonic() - import_start_time
+throttled_calls = default_rate_limiter.throttled_calls - throttled_calls
+
+print("Import of new security rules successful. Printing the timing summary below and exiting normally.\n\n")
+print(tabulate(
+    [["CSV RECORDS READ", len(my_rules), round(compile_seconds, 2)]] +
+    [summary_row + [""] for summary_row in summary_rows] +
+    [
+        ["REST CALLS", rest_calls, round(import_seconds, 2)],
+        ["THROTTLED CALLS RETRIED", throttled_calls, ""],
+        ["TOTAL", "", round(time.monotonic() - job_start_time, 2)]
+    ],
+    headers = ["STEP", "COUNT", "SECONDS"],
+    tablefmt = "simple"
+))
+print("")
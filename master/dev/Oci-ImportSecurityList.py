@@ -38,25 +38,34 @@ export PYTHONPATH=/Users/henrywojteczko/lib/oracle-cli/lib/python3.8/site-packag
 See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
-Package requirements: Python 3.8.5 or later, conda, pandas.
-Be certain your libpaths are correct for python otherwise pandas will not import.
+Package requirements: Python 3.8.5 or later, conda.
+The CSV file is read with lib/csvinput.py, so pandas and detect_delimiter are not required.
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
+# check the CSV file and exit if --validate-only was passed, before the OCI SDK is imported, see lib/rulecompiler.py
+from lib.rulecompiler import exit_if_validate_only
+exit_if_validate_only()
+
 # required system modules
-from detect_delimiter import detect
 import csv
 import os.path
-import pandas as pd
 import sys
-from time import sleep
 
 # required DKC modules
+from lib.csvinput import iterate_csv_records
 from lib.general import copywrite
 from lib.general import get_protocol
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
+from lib.rulecompiler import build_security_list_rules
+from lib.rulecompiler import compile_rule_rows
+from lib.rulesync import diff_security_rules
 from lib.securitylists import prepare_csv_record
 from lib.securitylists import export_security_list_rules_to_csv
 from lib.securitylists import GetNetworkSecurityList
@@ -75,14 +84,20 @@ from oci.core.models import UdpOptions
 from oci.core.models import UpdateSecurityListDetails
 
 copywrite()
-sleep(2)
-if len(sys.argv) != 7:
+if len(sys.argv) not in [7, 8]:
     print(
         "\n\nOci-ImportSecurityList : Correct Usage\n\n" +
         "Oci-ImportSecurityList.py [parent compartment] [child_compartment] [virtual_network] " +
-        "[network security list] [region] [csv file]\n\n" +
+        "[network security list] [region] [csv file] [--sync | --validate-only]\n\n" +
         "Use case example imports all security list rules into the specified security list from the CSV input file.\n" +
         "\tOci-ImportSecurityList.py admin_comp auto_comp auto_vcn auto_sec 'us-ashburn-1' auto_sec_rules.csv\n\n" +
+        "Pass --sync to compare the CSV input file with the live rules first. The security list is only updated\n" +
+        "when a rule was added, changed or removed.\n" +
+        "\tOci-ImportSecurityList.py admin_comp auto_comp auto_vcn auto_sec 'us-ashburn-1' auto_sec_rules.csv --sync\n\n" +
+        "Pass --validate-only with the CSV input file alone to check it without connecting to OCI or importing the OCI SDK.\n" +
+        "Every bad row, duplicate rule and rule shadowed by a broader rule is reported with its line number, and the\n" +
+        "program exits with status 1 if any are found.\n" +
+        "\tOci-ImportSecurityList.py --validate-only auto_sec_rules.csv\n\n" +
         "The format of the CSV is <field1>;<field2>;.......<last field><CR>\n" +
         "The CSV file is named <security list name>_rules.csv and includes a header file that describes each field.\n" +
         "The import program expects this header and ignores it as input.\n\n" +
@@ -98,569 +113,20 @@ security_list_name              = sys.argv[4]
 region                          = sys.argv[5]
 security_rule_export_file       = sys.argv[6]
 
-if not os.path.isfile(security_rule_export_file):
-    raise RuntimeWarning("WARNING! - File not found")
-'''
-
-We define all functions that use pandas within the main program. There are 2 main functions.
-
-Function import_csv_to_dataframe instiates a pandas dataframe that contains the CSV
-imported objects.
-
-'''
-def import_csv_to_dataframe(
-    security_rule_export_file):
-    '''
-    This function uses pandas to retrieve the data in the CSV rule export file into
-    a dataframe. It returns the dataframe to the calling code. For example, if the
-    a record contains:
-        Rule Description;Protocol (ICMP/ICMPv6/TCP/UDP);Is Stateless (False/True);Source;Source Type;Destination;Destination Type;ICMP Type;ICMP Code;Source TCP Maximum Port;Source TCP Minimum Port;Destination TCP Maximum Port;Destination TCP Minimum Port;Source UDP Maximum Port;Source UDP Minimum Port;Destination UDP Maximum Port;Destination UDP Minimum UDP Port
-        Sample rule permits all Inbound TCP traffic from tenancy;TCP;10.1.0.0/20;CIDR_BLOCK;;;;;;;;;;
-        Sample rule permits all Inbound TCP traffic from tenancy;TCP;10.1.0.0/20;CIDR_BLOCK;;;;;;;;;;
-
-    And you wish to read the second field in the 1st row, simply doing this will retrieve the data:
-    
-    my_data = rules.iloc[1,1]
-    
-    The contents of my_data now are "TCP"
-
-    WARNING!
-    This function must be called from __main__
-    pandas must be loaded
-
-    WARNING! This function requires the use of detect from the detect_delimiter module.
-    The module was developed during python2.x days but has been tested up to python
-    version 3.8.5. Versions after this should be tested during the codebase deployment.
-    See https://pypi.org/project/detect-delimiter/ 
-
-    To later extract specific values from the datafrom, use the iloc method.
-    See the pandas user guide for more information at
-    https://pandas.pydata.org/docs/user_guide/10min.html#object-creation
-    '''
-
-    # determine the delimiter with detect, see
-    # https://pypi.org/project/detect-delimiter/
-    with open(security_rule_export_file) as myfile:
-        firstline = myfile.readline()
-    myfile.close()
-    delimiter = detect(firstline)
-
-    # start by opening the CSV import file for reading
-    records = pd.read_csv(security_rule_export_file,
-                         sep = delimiter)
-    return records
-
-# end function import_csv_to_dataframe()
-
-def import_rules(rules):
-    
-    count = len(rules)
-    cntr = 0 # we skip the header since pandas is used
-    ingress_security_rules = []
-    egress_security_rules = []
-
-    while cntr < count:
-        # we'll test for the protocol type and take action based on the string values "TCP", "UDP", and "ICMP"
-        # This release does not support ICMPv6
-        if "TCP" == rules.iloc[cntr, 1]:
-            
-            protocol = "6" # set the RFC protocol acronym to its numeric equivalent, required by the OCI API
-            
-            # Testing to see if the field for source is empty, we are using pandas
-            if str(rules.iloc[cntr,3]) != "nan":
-                # now test to see if is_stateless is false, and if so, create a var
-                # is_stateless as a boolean False. OCI API requires this.
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-
-                # there is a defect in oci.core.models.TcpOptions when attempting to
-                # build it when not called from within oci.core.models.EgressSecurityRule.
-                # This big fat bug means we have to do some work-around code to make things work.
-                # Must be set to null and then defined only if source and/or destination
-                # rules exist. API is loosy goosie, so we must be careful.
-                source_max = None
-                destination_max = None
-                if str(rules.iloc[cntr, 9]) != "nan":
-                    source_max = int(rules.iloc[cntr, 9])
-                    source_min = int(rules.iloc[cntr, 10])
-                if str(rules.iloc[cntr, 11]) != "nan":
-                    destination_max = int(rules.iloc[cntr, 11])
-                    destination_min = int(rules.iloc[cntr, 12])
-                
-                # run through the logic, testing for source_max and destination_max. This will determine
-                # which OCI APIs get called for the specific rule type to define
-                if source_max is not None and destination_max is None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                        tcp_options = TcpOptions(
-                            source_port_range = PortRange(
-                                max = source_max,
-                                min = source_min
-                            )
-                        )
-                    )
-                elif source_max is None and destination_max is not None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                        tcp_options = TcpOptions(
-                            destination_port_range = PortRange(
-                                max = destination_max,
-                                min = destination_min
-                            )
-                        )
-                    )
-                elif source_max is not None and destination_max is not None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                        tcp_options = TcpOptions(
-                            destination_port_range = PortRange(
-                                max = destination_max,
-                                min = destination_min
-                            ),
-                            source_port_range = PortRange(
-                                max = source_max,
-                                min = source_min
-                            )
-                        )
-                    )
-                else:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4]
-                    )
-                ingress_security_rules.append(rule)
-            # end if str(rules.iloc[cntr,3]) != "nan":
-
-            # Testing to see if the field for destination is empty
-            if str(rules.iloc[cntr,5]) != "nan":
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-                
-                source_max = None
-                destination_max = None
-                if str(rules.iloc[cntr, 9]) != "nan":
-                    source_max = int(rules.iloc[cntr, 9])
-                    source_min = int(rules.iloc[cntr, 10])
-                if str(rules.iloc[cntr, 11]) != "nan":
-                    destination_max = int(rules.iloc[cntr, 11])
-                    destination_min = int(rules.iloc[cntr, 12])
-                
-                if source_max is not None and destination_max is None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6],
-                        tcp_options = TcpOptions(
-                            source_port_range = PortRange(
-                                max = source_max,
-                                min = source_min
-                            )
-                        )
-                    )
-                elif source_max is None and destination_max is not None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6],
-                        tcp_options = TcpOptions(
-                            destination_port_range = PortRange(
-                                max = destination_max,
-                                min = destination_min
-                            )
-                        )
-                    )
-                elif source_max is not None and destination_max is not None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6],
-                        tcp_options = TcpOptions(
-                            destination_port_range = PortRange(
-                                max = destination_max,
-                                min = destination_min
-                            ),
-                            source_port_range = PortRange(
-                                max = source_max,
-                                min = source_min
-                            )
-                        )
-                    )
-                else:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6]
-                    )
-                egress_security_rules.append(rule)
-            # end if str(rules.iloc[cntr,5]) != "nan":
-        # end if "TCP" == rules.iloc[cntr, 1]:
-
-        if "UDP" == rules.iloc[cntr, 1]:
-            protocol = "17" # set the RFC protocol acronym to its numeric equivalent
-            # test for the source
-            if str(rules.iloc[cntr,3]) != "nan":
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-                
-                source_max = None
-                destination_max = None
-                if str(rules.iloc[cntr, 13]) != "nan":
-                    source_max = int(rules.iloc[cntr, 13])
-                    source_min = int(rules.iloc[cntr, 14])
-                if str(rules.iloc[cntr, 15]) != "nan":
-                    destination_max = int(rules.iloc[cntr, 15])
-                    destination_min = int(rules.iloc[cntr, 16])
-
-                if source_max is not None and destination_max is None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                        udp_options = UdpOptions(
-                            source_port_range = PortRange(
-                                max = source_max,
-                                min = source_min
-                            )
-                        )
-                    )
-                elif source_max is not None and destination_max is not None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                        udp_options = UdpOptions(
-                            destination_port_range = PortRange(
-                                max = destination_max,
-                                min = destination_min
-                            ),
-                            source_port_range = PortRange(
-                                max = source_max,
-                                min = source_min
-                            )
-                        )
-                    )
-                elif source_max is None and destination_max is not None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                        udp_options = UdpOptions(
-                            destination_port_range = PortRange(
-                                max = destination_max,
-                                min = destination_min
-                            )
-                        )
-                    )
-                else:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                    )
-                ingress_security_rules.append(rule)
-            # end if str(rules.iloc[cntr,3]) != "nan":
-
-            if str(rules.iloc[cntr,5]) != "nan":
-                if str(rules.iloc[cntr, 6]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-                
-                source_max = None
-                destination_max = None
-                if str(rules.iloc[cntr, 13]) != "nan":
-                    source_max = int(rules.iloc[cntr, 13])
-                    source_min = int(rules.iloc[cntr, 14])
-                if str(rules.iloc[cntr, 15]) != "nan":
-                    destination_max = int(rules.iloc[cntr, 15])
-                    destination_min = int(rules.iloc[cntr, 16])
-                
-                if source_max is not None and destination_max is None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6],
-                        udp_options = UdpOptions(
-                            source_port_range = PortRange(
-                                max = source_max,
-                                min = source_min
-                            )
-                        )
-                    )
-                elif source_max is not None and destination_max is not None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6],
-                        udp_options = UdpOptions(
-                            destination_port_range = PortRange(
-                                max = destination_max,
-                                min = destination_min
-                            ),
-                            source_port_range = PortRange(
-                                max = source_max,
-                                min = source_min
-                            )
-                        )
-                    )
-                elif source_max is None and destination_max is not None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6],
-                        udp_options = UdpOptions(
-                            destination_port_range = PortRange(
-                                max = destination_max,
-                                min = destination_min
-                            )
-                        )
-                    )
-                else:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6]
-                    )
-                egress_security_rules.append(rule)
-            # end if str(rules.iloc[cntr,5]) != "nan":
-        # end if "UDP" == rules.iloc[cntr, 1]:
-
-        if "ICMP" == rules.iloc[cntr, 1]:
-            protocol = "1" # set the RFC protocol acronym to its numeric equivalent
-
-            if str(rules.iloc[cntr,3]) != "nan":
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-                
-                # for ICMP, we test for the ICMP type and then the ICMP code. In our
-                # code, we presume that where a code exists, a type must also exist.
-                # ICMP does not have to have a type/code, or a code, but must have a
-                # type if a code is present.
-                icmp_type = None
-                icmp_code = None
-                # test for the type value
-                if str(rules.iloc[cntr, 7]) != "nan":
-                    icmp_type = int(rules.iloc[cntr, 7])
-                # test for the code value
-                if str(rules.iloc[cntr, 8]) != "nan":
-                    icmp_code = int(rules.iloc[cntr, 8])
-                
-                # first we test to see if both type and code are present, then create the rule
-                if icmp_type is not None and icmp_code is not None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                        icmp_options = IcmpOptions(
-                            type = icmp_type,
-                            code = icmp_code
-                        )
-                    )
-                # Now test to see if only type is present
-                elif icmp_type is not None and icmp_code is None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                        icmp_options = IcmpOptions(
-                            type = icmp_type
-                        )
-                    )
-                # now we test to see if neither type or code are present
-                elif icmp_type is None and icmp_code is None:
-                    rule = IngressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        source = rules.iloc[cntr, 3],
-                        source_type = rules.iloc[cntr, 4],
-                    )
-                # finally, we test to see if code is present without type, in which
-                # case we raise a RuntimeWarning
-                elif icmp_type is None and icmp_code is not None:
-                    print(
-                        "\n\nWARNING! - ICMP type value is missing for {} but code {} is present\n".format(
-                        icmp_code,
-                        rules.iloc[cntr, 0]) +
-                        "Please resolve and try again.\n\n"
-                    )
-                    raise RuntimeWarning("WARNING! - ICMP code must always accompany an ICMP type\n")
-                ingress_security_rules.append(rule)
-            # end if str(rules.iloc[cntr,3]) != "nan":
-
-            if str(rules.iloc[cntr,5]) != "nan":
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-
-                icmp_type = None
-                icmp_code = None
-                # test for the type value
-                if str(rules.iloc[cntr, 7]) != "nan":
-                    icmp_type = int(rules.iloc[cntr, 7])
-                # test for the code value
-                if str(rules.iloc[cntr, 8]) != "nan":
-                    icmp_code = int(rules.iloc[cntr, 8])
-
-                if icmp_type is not None and icmp_code is not None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6],
-                        icmp_options = IcmpOptions(
-                            type = icmp_type,
-                            code = icmp_code
-                        )
-                    )
-                elif icmp_type is not None and icmp_code is None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6],
-                        icmp_options = IcmpOptions(
-                            type = icmp_type
-                        )
-                    )                
-                elif icmp_type is None and icmp_code is None:
-                    rule = EgressSecurityRule(
-                        description = rules.iloc[cntr, 0],
-                        is_stateless = is_stateless,
-                        protocol = protocol,
-                        destination = rules.iloc[cntr, 5],
-                        destination_type = rules.iloc[cntr, 6]
-                    )    
-                elif icmp_type is None and icmp_code is not None:
-                    print(
-                        "\n\nWARNING! - ICMP type value is missing for {} but code {} is present\n".format(
-                        icmp_code,
-                        rules.iloc[cntr, 0]) +
-                        "Please resolve and try again.\n\n"
-                    )
-                    raise RuntimeWarning("WARNING! - ICMP code must always accompany an ICMP type\n")
-                egress_security_rules.append(rule)
-
-            # end if str(rules.iloc[cntr,5]) != "nan":
-        # end     if "ICMP" == rules.iloc[cntr, 1]:
-
-        if "ALL" == rules.iloc[cntr, 1]:
-
-            protocol = "all"
-
-            if str(rules.iloc[cntr,3]) != "nan":
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-                
-                rule = IngressSecurityRule(
-                    description = rules.iloc[cntr, 0],
-                    is_stateless = is_stateless,
-                    protocol = protocol,
-                    source = rules.iloc[cntr, 3],
-                    source_type = rules.iloc[cntr, 4],
-                )
-                ingress_security_rules.append(rule)
-
-            if str(rules.iloc[cntr,5]) != "nan":
-                if str(rules.iloc[cntr, 2]) == "True":
-                    is_stateless = True
-                else:
-                    is_stateless = False
-                
-                rule = EgressSecurityRule(
-                    description = rules.iloc[cntr, 0],
-                    is_stateless = is_stateless,
-                    protocol = protocol,
-                    destination = rules.iloc[cntr, 5],
-                    destination_type = rules.iloc[cntr, 6],
-                )
-                egress_security_rules.append(rule)
-        cntr += 1
-    # end while cntr < count
-    
-    # The object security_list_details is the object that gets passed to network_client.update_security_list
-    security_list_details = UpdateSecurityListDetails(
-        ingress_security_rules = ingress_security_rules,
-        egress_security_rules = egress_security_rules
-    )
-    
-    # now apply the new rule set to the security list
-    results = network_client.update_security_list(
-        security_list_id = security_list.id,
-        update_security_list_details = security_list_details
-    ).data
-
-    if results is None:
-        raise RuntimeError("EXCEPTION! - UNKNOWN ERROR")
+sync_rules = False
+if len(sys.argv) == 8:
+    if sys.argv[7].upper() == "--SYNC":
+        sync_rules = True
     else:
-        print(results)
+        raise RuntimeWarning("INVALID OPTION! - The only valid options are --sync and --validate-only")
 
-# end function import_rules()
+if not os.path.isfile(security_rule_export_file):
+    raise RuntimeWarning("WARNING! - File not found")
 
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -733,7 +199,61 @@ error_trap_resource_not_found(
     "Security list " + security_list_name + " not found within virtual cloud network " + virtual_cloud_network_name
 )
 
-# Start by instiating the rules variable. This will be a pandas dataframe object.
-my_rules = import_csv_to_dataframe(security_rule_export_file)
+# Start by reading the CSV file. Each record is the line number and a list of the values within that line.
+my_rules = list(iterate_csv_records(security_rule_export_file))
+rule_records, rule_errors = compile_rule_rows(my_rules)
+if len(rule_errors) != 0:
+    for rule_error in rule_errors:
+        print("WARNING! - {}".format(rule_error))
+    raise RuntimeWarning("WARNING! - {} bad rows found in CSV file {}, no rules were changed\n".format(
+        len(rule_errors),
+        security_rule_export_file
+    ))
+ingress_security_rules, egress_security_rules = build_security_list_rules(
+    rule_records,
+    IngressSecurityRule,
+    EgressSecurityRule,
+    IcmpOptions,
+    TcpOptions,
+    UdpOptions,
+    PortRange)
+
+if sync_rules:
+    # The security list API replaces every rule at once, so there is never a window without rules. Syncing
+    # compares the CSV rules with the live rules and skips the update entirely when nothing has changed.
+    rule_diff = diff_security_rules(
+        security_list.ingress_security_rules + security_list.egress_security_rules,
+        ingress_security_rules + egress_security_rules,
+        prepare_csv_record
+    )
+    print("\n\nSecurity list {} differs from CSV file {} by {} rules to add, {} to update and {} to remove. {} rules are unchanged.\n".format(
+        security_list_name,
+        security_rule_export_file,
+        len(rule_diff["add"]),
+        len(rule_diff["update"]),
+        len(rule_diff["remove"]),
+        rule_diff["unchanged"]
+    ))
+    if len(rule_diff["add"]) + len(rule_diff["update"]) + len(rule_diff["remove"]) == 0:
+        print("Security list {} is already in sync with CSV file {}, no update is required.\n\n".format(
+            security_list_name,
+            security_rule_export_file
+        ))
+        exit(0)
+
+# The object security_list_details is the object that gets passed to network_client.update_security_list
+security_list_details = UpdateSecurityListDetails(
+    ingress_security_rules = ingress_security_rules,
+    egress_security_rules = egress_security_rules
+)
+
+# now apply the new rule set to the security list
+results = network_client.update_security_list(
+    security_list_id = security_list.id,
+    update_security_list_details = security_list_details
+).data
 
-import_rules(my_rules)
+if results is None:
+    raise RuntimeError("EXCEPTION! - UNKNOWN ERROR")
+else:
+    print(results)
@@ -0,0 +1,331 @@
+#!/usr/bin/python3
+
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+'''
+The system env var PATHONPATH must be exported in the shell's profile. It must point to the location of the OCI
+libraries. This is typically in the same directory structure that the OCI CLI installs to, such as
+~./lib/oracle-cli/lib/python3.8/site-packages
+
+Below find a literal example:
+
+export PYTHONPATH=/Users/henrywojteczko/lib/oracle-cli/lib/python3.8/site-packages
+
+See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
+https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
+
+This program starts or stops many VM instances within a compartment at once. The power requests
+are submitted concurrently, then every instance is tracked by one shared poller until it reaches
+a RUNNING or STOPPED state. Use it in place of running Oci-StartVM.py or Oci-StopVM.py once per
+VM instance.
+'''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
+# required system modules
+import os.path
+import sys
+import time
+from datetime import datetime
+from tabulate import tabulate
+
+# required DKC modules
+from lib.general import copywrite
+from lib.general import error_trap_resource_not_found
+from lib.general import GetInputOptions
+from lib.general import is_int
+from lib.general import validate_region
+from lib.general import warning_beep
+from lib.compartments import GetParentCompartments
+from lib.compartments import GetChildCompartments
+from lib.compute import GetInstance
+from lib.compute import select_instances
+from lib.compute import submit_instance_actions
+from lib.compute import wait_for_instance_states
+from lib.concurrency import DEFAULT_MAX_WORKERS
+
+# required OCI modules
+from oci.config import from_file
+from oci.identity import IdentityClient
+from oci.core import ComputeClient
+
+# the state each instance must be in for the action to be submitted, and the state it converges to
+power_actions = {
+    "START"     : {"required_state" : "STOPPED", "to_state" : "RUNNING"},
+    "SOFTSTOP"  : {"required_state" : "RUNNING", "to_state" : "STOPPED"},
+    "STOP"      : {"required_state" : "RUNNING", "to_state" : "STOPPED"}
+}
+
+copywrite()
+if len(sys.argv) < 5:
+    print(
+        "\n\nOci-PowerVms.py : Usage\n\n" +
+        "Oci-PowerVms.py [parent compartment] [child compartment] [start | softstop | stop] [region] [optional arguments]\n\n" +
+        "Use case example 1 gracefully stops every VM instance within the child compartment:\n" +
+        "\tOci-PowerVms.py admin_comp dev_comp softstop 'us-ashburn-1'\n\n" +
+        "Use case example 2 starts the VM instances whose names match the pattern and that carry the tag:\n" +
+        "\tOci-PowerVms.py admin_comp dev_comp start 'us-ashburn-1' --name 'dev-*' --tag environment=dev\n\n" +
+        "Use case example 3 gracefully stops the VM instances listed in a file without prompting:\n" +
+        "\tOci-PowerVms.py admin_comp dev_comp softstop 'us-ashburn-1' --file nightly_shutdown.txt --force true\n\n" +
+        "Optional arguments, which must be passed in pairs, are:\n" +
+        "\t--name\t\t\tShell style pattern matched against the VM instance names, such as 'dev-*'\n" +
+        "\t--tag\t\t\tFreeform tag as key=value or defined tag as namespace.key=value\n" +
+        "\t--file\t\t\tText file that lists one VM instance name per line\n" +
+        "\t--max-concurrent\tNumber of power requests submitted at once, {} by default\n".format(DEFAULT_MAX_WORKERS) +
+        "\t--force\t\t\tPass true to skip the confirmation prompt of a stop request\n\n" +
+        "Selections are combined, so only VM instances that match all of them are acted upon. The action softstop\n" +
+        "gracefully shuts down the OS, while stop forces a hard stop of the VM instance.\n\n" +
+        "Please see the online documentation at the David Kent Consulting GitHub repository for more information.\n\n"
+    )
+    raise RuntimeError("EXCEPTION! - Incorrect Usage")
+
+parent_compartment_name         = sys.argv[1]
+child_compartment_name          = sys.argv[2]
+power_action                    = sys.argv[3].upper()
+region                          = sys.argv[4]
+
+if power_action not in power_actions:
+    print("\n\nINVALID ACTION! - Valid actions are start, softstop or stop.\n\n")
+    raise RuntimeWarning("WARNING! Invalid action")
+
+# This program uses the class GetInputOptions to instiate variables from the argument vector.
+argument_list = GetInputOptions(
+    sys.argv
+)
+if not argument_list.populate_input_options(5):
+    warning_beep(1)
+    raise RuntimeError("SYNTAX ERROR! Invalid number of arguments provided by user")
+
+name_pattern = argument_list.return_input_option_data("--name")
+tag = argument_list.return_input_option_data("--tag")
+vm_list_file_name = argument_list.return_input_option_data("--file")
+
+max_concurrent_requests = DEFAULT_MAX_WORKERS
+if argument_list.return_input_option_data("--max-concurrent") is not None:
+    max_concurrent_requests = argument_list.return_input_option_data("--max-concurrent")
+    if not is_int(max_concurrent_requests) or int(max_concurrent_requests) < 1:
+        raise RuntimeWarning("INVALID OPTION VALUE! - Value for --max-concurrent must be a whole number of 1 or more")
+    max_concurrent_requests = int(max_concurrent_requests)
+
+force = False
+if argument_list.return_input_option_data("--force") is not None:
+    force = argument_list.return_input_option_data("--force").upper() == "TRUE"
+
+vm_names = None
+if vm_list_file_name is not None:
+    if not os.path.isfile(vm_list_file_name):
+        raise RuntimeWarning("WARNING! File " + vm_list_file_name + " not found")
+    vm_names = []
+    with open(vm_list_file_name, "r") as vm_list_file:
+        for line in vm_list_file:
+            line = line.strip()
+            if line != "" and not line.startswith("#"):
+                vm_names.append(line)
+
+# instiate the environment and validate that the specified region exists
+config = from_file() # gets ~./.oci/config and reads to the object
+identity_client = IdentityClient(config)
+correct_region = validate_region(identity_client, region)
+if not correct_region:
+    print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
+        region
+    ))
+    raise RuntimeWarning("WARNING! INVALID REGION")
+
+config["region"] = region # Must set the cloud region
+identity_client = IdentityClient(config) # builds the identity client method, required to manage compartments
+compute_client = ComputeClient(config) # builds the compute client method, required to manage compute resources
+
+print("\n\nFetching and validating tenancy resource data, please wait......\n")
+# get the parent compartment data
+parent_compartments = GetParentCompartments(parent_compartment_name, config, identity_client)
+parent_compartments.populate_compartments()
+parent_compartment = parent_compartments.return_parent_compartment()
+error_trap_resource_not_found(
+    parent_compartment,
+    "Parent compartment " + parent_compartment_name + " not found within tenancy " + config["tenancy"]
+)
+
+# get the child compartment
+child_compartments = GetChildCompartments(
+    parent_compartment.id,
+    child_compartment_name,
+    identity_client)
+child_compartments.populate_compartments()
+child_compartment = child_compartments.return_child_compartment()
+error_trap_resource_not_found(
+    child_compartment,
+    "Child compartment " + child_compartment_name + " within parent compartment " + parent_compartment_name
+)
+
+# get every VM instance in the compartment, then select the ones we want
+vm_instances = GetInstance(
+    compute_client,
+    child_compartment.id,
+    None
+)
+vm_instances.populate_instances()
+selected_instances = select_instances(
+    vm_instances.instance_list,
+    name_pattern = name_pattern,
+    tag = tag,
+    instance_names = vm_names
+)
+
+if vm_names is not None:
+    for vm_name in vm_names:
+        if vm_instances.return_instance_by_name(vm_name) is None:
+            print("WARNING! VM instance {} not found in compartment {} within region {}".format(
+                vm_name,
+                child_compartment_name,
+                region
+            ))
+
+if len(selected_instances) == 0:
+    print("\n\nNo VM instances in compartment {} within region {} match the selection.\n\n".format(
+        child_compartment_name,
+        region
+    ))
+    raise RuntimeWarning("WARNING! No VM instances selected")
+
+# only submit the action against instances that are in the required state
+action_states = power_actions[power_action]
+instances_to_action = []
+skipped_instances = []
+for instance in selected_instances:
+    if instance.lifecycle_state == action_states["required_state"]:
+        instances_to_action.append(instance)
+    else:
+        skipped_instances.append(instance)
+
+if len(instances_to_action) == 0:
+    print("\n\nNone of the {} selected VM instances are in a {} state. Nothing to do.\n\n".format(
+        len(selected_instances),
+        action_states["required_state"]
+    ))
+    exit(0)
+
+if power_action in ["SOFTSTOP", "STOP"] and not force:
+    warning_beep(6)
+    if power_action == "STOP":
+        print("WARNING! A hard stop may damage the OS of each VM instance.\n")
+    print("Enter YES to {} {} VM instances in compartment {} within region {} or any other key to abort".format(
+        power_action.lower(),
+        len(instances_to_action),
+        child_compartment_name,
+        region
+    ))
+    if "YES" != input():
+        print("\n\n{} request aborted per user request\n\n".format(power_action))
+        exit(0)
+
+# submit all of the requests, then poll every instance together until it converges
+print("\n\nSubmitting {} {} requests, {} at a time......\n".format(
+    len(instances_to_action),
+    power_action,
+    max_concurrent_requests
+))
+job_start_time = time.monotonic()
+action_results = submit_instance_actions(
+    compute_client,
+    instances_to_action,
+    power_action,
+    max_workers = max_concurrent_requests
+)
+
+submitted_instance_ids = []
+for action_result, instance in zip(action_results, instances_to_action):
+    if action_result["error"] is None:
+        submitted_instance_ids.append(instance.id)
+
+converged_times = {}
+def record_converged_time(instance):
+    converged_times[instance.id] = time.monotonic()
+
+print("Waiting for {} VM instances to reach a {} state......\n".format(
+    len(submitted_instance_ids),
+    action_states["to_state"]
+))
+final_states = wait_for_instance_states(
+    compute_client,
+    submitted_instance_ids,
+    [action_states["to_state"]],
+    poll_interval_in_seconds = 5,
+    compartment_id = child_compartment.id,
+    callback = record_converged_time
+)
+
+# print the per VM instance timing summary
+header = [
+    "VM NAME",
+    "ACTION",
+    "FINAL\nSTATE",
+    "SUBMIT\nSECONDS",
+    "CONVERGE\nSECONDS",
+    "RESULT"
+]
+data_rows = []
+vms_converged = 0
+for action_result, instance in zip(action_results, instances_to_action):
+    if action_result["error"] is not None:
+        data_rows.append([
+            instance.display_name,
+            power_action,
+            instance.lifecycle_state,
+            round(action_result["submitted"] - job_start_time, 1),
+            "",
+            "REQUEST FAILED: " + str(getattr(action_result["error"], "message", action_result["error"]))
+        ])
+        continue
+    # an instance that was never fetched while waiting is reported in its submitted state
+    final_instance = final_states.get(instance.id, instance)
+    if final_instance.lifecycle_state == action_states["to_state"] and instance.id in converged_times:
+        vms_converged += 1
+        result = "OK"
+        converge_seconds = round(converged_times[instance.id] - job_start_time, 1)
+    else:
+        result = "TIMED OUT" if instance.id not in converged_times else "FAILED"
+        converge_seconds = ""
+    data_rows.append([
+        instance.display_name,
+        power_action,
+        final_instance.lifecycle_state,
+        round(action_result["submitted"] - job_start_time, 1),
+        converge_seconds,
+        result
+    ])
+for instance in skipped_instances:
+    data_rows.append([
+        instance.display_name,
+        power_action,
+        instance.lifecycle_state,
+        "",
+        "",
+        "SKIPPED"
+    ])
+
+print(tabulate(data_rows, headers = header, tablefmt = "simple"))
+print("\n\n{} of {} VM instances reached a {} state in {} seconds. {} VM instances were skipped since they were not in a {} state.\n".format(
+    vms_converged,
+    len(instances_to_action),
+    action_states["to_state"],
+    round(time.monotonic() - job_start_time, 1),
+    len(skipped_instances),
+    action_states["required_state"]
+))
+print("Job ending as of {}\n\n".format(
+    datetime.now()
+))
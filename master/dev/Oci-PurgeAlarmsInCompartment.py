@@ -27,26 +27,29 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required system modules
 import os.path
 import sys
-from time import sleep
 
 # required KENT modules
 from lib.general import GetAlarms
 from lib.general import copywrite
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import error_trap_resource_not_found
 from lib.general import GetNotificationItems
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
+from lib.ratelimit import rate_limited
 
 # required OCI modules
 from oci.config import from_file
@@ -84,11 +87,7 @@ identity_client     = IdentityClient(config) # builds the identity client method
 ons_client          = NotificationControlPlaneClient(config)
 monitoring_client   = MonitoringClient(config)
 
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -140,14 +139,14 @@ if option != "--FORCE":
 
 # start deleting the alarms
 
+delete_alarm = rate_limited(monitoring_client.delete_alarm)
 for a in alarm_list:
 
     print("\n\nDeleting alarm {}......\n".format(a.display_name))
-    delete_alarm_response = monitoring_client.delete_alarm(
+    delete_alarm_response = delete_alarm(
         alarm_id = a.id
     )
     print(delete_alarm_response.headers)
-    sleep(1)
 
 print("\n\nAll alarms have been purged from compartment {} within region {}\n".format(
     child_compartment_name,
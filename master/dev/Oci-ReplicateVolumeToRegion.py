@@ -28,6 +28,10 @@ https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-try
 
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # system modules
 from datetime import datetime
 import os.path
@@ -35,12 +39,11 @@ import platform
 import resource
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
@@ -54,7 +57,6 @@ from oci.core import ComputeClient
 from oci.core.models import CopyVolumeBackupDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 6:
     print(
         "\n\nOci-ReplicateVolumeToRegion.py\n" +
@@ -86,20 +88,13 @@ elif "volumebackup" not in backup_item_id:
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
     ))
     raise RuntimeWarning("WARNING! INVALID REGION")
-correct_region = False
-for rg in regions:
-    if rg.name == destination_region:
-        correct_region = True
+correct_region = validate_region(identity_client, destination_region)
 if not correct_region:
     print("\n\nWARNING! - Disaster Recovery Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -27,18 +27,22 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
+import time
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import return_availability_domain
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
@@ -48,6 +52,7 @@ from lib.compute import get_boot_vol_attachments
 from lib.compute import GetInstance
 from lib.compute import GetShapes
 from lib.compute import reboot_instance
+from lib.ratelimit import call_with_rate_limit
 from lib.subnets import GetPrivateIP
 from lib.subnets import GetSubnet
 from lib.vcns import GetVirtualCloudNetworks
@@ -56,6 +61,7 @@ from lib.volumes import GetVolumes
 from lib.volumes import GetVolumeBackups
 from lib.volumes import restore_block_volume
 from lib.volumes import restore_boot_volume
+from lib.waiters import ResourceWaiter
 
 # required OCI modules
 from oci.config import from_file
@@ -80,7 +86,6 @@ from oci.core.models import LaunchInstanceDetails
 from oci.core.models import LaunchInstanceShapeConfigDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) < 13 or len(sys.argv) > 14:
     print(
         "\n\nOci-RestoreVM.py : Usage\n\n" +
@@ -119,11 +124,7 @@ else:
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -198,7 +199,7 @@ vm_instances = GetInstance(
     child_compartment.id,
     virtual_machine_name
 )
-vm_instances.populate_instances()
+vm_instances.populate_instance()
 vm_instance = vm_instances.return_instance()
 error_trap_resource_not_found(
     vm_instance,
@@ -215,7 +216,7 @@ target_vm_instances = GetInstance(
     target_child_compartment.id,
     vm_to_restore
 )
-target_vm_instances.populate_instances()
+target_vm_instances.populate_instance()
 target_vm_instance = target_vm_instances.return_instance()
 error_trap_resource_found(
     target_vm_instance,
@@ -348,11 +349,128 @@ target_ad_name = return_availability_domain(
     target_child_compartment.id,
     target_ad_number)
 
-# restore the boot volume backup to a new volume in the target location
-print("\nRestoring the VM boot volume instance to the target compartment {}. Please wait......\n".format(
+'''
+The boot volume and every block volume are restored at once, and a single ResourceWaiter polls
+all of them together. The VM instance is launched as soon as its boot volume is AVAILABLE, and
+each block volume is attached as soon as both it and the VM instance are ready. Attachments are
+made one at a time since OCI permits only one attach operation against an instance at once.
+The callbacks below are called by the waiter as each resource completes.
+'''
+restore_waiter = ResourceWaiter()
+restore_start_time = time.monotonic()
+new_block_volumes = []
+new_volume_attachments = []
+volumes_to_attach = []
+restore_state = {
+    "instance"          : None,
+    "attach_in_progress": False
+}
+
+def attach_next_volume():
+    if restore_state["instance"] is None or restore_state["attach_in_progress"] or len(volumes_to_attach) == 0:
+        return None
+    new_block_volume = volumes_to_attach.pop(0)
+    restore_state["attach_in_progress"] = True
+    attach_paravirtualized_volume(
+        target_compute_composite_client,
+        AttachParavirtualizedVolumeDetails,
+        restore_state["instance"].id,
+        new_block_volume.id,
+        new_block_volume.display_name + "_attachment",
+        waiter = restore_waiter,
+        callback = volume_attached
+    )
+
+def volume_attached(new_volume_attachment):
+    if new_volume_attachment.lifecycle_state != "ATTACHED":
+        print(new_volume_attachment)
+        raise RuntimeError("EXCEPTION! Volume attachment in an invalid state. Program aborting.")
+    print("Data disk attached to VM instance {} after {} seconds.\n".format(
+        vm_to_restore,
+        round(time.monotonic() - restore_start_time)
+    ))
+    new_volume_attachments.append(new_volume_attachment)
+    restore_state["attach_in_progress"] = False
+    attach_next_volume()
+
+def block_volume_restored(new_block_volume):
+    if new_block_volume.lifecycle_state != "AVAILABLE":
+        print(new_block_volume)
+        raise RuntimeError("EXCEPTION! Volume in an invalid state. Program aborting.")
+    print("Data disk {} restored after {} seconds.\n".format(
+        new_block_volume.display_name,
+        round(time.monotonic() - restore_start_time)
+    ))
+    new_block_volumes.append(new_block_volume)
+    volumes_to_attach.append(new_block_volume)
+    attach_next_volume()
+
+def instance_launched(launched_instance):
+    if launched_instance.lifecycle_state != "RUNNING":
+        print("VM instance {} failed to start within compartment {}. Please check the OCI console for details.\n".format(
+            vm_to_restore,
+            target_child_compartment_name
+        ))
+        raise RuntimeError("EXCEPTION! VM instance failed to start.")
+    print("VM instance {} has started and is in a run state after {} seconds.\n".format(
+        vm_to_restore,
+        round(time.monotonic() - restore_start_time)
+    ))
+    restore_state["instance"] = launched_instance
+    attach_next_volume()
+
+def boot_volume_restored(new_volume):
+    if new_volume.lifecycle_state != "AVAILABLE":
+        print(new_volume)
+        raise RuntimeError("EXCEPTION! Volume in an invalid state. Program aborting.")
+    print("Boot volume restored after {} seconds, launching the restore VM instance {}......\n".format(
+        round(time.monotonic() - restore_start_time),
+        vm_to_restore
+    ))
+
+    # prepare the launch instance details
+    launch_instance_details = LaunchInstanceDetails(
+        availability_domain = new_volume.availability_domain,
+        compartment_id = target_child_compartment.id,
+        create_vnic_details = CreateVnicDetails(
+            assign_public_ip = False,
+            display_name = vm_to_restore + "_vnic_00",
+            hostname_label = vm_to_restore,
+            private_ip = target_ip_address,
+            subnet_id = subnet.id
+        ),
+        display_name = vm_to_restore,
+        shape = vm_instance.shape,
+        shape_config = LaunchInstanceShapeConfigDetails(
+            ocpus = vm_instance.shape_config.ocpus,
+            vcpus = vm_instance.shape_config.vcpus,
+            memory_in_gbs = vm_instance.shape_config.memory_in_gbs,
+            baseline_ocpu_utilization = vm_instance.shape_config.baseline_ocpu_utilization
+        ),
+        source_details = InstanceSourceViaBootVolumeDetails(
+            source_type = "bootVolume",
+            boot_volume_id = new_volume.id
+        )
+    )
+    launched_instance = call_with_rate_limit(
+        target_compute_client.launch_instance,
+        launch_instance_details = launch_instance_details
+    ).data
+    restore_waiter.add(
+        launched_instance.id,
+        "instance",
+        target_compute_client.get_instance,
+        ["RUNNING"],
+        failed_states = ["TERMINATING", "TERMINATED", "UNKNOWN_ENUM_VALUE"],
+        callback = instance_launched
+    )
+
+# submit the boot volume restore and every block volume restore at once
+print("\nRestoring the VM boot volume and {} data disks to the target compartment {}. Please wait......\n".format(
+    len(block_volume_backups),
     target_child_compartment_name
 ))
-new_volume = restore_boot_volume(
+restore_boot_volume(
     target_storage_composite_client,
     BootVolumeSourceFromBootVolumeBackupDetails,
     BootVolumeSourceDetails,
@@ -361,111 +479,41 @@ new_volume = restore_boot_volume(
     target_ad_name,
     target_child_compartment.id,
     boot_volume.size_in_gbs,
-    boot_volume_backup.id
-    )
-if new_volume is not None:
-    if new_volume.lifecycle_state == "AVAILABLE":
-        print("Volume restored, launching the restore VM instance {}. Please wait......\n".format(
-            vm_to_restore
-        ))
-    else:
-        print(new_volume)
-        raise RuntimeError("EXCEPTION! Volume in an invalid state. Program aborting.")
-else:
-    raise RuntimeError("EXCEPTION! UNKNOWN ERROR")
-
-# prepare the launch instance details
-launch_instance_details = LaunchInstanceDetails(
-    availability_domain = new_volume.availability_domain,
-    compartment_id = target_child_compartment.id,
-    create_vnic_details = CreateVnicDetails(
-        assign_public_ip = False,
-        display_name = vm_to_restore + "_vnic_00",
-        hostname_label = vm_to_restore,
-        private_ip = target_ip_address,
-        subnet_id = subnet.id
-    ),
-    display_name = vm_to_restore,
-    shape = vm_instance.shape,
-    shape_config = LaunchInstanceShapeConfigDetails(
-        ocpus = vm_instance.shape_config.ocpus,
-        vcpus = vm_instance.shape_config.vcpus,
-        memory_in_gbs = vm_instance.shape_config.memory_in_gbs,
-        baseline_ocpu_utilization = vm_instance.shape_config.baseline_ocpu_utilization
-    ),
-    source_details = InstanceSourceViaBootVolumeDetails(
-        source_type = "bootVolume",
-        boot_volume_id = new_volume.id
-    )
+    boot_volume_backup.id,
+    waiter = restore_waiter,
+    callback = boot_volume_restored
 )
-# remove print statement wojteczko 11sep2024
-# print(launch_instance_details)
-
-# remove when coding is completed wojteczko 11sep20204
-# print(launch_instance_details)
-
-# Launch the instance
-print("Launching the VM instance......\n")
-
-launch_instance_response = target_compute_composite_client.launch_instance_and_wait_for_state(
-    launch_instance_details = launch_instance_details,
-    wait_for_states = ["RUNNING", "TERMINATED", "UNKNOWN_ENUM_VALUE"]
-).data
 
-
-if launch_instance_response.lifecycle_state != "RUNNING":
-    print("VM instance {} failed to start within compartment {}. Please check the OCI console for details.\n".format(
+count = 0
+for block_volume_backup in block_volume_backups:
+    for block_volume in block_volumes:
+        if block_volume.id == block_volume_backup.volume_id:
+            restore_block_volume(
+                target_storage_composite_client,
+                VolumeSourceFromVolumeBackupDetails,
+                VolumeSourceDetails,
+                CreateVolumeDetails,
+                vm_to_restore + "datadisk_" + str(count),
+                target_ad_name,
+                target_child_compartment.id,
+                block_volume.size_in_gbs,
+                block_volume_backup.id,
+                waiter = restore_waiter,
+                callback = block_volume_restored
+            )
+            count += 1
+
+restore_waiter.wait()
+
+launch_instance_response = restore_state["instance"]
+if launch_instance_response is None or len(new_volume_attachments) != len(block_volume_backups):
+    print("The restore of VM instance {} did not complete within compartment {}. Please check the OCI console for details.\n".format(
         vm_to_restore,
         target_child_compartment_name
     ))
-    raise RuntimeError("EXCEPTION! VM instance failed to start.")
-else:
-    print("VM instance {} has started and is in a run state. Restoring data disks now. Please wait......\n".format(
-        vm_to_restore
-    ))
-
-
-# perform a restore operation on each of the data disks if present
-if len(block_volumes) > 0:
-    new_block_volumes = []
-    count = 0
-    for block_volume_backup in block_volume_backups:
-        for block_volume in block_volumes:
-            if block_volume.id == block_volume_backup.volume_id:
-                results = restore_block_volume(
-                    target_storage_composite_client,
-                    VolumeSourceFromVolumeBackupDetails,
-                    VolumeSourceDetails,
-                    CreateVolumeDetails,
-                    launch_instance_response.display_name + "datadisk_" + str(count),
-                    launch_instance_response.availability_domain,
-                    target_child_compartment.id,
-                    block_volume.size_in_gbs,
-                    block_volume_backup.id
-                )
-                if results is None:
-                    raise RuntimeError("EXCEPTION! UNKNOWN ERROR")
-                else:
-                    new_block_volumes.append(results)
-                    count += 1
-
-    # attach the volumes to the restored VM instance
-    print("Attaching data disks to VM instance {}. Please wait......\n".format(
-        vm_to_restore
-    ))
-    new_volume_attachments = []
-    for new_block_volume in new_block_volumes:
-        new_volume_attachment = attach_paravirtualized_volume(
-            target_compute_composite_client,
-            AttachParavirtualizedVolumeDetails,
-            launch_instance_response.id,
-            new_block_volume.id,
-            new_block_volume.display_name + "_attachment"
-        )
-        new_volume_attachments.append(new_volume_attachment)
-else:
+    raise RuntimeError("EXCEPTION! Timed out waiting on the restore to complete.")
+if len(block_volumes) == 0:
     print("There are no data disks to restore. Proceeding to the next task.\n")
-# end if len(block_volumes) > 0
 
 # restart the VM instance
 print("VM instance {} successfully restored. A restart is required, restarting the VM. Please wait.......\n".format(
@@ -475,9 +523,7 @@ results = reboot_instance (
     target_compute_composite_client,
     launch_instance_response.id
 )
-sleep(60)
 print("Restarted the VM instance, printing the results below......\n")
-sleep(5)
 if option == "--JSON":
     print(results)
 else:
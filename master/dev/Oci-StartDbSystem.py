@@ -27,16 +27,19 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
-from time import sleep
 
 # Required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
 from lib.general import return_availability_domain
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import is_int
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
@@ -52,7 +55,6 @@ from oci.database import DatabaseClient
 from oci.database import DatabaseClientCompositeOperations
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 5:
     print(
         "\n\nOci-StartDbSystem.py : Usage\n\n" +
@@ -76,11 +78,7 @@ else:
 print("\n\nFetching and verifying tenant resource data. Please wait......\n")
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     warning_beep(1)
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
@@ -27,6 +27,10 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
@@ -36,7 +40,7 @@ from time import sleep
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
 from lib.general import return_availability_domain
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import is_int
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
@@ -53,7 +57,6 @@ from oci.database import DatabaseClientCompositeOperations
 from oci.database.models import UpdateDbSystemDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) != 6:
     print(
         "\n\nOci-UpdateDbSystemLicenseModel.py : Usage\n\n" +
@@ -81,11 +84,7 @@ if license_model not in ["BRING_YOUR_OWN_LICENSE", "LICENSE_INCLUDED"]:
 print("\n\nFetching and verifying tenant resource data. Please wait......\n")
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     warning_beep(1)
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
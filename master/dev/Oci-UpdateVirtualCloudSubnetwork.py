@@ -27,6 +27,10 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
@@ -36,12 +40,13 @@ from time import sleep
 from lib.general import copywrite
 from lib.general import error_trap_resource_not_found
 from lib.general import GetInputOptions
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
 from lib.routetables import GetRouteTable
 from lib.securitylists import GetNetworkSecurityList
 from lib.subnets import GetSubnet
+from lib.subnets import update_subnet
 from lib.vcns import GetVirtualCloudNetworks
 
 # required OCI modules
@@ -53,7 +58,6 @@ from oci.core import VirtualNetworkClient
 from oci.core.models import UpdateSubnetDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) == 2 and sys.argv[1].upper() == "--HELP":
     print(
         "\n\nOci-UpdateVirtualCloudSubNetwork.py [parent compartment] [child compartment] [virtual cloud network] \\\n" +
@@ -91,11 +95,7 @@ argument_list.populate_input_options(6)
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -153,6 +153,15 @@ error_trap_resource_not_found(
     subnet,
     "Unable to find subnetwork " + subnet_name + " within virtual cloud network " + virtual_cloud_network_name
 )
+# the settings that are not changed are copied from the subnet, so read them from the REST
+# service rather than from a cached copy that may predate an earlier update
+if subnets.from_cache:
+    subnets.refresh_subnets()
+    subnet = subnets.return_subnet()
+    error_trap_resource_not_found(
+        subnet,
+        "Unable to find subnetwork " + subnet_name + " within virtual cloud network " + virtual_cloud_network_name
+    )
 
 '''
 This part of the logic will now test for each option using the method argument_list that was instiated from
@@ -232,10 +241,13 @@ update_subnet_details = UpdateSubnetDetails(
 
 # print(update_subnet_details)
 # Apply changes to the subnet
-update_subnet_response = network_client.update_subnet(
-    subnet_id = subnet.id,
-    update_subnet_details = update_subnet_details
-).data
+update_subnet_response = update_subnet(
+    network_client,
+    child_compartment.id,
+    virtual_cloud_network.id,
+    subnet.id,
+    update_subnet_details
+)
 
 if update_subnet_response is not None:
     print("\n\nUpdate of subnet is complete, please inspect the results below:\n")
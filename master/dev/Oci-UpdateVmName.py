@@ -27,23 +27,27 @@ See https://docs.python.org/3/tutorial/modules.html#the-module-search-path and
 https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-trying-to-import-module-from-imported-package
 
 '''
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 import os.path
 import sys
 from tabulate import tabulate
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.general import is_int
 from lib.general import return_availability_domain
 from lib.general import warning_beep
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
+from lib.compute import check_for_vm
 from lib.compute import GetInstance
 from lib.compute import get_vm_instance_response
 from lib.compute import update_instance_name
@@ -59,7 +63,6 @@ from oci.core import ComputeClientCompositeOperations
 from oci.core.models import UpdateInstanceDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) < 6 or len(sys.argv) > 7:
     print(
         "\n\nOci-UpdateVmName.py : Usage\n\n" +
@@ -84,11 +87,7 @@ else:
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -129,7 +128,7 @@ vm_instances = GetInstance(
     child_compartment.id,
     virtual_machine_name
 )
-vm_instances.populate_instances()
+vm_instances.populate_instance()
 vm_instance = vm_instances.return_instance()
 error_trap_resource_not_found(
     vm_instance,
@@ -137,15 +136,14 @@ error_trap_resource_not_found(
 )
 
 # check for duplicates
-for VM in vm_instances.instance_list:
-    if VM.display_name == new_virtual_machine_name:
-        print("VM instance {} already present in compartment {} within region {}.\n".format(
-            virtual_machine_name,
-            child_compartment_name,
-            region
-        ))
-        print("Duplicate names are not permitted.\n\n")
-        raise RuntimeWarning("WARNING! Duplicate VM instance names are not permitted.")
+if check_for_vm(compute_client, child_compartment.id, new_virtual_machine_name):
+    print("VM instance {} already present in compartment {} within region {}.\n".format(
+        new_virtual_machine_name,
+        child_compartment_name,
+        region
+    ))
+    print("Duplicate names are not permitted.\n\n")
+    raise RuntimeWarning("WARNING! Duplicate VM instance names are not permitted.")
 
 # run through the logic
 results = None
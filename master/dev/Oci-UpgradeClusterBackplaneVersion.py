@@ -18,16 +18,19 @@
 # file 'LICENSE.txt', which is part of this source code package.
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required bsystem modules
 import os.path
 import sys
-from time import sleep
 
 # required DKC modules
 from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
-from lib.general import get_regions
+from lib.general import validate_region
 from lib.compute import GetImages
 from lib.container import create_cluster
 from lib.compartments import GetParentCompartments
@@ -53,7 +56,6 @@ from oci.container_engine.models import AddOnOptions
 from oci.container_engine.models import UpdateClusterDetails
 
 copywrite()
-sleep(2)
 if len(sys.argv) < 6 or len(sys.argv) > 7:
     print(
         "\n\nOci-UpgradeClusterBackplaneVersion.py : Usage\n" +
@@ -82,12 +84,8 @@ else:
 
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
 
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -28,14 +28,16 @@ https://stackoverflow.com/questions/54598292/python-modulenotfounderror-when-try
 
 '''
 
+# hand the work to the resident KENT daemon if one is running, see lib/daemon.py
+from lib.daemon import forward_to_daemon
+forward_to_daemon(__file__)
+
 # required system modules
 from datetime import datetime
 import os.path
 import platform
 import resource
 import sys
-from tabulate import tabulate
-from time import sleep
 
 
 # required DKC modules
@@ -43,15 +45,21 @@ from lib.general import copywrite
 from lib.general import error_trap_resource_found
 from lib.general import error_trap_resource_not_found
 from lib.general import get_availability_domains
-from lib.general import get_regions
-from lib.general import test_free_mem_1gb
+from lib.general import validate_region
 from lib.general import warning_beep
 from lib.backups import GetBackupPolicies
+from lib.backups import iterate_compartment_backup_data
+from lib.backups import return_backup_state_counts
+from lib.backups import return_serializable_vm_backup_data
+from lib.backupsnapshot import BackupSnapshot
 from lib.compartments import GetParentCompartments
 from lib.compartments import GetChildCompartments
 from lib.compute import get_block_vol_attachments
 from lib.compute import get_boot_vol_attachments
 from lib.compute import GetInstance
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.reportwriters import return_report_writer
+from lib.volumes import GetVolumeBackups
 from lib.volumes import GetVolumes
 from lib.volumes import GetVolumeAttachment
 
@@ -62,221 +70,8 @@ from oci.core import BlockstorageClient
 from oci.core import ComputeClient
 
 
-##########################################################################################################
-#                                               functions                                                #
-##########################################################################################################
-
-def get_compartment_backup_data():
-    
-    # get all vm and volume data
-
-    all_vm_backup_data = [] # will hold a list of the dictionary objects defined below
-    for vm_instance in vm_instances.return_all_instances():
-        # this is the dictionary object
-        vm_backup_data = {
-            "vm_name"                  : "",
-            "vm_id"                    : "",
-            "boot_vol_backups_enabled" : False,   # will set to true if bootvol backup objects are found
-            "vol_backups_enabled"      : False,   # will set to true if vol backup objects are found
-            "boot_volumes"             : "",      # will contain a list of boot volumes
-#             "boot_vol_backups"     : "",          # will contain a list of boot volume backups if found
-            "volumes"                  : ""      # will contain a list of volumes if found
-#             "vol_backups"          : ""           # will contain a list of volume backups if found
-        }
-        
-        # we have to know the bootvol attachments to get to boot vols for the VM
-        bootvol_attachments = get_boot_vol_attachments(
-            compute_client,
-            vm_instance.availability_domain,
-            child_compartment.id,
-            vm_instance.id
-        )
-        
-        # now we get the boot volumes
-        boot_volumes = []
-        for bva in bootvol_attachments:
-            boot_volume = storage_client.get_boot_volume(
-                boot_volume_id = bva.boot_volume_id
-            ).data
-            boot_volumes.append(boot_volume)
-
-        # don't do any more work if there are no boot volumes
-        if len(boot_volumes) == 0:
-            return None
-    
-        # we have to know the vol attachments to get any volumes
-        vol_attachments = get_block_vol_attachments(
-            compute_client,
-            vm_instance.availability_domain,
-            child_compartment.id,
-            vm_instance.id
-        )
-        
-        # Now we get the volumes, if any
-        volumes = []
-        for bva in vol_attachments:
-            volume = storage_client.get_volume(
-                volume_id = bva.volume_id
-            ).data
-            volumes.append(volume)
-            
-        vm_backup_data["vm_name"]            = vm_instance.display_name
-        vm_backup_data["vm_id"]              = vm_instance.id
-        vm_backup_data["boot_volumes"]       = boot_volumes
-        vm_backup_data["volumes"]            = volumes
-    
-        '''
-        In this section we will walk down each bootvol and pull any backup data by its status. The statuses
-        we look for are AVAILABLE, CREATING, TERMINATED, TERMINATING, and FAULTY. This is done so we avoid 
-        exceeding the page legnth in the API call. Each set of results are appended to boot_volumes, which 
-        is later added to the dictionary object vm_backup_data.
-        '''
-        boot_vol_backups = []
-        for bv in boot_volumes:
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "AVAILABLE"
-            ).data
-            # now append each backup set to bool_vol_backups
-            for bk in backups:
-                boot_vol_backups.append(bk)
-            '''
-            Repeat this operand now for each lifecycle that we must collect data about.
-            '''
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "CREATING"
-            ).data
-            for bk in backups:
-                boot_vol_backups.append(bk)
-            
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "FAULTY"
-            ).data
-            for bk in backups:
-                boot_vol_backups.append(bk)
-                
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "TERMINATED"
-            ).data
-            for bk in backups:
-                boot_vol_backups.append(bk)
-                
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "TERMINATING"
-            ).data
-            for bk in backups:
-                boot_vol_backups.append(bk)
-                
-        '''
-        Now we will repeat the same operand for volume backups
-        '''
-        vol_backups = []
-        for v in volumes:
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "AVAILABLE"
-            ).data
-            for bk in backups:
-                vol_backups.append(bk)
-                
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "CREATING"
-            ).data
-            
-            for bk in backups:
-                vol_backups.append(bk)
-
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "FAULTY"
-            ).data
-            for bk in backups:
-                vol_backups.append(bk)
 
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "TERMINATED"
-            ).data
-            for bk in backups:
-                vol_backups.append(bk)
-
-                
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "TERMINATING"
-            ).data
-            for bk in backups:
-                vol_backups.append(bk)
-                
-        '''
-        The dictionary object boot_vol_backups must now have boot_vol_backups and vol_backups appended to it.
-        Set the values for boot_vol_backups_enabled and vol_backups_enabled
-        '''
-        vm_backup_data["boot_volume_backups"] = boot_vol_backups
-        vm_backup_data["vol_backups"]         = vol_backups
-        
-        if len(boot_vol_backups) > 0:
-            vm_backup_data["boot_vol_backups_enabled"] = True
-        if len(vol_backups) > 0:
-            vm_backup_data["vol_backups_enabled"] = True
-        
-        
-        
-        '''
-        The very last action is to append all_vm_backups with this dictionary object, and then to return it
-        to the calling code block
-        '''
-        all_vm_backup_data.append(vm_backup_data)
-    
-    
-    '''
-    Each dictionary object vm_backup_data contains the VM instance, block volumes, and any backups if found. We
-    also have written to the object True for any backup types we have found. Each object is appended to
-    all_vm_backup_data.
-    '''
-    
-    
-    return all_vm_backup_data
-
-
-# end function get_compartment_backup_data()
-
-##########################################################################################################
-#                                             end functions                                              #
-##########################################################################################################
-
-copywrite()
-sleep(2)
-
-
-'''
-Current metrics suggest around 200MB free RAM are required for the program based on a typical compartment
-with around 143MB for the program load and around 545KB per complete record of each VM's metadata and
-backup data, presuming 31 days of backups are retained. The utility should be able to collect records
-from up to 1600 VMs and live within a heap space of 1GB. In practical terms, we would not consider this
-to be a best practice, aka to have thousands of VMs within a single compartment. Regardless, we point
-this out since use cases are difficult to predict.
-'''
-if not test_free_mem_1gb():
-    raise RuntimeError("INSUFFICIENT RAM, 1GB FREE RAM REQUIRED\n\n")
-
-
-if len(sys.argv) < 5 or len(sys.argv) > 6:
+if len(sys.argv) < 5 or len(sys.argv) > 8:
     print(
         "Oci-VmBackupReport.py : Usage\n\n" +
         "Oci-VmBackupRepoprt.py [parent compartment] [child compartment] [virtual machine] [region] [option]\n\n" +
@@ -288,6 +83,12 @@ if len(sys.argv) < 5 or len(sys.argv) > 6:
         "\tOci-VmBackupReport.py admin_comp dbs_comp kentrmanp01 'us-ashburn-1'\n\n" +
         "Use case example below lists all backup data for the specified virtual machine in JSON format\n" +
         "\tOci-VmBackupReport.py admin_comp dbs_comp kentrmanp01 'us-ashburn-1' --json\n\n" +
+        "Use case example below writes the detailed backups for all virtual machines as CSV, pass --csv with\n" +
+        "--summary-only to write the summary as CSV:\n" +
+        "\tOci-VmBackupReport.py admin_comp dbs_comp list_all_backups 'us-ashburn-1' --csv > backups.csv\n\n" +
+        "Use case example below lists the backup summary from the local backup snapshot, only fetching the backups\n" +
+        "that changed since the last run. Pass --full-rescan in place of --incremental to rebuild the snapshot:\n" +
+        "\tOci-VmBackupReport.py admin_comp dbs_comp list_all_backups 'us-ashburn-1' --summary-only --incremental\n\n" +
         "Please see the online documentation at the David Kent Consulting GitHub repository for more information.\n\n"
     )
     raise RuntimeWarning("INVALID USAGE\n\n")
@@ -297,21 +98,36 @@ child_compartment_name              = sys.argv[2]
 virtual_machine_name                = sys.argv[3]
 region                              = sys.argv[4]
 
-if len(sys.argv) == 6:
-    option = sys.argv[5].upper()
+# --incremental and --full-rescan choose how the backups are fetched and may accompany either report option,
+# and --csv writes the detailed or summary report as CSV in place of a table
+option = None
+snapshot_option = None
+report_format = "TABLE"
+for input_option in [argument.upper() for argument in sys.argv[5:]]:
+    if input_option in ["--SUMMARY-ONLY", "--JSON"] and option is None:
+        option = input_option
+    elif input_option in ["--INCREMENTAL", "--FULL-RESCAN"] and snapshot_option is None:
+        snapshot_option = input_option
+    elif input_option == "--CSV" and report_format == "TABLE":
+        report_format = "CSV"
+    else:
+        raise RuntimeWarning("INVALID OPTIONS, VALID OPTIONS ARE --SUMMARY-ONLY OR --JSON, --CSV, AND --INCREMENTAL OR --FULL-RESCAN")
+if option == "--JSON":
+    if report_format == "CSV":
+        raise RuntimeWarning("INVALID OPTIONS, --JSON AND --CSV MAY NOT BE COMBINED")
+    report_format = "JSON"
+
+# CSV and JSON reports are meant to be redirected to a file, so the progress messages go to stderr
+status_output = sys.stdout
+if report_format == "TABLE":
+    copywrite()
 else:
-    option = None
-if option is not None and option not in ["--SUMMARY-ONLY", "--JSON"]:
-    raise RuntimeWarning("INVALID OPTIONS, VALID OPTIONS ARE --SUMMARY-ONLY OR --JSON")
+    status_output = sys.stderr
 
 # instiate the environment and validate that the specified region exists
 config = from_file() # gets ~./.oci/config and reads to the object
 identity_client = IdentityClient(config)
-regions = get_regions(identity_client)
-correct_region = False
-for rg in regions:
-    if rg.name == region:
-        correct_region = True
+correct_region = validate_region(identity_client, region)
 if not correct_region:
     print("\n\nWARNING! - Region {} does not exist in OCI. Please try again with a correct region.\n\n".format(
         region
@@ -323,7 +139,7 @@ identity_client = IdentityClient(config) # identity instance
 compute_client = ComputeClient(config) # compute instance
 storage_client = BlockstorageClient(config) # storage instance primary region
 
-print("\n\nFetching and verifying tenant resource data, please wait......\n")
+print("\n\nFetching and verifying tenant resource data, please wait......\n", file = status_output)
 
 # Get the parent compartment
 parent_compartments = GetParentCompartments(parent_compartment_name, config, identity_client)
@@ -351,253 +167,135 @@ availability_domains = get_availability_domains(
     identity_client,
     child_compartment.id)
 
-# Get the VM data but do not pass a VM instance name, we do not need it in this use case
+# Get the VM instance, or every VM instance when a report of the whole compartment is requested
 vm_instances = GetInstance(
     compute_client,
     child_compartment.id,
     virtual_machine_name
 )
-vm_instances.populate_instances()
-
 if virtual_machine_name.upper() != "LIST_ALL_BACKUPS":
+    vm_instances.populate_instance()
     virtual_machine = vm_instances.return_instance()
     
     error_trap_resource_not_found(
-        virtual_machine_name,
+        virtual_machine,
         "Virtual machine {} not found in compartment {} within region {}\n".format(
             virtual_machine_name,
             child_compartment_name,
             region
         )
     )
+else:
+    vm_instances.populate_instances()
+
+volume_backups = None
+if snapshot_option is not None:
+    print("Refreshing the local backup snapshot of compartment {}. Please wait......\n".format(child_compartment_name), file = status_output)
+    backup_snapshot = BackupSnapshot(
+        storage_client,
+        child_compartment.id,
+        region
+    )
+    backup_snapshot.refresh(full = snapshot_option == "--FULL-RESCAN")
+    refresh_stats = backup_snapshot.return_refresh_stats()
+    print("{} refresh listed {} backups, refreshed {} in progress backups and dropped {} expired backups.\n".format(
+        "Full" if refresh_stats["full_scan"] else "Incremental",
+        refresh_stats["backups_listed"],
+        refresh_stats["backups_refreshed"],
+        refresh_stats["backups_expired"]
+    ), file = status_output)
+    volume_backups = GetVolumeBackups(
+        storage_client,
+        child_compartment.id
+    )
+    backup_snapshot.load_volume_backups(volume_backups)
 
 '''
-Only run the following if we are just looking for a particular VM's backups. We do
-this to error out if the VM is not found. That's because get_compartment_backup_data()
-consumes a lot of time and resources to run.
+The backup data is streamed one VM instance at a time by iterate_compartment_backup_data(), and each row is
+written as soon as its VM instance has been fetched. Only the fields of each volume and backup that the
+report uses are kept, so memory use stays flat no matter how many VM instances are within the compartment.
 '''
-print("Fetching compartment backup data. Please wait......\n")
-all_compartment_backup_data = get_compartment_backup_data()
-
-if len(all_compartment_backup_data) == 0: # no backups found, exit out
-    print("\n\nNo backups found in compartment {} within region {}.\n\n".format(
-        child_compartment_name,
-        region
-    ))
-    exit(0)
-
-# this condition only if a backup report is requested for a particular vm
-if virtual_machine_name.upper() != "LIST_ALL_BACKUPS":
-
-    if option is None: # print a complete list of backup objects
-        for vm in all_compartment_backup_data:
-            if vm["vm_name"] == virtual_machine_name: # parse down to only the record we want
-                if not vm["boot_vol_backups_enabled"]: # this field tells us backups are not setup for the VM
-                    print("\nBackups for virtual machine {} are not enabled\n\n".format(virtual_machine_name))
-                    exit (0)
-
-                elif not vm["vol_backups_enabled"]: # just print a message that data vol backups are not enabled for the vm
-                    print("\nData volume backups are not enabled or no data volumes exist for virtual machine {}\n\n".format(virtual_machine_name))
-            else:
-                header = [
-                    "VIRTUAL\nMACHINE",
-                    "BACKUP\nTYPE",
-                    "BACKUP\nDATE",
-                    "STATUS",
-                    "BACKUP\n\OBJECT\nOCID"
-                ]
-
-                backup_objects = []
-
-                for bk in vm["boot_volume_backups"]:
-                    backup_object = [
-                        virtual_machine_name,
-                        "BOOT VOLUME",
-                        bk.time_created.ctime(),
-                        bk.lifecycle_state,
-                        bk.id
-                    ]
-                    backup_objects.append(backup_object)
-                
-                for bk in vm["vol_backups"]:
-                    backup_object = [
-                        virtual_machine_name,
-                        "DATA VOLUME",
-                        bk.time_created.ctime(),
-                        bk.lifecycle_state,
-                        bk.id
-                    ]
-                    backup_objects.append(backup_object)
-                
-                print(tabulate(backup_objects, headers = header, tablefmt = "grid"))
-
-    elif option == "--SUMMARY-ONLY": # do the summary report
-
-        for vm in all_compartment_backup_data:
-            if vm["vm_name"] == virtual_machine_name:
-                successful_backups = 0
-                backups_in_progress = 0
-                faulty_backups = 0
-                terminated_backups = 0
-
-                for bk in vm["boot_volume_backups"]:
-                    if bk.lifecycle_state == "AVAILABLE":
-                        successful_backups += 1
-                    elif bk.lifecycle_state == "CREATING":
-                        backups_in_progress += 1
-                    elif bk.lifecycle_state == "FAULTY":
-                        faulty_backups += 1
-                    elif bk.lifecycle_state == "TERMINATED" or bk.lifecycle_state == "TERMINATING":
-                        terminated_backups += 1
-
-                for bk in vm["vol_backups"]:
-                    if bk.lifecycle_state == "AVAILABLE":
-                        successful_backups += 1
-                    elif bk.lifecycle_state == "CREATING":
-                        backups_in_progress += 1
-                    elif bk.lifecycle_state == "FAULTY":
-                        faulty_backups += 1
-                    elif bk.lifecycle_state == "TERMINATED" or bk.lifecycle_state == "TERMINATING":
-                        terminated_backups += 1
-
-        header = [
-            "VIRTUAL\n\MACHINE",
-            "SUCCESSFUL\nBACKUPS",
-            "BACKUPS\nIN PROGRESS",
-            "FAULTY\nBACKUPS",
-            "TERMINATED\nBACKUPS"
-        ]
-
-        data_rows = []
-
-        backup_object = [
-            virtual_machine_name,
-            successful_backups,
-            backups_in_progress,
-            faulty_backups,
-            terminated_backups
-        ]
-        data_rows.append(backup_object)
-
-        print(tabulate(
-            data_rows,
-            headers = header,
-            tablefmt="simple"
-        ))
-
-    elif option == "--JSON": # print the vm's backup data in JSON format
-        for vm in all_compartment_backup_data:
-            if vm["vm_name"] == virtual_machine_name:
-                print(vm)
-
-# the only remaining option is to run the report for all VMs within a compartment
-else:
-    if option is None: # print all backup items
+print("Fetching compartment backup data. Please wait......\n", file = status_output)
+compartment_backup_data = iterate_compartment_backup_data(
+    compute_client,
+    get_block_vol_attachments,
+    get_boot_vol_attachments,
+    storage_client,
+    child_compartment,
+    vm_instances,
+    max_workers = DEFAULT_MAX_WORKERS,
+    volume_backups = volume_backups
+)
 
-        header = [
-            "VIRTUAL\nMACHINE",
-            "BACKUP\nTYPE",
-            "BACKUP\nDATE",
+if option is None: # write a complete list of backup objects
+    report_writer = return_report_writer(
+        report_format,
+        [
+            "VIRTUAL MACHINE",
+            "BACKUP TYPE",
+            "BACKUP DATE",
             "STATUS",
-            "BACKUP\n\OBJECT\nOCID"
-        ]
-
-        backup_objects = []
-
-        for vm in all_compartment_backup_data:
-
-
-            for bk in vm["boot_volume_backups"]:
-                backup_object = [
-                    vm["vm_name"],
-                    "BOOT VOLUME",
-                    bk.time_created.ctime(),
-                    bk.lifecycle_state,
-                    bk.id
-                ]
-                backup_objects.append(backup_object)
-
-
-            for bk in vm["vol_backups"]:
-                backup_object = [
+            "BACKUP OBJECT OCID"
+        ],
+        column_widths = [32, 12, 24, 12, 90]
+    )
+elif option == "--SUMMARY-ONLY": # tally up the numbers by VM and write the summary report
+    report_writer = return_report_writer(
+        report_format,
+        [
+            "VIRTUAL MACHINE",
+            "BOOT VOLUME BACKUPS ENABLED",
+            "DATA VOLUME BACKUPS ENABLED",
+            "SUCCESSFUL BACKUPS",
+            "BACKUPS IN PROGRESS",
+            "FAULTY BACKUPS",
+            "TERMINATED BACKUPS"
+        ],
+        column_widths = [32, 11, 11, 10, 11, 7, 10]
+    )
+else: # write each VM's backup data as a JSON object
+    report_writer = return_report_writer(report_format, [])
+
+vms_reported = 0
+for vm in compartment_backup_data:
+    vms_reported += 1
+
+    if option is None:
+        if virtual_machine_name.upper() != "LIST_ALL_BACKUPS":
+            if not vm["boot_vol_backups_enabled"]: # this field tells us backups are not setup for the VM
+                print("\nBackups for virtual machine {} are not enabled\n\n".format(virtual_machine_name), file = status_output)
+                exit(0)
+            elif not vm["vol_backups_enabled"]: # just print a message that data vol backups are not enabled for the vm
+                print("\nData volume backups are not enabled or no data volumes exist for virtual machine {}\n\n".format(virtual_machine_name), file = status_output)
+
+        for backup_type, backups in [("BOOT VOLUME", vm["boot_volume_backups"]), ("DATA VOLUME", vm["vol_backups"])]:
+            for bk in backups:
+                report_writer.write_row([
                     vm["vm_name"],
-                    "DATA VOLUME",
+                    backup_type,
                     bk.time_created.ctime(),
                     bk.lifecycle_state,
                     bk.id
-                ]
-                backup_objects.append(backup_object)
-
-        print(tabulate(
-            backup_objects,
-            headers = header,
-            tablefmt = "grid"
-        ))
-
-    elif option == "--SUMMARY-ONLY": # this will tally up the numbers by VM and present the summary report
-
-        backup_objects = []
-
-        for vm in all_compartment_backup_data:
-
-            successful_backups = 0
-            backups_in_progress = 0
-            faulty_backups = 0
-            terminated_backups = 0
-
-            for bk in vm["boot_volume_backups"]:
-                if bk.lifecycle_state == "AVAILABLE":
-                    successful_backups += 1
-                elif bk.lifecycle_state == "CREATING":
-                    backups_in_progress += 1
-                elif bk.lifecycle_state == "FAULTY":
-                    faulty_backups += 1
-                elif bk.lifecycle_state == "TERMINATED" or bk.lifecycle_state == "TERMINATING":
-                    terminated_backups += 1
-
-            for bk in vm["vol_backups"]:
-                if bk.lifecycle_state == "AVAILABLE":
-                    successful_backups += 1
-                elif bk.lifecycle_state == "CREATING":
-                    backups_in_progress += 1
-                elif bk.lifecycle_state == "FAULTY":
-                    faulty_backups += 1
-                elif bk.lifecycle_state == "TERMINATED" or bk.lifecycle_state == "TERMINATING":
-                    terminated_backups += 1
-
-            backup_object = [
-                vm["vm_name"],
-                vm["boot_vol_backups_enabled"],
-                vm["vol_backups_enabled"],
-                successful_backups,
-                backups_in_progress,
-                faulty_backups,
-                terminated_backups
-            ]
-
-            backup_objects.append(backup_object)
-
-        header = [
-            "VIRTUAL\nMACHINE",
-            "BOOT\nVOLUME\nBACKUPS\nENABLED",
-            "DATA\nVOLUME\nBACKUPS\nENABLED",
-            "SUCCESSFUL\nBACKUPS",
-            "BACKUPS\nIN PROGRESS",
-            "FAULTY\nBACKUPS",
-            "TERMINATED\nBACKUPS"
-        ]
-
-        print(tabulate(
-            backup_objects,
-            headers = header,
-            tablefmt = "grid"
-        ))
-            
-
-    elif option == "--JSON": # print all the backup objects in simple JSON format
-        
-        for vm in all_compartment_backup_data:
-            print(vm)
-
-
-
+                ])
+
+    elif option == "--SUMMARY-ONLY":
+        backup_state_counts = return_backup_state_counts(vm)
+        report_writer.write_row([
+            vm["vm_name"],
+            vm["boot_vol_backups_enabled"],
+            vm["vol_backups_enabled"],
+            backup_state_counts["successful_backups"],
+            backup_state_counts["backups_in_progress"],
+            backup_state_counts["faulty_backups"],
+            backup_state_counts["terminated_backups"]
+        ])
+
+    elif option == "--JSON":
+        report_writer.write_record(return_serializable_vm_backup_data(vm))
+
+report_writer.close()
+if vms_reported == 0: # no backups found
+    print("\n\nNo backups found in compartment {} within region {}.\n\n".format(
+        child_compartment_name,
+        region
+    ), file = status_output)
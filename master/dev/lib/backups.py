@@ -16,6 +16,13 @@
 import csv
 import os
 import os.path
+from lib.backupsnapshot import BackupRecord
+from lib.concurrency import EndpointLimits
+from lib.concurrency import iterate_in_parallel
+from lib.concurrency import run_in_parallel
+from lib.pagination import iterate_results
+from lib.pagination import list_all_results
+from lib.volumes import GetVolumeBackups
 
 
 class GetBackupPolicies:
@@ -41,10 +48,11 @@ class GetBackupPolicies:
         if len(self.volume_backup_policies) != 0:
             return None
         else:
-            results = self.storage_client.list_volume_backup_policies(
+            results = list_all_results(
+                self.storage_client.list_volume_backup_policies,
                 compartment_id = self.compartment_id
             )
-            for bp in results.data:
+            for bp in results:
                 self.volume_backup_policies.append(bp)
     
     def return_all_volume_backup_policies(self):
@@ -129,23 +137,27 @@ class GetVolumeBackupItems:
         else:
             
             if self.volume_type == "--BOOT-VOLUME":
-                list_volume_backups_response = self.storage_client.list_boot_volume_backups(
+                list_volume_backups_response = list_all_results(
+                    self.storage_client.list_boot_volume_backups,
                     compartment_id = self.compartment_id,
                     boot_volume_id = self.volume_id
-                ).data
-                list_dr_volume_backup_response = self.dr_storage_client.list_boot_volume_backups(
+                )
+                list_dr_volume_backup_response = list_all_results(
+                    self.dr_storage_client.list_boot_volume_backups,
                     compartment_id = self.compartment_id,
                     boot_volume_id = self.volume_id
-                ).data
+                )
             elif self.volume_type == "--VOLUME":
-                list_volume_backups_response = self.storage_client.list_volume_backups(
+                list_volume_backups_response = list_all_results(
+                    self.storage_client.list_volume_backups,
                     compartment_id = self.compartment_id,
                     volume_id = self.volume_id
-                ).data
-                list_dr_volume_backup_response = self.dr_storage_client.list_volume_backups(
+                )
+                list_dr_volume_backup_response = list_all_results(
+                    self.dr_storage_client.list_volume_backups,
                     compartment_id = self.compartment_id,
                     volume_id = self.volume_id
-                ).data
+                )
 
                 
             for backup_item in list_volume_backups_response:
@@ -560,199 +572,388 @@ def delete_volume_backup(
 
 # end function delete_volume_backup
 
-def get_compartment_backup_data(
+def get_vm_backup_data(
     compute_client,
     get_block_vol_attachments,
     get_boot_vol_attachments,
     storage_client,
     child_compartment,
-    vm_instances
+    vm_instance,
+    volume_backups,
+    endpoint_limits
 ):
-    
-    # get all vm and volume data
-
-    all_vm_backup_data = [] # will hold a list of the dictionary objects defined below
-    for vm_instance in vm_instances.return_all_instances():
-        # this is the dictionary object
-        vm_backup_data = {
-            "vm_name"                  : "",
-            "vm_id"                    : "",
-            "boot_vol_backups_enabled" : False,   # will set to true if bootvol backup objects are found
-            "vol_backups_enabled"      : False,   # will set to true if vol backup objects are found
-            "boot_volumes"             : "",      # will contain a list of boot volumes
-#             "boot_vol_backups"     : "",          # will contain a list of boot volume backups if found
-            "volumes"                  : ""      # will contain a list of volumes if found
-#             "vol_backups"          : ""           # will contain a list of volume backups if found
-        }
-        
-        # we have to know the bootvol attachments to get to boot vols for the VM
+    '''
+    This function collects the volume and backup data for a single VM instance and returns it
+    as the dictionary object described in get_compartment_backup_data(). It returns None if no
+    boot volumes are found for the VM instance. All REST calls are made through endpoint_limits,
+    an instance of lib.concurrency.EndpointLimits, so that the function may be run from many
+    threads at once.
+
+    The backups are not fetched here. They are read from volume_backups, an instance of
+    lib.volumes.GetVolumeBackups that your code must populate for the compartment beforehand.
+    '''
+
+    # this is the dictionary object
+    vm_backup_data = {
+        "vm_name"                  : "",
+        "vm_id"                    : "",
+        "boot_vol_backups_enabled" : False,   # will set to true if bootvol backup objects are found
+        "vol_backups_enabled"      : False,   # will set to true if vol backup objects are found
+        "boot_volumes"             : "",      # will contain a list of boot volumes
+        "volumes"                  : ""       # will contain a list of volumes if found
+    }
+    
+    # we have to know the bootvol attachments to get to boot vols for the VM
+    with endpoint_limits.slot("list_boot_volume_attachments"):
         bootvol_attachments = get_boot_vol_attachments(
             compute_client,
             vm_instance.availability_domain,
             child_compartment.id,
             vm_instance.id
         )
-        
-        # now we get the boot volumes
-        boot_volumes = []
-        for bva in bootvol_attachments:
-            boot_volume = storage_client.get_boot_volume(
-                boot_volume_id = bva.boot_volume_id
-            ).data
-            boot_volumes.append(boot_volume)
-
-        # don't do any more work if there are no boot volumes
-        if len(boot_volumes) == 0:
-            return None
     
-        # we have to know the vol attachments to get any volumes
+    # now we get the boot volumes
+    boot_volumes = []
+    for bva in bootvol_attachments:
+        boot_volume = endpoint_limits.limit(storage_client.get_boot_volume)(
+            boot_volume_id = bva.boot_volume_id
+        ).data
+        boot_volumes.append(boot_volume)
+
+    # don't do any more work if there are no boot volumes
+    if len(boot_volumes) == 0:
+        return None
+
+    # we have to know the vol attachments to get any volumes
+    with endpoint_limits.slot("list_volume_attachments"):
         vol_attachments = get_block_vol_attachments(
             compute_client,
             vm_instance.availability_domain,
             child_compartment.id,
             vm_instance.id
         )
-        
-        # Now we get the volumes, if any
-        volumes = []
-        for bva in vol_attachments:
-            volume = storage_client.get_volume(
-                volume_id = bva.volume_id
-            ).data
-            volumes.append(volume)
-            
-        vm_backup_data["vm_name"]            = vm_instance.display_name
-        vm_backup_data["vm_id"]              = vm_instance.id
-        vm_backup_data["boot_volumes"]       = boot_volumes
-        vm_backup_data["volumes"]            = volumes
     
-        '''
-        In this section we will walk down each bootvol and pull any backup data by its status. The statuses
-        we look for are AVAILABLE, CREATING, TERMINATED, TERMINATING, and FAULTY. This is done so we avoid 
-        exceeding the page legnth in the API call. Each set of results are appended to boot_volumes, which 
-        is later added to the dictionary object vm_backup_data.
-        '''
-        boot_vol_backups = []
-        for bv in boot_volumes:
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "AVAILABLE"
-            ).data
-            # now append each backup set to bool_vol_backups
-            for bk in backups:
-                boot_vol_backups.append(bk)
-            '''
-            Repeat this operand now for each lifecycle that we must collect data about.
-            '''
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "CREATING"
-            ).data
-            for bk in backups:
-                boot_vol_backups.append(bk)
+    # Now we get the volumes, if any
+    volumes = []
+    for bva in vol_attachments:
+        volume = endpoint_limits.limit(storage_client.get_volume)(
+            volume_id = bva.volume_id
+        ).data
+        volumes.append(volume)
+        
+    vm_backup_data["vm_name"]            = vm_instance.display_name
+    vm_backup_data["vm_id"]              = vm_instance.id
+    vm_backup_data["boot_volumes"]       = boot_volumes
+    vm_backup_data["volumes"]            = volumes
+
+    '''
+    In this section we will walk down each bootvol and pull its backups from volume_backups by status.
+    The statuses we look for are AVAILABLE, CREATING, FAULTY, TERMINATED, and TERMINATING, in that order.
+    Each set of results are appended to boot_vol_backups, which is later added to the dictionary object
+    vm_backup_data.
+    '''
+    boot_vol_backups = []
+    for bv in boot_volumes:
+        boot_vol_backups.extend(volume_backups.return_boot_volume_backups_by_state(bv.id))
             
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "FAULTY"
-            ).data
-            for bk in backups:
-                boot_vol_backups.append(bk)
-                
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "TERMINATED"
-            ).data
-            for bk in backups:
-                boot_vol_backups.append(bk)
-                
-            backups = storage_client.list_boot_volume_backups(
-                compartment_id = child_compartment.id,
-                boot_volume_id = bv.id,
-                lifecycle_state = "TERMINATING"
-            ).data
-            for bk in backups:
-                boot_vol_backups.append(bk)
-                
-        '''
-        Now we will repeat the same operand for volume backups
-        '''
-        vol_backups = []
-        for v in volumes:
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "AVAILABLE"
-            ).data
-            for bk in backups:
-                vol_backups.append(bk)
-                
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "CREATING"
-            ).data
+    '''
+    Now we will repeat the same operand for volume backups
+    '''
+    vol_backups = []
+    for v in volumes:
+        vol_backups.extend(volume_backups.return_block_volume_backups_by_state(v.id))
             
-            for bk in backups:
-                vol_backups.append(bk)
+    '''
+    The dictionary object boot_vol_backups must now have boot_vol_backups and vol_backups appended to it.
+    Set the values for boot_vol_backups_enabled and vol_backups_enabled
+    '''
+    vm_backup_data["boot_volume_backups"] = boot_vol_backups
+    vm_backup_data["vol_backups"]         = vol_backups
+    
+    if len(boot_vol_backups) > 0:
+        vm_backup_data["boot_vol_backups_enabled"] = True
+    if len(vol_backups) > 0:
+        vm_backup_data["vol_backups_enabled"] = True
 
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "FAULTY"
-            ).data
-            for bk in backups:
-                vol_backups.append(bk)
+    return vm_backup_data
 
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "TERMINATED"
-            ).data
-            for bk in backups:
-                vol_backups.append(bk)
+# end function get_vm_backup_data()
+
+def get_compartment_backup_data(
+    compute_client,
+    get_block_vol_attachments,
+    get_boot_vol_attachments,
+    storage_client,
+    child_compartment,
+    vm_instances,
+    max_workers = 1,
+    endpoint_limits = None,
+    volume_backups = None
+):
+    '''
+    This function returns a list of dictionary objects, one for each VM instance in vm_instances.
+    Each dictionary object contains the VM instance, its boot and block volumes, and any backups
+    found for those volumes. See get_vm_backup_data() for the layout of the dictionary object.
+
+    All backups in the compartment are listed once per backup type using the class
+    lib.volumes.GetVolumeBackups, and then partitioned locally by volume and lifecycle state.
+    The number of calls made to list backups therefore depends on the number of pages of
+    backups in the compartment rather than on the number of volumes. Pass volume_backups, an
+    instance of GetVolumeBackups that your code has already loaded, such as from
+    lib.backupsnapshot.BackupSnapshot, to skip the listing altogether.
+
+    By default the VM instances are processed serially. Pass max_workers greater than 1 to
+    collect the data for up to max_workers VM instances at once. Concurrent calls against any
+    single OCI endpoint are capped by endpoint_limits, an instance of
+    lib.concurrency.EndpointLimits. If endpoint_limits is None, an instance with the default
+    limits is created for the call. The records are returned in the same order as
+    vm_instances regardless of the value of max_workers.
+    '''
+
+    if vm_instances.return_all_instances() is None:
+        return []
+
+    if endpoint_limits is None:
+        endpoint_limits = EndpointLimits()
+
+    # list the backups for the whole compartment once, both backup types at the same time
+    if volume_backups is None:
+        volume_backups = GetVolumeBackups(
+            storage_client,
+            child_compartment.id
+        )
+        run_in_parallel(
+            lambda populate_method: populate_method(),
+            [volume_backups.populate_boot_volume_backups, volume_backups.populate_block_volume_backups],
+            max_workers = max_workers
+        )
+
+    def collect_vm_backup_data(vm_instance):
+        return get_vm_backup_data(
+            compute_client,
+            get_block_vol_attachments,
+            get_boot_vol_attachments,
+            storage_client,
+            child_compartment,
+            vm_instance,
+            volume_backups,
+            endpoint_limits
+        )
+
+    results = run_in_parallel(
+        collect_vm_backup_data,
+        vm_instances.return_all_instances(),
+        max_workers = max_workers
+    )
 
-                
-            backups = storage_client.list_volume_backups(
-                compartment_id = child_compartment.id,
-                volume_id = v.id,
-                lifecycle_state = "TERMINATING"
-            ).data
-            for bk in backups:
-                vol_backups.append(bk)
-                
-        '''
-        The dictionary object boot_vol_backups must now have boot_vol_backups and vol_backups appended to it.
-        Set the values for boot_vol_backups_enabled and vol_backups_enabled
-        '''
-        vm_backup_data["boot_volume_backups"] = boot_vol_backups
-        vm_backup_data["vol_backups"]         = vol_backups
-        
-        if len(boot_vol_backups) > 0:
-            vm_backup_data["boot_vol_backups_enabled"] = True
-        if len(vol_backups) > 0:
-            vm_backup_data["vol_backups_enabled"] = True
-        
-        
-        
-        '''
-        The very last action is to append all_vm_backups with this dictionary object, and then to return it
-        to the calling code block
-        '''
-        all_vm_backup_data.append(vm_backup_data)
-    
-    
     '''
     Each dictionary object vm_backup_data contains the VM instance, block volumes, and any backups if found. We
-    also have written to the object True for any backup types we have found. Each object is appended to
-    all_vm_backup_data.
+    also have written to the object True for any backup types we have found. VM instances without a boot
+    volume are left out of all_vm_backup_data.
     '''
-    
+    all_vm_backup_data = []
+    for vm_backup_data in results:
+        if vm_backup_data is not None:
+            all_vm_backup_data.append(vm_backup_data)
     
     return all_vm_backup_data
 
-
 # end function get_compartment_backup_data()
+
+class VolumeRecord:
+    '''
+    This class holds the fields of a boot volume or block volume that the KENT backup
+    reports use, in place of the SDK model object.
+    '''
+
+    __slots__ = [
+        "id",
+        "display_name",
+        "size_in_gbs"
+    ]
+
+    def __init__(self, id, display_name, size_in_gbs = None):
+
+        self.id             = id
+        self.display_name   = display_name
+        self.size_in_gbs    = size_in_gbs
+
+    @classmethod
+    def from_volume(cls, volume):
+
+        return cls(volume.id, volume.display_name, getattr(volume, "size_in_gbs", None))
+
+    def to_dict(self):
+
+        return {
+            "id"            : self.id,
+            "display_name"  : self.display_name,
+            "size_in_gbs"   : self.size_in_gbs
+        }
+
+# end class VolumeRecord
+
+def return_compact_vm_backup_data(vm_backup_data):
+    '''
+    This function returns a copy of vm_backup_data, a dictionary object built by
+    get_vm_backup_data(), with every SDK model object replaced by a VolumeRecord or
+    BackupRecord. The keys are unchanged, so code written against get_compartment_backup_data()
+    reads the compact copy the same way. Call to_dict() on each record to serialize it.
+    '''
+
+    return {
+        "vm_name"                  : vm_backup_data["vm_name"],
+        "vm_id"                    : vm_backup_data["vm_id"],
+        "boot_vol_backups_enabled" : vm_backup_data["boot_vol_backups_enabled"],
+        "vol_backups_enabled"      : vm_backup_data["vol_backups_enabled"],
+        "boot_volumes"             : [VolumeRecord.from_volume(bv) for bv in vm_backup_data["boot_volumes"]],
+        "volumes"                  : [VolumeRecord.from_volume(v) for v in vm_backup_data["volumes"]],
+        "boot_volume_backups"      : [BackupRecord.from_backup(bk) for bk in vm_backup_data["boot_volume_backups"]],
+        "vol_backups"              : [BackupRecord.from_backup(bk) for bk in vm_backup_data["vol_backups"]]
+    }
+
+# end function return_compact_vm_backup_data()
+
+def return_serializable_vm_backup_data(vm_backup_data):
+    '''
+    This function returns a compact dictionary object from iterate_compartment_backup_data()
+    with each record replaced by its dict, ready for json.dumps().
+    '''
+
+    serializable_data = dict(vm_backup_data)
+    for key in ["boot_volumes", "volumes", "boot_volume_backups", "vol_backups"]:
+        serializable_data[key] = [record.to_dict() for record in vm_backup_data[key]]
+    return serializable_data
+
+# end function return_serializable_vm_backup_data()
+
+def iterate_compartment_backup_data(
+    compute_client,
+    get_block_vol_attachments,
+    get_boot_vol_attachments,
+    storage_client,
+    child_compartment,
+    vm_instances,
+    max_workers = 1,
+    endpoint_limits = None,
+    volume_backups = None
+):
+    '''
+    This generator yields the same dictionary objects as get_compartment_backup_data(), one
+    VM instance at a time and in the same order, but compacted by
+    return_compact_vm_backup_data(). Memory use therefore does not grow with the number of VM
+    instances, and your code may print the first VM instance while the rest are fetched.
+
+    The backups of the compartment are listed a page at a time and each one is reduced to a
+    BackupRecord as it arrives, so the SDK model objects are never held all at once. Pass
+    volume_backups to skip the listing, as with get_compartment_backup_data().
+    '''
+
+    if vm_instances.return_all_instances() is None:
+        return
+
+    if endpoint_limits is None:
+        endpoint_limits = EndpointLimits()
+
+    if volume_backups is None:
+        volume_backups = GetVolumeBackups(
+            storage_client,
+            child_compartment.id
+        )
+
+        def list_backup_records(list_method):
+            return [BackupRecord.from_backup(backup) for backup in iterate_results(
+                list_method,
+                compartment_id = child_compartment.id,
+                sort_by = "TIMECREATED"
+            )]
+
+        boot_volume_backups, block_volume_backups = run_in_parallel(
+            list_backup_records,
+            [storage_client.list_boot_volume_backups, storage_client.list_volume_backups],
+            max_workers = max_workers
+        )
+        volume_backups.load_boot_volume_backups(boot_volume_backups)
+        volume_backups.load_block_volume_backups(block_volume_backups)
+
+    def collect_vm_backup_data(vm_instance):
+        vm_backup_data = get_vm_backup_data(
+            compute_client,
+            get_block_vol_attachments,
+            get_boot_vol_attachments,
+            storage_client,
+            child_compartment,
+            vm_instance,
+            volume_backups,
+            endpoint_limits
+        )
+        if vm_backup_data is None:
+            return None
+        return return_compact_vm_backup_data(vm_backup_data)
+
+    for vm_backup_data in iterate_in_parallel(
+        collect_vm_backup_data,
+        vm_instances.return_all_instances(),
+        max_workers = max_workers):
+        if vm_backup_data is not None:
+            yield vm_backup_data
+
+# end function iterate_compartment_backup_data()
+
+def return_backup_state_counts(vm_backup_data):
+    '''
+    This function tallies the boot volume and block volume backups within vm_backup_data, a
+    dictionary object from get_compartment_backup_data() or iterate_compartment_backup_data(),
+    by lifecycle state. It returns a dictionary of the counts of successful, in progress,
+    faulty and terminated backups, along with the time_created of the newest AVAILABLE
+    backup, or None if there is none.
+    '''
+
+    backup_state_counts = {
+        "successful_backups"        : 0,
+        "backups_in_progress"       : 0,
+        "faulty_backups"            : 0,
+        "terminated_backups"        : 0,
+        "newest_successful_backup"  : None
+    }
+
+    for bk in vm_backup_data["boot_volume_backups"] + vm_backup_data["vol_backups"]:
+        if bk.lifecycle_state == "AVAILABLE":
+            backup_state_counts["successful_backups"] += 1
+            if backup_state_counts["newest_successful_backup"] is None or bk.time_created > backup_state_counts["newest_successful_backup"]:
+                backup_state_counts["newest_successful_backup"] = bk.time_created
+        elif bk.lifecycle_state == "CREATING":
+            backup_state_counts["backups_in_progress"] += 1
+        elif bk.lifecycle_state == "FAULTY":
+            backup_state_counts["faulty_backups"] += 1
+        elif bk.lifecycle_state == "TERMINATED" or bk.lifecycle_state == "TERMINATING":
+            backup_state_counts["terminated_backups"] += 1
+
+    return backup_state_counts
+
+# end function return_backup_state_counts()
+
+def return_backup_compliance_findings(
+    backup_state_counts,
+    stale_before):
+    '''
+    This function returns the compliance findings for a VM instance from its
+    backup_state_counts, the dictionary object returned by return_backup_state_counts(). The
+    list is empty when the VM instance is compliant, otherwise it holds one or more of:
+
+        NO BACKUPS      the VM instance has no AVAILABLE backup
+        STALE BACKUPS   the newest AVAILABLE backup was created before stale_before, a datetime
+        FAULTY BACKUPS  one or more backups are FAULTY
+    '''
+
+    findings = []
+    if backup_state_counts["newest_successful_backup"] is None:
+        findings.append("NO BACKUPS")
+    elif backup_state_counts["newest_successful_backup"] < stale_before:
+        findings.append("STALE BACKUPS")
+    if backup_state_counts["faulty_backups"] > 0:
+        findings.append("FAULTY BACKUPS")
+
+    return findings
+
+# end function return_backup_compliance_findings()
@@ -0,0 +1,359 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module keeps a local snapshot of the backup metadata of a compartment so that backup
+reports need not list every backup on every run. A compartment that retains 31 days of
+backups holds thousands of them, yet only the backups taken since the last run, and those
+that were still being created, can have changed.
+
+BackupSnapshot.refresh() lists the backups newest first and stops once it reaches the
+watermark, the time_created of the newest backup already within the snapshot. Backups left
+in a CREATING, REQUEST_RECEIVED or TERMINATING state are fetched one by one, and backups
+past their expiration_time are dropped. The snapshot is then saved for the next run, as in:
+
+    snapshot = BackupSnapshot(storage_client, child_compartment.id, region)
+    snapshot.refresh()
+    volume_backups = GetVolumeBackups(storage_client, child_compartment.id)
+    snapshot.load_volume_backups(volume_backups)
+
+A backup deleted by hand is not seen by an incremental refresh, so the snapshot is rebuilt
+from a full listing once it is older than FULL_RESCAN_SECONDS, or when refresh() is called
+with full = True.
+
+The snapshots are kept in ~/.oci/kent_backup_snapshots unless the environment variable
+KENT_BACKUP_SNAPSHOT_DIR supplies another path. As with lib/cache.py, a snapshot that cannot
+be read is ignored and rebuilt, so the snapshot never breaks a report.
+'''
+
+import json
+import os
+import os.path
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.concurrency import run_in_parallel
+from lib.pagination import iterate_results
+from lib.ratelimit import call_with_rate_limit
+
+
+SNAPSHOT_DIR_ENV_VAR        = "KENT_BACKUP_SNAPSHOT_DIR"
+DEFAULT_SNAPSHOT_DIR        = os.path.join(os.path.expanduser("~"), ".oci", "kent_backup_snapshots")
+SNAPSHOT_VERSION            = 1
+FULL_RESCAN_SECONDS         = 604800    # rebuild the snapshot from a full listing once a week
+WATERMARK_OVERLAP_SECONDS   = 3600      # list this far behind the watermark to catch late arrivals
+IN_FLIGHT_STATES            = ["CREATING", "REQUEST_RECEIVED", "TERMINATING"]
+NOT_FOUND_STATUS            = 404
+
+
+class BackupRecord:
+    '''
+    This class holds the fields of a boot volume or block volume backup that the KENT backup
+    reports use, in place of the SDK model object. It has the same attribute names as the SDK
+    model, so it may be passed to lib.volumes.GetVolumeBackups. volume_id is None for a boot
+    volume backup, and boot_volume_id is None for a block volume backup.
+    '''
+
+    __slots__ = [
+        "id",
+        "display_name",
+        "boot_volume_id",
+        "volume_id",
+        "lifecycle_state",
+        "time_created",
+        "expiration_time",
+        "size_in_gbs",
+        "source_type"
+    ]
+
+    def __init__(
+        self,
+        id,
+        display_name,
+        boot_volume_id,
+        volume_id,
+        lifecycle_state,
+        time_created,
+        expiration_time = None,
+        size_in_gbs = None,
+        source_type = None):
+
+        self.id                 = id
+        self.display_name       = display_name
+        self.boot_volume_id     = boot_volume_id
+        self.volume_id          = volume_id
+        self.lifecycle_state    = lifecycle_state
+        self.time_created       = time_created
+        self.expiration_time    = expiration_time
+        self.size_in_gbs        = size_in_gbs
+        self.source_type        = source_type
+
+    @classmethod
+    def from_backup(cls, backup):
+        # builds the record from an SDK BootVolumeBackup or VolumeBackup
+
+        return cls(
+            backup.id,
+            backup.display_name,
+            getattr(backup, "boot_volume_id", None),
+            getattr(backup, "volume_id", None),
+            backup.lifecycle_state,
+            backup.time_created,
+            expiration_time = getattr(backup, "expiration_time", None),
+            size_in_gbs = getattr(backup, "size_in_gbs", None),
+            source_type = getattr(backup, "source_type", None)
+        )
+
+    @classmethod
+    def from_dict(cls, record):
+
+        return cls(
+            record["id"],
+            record["display_name"],
+            record["boot_volume_id"],
+            record["volume_id"],
+            record["lifecycle_state"],
+            datetime.fromisoformat(record["time_created"]),
+            expiration_time = datetime.fromisoformat(record["expiration_time"]) if record["expiration_time"] else None,
+            size_in_gbs = record["size_in_gbs"],
+            source_type = record["source_type"]
+        )
+
+    def to_dict(self):
+
+        return {
+            "id"                : self.id,
+            "display_name"      : self.display_name,
+            "boot_volume_id"    : self.boot_volume_id,
+            "volume_id"         : self.volume_id,
+            "lifecycle_state"   : self.lifecycle_state,
+            "time_created"      : self.time_created.isoformat(),
+            "expiration_time"   : self.expiration_time.isoformat() if self.expiration_time is not None else None,
+            "size_in_gbs"       : self.size_in_gbs,
+            "source_type"       : self.source_type
+        }
+
+    def __repr__(self):
+        return "BackupRecord(" + str(self.to_dict()) + ")"
+
+# end class BackupRecord
+
+def return_snapshot_file(compartment_id, region):
+
+    snapshot_dir = os.environ.get(SNAPSHOT_DIR_ENV_VAR, DEFAULT_SNAPSHOT_DIR)
+    return os.path.join(snapshot_dir, region, compartment_id + ".json")
+
+# end function return_snapshot_file()
+
+class BackupSnapshot:
+    '''
+    This class maintains the snapshot of the boot volume and block volume backups within
+    compartment_id, see the module notes. Call refresh() to bring the snapshot up to date and
+    save it, then read the backups with return_boot_volume_backups() and
+    return_block_volume_backups(), or hand them to GetVolumeBackups with load_volume_backups().
+    return_refresh_stats() reports how the last refresh was done.
+    '''
+
+    def __init__(
+        self,
+        storage_client,
+        compartment_id,
+        region,
+        snapshot_file = None,
+        max_workers = DEFAULT_MAX_WORKERS):
+
+        self.storage_client     = storage_client
+        self.compartment_id     = compartment_id
+        self.region             = region
+        self.snapshot_file      = snapshot_file or return_snapshot_file(compartment_id, region)
+        self.max_workers        = max_workers
+        self.full_scan_time     = None
+        self.refresh_time       = None
+        self.boot_volume_backups = {}       # backup OCID -> BackupRecord
+        self.block_volume_backups = {}      # backup OCID -> BackupRecord
+        self.refresh_stats      = {}
+
+    def load(self):
+        '''
+        Reads the snapshot file and returns True, or returns False if there is no usable
+        snapshot for the compartment.
+        '''
+
+        try:
+            with open(self.snapshot_file, "r") as snapshot:
+                snapshot_data = json.load(snapshot)
+            if snapshot_data.get("version") != SNAPSHOT_VERSION or snapshot_data.get("compartment_id") != self.compartment_id:
+                return False
+            self.full_scan_time = datetime.fromisoformat(snapshot_data["full_scan_time"])
+            self.refresh_time = datetime.fromisoformat(snapshot_data["refresh_time"])
+            self.boot_volume_backups = {}
+            for record in snapshot_data["boot_volume_backups"]:
+                self.boot_volume_backups[record["id"]] = BackupRecord.from_dict(record)
+            self.block_volume_backups = {}
+            for record in snapshot_data["block_volume_backups"]:
+                self.block_volume_backups[record["id"]] = BackupRecord.from_dict(record)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.boot_volume_backups = {}
+            self.block_volume_backups = {}
+            return False
+        return True
+
+    def save(self):
+        '''
+        Writes the snapshot file. The file is written beside the old one and then renamed, so
+        a report that is interrupted never leaves a partial snapshot behind. Errors are
+        ignored since the next run simply rebuilds the snapshot.
+        '''
+
+        snapshot_data = {
+            "version"               : SNAPSHOT_VERSION,
+            "compartment_id"        : self.compartment_id,
+            "region"                : self.region,
+            "full_scan_time"        : self.full_scan_time.isoformat(),
+            "refresh_time"          : self.refresh_time.isoformat(),
+            "boot_volume_backups"   : [record.to_dict() for record in self.boot_volume_backups.values()],
+            "block_volume_backups"  : [record.to_dict() for record in self.block_volume_backups.values()]
+        }
+        try:
+            snapshot_dir = os.path.dirname(self.snapshot_file)
+            if snapshot_dir != "" and not os.path.exists(snapshot_dir):
+                os.makedirs(snapshot_dir, mode = 0o700, exist_ok = True)
+            temp_file = self.snapshot_file + ".tmp"
+            with open(temp_file, "w") as snapshot:
+                json.dump(snapshot_data, snapshot)
+            os.chmod(temp_file, 0o600)
+            os.replace(temp_file, self.snapshot_file)
+        except OSError:
+            return None
+
+    def list_backups(self, list_method, records, cutoff):
+        '''
+        Lists backups newest first into records until a backup created before cutoff is
+        reached. A cutoff of None lists every backup. Returns the set of backup OCIDs listed.
+        '''
+
+        listed_ids = set()
+        for backup in iterate_results(
+            list_method,
+            compartment_id = self.compartment_id,
+            sort_by = "TIMECREATED",
+            sort_order = "DESC"):
+            if cutoff is not None and backup.time_created < cutoff:
+                break
+            records[backup.id] = BackupRecord.from_backup(backup)
+            listed_ids.add(backup.id)
+        return listed_ids
+
+    def refresh_in_flight_backups(self, get_method, records, listed_ids):
+        '''
+        Fetches each backup within records that was in flight as of the last refresh and was
+        not just listed. Backups that no longer exist are removed. Returns the number fetched.
+        '''
+
+        backup_ids = [
+            backup_id for backup_id, record in records.items()
+            if record.lifecycle_state in IN_FLIGHT_STATES and backup_id not in listed_ids
+        ]
+
+        def fetch_backup(backup_id):
+            try:
+                return call_with_rate_limit(get_method, backup_id).data
+            except Exception as error:
+                if getattr(error, "status", None) == NOT_FOUND_STATUS:
+                    return None
+                raise
+
+        for backup_id, backup in zip(backup_ids, run_in_parallel(fetch_backup, backup_ids, max_workers = self.max_workers)):
+            if backup is None:
+                del records[backup_id]
+            else:
+                records[backup_id] = BackupRecord.from_backup(backup)
+        return len(backup_ids)
+
+    def return_watermark(self, records):
+
+        if len(records) == 0:
+            return None
+        return max(record.time_created for record in records.values())
+
+    def refresh(self, full = False):
+        '''
+        Brings the snapshot up to date with the REST service and saves it. A full listing is
+        made if full is True, if there is no usable snapshot, or if the last full listing is
+        older than FULL_RESCAN_SECONDS.
+        '''
+
+        now = datetime.now(timezone.utc)
+        if not full:
+            full = not self.load() or (now - self.full_scan_time).total_seconds() > FULL_RESCAN_SECONDS
+        if full:
+            self.boot_volume_backups = {}
+            self.block_volume_backups = {}
+
+        self.refresh_stats = {
+            "full_scan"         : full,
+            "backups_listed"    : 0,
+            "backups_refreshed" : 0,
+            "backups_expired"   : 0
+        }
+        for records, list_method, get_method in [
+            (self.boot_volume_backups, self.storage_client.list_boot_volume_backups, self.storage_client.get_boot_volume_backup),
+            (self.block_volume_backups, self.storage_client.list_volume_backups, self.storage_client.get_volume_backup)]:
+
+            cutoff = None
+            watermark = self.return_watermark(records)
+            if not full and watermark is not None:
+                cutoff = watermark - timedelta(seconds = WATERMARK_OVERLAP_SECONDS)
+            listed_ids = self.list_backups(list_method, records, cutoff)
+            self.refresh_stats["backups_listed"] += len(listed_ids)
+            if not full:
+                self.refresh_stats["backups_refreshed"] += self.refresh_in_flight_backups(get_method, records, listed_ids)
+
+            # OCI deletes a backup once it expires, so it is dropped rather than listed again
+            for backup_id in [backup_id for backup_id, record in records.items() if record.expiration_time is not None and record.expiration_time < now]:
+                del records[backup_id]
+                self.refresh_stats["backups_expired"] += 1
+
+        if full:
+            self.full_scan_time = now
+        self.refresh_time = now
+        self.save()
+
+    def return_boot_volume_backups(self):
+
+        return list(self.boot_volume_backups.values())
+
+    def return_block_volume_backups(self):
+
+        return list(self.block_volume_backups.values())
+
+    def load_volume_backups(self, volume_backups):
+        '''
+        Loads the backups within the snapshot into volume_backups, an instance of
+        lib.volumes.GetVolumeBackups, in place of calling its populate methods.
+        '''
+
+        volume_backups.load_boot_volume_backups(self.return_boot_volume_backups())
+        volume_backups.load_block_volume_backups(self.return_block_volume_backups())
+
+    def return_refresh_stats(self):
+
+        return dict(self.refresh_stats)
+
+    def __str__(self):
+        return "Class setup to maintain the backup snapshot of compartment " + self.compartment_id
+
+# end class BackupSnapshot
@@ -0,0 +1,271 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module is the local resource cache used by the KENT codebase. Nearly every Oci-*.py
+program resolves the parent compartment, child compartment, VCN and subnet by name before
+doing any real work. When many programs are run back to back, as from an Ansible playbook,
+these identical lookups account for most of the run time. The cache stores the results of
+those lookups in a SQLite database so that the next program can reuse them.
+
+The cache is off unless the environment variable KENT_CACHE is set to 1, true or yes, as in:
+
+    export KENT_CACHE=1
+
+The database is kept in ~/.oci/kent_cache.db unless KENT_CACHE_FILE supplies another path.
+Each resource type has its own time to live in seconds, set within CACHE_TTLS. The TTL of a
+type may be overridden with an environment variable named KENT_CACHE_TTL_ followed by the
+type in upper case, as in KENT_CACHE_TTL_SUBNETS=300.
+
+Pass --no-cache (or --NO-CACHE) anywhere on the command line of a program to bypass the
+cache for that run. The option is removed from sys.argv when this module is imported, so
+it does not upset the argument checks of the program. The results fetched during a
+bypassed run still refresh the cache.
+
+The add and delete functions within lib invalidate the entries they affect. Invalidation
+takes place whether or not the cache is enabled for the run, so a program run with the
+cache off cannot leave stale entries behind for the next program.
+
+The cache must never break a program. Any error reading or writing the database is
+ignored and the data is fetched from the REST service instead.
+'''
+
+import os
+import pickle
+import sqlite3
+import sys
+import time
+
+
+CACHE_ENV_VAR           = "KENT_CACHE"
+CACHE_FILE_ENV_VAR      = "KENT_CACHE_FILE"
+CACHE_TTL_ENV_PREFIX    = "KENT_CACHE_TTL_"
+DEFAULT_CACHE_FILE      = os.path.join(os.path.expanduser("~"), ".oci", "kent_cache.db")
+NO_CACHE_OPTIONS        = ["--no-cache", "--NO-CACHE"]
+
+# seconds that each resource type remains valid within the cache
+CACHE_TTLS = {
+    "compartments"          : 3600,
+    "vcns"                  : 900,
+    "subnets"               : 900,
+    "regions"               : 604800,
+    "region_subscriptions"  : 86400
+}
+
+cache_bypassed = False
+
+
+def strip_no_cache_option(argv):
+    '''
+    This function removes --no-cache from argv and bypasses the cache for the rest of the
+    run if it was found. It is called on sys.argv when this module is imported, and again
+    by lib/daemon.py for each program the daemon runs.
+    '''
+
+    global cache_bypassed
+    cache_bypassed = False
+    for no_cache_option in NO_CACHE_OPTIONS:
+        while no_cache_option in argv:
+            argv.remove(no_cache_option)
+            cache_bypassed = True
+
+# end function strip_no_cache_option()
+
+def cache_enabled():
+    '''
+    This function returns True if the cache has been enabled with KENT_CACHE.
+    '''
+
+    return os.environ.get(CACHE_ENV_VAR, "").lower() in ["1", "true", "yes"]
+
+# end function cache_enabled()
+
+def return_cache_file():
+
+    return os.environ.get(CACHE_FILE_ENV_VAR, DEFAULT_CACHE_FILE)
+
+# end function return_cache_file()
+
+def return_ttl(resource_type):
+
+    ttl = os.environ.get(CACHE_TTL_ENV_PREFIX + resource_type.upper())
+    if ttl is not None:
+        try:
+            return int(ttl)
+        except ValueError:
+            pass
+    return CACHE_TTLS.get(resource_type, 0)
+
+# end function return_ttl()
+
+def return_scope_key(scope):
+    '''
+    The scope is the tuple of values that the list call was made with, such as the
+    compartment OCID and the VCN OCID. It is stored as a single string.
+    '''
+
+    return "|".join(str(item) for item in scope)
+
+# end function return_scope_key()
+
+def open_cache(create = True):
+    '''
+    This function returns a connection to the cache database, or None if the database does
+    not exist and create is False. The database file is only readable by the owner since
+    it holds resource data from the tenancy.
+    '''
+
+    cache_file = return_cache_file()
+    if not create and not os.path.exists(cache_file):
+        return None
+
+    cache_dir = os.path.dirname(cache_file)
+    if cache_dir != "" and not os.path.exists(cache_dir):
+        os.makedirs(cache_dir, mode = 0o700, exist_ok = True)
+
+    # the timeout allows programs run in parallel to wait on each other's writes
+    connection = sqlite3.connect(cache_file, timeout = 30)
+    os.chmod(cache_file, 0o600)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS resource_cache ("
+        "resource_type TEXT NOT NULL, "
+        "scope TEXT NOT NULL, "
+        "time_stored REAL NOT NULL, "
+        "payload BLOB NOT NULL, "
+        "PRIMARY KEY (resource_type, scope))"
+    )
+    return connection
+
+# end function open_cache()
+
+def return_cached_resources(resource_type, scope):
+    '''
+    This function returns the list of resources stored for resource_type and scope, or None
+    if the cache is disabled or bypassed, or the entry is missing or older than its TTL.
+    '''
+
+    if not cache_enabled() or cache_bypassed:
+        return None
+
+    try:
+        connection = open_cache(create = False)
+        if connection is None:
+            return None
+        with connection:
+            row = connection.execute(
+                "SELECT time_stored, payload FROM resource_cache WHERE resource_type = ? AND scope = ?",
+                (resource_type, return_scope_key(scope))
+            ).fetchone()
+        connection.close()
+        if row is None:
+            return None
+        if time.time() - row[0] > return_ttl(resource_type):
+            return None
+        return pickle.loads(row[1])
+    except (sqlite3.Error, OSError, pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+        return None
+
+# end function return_cached_resources()
+
+def store_cached_resources(resource_type, scope, resources):
+    '''
+    This function stores the list resources for resource_type and scope if the cache
+    is enabled.
+    '''
+
+    if not cache_enabled():
+        return None
+
+    try:
+        payload = pickle.dumps(list(resources))
+        connection = open_cache()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO resource_cache (resource_type, scope, time_stored, payload) VALUES (?, ?, ?, ?)",
+                (resource_type, return_scope_key(scope), time.time(), payload)
+            )
+        connection.close()
+    except (sqlite3.Error, OSError, pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+# end function store_cached_resources()
+
+def invalidate_cached_resources(resource_type, scope = None):
+    '''
+    This function removes the entry for resource_type and scope from the cache. If scope is
+    None, every entry of resource_type is removed. Call this function after creating or
+    deleting a resource so that the next lookup fetches fresh data.
+    '''
+
+    try:
+        connection = open_cache(create = False)
+        if connection is None:
+            return None
+        with connection:
+            if scope is None:
+                connection.execute(
+                    "DELETE FROM resource_cache WHERE resource_type = ?",
+                    (resource_type,)
+                )
+            else:
+                connection.execute(
+                    "DELETE FROM resource_cache WHERE resource_type = ? AND scope = ?",
+                    (resource_type, return_scope_key(scope))
+                )
+        connection.close()
+    except (sqlite3.Error, OSError):
+        return None
+
+# end function invalidate_cached_resources()
+
+def return_client_region(client):
+    '''
+    VCNs and subnets are regional resources, so the region endpoint of the client becomes
+    part of the scope for those types.
+    '''
+
+    base_client = getattr(client, "base_client", None)
+    return getattr(base_client, "endpoint", "")
+
+# end function return_client_region()
+
+def list_cached_resources(resource_type, scope, fetch_function):
+    '''
+    This function returns a tuple of the list of resources for resource_type and scope, and
+    a boolean that is True if the list came from the cache. When the cache cannot supply
+    the list, fetch_function is called with no arguments to fetch it from the REST service
+    and its results are stored. As in:
+
+        resources, from_cache = list_cached_resources(
+            "vcns",
+            (return_client_region(network_client), compartment_id),
+            fetch_vcns
+        )
+    '''
+
+    resources = return_cached_resources(resource_type, scope)
+    if resources is not None:
+        return resources, True
+
+    resources = fetch_function()
+    # an empty list is not stored, since it is most likely followed by a create
+    if len(resources) != 0:
+        store_cached_resources(resource_type, scope, resources)
+    return resources, False
+
+# end function list_cached_resources()
+
+# strip the bypass option from the command line before the program checks sys.argv
+strip_no_cache_option(sys.argv)
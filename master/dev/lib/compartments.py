@@ -16,6 +16,10 @@
 from oci import config
 from oci import identity
 import oci
+from lib.pagination import list_all_results
+from lib.cache import invalidate_cached_resources
+from lib.cache import list_cached_resources
+from lib.concurrency import run_in_parallel
 
 
 
@@ -69,23 +73,32 @@ class GetParentCompartments:
 
     Method return_parent_compartment(self)
         This method parses through parent_compartments and returns the parent compartment object
-        with the name that matches self.parent_compartment_name if found.
+        with the name that matches self.parent_compartment_name if found. If the compartments
+        came from the local cache (see lib/cache.py) and the name is not found, the compartments
+        are fetched again from the REST service before giving up.
 '''
     def __init__(self,parent_compartment_name, config, identity_client):
         self.parent_compartment_name = parent_compartment_name
         self.parent_compartments = []
         self.config = config
         self.identity_client = identity_client
+        self.from_cache = False
         
     def populate_compartments(self):
         if len(self.parent_compartments) != 0:
             return None
         
-        results = self.identity_client.list_compartments(self.config["tenancy"])
-        for item in results.data:
-            if item.lifecycle_state != 'DELETED':
-                if item.lifecycle_state != 'DELETING':
-                    self.parent_compartments.append(item)
+        self.parent_compartments, self.from_cache = list_cached_resources(
+            "compartments",
+            (self.config["tenancy"],),
+            lambda: return_active_compartments(self.identity_client, self.config["tenancy"])
+        )
+
+    def refresh_compartments(self):
+        
+        invalidate_cached_resources("compartments", (self.config["tenancy"],))
+        self.parent_compartments = []
+        self.populate_compartments()
 
     def return_all_parent_compartments(self):
         
@@ -102,6 +115,9 @@ class GetParentCompartments:
             for item in self.parent_compartments:
                 if item.name == self.parent_compartment_name:
                     return item
+            if self.from_cache:
+                self.refresh_compartments()
+                return self.return_parent_compartment()
     
     def __str__(self):
         return "The parent compartment name is " + self.parent_compartment_name + " in tenancy " \
@@ -120,16 +136,23 @@ class GetChildCompartments:
         self.child_compartment_name = child_compartment_name
         self.identity_client = identity_client
         self.child_compartments = []
+        self.from_cache = False
     
     def populate_compartments(self):
 
         if len(self.child_compartments) != 0:
             return None
-        results = self.identity_client.list_compartments(self.parent_compartment_id)
-        for item in results.data:
-            if item.lifecycle_state != 'DELETED':
-                if item.lifecycle_state != 'DELETING':
-                    self.child_compartments.append(item)
+        self.child_compartments, self.from_cache = list_cached_resources(
+            "compartments",
+            (self.parent_compartment_id,),
+            lambda: return_active_compartments(self.identity_client, self.parent_compartment_id)
+        )
+
+    def refresh_compartments(self):
+
+        invalidate_cached_resources("compartments", (self.parent_compartment_id,))
+        self.child_compartments = []
+        self.populate_compartments()
     
     def return_all_child_compartments(self):
         if len(self.child_compartments) == 0:
@@ -144,12 +167,77 @@ class GetChildCompartments:
             for item in self.child_compartments:
                 if item.name == self.child_compartment_name:
                     return item
+            if self.from_cache:
+                self.refresh_compartments()
+                return self.return_child_compartment()
                 
     def __str__(self):
         return "The child compartment name is " + self.child_compartment_name
                 
 # end GetChildCompartments
 
+def return_active_compartments(identity_client, parent_compartment_id):
+    '''
+    This function returns the compartments within parent_compartment_id that are not
+    DELETED or DELETING. It is the fetch function used by GetParentCompartments and
+    GetChildCompartments when the data is not in the local cache.
+    '''
+
+    compartments = []
+    results = list_all_results(
+        identity_client.list_compartments,
+        parent_compartment_id
+    )
+    for item in results:
+        if item.lifecycle_state != 'DELETED':
+            if item.lifecycle_state != 'DELETING':
+                compartments.append(item)
+
+    return compartments
+
+# end function return_active_compartments()
+
+def return_compartment_tree(
+    identity_client,
+    root_compartment,
+    root_path,
+    max_workers = 1):
+    '''
+    This function walks every active compartment beneath root_compartment, however deeply
+    nested, and returns a list of (path, compartment) tuples that starts with root_compartment
+    itself. The path is the slash separated names of the compartments from root_path down, as
+    in "admin_comp/dbs_comp". Each level of the tree is listed with GetChildCompartments, so
+    the lists are shared through the local cache, and the compartments of a level are listed
+    together on a thread pool of at most max_workers threads.
+    '''
+
+    compartment_tree = [(root_path, root_compartment)]
+    current_level = [(root_path, root_compartment)]
+    while len(current_level) != 0:
+
+        def list_child_compartments(parent_item):
+            parent_path, parent_compartment = parent_item
+            child_compartments = GetChildCompartments(
+                parent_compartment.id,
+                None,
+                identity_client
+            )
+            child_compartments.populate_compartments()
+            return [(parent_path + "/" + item.name, item) for item in child_compartments.child_compartments]
+
+        next_level = []
+        for child_items in run_in_parallel(
+            list_child_compartments,
+            current_level,
+            max_workers = max_workers):
+            next_level.extend(child_items)
+        compartment_tree.extend(next_level)
+        current_level = next_level
+
+    return compartment_tree
+
+# end function return_compartment_tree()
+
 
 def add_compartment(parent_compartment_id, identity_client, new_compartment_name, description):
     '''
@@ -175,6 +263,7 @@ def add_compartment(parent_compartment_id, identity_client, new_compartment_name
     results = identity_client.create_compartment(
         create_compartment_details  = compartment_details
     ).data
+    invalidate_cached_resources("compartments", (parent_compartment_id,))
 
     return results
 # end add_compartment()
@@ -191,6 +280,8 @@ def del_compartment(identity_client, compartment_id):
     results = identity_client.delete_compartment(
         compartment_id = compartment_id
     )
+    # the parent of compartment_id is not known here, so drop every cached compartment list
+    invalidate_cached_resources("compartments")
     # now we call the method create_compartment and pass the dict object compartment_details
     # to associated with the key word create_compartment_details. This is what the REST API
     # service is expecting. We opt to not send any tags.
@@ -14,8 +14,25 @@
 # file 'LICENSE.txt', which is part of this source code package.
 
 import csv
+import fnmatch
 import os
 import os.path
+import time
+from lib.pagination import list_all_results
+from lib.concurrency import run_in_parallel
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.ratelimit import call_with_rate_limit
+from lib.general import get_availability_domains
+from lib.subnets import GetPrivateIP
+from lib.subnets import GetSubnet
+from lib.vcns import GetVirtualCloudNetworks
+from lib.waiters import register_or_wait
+from lib.waiters import ResourceWaiter
+from lib.waiters import wait_for_resource
+
+
+RESET_POLL_SECONDS  = 2         # poll interval while waiting for a reset instance to leave RUNNING
+RESET_START_SECONDS = 300       # seconds a reset instance is given to leave RUNNING
 
 
 class GetCapacityReservations:
@@ -35,22 +52,13 @@ class GetCapacityReservations:
             return None
         
         else:
-            capacity_response = self.compute_client.list_compute_capacity_reservations(
+            results = list_all_results(
+                self.compute_client.list_compute_capacity_reservations,
                 compartment_id      = self.compartment_id
             )
-            results = capacity_response.data
-            if len(results) > 0:
-                for cap in results:
-                    if cap.lifecycle_state in ["ACTIVE", "CREATING", "UPDATING", "MOVING"]:
-                        self.reservation_list.append(cap)
-                while capacity_response.has_next_page:
-                    capacity_response = self.compute_client.list_compute_capacity_reservations(
-                    compartment_id      = self.compartment_id
-                    )
-                    capacity_response = results.data
-                    for cap in results:
-                        if cap.lifecycle_state in ["ACTIVE", "CREATING", "UPDATING", "MOVING"]:
-                            self.reservation_list.append(cap)
+            for cap in results:
+                if cap.lifecycle_state in ["ACTIVE", "CREATING", "UPDATING", "MOVING"]:
+                    self.reservation_list.append(cap)
     
     def return_all_capacity_reservations(self):
         if len(self.reservation_list) > 0:
@@ -82,28 +90,15 @@ class GetImages:
         if len(self.image_list) != 0:
             return None
         else:
-            image_response = self.compute_client.list_images(
+            results = list_all_results(
+                self.compute_client.list_images,
                 compartment_id = self.compartment_id,
                 sort_order = "ASC",
                 lifecycle_state = "AVAILABLE"
                 )
-            results = image_response.data
-            if len(results) > 0:
-                for image in results:
-                    temp_value = [image.display_name, image.id]
-                    self.image_list.append(temp_value)
-            while image_response.has_next_page:
-                image_response = self.compute_client.list_images(
-                    compartment_id = self.compartment_id,
-                    sort_order = "ASC",
-                    lifecycle_state = "AVAILABLE",
-                    page = image_response.next_page
-                )
-                results = image_response.data
-                if len(results) > 0:
-                    for image in results:
-                        temp_value = [image.display_name, image.id]
-                        self.image_list.append(temp_value)
+            for image in results:
+                temp_value = [image.display_name, image.id]
+                self.image_list.append(temp_value)
             
                     
     def return_image(self, image_name):
@@ -141,6 +136,20 @@ class GetImages:
 # end class GetImages
 
 class GetInstance:
+    '''
+    This class fetches and returns data from the REST service for VM instances. Instiate by
+    passing to the class the compute client, compartment_id and instance_name.
+
+    Call populate_instance() when you only need instance_name. The display name is passed to
+    the REST service as a filter, so only the matching instances are returned rather than the
+    whole compartment. Pass lifecycle_state to filter on the state as well.
+
+    Call populate_instances() to add every instance within the compartment to the class.
+
+    Terminated and terminating instances are never added. Call return_instance() to return
+    instance_name, or return_instance_by_name() to return any other instance held by the
+    class. Both are dictionary lookups.
+    '''
     
     def __init__(
         self,
@@ -152,19 +161,40 @@ class GetInstance:
         self.compartment_id             = compartment_id
         self.instance_name              = instance_name
         self.instance_list              = []
+        self.instances_by_name          = {}
         
     def populate_instances(self):
 
         if len(self.instance_list) != 0:
             return None
         else:
-            results = self.compute_client.list_instances(
-                compartment_id = self.compartment_id).data
-            for instance in results:
-                if instance.lifecycle_state != "TERMINATED":
-                    # had to nest the logic, using and did not work due to an unknown cause.
-                    if instance.lifecycle_state != "TERMINATING":
-                        self.instance_list.append(instance)
+            results = list_all_results(
+                self.compute_client.list_instances,
+                compartment_id = self.compartment_id)
+            self.add_instances(results)
+
+    def populate_instance(self, lifecycle_state = None):
+
+        if len(self.instance_list) != 0:
+            return None
+        else:
+            filters = {"display_name" : self.instance_name}
+            if lifecycle_state is not None:
+                filters["lifecycle_state"] = lifecycle_state
+            results = list_all_results(
+                self.compute_client.list_instances,
+                compartment_id = self.compartment_id,
+                **filters)
+            self.add_instances(results)
+
+    def add_instances(self, results):
+
+        for instance in results:
+            if instance.lifecycle_state not in ["TERMINATED", "TERMINATING"]:
+                self.instance_list.append(instance)
+                # the first instance returned wins should display names be duplicated
+                if instance.display_name not in self.instances_by_name:
+                    self.instances_by_name[instance.display_name] = instance
 
     def return_all_instances(self):
 
@@ -175,12 +205,11 @@ class GetInstance:
     
     def return_instance(self):
 
-        if self.instance_list == 0:
-            return None
-        else:
-            for instance in self.instance_list:
-                if instance.display_name == self.instance_name:
-                    return instance
+        return self.instances_by_name.get(self.instance_name)
+
+    def return_instance_by_name(self, instance_name):
+
+        return self.instances_by_name.get(instance_name)
     
     def start_instance(self):
 
@@ -303,9 +332,10 @@ class GetVnicAttachment:
         if len(self.vnics) != 0:
             return None
         else:
-            results = self.compute_client.list_vnic_attachments(
+            results = list_all_results(
+                self.compute_client.list_vnic_attachments,
                 compartment_id = self.compartment_id
-            ).data
+            )
             # OCI's housekeeping for VNICs is insane. We only care about attached VNICs. 
             for vnic in results:
                 if vnic.lifecycle_state not in ["DETACHED"]:
@@ -489,19 +519,175 @@ class LaunchVmInstance:
                 shape_config = self.shape_config,
                 source_details = self.instance_source_via_image_details)
         
-    def launch_instance_and_wait_for_state(self):
-        
-        results = self.compute_composite_client.launch_instance_and_wait_for_state(
-            launch_instance_details = self.launch_instance_details,
-            wait_for_states = ["RUNNING", "UNKNOWN_ENUM_VALUE"]).data
+    def launch_instance_and_wait_for_state(self, waiter = None, callback = None):
+        '''
+        This method launches the instance and waits for it to start. Pass a
+        lib.waiters.ResourceWaiter as waiter to return the PROVISIONING instance at once
+        and leave the waiter to poll it along with any others. callback, if passed, is
+        called with the instance once it has started or failed.
+        '''
+
+        results = self.submit_launch_instance()
+        instance = register_or_wait(
+            waiter,
+            results.id,
+            "instance",
+            self.compute_composite_client.client.get_instance,
+            ["RUNNING", "UNKNOWN_ENUM_VALUE"],
+            failed_states = ["TERMINATING", "TERMINATED"],
+            callback = callback
+        )
+        if instance is not None:
+            results = instance
         
         return results
+
+    def submit_launch_instance(self):
+        '''
+        This method submits the launch request and returns the instance object, which will be
+        in a PROVISIONING state, without waiting for the instance to start. Use it with
+        submit_vm_launches() and wait_for_instance_states() to launch many instances at once.
+        '''
+
+        results = call_with_rate_limit(
+            self.compute_composite_client.client.launch_instance,
+            launch_instance_details = self.launch_instance_details).data
+
+        return results
         
     def __str__(self):
         return "Class setup to perform launch instance operations for " + self.host_details["instance_name"]
 
 # end class LaunchVmInstance
 
+class GetVmLaunchResources:
+    '''
+    This class resolves the resources needed to launch many VM instances into one
+    compartment, such as from a CSV file. Each distinct resource is fetched from the REST
+    service once, the first time a record asks for it, and every later record is answered
+    from memory. The number of REST calls therefore grows with the number of distinct VCNs,
+    subnets and image compartments rather than with the number of records.
+
+    Instiate the class with the clients and the OCID of the compartment the instances are
+    to be launched into, then call populate_launch_resources() to load the VCNs, the
+    availability domains and the names of the existing instances within that compartment.
+    Subnets, private IP addresses and image catalogs are loaded as they are first requested.
+
+    The class remembers the private IP addresses your code reserves with reserve_ip(), so
+    is_dup_ip() also reports addresses that are taken by records that have not yet been
+    launched.
+    '''
+
+    def __init__(
+        self,
+        compute_client,
+        identity_client,
+        network_client,
+        compartment_id):
+
+        self.compute_client         = compute_client
+        self.identity_client        = identity_client
+        self.network_client         = network_client
+        self.compartment_id         = compartment_id
+        self.virtual_cloud_networks = {}    # display_name -> VCN
+        self.subnets                = {}    # vcn_id -> display_name -> subnet
+        self.private_ips            = {}    # subnet_id -> set of IP addresses
+        self.images                 = {}    # compartment_id -> display_name -> image OCID
+        self.availability_domains   = []
+        self.instance_names         = set()
+
+    def populate_launch_resources(self):
+
+        if len(self.availability_domains) != 0:
+            return None
+
+        virtual_cloud_networks = GetVirtualCloudNetworks(
+            self.network_client,
+            self.compartment_id,
+            None)
+        virtual_cloud_networks.populate_virtual_cloud_networks()
+        for vcn in virtual_cloud_networks.return_all_virtual_networks():
+            self.virtual_cloud_networks[vcn.display_name] = vcn
+
+        self.availability_domains = get_availability_domains(
+            self.identity_client,
+            self.compartment_id)
+
+        instances = GetInstance(
+            self.compute_client,
+            self.compartment_id,
+            None)
+        instances.populate_instances()
+        for instance in instances.instance_list:
+            self.instance_names.add(instance.display_name)
+
+    def return_virtual_cloud_network(self, vcn_name):
+
+        return self.virtual_cloud_networks.get(vcn_name)
+
+    def return_subnet(self, vcn_id, subnet_name):
+
+        if vcn_id not in self.subnets:
+            subnets = GetSubnet(
+                self.network_client,
+                self.compartment_id,
+                vcn_id,
+                None)
+            subnets.populate_subnets()
+            self.subnets[vcn_id] = {}
+            for subnet in subnets.subnets:
+                self.subnets[vcn_id][subnet.display_name] = subnet
+
+        return self.subnets[vcn_id].get(subnet_name)
+
+    def return_private_ips(self, subnet_id):
+
+        if subnet_id not in self.private_ips:
+            private_ips = GetPrivateIP(
+                self.network_client,
+                subnet_id)
+            private_ips.populate_ip_addresses()
+            self.private_ips[subnet_id] = set(ip.ip_address for ip in private_ips.ip_addresses)
+
+        return self.private_ips[subnet_id]
+
+    def is_dup_ip(self, subnet_id, ip_address):
+
+        return ip_address in self.return_private_ips(subnet_id)
+
+    def reserve_ip(self, subnet_id, ip_address):
+
+        self.return_private_ips(subnet_id).add(ip_address)
+
+    def return_image_id(self, image_compartment_id, image_name):
+
+        if image_compartment_id not in self.images:
+            images = GetImages(
+                self.compute_client,
+                image_compartment_id)
+            # populate_image_list() only lists images in an AVAILABLE state
+            images.populate_image_list()
+            self.images[image_compartment_id] = {}
+            for image in images.image_list:
+                self.images[image_compartment_id][image[0]] = image[1]
+
+        return self.images[image_compartment_id].get(image_name)
+
+    def return_availability_domain(self, ad_number):
+
+        if ad_number is not None and ad_number > 0 and ad_number <= len(self.availability_domains):
+            return self.availability_domains[ad_number - 1].name
+        return None
+
+    def check_for_vm(self, vm_name):
+
+        return vm_name in self.instance_names
+
+    def __str__(self):
+        return "Class setup to resolve VM launch resources in compartment id " + self.compartment_id
+
+# end class GetVmLaunchResources
+
 class GetShapes:
     
     def __init__(
@@ -518,9 +704,10 @@ class GetShapes:
         if len(self.shapes) != 0:
             return None
         else:
-            results = self.compute_client.list_shapes(
+            results = list_all_results(
+                self.compute_client.list_shapes,
                 compartment_id = self.compartment_id
-            ).data
+            )
             
             self.shapes = results
             
@@ -560,10 +747,11 @@ def get_block_vol_attachments(
     
     block_volumes = []
     
-    results = compute_client.list_volume_attachments(
+    results = list_all_results(
+        compute_client.list_volume_attachments,
         availability_domain = availability_domain_name,
         compartment_id = compartment_id,
-        instance_id = instance_id).data
+        instance_id = instance_id)
     
     for block_volume in results:
         if block_volume.lifecycle_state != "DETACHED" and block_volume.lifecycle_state != "DETACHING":
@@ -594,10 +782,11 @@ def get_boot_vol_attachments(
     
     boot_volumes = []
     
-    results = compute_client.list_boot_volume_attachments(
+    results = list_all_results(
+        compute_client.list_boot_volume_attachments,
         availability_domain = availability_domain_name,
         compartment_id = compartment_id,
-        instance_id = instance_id).data
+        instance_id = instance_id)
     
     for boot_volume in results:
         if boot_volume.lifecycle_state != "TERMINATED" and boot_volume.lifecycle_state != "TERMINATING":
@@ -678,19 +867,18 @@ def check_for_vm(
     compartment_id,
     vm_name):
     '''
-    Function returns boolean True if the vm instance is found, otherwise it returns false
+    Function returns boolean True if the vm instance is found, otherwise it returns false.
+    The display name is filtered by the REST service, so only matching instances are fetched.
     '''
-    vm_instances = GetInstance(
-        compute_client,
-        compartment_id,
-        vm_name
+    results = list_all_results(
+        compute_client.list_instances,
+        compartment_id = compartment_id,
+        display_name = vm_name
     )
-    vm_instances.populate_instances()
-    vm_instance = vm_instances.return_instance()
-    if vm_instance is not None:
-        return True
-    else:
-        return False
+    for instance in results:
+        if instance.lifecycle_state not in ["TERMINATED", "TERMINATING"]:
+            return True
+    return False
 
 # end function check_for_vm()
 
@@ -827,6 +1015,172 @@ def launch_instance(
 
 # end function launch_Linux_instance
 
+def submit_vm_launches(
+    vm_instances,
+    max_workers = DEFAULT_MAX_WORKERS):
+    '''
+    This function submits the launch request of each LaunchVmInstance object within
+    vm_instances, using up to max_workers concurrent requests. The build_* methods of each
+    object must have been called first. It returns a list of dicts in the same order as
+    vm_instances, as in:
+
+        {
+            "instance_name" : "MYVM01",
+            "instance"      : <Instance object, or None if the request failed>,
+            "error"         : <the exception raised by the request, or None>
+        }
+
+    A failed request does not stop the remaining launches. Your code must check each error.
+    '''
+
+    def submit_launch(vm_instance):
+        launch_result = {
+            "instance_name" : vm_instance.host_details["instance_name"],
+            "instance"      : None,
+            "error"         : None
+        }
+        try:
+            launch_result["instance"] = vm_instance.submit_launch_instance()
+        except Exception as error:
+            launch_result["error"] = error
+        return launch_result
+
+    return run_in_parallel(submit_launch, vm_instances, max_workers = max_workers)
+
+# end function submit_vm_launches()
+
+def submit_instance_actions(
+    compute_client,
+    instances,
+    action,
+    max_workers = DEFAULT_MAX_WORKERS):
+    '''
+    This function submits the power action, such as START, STOP or SOFTSTOP, against each VM
+    instance within instances, using up to max_workers concurrent requests. It does not wait
+    for the instances to change state, see wait_for_instance_states(). It returns a list of
+    dicts in the same order as instances, as in:
+
+        {
+            "instance_name" : "MYVM01",
+            "instance"      : <Instance object returned by the request, or None if it failed>,
+            "submitted"     : <time.monotonic() when the request returned>,
+            "error"         : <the exception raised by the request, or None>
+        }
+
+    A failed request does not stop the remaining requests. Your code must check each error.
+    '''
+
+    def submit_action(instance):
+        action_result = {
+            "instance_name" : instance.display_name,
+            "instance"      : None,
+            "submitted"     : None,
+            "error"         : None
+        }
+        try:
+            action_result["instance"] = call_with_rate_limit(
+                compute_client.instance_action,
+                instance_id = instance.id,
+                action = action).data
+        except Exception as error:
+            action_result["error"] = error
+        action_result["submitted"] = time.monotonic()
+        return action_result
+
+    return run_in_parallel(submit_action, instances, max_workers = max_workers)
+
+# end function submit_instance_actions()
+
+def select_instances(
+    instances,
+    name_pattern = None,
+    tag = None,
+    instance_names = None):
+    '''
+    This function returns the VM instances within instances that match every selection passed
+    to it. name_pattern is a shell style glob matched against the display name, such as
+    "dev-*". tag is either a freeform tag as key=value, or a defined tag as
+    namespace.key=value. instance_names is a list of display names. A selection left as None
+    matches every instance.
+    '''
+
+    if tag is not None:
+        if "=" not in tag:
+            raise RuntimeWarning("WARNING! Tag " + tag + " must be passed as key=value or namespace.key=value")
+        tag_key, tag_value = tag.split("=", 1)
+
+    if instance_names is not None:
+        instance_names = set(instance_names)
+
+    selected_instances = []
+    for instance in instances:
+        if name_pattern is not None and not fnmatch.fnmatchcase(instance.display_name, name_pattern):
+            continue
+        if instance_names is not None and instance.display_name not in instance_names:
+            continue
+        if tag is not None:
+            freeform_tags = instance.freeform_tags or {}
+            defined_tags = instance.defined_tags or {}
+            tag_found = freeform_tags.get(tag_key) == tag_value
+            if not tag_found and "." in tag_key:
+                tag_namespace, defined_tag_key = tag_key.split(".", 1)
+                tag_found = str(defined_tags.get(tag_namespace, {}).get(defined_tag_key)) == tag_value
+            if not tag_found:
+                continue
+        selected_instances.append(instance)
+
+    return selected_instances
+
+# end function select_instances()
+
+def wait_for_instance_states(
+    compute_client,
+    instance_ids,
+    wait_for_states,
+    failed_states = ["TERMINATING", "TERMINATED"],
+    poll_interval_in_seconds = None,
+    max_wait_time_in_seconds = 3600,
+    compartment_id = None,
+    callback = None):
+    '''
+    This function polls all of the VM instances within instance_ids together until each one
+    has reached a state within wait_for_states or failed_states, or until
+    max_wait_time_in_seconds has passed. It returns a dict keyed on the instance OCID that
+    holds the last instance object fetched for each instance. Your code must check the
+    lifecycle_state of each one, since instances that timed out are returned in whatever
+    state they were last seen in.
+
+    If every instance lives within compartment_id, pass it to poll the whole batch with one
+    paged list call per round rather than one get call per instance. If callback is passed,
+    it is called with the instance object as soon as each instance reaches a final state.
+    The instances are polled by a lib.waiters.ResourceWaiter at the interval set for
+    instances unless poll_interval_in_seconds is passed.
+    '''
+
+    def list_instances():
+        return list_all_results(
+            compute_client.list_instances,
+            compartment_id = compartment_id)
+
+    list_function = list_instances if compartment_id is not None else None
+
+    waiter = ResourceWaiter()
+    for instance_id in instance_ids:
+        waiter.add(
+            instance_id,
+            "instance",
+            compute_client.get_instance,
+            wait_for_states,
+            failed_states = failed_states,
+            callback = callback,
+            list_function = list_function,
+            poll_interval_in_seconds = poll_interval_in_seconds
+        )
+
+    return waiter.wait(max_wait_time_in_seconds = max_wait_time_in_seconds)
+
+# end function wait_for_instance_states()
+
 def launch_instance_from_boot_volume(
     compute_composite_client,
     LaunchInstanceDetails,
@@ -841,8 +1195,17 @@ def launch_instance_from_boot_volume(
     private_ip,
     subnet_id,
     shape_config,
-    boot_volume_id
+    boot_volume_id,
+    waiter = None,
+    callback = None
     ):
+    '''
+    This function launches a VM instance from an existing boot volume and waits for it to
+    start. It returns the launch response with the instance in its final state. Pass a
+    lib.waiters.ResourceWaiter as waiter to return the response as soon as the launch is
+    accepted, leaving the waiter to poll the instance. callback, if passed, is called
+    with the instance once it has started or failed.
+    '''
 
     launch_instance_details = LaunchInstanceDetails(
         availability_domain = availability_domain,
@@ -870,10 +1233,21 @@ def launch_instance_from_boot_volume(
 
     # return launch_instance_details
 
-    launch_instance_from_boot_volume_response = compute_composite_client.launch_instance_and_wait_for_state(
-        launch_instance_details = launch_instance_details,
-        wait_for_states = ["RUNNING", "UNKNOWN_ENUM_VALUE", "TERMINATING", "TERMINATED"]
+    launch_instance_from_boot_volume_response = call_with_rate_limit(
+        compute_composite_client.client.launch_instance,
+        launch_instance_details = launch_instance_details
     )
+    instance = register_or_wait(
+        waiter,
+        launch_instance_from_boot_volume_response.data.id,
+        "instance",
+        compute_composite_client.client.get_instance,
+        ["RUNNING", "UNKNOWN_ENUM_VALUE", "TERMINATING", "TERMINATED"],
+        callback = callback
+    )
+    # the response is returned as before, holding the instance in its final state
+    if instance is not None:
+        launch_instance_from_boot_volume_response.data = instance
 
     return launch_instance_from_boot_volume_response
 
@@ -906,15 +1280,42 @@ def reboot_instance(
     '''
 
     This function ungracefully shuts down a VM instance OS and then reboots the instance.
-    The function will wait until the instance is in a RUNNINGF state and then returns
-    the results to the calling code. Your code must handle any runtime errors or
-    unexpected results.
+    The instance is still RUNNING when the reset is sent, so the function first waits for
+    it to leave RUNNING and then waits for it to come back to RUNNING, and returns the
+    instance in that state. RuntimeError is raised if the instance is never seen to leave
+    RUNNING within RESET_START_SECONDS, or does not return to RUNNING. Your code must
+    handle any runtime errors or unexpected results.
 
     '''
-    results = compute_composite_client.instance_action_and_wait_for_state(
-        instance_id = instance_id,
-        action = "RESET",
-        wait_for_states = ["RUNNING", "STARTING", "STOPPED", "UNKNOWN_ENUM_VALUE"]).data
+    compute_client = compute_composite_client.client
+    call_with_rate_limit(
+        compute_client.instance_action,
+        instance_id,
+        "RESET"
+    )
+
+    # the reset is short, so poll often enough to see the instance leave RUNNING
+    waiter = ResourceWaiter()
+    waiter.add(
+        instance_id,
+        "instance",
+        compute_client.get_instance,
+        ["STOPPING", "STOPPED", "STARTING", "TERMINATING", "TERMINATED"],
+        poll_interval_in_seconds = RESET_POLL_SECONDS
+    )
+    instance = waiter.wait(max_wait_time_in_seconds = RESET_START_SECONDS).get(instance_id)
+    if len(waiter.return_pending_ids()) != 0:
+        raise RuntimeError("EXCEPTION! VM instance " + instance_id + " did not leave the RUNNING state after the reset")
+    if instance.lifecycle_state in ["TERMINATING", "TERMINATED"]:
+        return instance
+
+    results = wait_for_resource(
+        instance_id,
+        "instance",
+        compute_client.get_instance,
+        ["RUNNING"],
+        failed_states = ["TERMINATING", "TERMINATED", "UNKNOWN_ENUM_VALUE"]
+    )
     return results
 
 # end function reboot_instance()
@@ -0,0 +1,163 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module holds the tools the KENT codebase uses to run REST calls concurrently.
+run_in_parallel() fans a function out over a bounded thread pool, and iterate_in_parallel()
+does the same while yielding each result as soon as it is ready. EndpointLimits caps
+the number of calls that may be in flight against any one OCI API endpoint, so a wide
+thread pool does not trip the per-API throttles of the REST service. Calls made through
+EndpointLimits.limit() are also paced by lib/ratelimit.py.
+'''
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import threading
+from lib.ratelimit import rate_limited
+
+
+DEFAULT_MAX_WORKERS         = 8     # size of the thread pool used by run_in_parallel()
+DEFAULT_ENDPOINT_LIMIT      = 4     # calls in flight per endpoint unless set in EndpointLimits
+
+
+class EndpointLimits:
+    '''
+    This class caps the number of concurrent calls against each OCI API endpoint. The
+    endpoint is keyed on the name of the SDK method, such as "list_volume_backups" or
+    "get_boot_volume". Pass a dict of endpoint names and limits when instiating the class
+    to override default_limit for specific endpoints, as in:
+
+        endpoint_limits = EndpointLimits(
+            default_limit = 4,
+            limits = {"list_volume_backups" : 2}
+        )
+
+    Call limit() and pass to it the SDK method to get back a function that waits for a free
+    slot before calling the method. The returned function may be passed to
+    lib.pagination.list_all_results() as the list method, as in:
+
+        backups = list_all_results(
+            endpoint_limits.limit(storage_client.list_volume_backups),
+            compartment_id = compartment_id
+        )
+
+    Use slot() as a context manager when the call is made from within a KENT function that
+    takes the client rather than the method, as in:
+
+        with endpoint_limits.slot("list_boot_volume_attachments"):
+            bootvol_attachments = get_boot_vol_attachments(...)
+
+    One instance of this class must be shared by all threads for the limits to hold.
+    '''
+
+    def __init__(
+        self,
+        default_limit = DEFAULT_ENDPOINT_LIMIT,
+        limits = None):
+
+        self.default_limit  = default_limit
+        self.limits         = {}
+        if limits is not None:
+            self.limits.update(limits)
+        self.semaphores     = {}
+        self.lock           = threading.Lock()
+
+    def return_semaphore(self, endpoint_name):
+
+        with self.lock:
+            if endpoint_name not in self.semaphores:
+                self.semaphores[endpoint_name] = threading.BoundedSemaphore(
+                    self.limits.get(endpoint_name, self.default_limit)
+                )
+            return self.semaphores[endpoint_name]
+
+    @contextmanager
+    def slot(self, endpoint_name):
+
+        semaphore = self.return_semaphore(endpoint_name)
+        with semaphore:
+            yield
+
+    def limit(self, method):
+
+        endpoint_name = getattr(method, "__name__", str(method))
+        paced_method = rate_limited(method)
+
+        def limited_method(*args, **kwargs):
+            with self.slot(endpoint_name):
+                return paced_method(*args, **kwargs)
+
+        limited_method.__name__ = endpoint_name
+        limited_method.rate_limited = True
+        return limited_method
+
+    def __str__(self):
+        return "Class setup to limit concurrent calls to " + str(self.default_limit) + " per endpoint"
+
+# end class EndpointLimits
+
+def run_in_parallel(
+    function,
+    work_items,
+    max_workers = DEFAULT_MAX_WORKERS):
+    '''
+    This function calls function once for each item in work_items using a thread pool of
+    at most max_workers threads, and returns a list of the results in the same order as
+    work_items. Each item is passed to function as its only argument. If any call raises an
+    exception, the exception is raised to your code once the running calls have finished.
+
+    A value of 1 or None for max_workers runs the work serially on the calling thread,
+    which is useful when debugging.
+    '''
+
+    work_items = list(work_items)
+    if max_workers is None or max_workers <= 1 or len(work_items) <= 1:
+        return [function(item) for item in work_items]
+
+    with ThreadPoolExecutor(max_workers = min(max_workers, len(work_items))) as executor:
+        results = list(executor.map(function, work_items))
+
+    return results
+
+# end function run_in_parallel()
+
+def iterate_in_parallel(
+    function,
+    work_items,
+    max_workers = DEFAULT_MAX_WORKERS):
+    '''
+    This generator works the same as run_in_parallel() except that it yields each result,
+    in the same order as work_items, as soon as it is ready rather than returning a list once
+    every call has finished. No more than twice max_workers calls are submitted ahead of the
+    result being yielded, so neither work_items nor the results are ever held in memory all
+    at once. work_items may itself be a generator.
+    '''
+
+    if max_workers is None or max_workers <= 1:
+        for item in work_items:
+            yield function(item)
+        return
+
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+        pending = deque()
+        for item in work_items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= max_workers * 2:
+                yield pending.popleft().result()
+        while len(pending) != 0:
+            yield pending.popleft().result()
+
+# end function iterate_in_parallel()
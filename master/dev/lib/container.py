@@ -26,6 +26,7 @@ from oci.container_engine.models import KubernetesNetworkConfig
 from oci.container_engine.models import NodePoolNodeConfigDetails
 from oci.container_engine.models import NodePoolPlacementConfigDetails
 from oci.container_engine.models import NodeSourceViaImageDetails
+from lib.pagination import list_all_results
 
 class GetCluster:
     
@@ -44,9 +45,10 @@ class GetCluster:
         if len(self.clusters) != 0:
             return None
         else:
-            results = self.container_client.list_clusters(
+            results = list_all_results(
+                self.container_client.list_clusters,
                 compartment_id = self.compartment_id
-            ).data
+            )
             for cluster in results:
                 if cluster.lifecycle_state != "DELETED":
                     if cluster.lifecycle_state != "DELETING":
@@ -81,10 +83,11 @@ def get_node_pool(
     this in a class. Since the API will bind its response to cluster_id,
     we choose the simplicity of this fuction instead.
     '''
-    results = container_client.list_node_pools(
+    results = list_all_results(
+        container_client.list_node_pools,
         compartment_id = compartment_id,
         cluster_id = cluster_id
-    ).data
+    )
     
     return results
 
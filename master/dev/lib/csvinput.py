@@ -0,0 +1,161 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module reads the CSV input files of the KENT import programs with the csv module of the
+standard library. Importing pandas costs up to a second each time a program starts, and
+read_csv() holds the whole file in memory, so the import programs read their files through
+iterate_csv_records() instead, which yields one record at a time, as in:
+
+    for line_number, vm_record in iterate_csv_records("windows_vms.csv", converters = {8 : int}):
+        print(line_number, vm_record[0], vm_record[8])
+
+The delimiter is found by return_csv_delimiter(), which parses a sample of the file with each
+delimiter in CSV_DELIMITERS and picks the one that splits the header and the records that follow
+it into the same number of fields. This replaces detect() from the detect_delimiter module,
+which only looked at the first line.
+
+Programs that still want a pandas dataframe may call read_csv_dataframe(). pandas is only
+imported when that function is called.
+'''
+
+import csv
+import io
+
+
+CSV_DELIMITERS      = [";", ",", "\t", "|"]     # in order of preference when the sample is a tie
+CSV_ENCODING        = "utf-8-sig"               # reads files with or without a byte order mark
+SAMPLE_LINES        = 50                        # lines read by return_csv_delimiter()
+
+
+def return_csv_delimiter(
+    import_file,
+    delimiters = None):
+    '''
+    This function returns the delimiter of import_file. Each of delimiters, CSV_DELIMITERS by
+    default, is scored by how many of the first SAMPLE_LINES records split into as many fields
+    as the header. Quoted fields are parsed as the csv module parses them, so a comma within
+    a quoted description does not count. The delimiter with the highest score wins, and the
+    one that gives the header the most fields breaks a tie. A header that no delimiter splits
+    is read as a single column file, and "," is returned.
+    '''
+
+    delimiters = delimiters or CSV_DELIMITERS
+    sample_lines = []
+    with open(import_file, newline = "", encoding = CSV_ENCODING) as csv_file:
+        for csv_line in csv_file:
+            if csv_line.strip() == "":
+                continue
+            sample_lines.append(csv_line)
+            if len(sample_lines) == SAMPLE_LINES:
+                break
+    sample = "".join(sample_lines)
+
+    best_delimiter  = ","
+    best_score      = None
+    for delimiter in delimiters:
+        rows = list(csv.reader(io.StringIO(sample), delimiter = delimiter))
+        if len(rows) == 0 or len(rows[0]) < 2:
+            continue
+        field_count = len(rows[0])
+        matching_rows = 0
+        for row in rows[1:]:
+            if len(row) == field_count:
+                matching_rows += 1
+        score = (matching_rows, field_count)
+        if best_score is None or score > best_score:
+            best_delimiter  = delimiter
+            best_score      = score
+
+    return best_delimiter
+
+# end function return_csv_delimiter()
+
+def iterate_csv_records(
+    import_file,
+    delimiter = None,
+    converters = None):
+    '''
+    This function yields a (line number, record) tuple for each record of import_file after
+    the header. Each record is a list with one value for each column of the header. Values
+    are stripped strings, and a blank value or a missing trailing column is None, the same
+    as pandas reading a blank as nan. Blank lines are skipped, as pandas does.
+
+    converters is an optional dict of column numbers and functions, such as {8 : int}, that
+    are applied to the values of that column that are not None. The delimiter is found with
+    return_csv_delimiter() unless passed. RuntimeWarning is raised, with the line number, for
+    a record that has more fields than the header or a value that a converter rejects.
+
+    Only the current record is held in memory, so the file may be of any size.
+    '''
+
+    delimiter = delimiter or return_csv_delimiter(import_file)
+    converters = converters or {}
+    with open(import_file, newline = "", encoding = CSV_ENCODING) as csv_file:
+        csv_reader = csv.reader(csv_file, delimiter = delimiter)
+        header = next(csv_reader, None)
+        if header is None:
+            return
+        field_count = len(header)
+        for row in csv_reader:
+            line_number = csv_reader.line_num
+            if len(row) == 0 or (len(row) == 1 and row[0].strip() == ""):
+                continue
+            if len(row) > field_count:
+                raise RuntimeWarning("WARNING! Line {} of {} has {} fields, the header has {}".format(
+                    line_number,
+                    import_file,
+                    len(row),
+                    field_count
+                ))
+            csv_record = []
+            for value in row:
+                value = value.strip()
+                csv_record.append(value if value != "" else None)
+            csv_record.extend([None] * (field_count - len(csv_record)))
+            for column, converter in converters.items():
+                if csv_record[column] is None:
+                    continue
+                try:
+                    csv_record[column] = converter(csv_record[column])
+                except ValueError:
+                    raise RuntimeWarning("WARNING! Line {} of {} has an invalid value {} in column {}".format(
+                        line_number,
+                        import_file,
+                        csv_record[column],
+                        column + 1
+                    ))
+            yield line_number, csv_record
+
+# end function iterate_csv_records()
+
+def read_csv_dataframe(
+    import_file,
+    delimiter = None):
+    '''
+    This function returns import_file as a pandas dataframe, using the delimiter found by
+    return_csv_delimiter() unless one is passed. pandas is imported here rather than at the
+    top of the module so that programs that only call iterate_csv_records() never load it.
+    '''
+
+    import pandas as pd
+
+    return pd.read_csv(
+        import_file,
+        sep = delimiter or return_csv_delimiter(import_file),
+        encoding = CSV_ENCODING
+    )
+
+# end function read_csv_dataframe()
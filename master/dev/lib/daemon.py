@@ -0,0 +1,470 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module is the resident KENT daemon. Each Oci-*.py program is a new Python process
+that must import the OCI SDK, pandas, tabulate and the KENT libraries before doing any
+work, which takes longer than most of the programs spend talking to OCI. The daemon
+imports all of this once, then listens on a Unix socket. Each program calls
+forward_to_daemon() before its own imports. If a daemon is running, the program hands its
+command line, working directory, environment and terminal to the daemon and waits for the
+exit status. The daemon forks a child that already has every module loaded, and the child
+runs the program as __main__ with the terminal of the caller. The child inherits a copy
+of the daemon, so no state leaks from one program to the next.
+
+Start the daemon with Oci-Daemon.py, as in:
+
+    ./Oci-Daemon.py start &
+
+The socket is kept at ~/.oci/kent_daemon.sock unless KENT_DAEMON_SOCKET supplies another
+path. The socket is only accessible to the owner. Programs run on their own, as before,
+when no daemon is running, or when KENT_DAEMON is set to 0, false or no.
+
+The daemon only runs programs located in the same directory as the code it has loaded,
+since those programs must match the libraries within the daemon. Restart the daemon after
+updating the codebase. The daemon requires Python 3.9 or later, and an OS that supports
+passing file descriptors over Unix sockets, such as Linux or macOS.
+
+Only the Python standard library is imported at module level, so that forward_to_daemon()
+adds nothing to the start up time of a program.
+'''
+
+import importlib
+import json
+import os
+import runpy
+import signal
+import socket
+import struct
+import sys
+import time
+import traceback
+
+
+DAEMON_ENV_VAR          = "KENT_DAEMON"
+SOCKET_ENV_VAR          = "KENT_DAEMON_SOCKET"
+DEFAULT_SOCKET_FILE     = os.path.join(os.path.expanduser("~"), ".oci", "kent_daemon.sock")
+CODEBASE_DIR            = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEADER_FORMAT           = "!I"      # length of each message, sent before the JSON body
+HEADER_SIZE             = struct.calcsize(HEADER_FORMAT)
+LISTEN_BACKLOG          = 64
+
+# packages imported by the daemon before it accepts programs, along with every module within
+# lib, see return_preload_modules(). Missing modules are skipped.
+PRELOAD_PACKAGES = [
+    "oci",
+    "pandas",
+    "tabulate"
+]
+
+# True within a child of the daemon, so that the program it runs does not forward again
+in_daemon = False
+
+
+def daemon_enabled():
+
+    return os.environ.get(DAEMON_ENV_VAR, "").lower() not in ["0", "false", "no"]
+
+# end function daemon_enabled()
+
+def return_socket_file():
+
+    return os.environ.get(SOCKET_ENV_VAR, DEFAULT_SOCKET_FILE)
+
+# end function return_socket_file()
+
+def send_message(
+    connection,
+    message,
+    fds = None):
+    '''
+    Messages are JSON dicts preceded by their length. File descriptors, if any, travel with
+    the first byte of the message.
+    '''
+
+    body = json.dumps(message).encode("utf-8")
+    data = struct.pack(HEADER_FORMAT, len(body)) + body
+    if fds:
+        sent = socket.send_fds(connection, [data], fds)
+        data = data[sent:]
+    if len(data) != 0:
+        connection.sendall(data)
+
+# end function send_message()
+
+def receive_message(
+    connection,
+    max_fds = 0):
+    '''
+    This function returns a tuple of the next message and the list of file descriptors
+    received with it. The message is None if the other end closed the connection.
+    '''
+
+    fds = []
+    if max_fds > 0:
+        data, fds, flags, address = socket.recv_fds(connection, 65536, max_fds)
+    else:
+        data = connection.recv(65536)
+    if len(data) == 0:
+        return None, fds
+
+    while len(data) < HEADER_SIZE:
+        chunk = connection.recv(65536)
+        if len(chunk) == 0:
+            return None, fds
+        data += chunk
+    message_size = struct.unpack(HEADER_FORMAT, data[:HEADER_SIZE])[0]
+    while len(data) < HEADER_SIZE + message_size:
+        chunk = connection.recv(65536)
+        if len(chunk) == 0:
+            return None, fds
+        data += chunk
+
+    return json.loads(data[HEADER_SIZE:HEADER_SIZE + message_size].decode("utf-8")), fds
+
+# end function receive_message()
+
+def connect_to_daemon():
+    '''
+    This function returns a socket connected to the daemon, or None if no daemon is running.
+    '''
+
+    socket_file = return_socket_file()
+    if not os.path.exists(socket_file):
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_file)
+    except OSError:
+        connection.close()
+        return None
+
+    return connection
+
+# end function connect_to_daemon()
+
+def forward_to_daemon(script_file):
+    '''
+    Call this function at the top of a program, before importing the OCI SDK, as in:
+
+        from lib.daemon import forward_to_daemon
+        forward_to_daemon(__file__)
+
+    If a daemon is running, the program is run by the daemon and this function exits with
+    the exit status of the program. Otherwise it returns None and the program continues
+    on its own.
+    '''
+
+    if in_daemon or not daemon_enabled() or not hasattr(socket, "send_fds"):
+        return None
+
+    connection = connect_to_daemon()
+    if connection is None:
+        return None
+
+    try:
+        send_message(
+            connection,
+            {
+                "command"   : "run",
+                "script"    : os.path.abspath(script_file),
+                "argv"      : sys.argv,
+                "cwd"       : os.getcwd(),
+                "environ"   : dict(os.environ)
+            },
+            [sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno()]
+        )
+        reply, fds = receive_message(connection)
+    except (OSError, ValueError, AttributeError):
+        # AttributeError is raised when the program has no stdin, stdout or stderr
+        connection.close()
+        return None
+
+    # the daemon has refused the program, so run it here instead
+    if reply is None or "pid" not in reply:
+        connection.close()
+        return None
+
+    # from here on the program is running within the daemon and must not be run again
+    child_pid = reply["pid"]
+    exit_status = 1
+    while True:
+        try:
+            reply, fds = receive_message(connection)
+        except KeyboardInterrupt:
+            # the terminal only signals this process, so pass CTRL-C along to the program
+            try:
+                os.kill(child_pid, signal.SIGINT)
+            except OSError:
+                break
+            continue
+        except OSError:
+            break
+        if reply is not None and "exit_status" in reply:
+            exit_status = reply["exit_status"]
+        break
+
+    connection.close()
+    sys.exit(exit_status)
+
+# end function forward_to_daemon()
+
+def return_preload_modules():
+    '''
+    This function returns PRELOAD_PACKAGES followed by the name of every module within the
+    lib directory of the codebase, so that a module added to lib is preloaded without being
+    listed here. Files whose names are not valid module names are left out.
+    '''
+
+    lib_modules = []
+    for file_name in sorted(os.listdir(os.path.join(CODEBASE_DIR, "lib"))):
+        module_name, extension = os.path.splitext(file_name)
+        if extension == ".py" and module_name.isidentifier() and module_name != "__init__":
+            lib_modules.append("lib." + module_name)
+    return PRELOAD_PACKAGES + lib_modules
+
+# end function return_preload_modules()
+
+def preload_modules():
+    '''
+    This function imports the modules returned by return_preload_modules() and returns the
+    list of modules that could not be imported. A lib module that fails for any reason is
+    skipped rather than stopping the daemon, and the programs that need it import it
+    themselves as they would without the daemon.
+    '''
+
+    if CODEBASE_DIR not in sys.path:
+        sys.path.insert(0, CODEBASE_DIR)
+
+    missing_modules = []
+    for module_name in return_preload_modules():
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            missing_modules.append(module_name)
+
+    return missing_modules
+
+# end function preload_modules()
+
+def return_exit_status(code):
+    '''
+    This function converts the code of SystemExit into an exit status the same way the
+    Python interpreter does.
+    '''
+
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file = sys.stderr)
+    return 1
+
+# end function return_exit_status()
+
+def run_program(
+    connection,
+    request,
+    fds):
+    '''
+    This function runs within the forked child of the daemon. It takes over the terminal
+    of the caller, runs the program as __main__ and reports its exit status.
+    '''
+
+    global in_daemon
+    in_daemon = True
+
+    for target_fd, fd in enumerate(fds):
+        os.dup2(fd, target_fd)
+        os.close(fd)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    # rebuild the standard streams so buffering matches the terminal of the caller
+    sys.stdin = open(0, "r", closefd = False)
+    sys.stdout = open(1, "w", buffering = 1 if os.isatty(1) else -1, closefd = False)
+    sys.stderr = open(2, "w", buffering = 1, closefd = False)
+
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["environ"])
+    sys.argv = list(request["argv"])
+    sys.path[0] = os.path.dirname(request["script"])
+
+    from lib.cache import strip_no_cache_option
+    strip_no_cache_option(sys.argv)
+
+    exit_status = 0
+    try:
+        runpy.run_path(request["script"], run_name = "__main__")
+    except SystemExit as e:
+        exit_status = return_exit_status(e.code)
+    except KeyboardInterrupt:
+        traceback.print_exc()
+        exit_status = 130
+    except BaseException:
+        traceback.print_exc()
+        exit_status = 1
+
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except OSError:
+        pass
+    try:
+        send_message(connection, {"exit_status" : exit_status})
+    except OSError:
+        pass
+    os._exit(0)
+
+# end function run_program()
+
+def validate_script(script):
+    '''
+    This function returns None if the daemon may run script, otherwise it returns the reason
+    the script has been refused.
+    '''
+
+    if os.path.dirname(script) != CODEBASE_DIR:
+        return "script is not within " + CODEBASE_DIR
+    if not os.path.basename(script).startswith("Oci-") or not script.endswith(".py"):
+        return "only Oci-*.py programs may be run by the daemon"
+    if not os.path.isfile(script):
+        return "script not found"
+
+    return None
+
+# end function validate_script()
+
+def serve(socket_file = None):
+    '''
+    This function runs the daemon until it is sent a stop request. It raises RuntimeWarning
+    if another daemon is already listening on socket_file.
+    '''
+
+    if socket_file is None:
+        socket_file = return_socket_file()
+
+    existing_connection = connect_to_daemon()
+    if existing_connection is not None:
+        existing_connection.close()
+        raise RuntimeWarning("WARNING! A KENT daemon is already listening on " + socket_file)
+    if os.path.exists(socket_file):
+        os.remove(socket_file)
+
+    missing_modules = preload_modules()
+    if len(missing_modules) != 0:
+        print("The following modules could not be preloaded: {}".format(", ".join(missing_modules)))
+
+    socket_dir = os.path.dirname(socket_file)
+    if socket_dir != "" and not os.path.exists(socket_dir):
+        os.makedirs(socket_dir, mode = 0o700, exist_ok = True)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(socket_file)
+    finally:
+        os.umask(old_umask)
+    listener.listen(LISTEN_BACKLOG)
+
+    # children are not waited on, they report their exit status to the caller directly
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    started = time.time()
+    programs_run = 0
+    print("KENT daemon listening on {} with pid {}".format(socket_file, os.getpid()))
+
+    try:
+        while True:
+            connection, address = listener.accept()
+            fds = []
+            try:
+                request, fds = receive_message(connection, max_fds = 3)
+                if request is None:
+                    continue
+
+                if request.get("command") == "stop":
+                    send_message(connection, {"stopped" : True})
+                    break
+
+                if request.get("command") == "status":
+                    send_message(
+                        connection,
+                        {
+                            "pid"           : os.getpid(),
+                            "socket"        : socket_file,
+                            "started"       : started,
+                            "programs_run"  : programs_run,
+                            "codebase"      : CODEBASE_DIR
+                        }
+                    )
+                    continue
+
+                refused_reason = validate_script(request.get("script", ""))
+                if request.get("command") != "run" or len(fds) != 3:
+                    refused_reason = "malformed request"
+                if refused_reason is not None:
+                    send_message(connection, {"refused" : refused_reason})
+                    continue
+
+                child_pid = os.fork()
+                if child_pid == 0:
+                    # the child must never return into this loop
+                    try:
+                        listener.close()
+                        send_message(connection, {"pid" : os.getpid()})
+                        run_program(connection, request, fds)
+                    finally:
+                        os._exit(1)
+                programs_run += 1
+
+            except (OSError, ValueError) as e:
+                print("WARNING! Request failed: {}".format(e), file = sys.stderr)
+            finally:
+                for fd in fds:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+                connection.close()
+    finally:
+        listener.close()
+        if os.path.exists(socket_file):
+            os.remove(socket_file)
+
+# end function serve()
+
+def send_daemon_command(command):
+    '''
+    This function sends a stop or status command to the daemon and returns its reply, or
+    None if no daemon is running.
+    '''
+
+    connection = connect_to_daemon()
+    if connection is None:
+        return None
+
+    try:
+        send_message(connection, {"command" : command})
+        reply, fds = receive_message(connection)
+    finally:
+        connection.close()
+
+    return reply
+
+# end function send_daemon_command()
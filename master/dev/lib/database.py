@@ -20,6 +20,7 @@ from oci.database.models import CreateDatabaseDetails
 from oci.database.models import CreateDbHomeDetails
 from oci.database.models import DbSystemOptions
 from oci.database.models import LaunchDbSystemDetails
+from lib.pagination import list_all_results
 
 
 class GetDatabase:
@@ -44,10 +45,11 @@ class GetDatabase:
         if len(self.databases) != 0:
             return None
         else:
-            results = self.database_client.list_databases(
+            results = list_all_results(
+                self.database_client.list_databases,
                 compartment_id = self.compartment_id,
                 db_home_id = self.db_home_id
-            ).data
+            )
             for db in results:
                 if db.lifecycle_state != "TERMINATED" and db.lifecycle_state != "TERMINATING":
                     self.databases.append(db)
@@ -95,10 +97,11 @@ class GetDbHome:
         if len(self.db_homes) != 0:
             return None
         else:
-            results = self.database_client.list_db_homes(
+            results = list_all_results(
+                self.database_client.list_db_homes,
                 compartment_id = self.comparetment_id,
                 db_system_id = self.db_system_id
-            ).data
+            )
             for dbh in results:
                 if dbh.lifecycle_state != "TERMINATED" and dbh.lifecycle_state != "TERMINATING":
                     self.db_homes.append(dbh)
@@ -149,11 +152,12 @@ class GetDbNode:
         if len(self.db_nodes) != 0:
             return None
         else:
-            results = self.database_client.list_db_nodes(
+            results = list_all_results(
+                self.database_client.list_db_nodes,
                 compartment_id = self.compartment_id,
                 db_system_id = self.db_system_id,
                 sort_order = "ASC"
-            ).data
+            )
         for dbn in results:
             if dbn.lifecycle_state != "TERMINATED" and dbn.lifecycle_state != "TERMINATING":
                 self.db_nodes.append(dbn)
@@ -229,9 +233,10 @@ class GetDbSystem:
         if len(self.db_systems) != 0:
             return None
         
-        results = self.database_client.list_db_systems(
+        results = list_all_results(
+            self.database_client.list_db_systems,
             compartment_id = self.compartment_id
-        ).data
+        )
         
         for dbs in results:
             if dbs.lifecycle_state != "TERMINATED" and dbs.lifecycle_state != "TERMINATING":
@@ -280,10 +285,10 @@ class GetDgAssociations:
         if len(self.database_dg_asc) != 0:
             return None
         else:
-            list_data_guard_associations_response = self.database_client.list_data_guard_associations(
+            dg_associations = list_all_results(
+                self.database_client.list_data_guard_associations,
                 database_id = self.database_ocid
             )
-            dg_associations = list_data_guard_associations_response.data
             if len(dg_associations) > 0:
                 for dg in dg_associations:
                     self.database_dg_asc.append(dg)
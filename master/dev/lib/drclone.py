@@ -0,0 +1,430 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module clones VM instances to the disaster recovery region from the replicas of their
+boot and block volumes. Every volume of a VM instance is created at once and the clone then
+moves forward as each resource becomes ready, driven by the callbacks of a shared
+lib.waiters.ResourceWaiter:
+
+    1. every boot and block volume is created from its replica
+    2. the VM instance is launched as soon as its boot volume is AVAILABLE
+    3. each block volume is attached as soon as both it and the VM instance are ready
+    4. the VM instance is stopped and started once every block volume is attached
+
+Since the waiter is shared, any number of clones may be in flight together, as in:
+
+    waiter = ResourceWaiter()
+    dr_clone = CloneVmFromReplicas(
+        dr_compute_client,
+        dr_storage_client,
+        waiter,
+        vm_instance,
+        boot_volume,
+        block_volumes,
+        target_child_compartment.id,
+        target_availability_domain,
+        subnet.id,
+        "10.1.0.100"
+    )
+    dr_clone.start()
+    waiter.wait()
+    if dr_clone.status != "COMPLETED":
+        print(dr_clone.error)
+
+CloneVmScheduler starts many clones under a global limit and a limit per availability
+domain, starting the next queued clone as each one finishes.
+'''
+
+import time
+from lib.compute import launch_instance_from_boot_volume
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.ratelimit import call_with_rate_limit
+from lib.volumes import attach_paravirtualized_volume
+from lib.volumes import create_boot_volume_from_replica
+from lib.volumes import create_volume_from_volume_replica
+from oci.core import BlockstorageClientCompositeOperations
+from oci.core import ComputeClientCompositeOperations
+from oci.core.models import AttachParavirtualizedVolumeDetails
+from oci.core.models import BootVolumeSourceFromBootVolumeReplicaDetails
+from oci.core.models import CreateBootVolumeDetails
+from oci.core.models import CreateVnicDetails
+from oci.core.models import CreateVolumeDetails
+from oci.core.models import InstanceSourceDetails
+from oci.core.models import InstanceSourceViaBootVolumeDetails
+from oci.core.models import LaunchInstanceDetails
+from oci.core.models import LaunchInstanceShapeConfigDetails
+from oci.core.models import LaunchOptions
+from oci.core.models import VolumeSourceFromBlockVolumeReplicaDetails
+
+
+class CloneVmFromReplicas:
+    '''
+    This class clones one VM instance to the DR region from its volume replicas. Instiate it
+    with the DR clients, the shared waiter, the source VM instance and its volumes, and the
+    target compartment, availability domain, subnet and private IP address. Call start()
+    to submit the volume requests, then call wait() on the waiter. callback, if passed, is
+    called with the class once the clone has completed or failed. progress_callback, if
+    passed, is called with the class and the name of each step as the clone reaches it.
+
+    The clone never raises from within the waiter, so one failed clone does not stop the
+    others sharing the waiter. Check status, which ends as COMPLETED or FAILED, and error.
+    return_timings() returns the seconds taken to reach each step.
+
+    Your code must validate the replicas, the target names and the private IP address
+    before calling start(). See lib.volumes.return_volume_replica_states().
+    '''
+
+    def __init__(
+        self,
+        dr_compute_client,
+        dr_storage_client,
+        waiter,
+        vm_instance,
+        boot_volume,
+        block_volumes,
+        compartment_id,
+        availability_domain,
+        subnet_id,
+        private_ip_address,
+        callback = None,
+        progress_callback = None):
+
+        self.dr_compute_client              = dr_compute_client
+        self.dr_compute_composite_client    = ComputeClientCompositeOperations(dr_compute_client)
+        self.dr_storage_composite_client    = BlockstorageClientCompositeOperations(dr_storage_client)
+        self.waiter                         = waiter
+        self.vm_instance                    = vm_instance
+        self.boot_volume                    = boot_volume
+        self.block_volumes                  = list(block_volumes)
+        self.compartment_id                 = compartment_id
+        self.availability_domain            = availability_domain
+        self.subnet_id                      = subnet_id
+        self.private_ip_address             = private_ip_address
+        self.callback                       = callback
+        self.progress_callback              = progress_callback
+        self.status                         = "PENDING"
+        self.error                          = None
+        self.dr_boot_volume                 = None
+        self.dr_block_volumes               = []
+        self.dr_instance                    = None
+        self.volume_attachments             = []
+        self.volumes_to_attach              = []
+        self.attach_in_progress             = False
+        self.start_time                     = None
+        self.timings                        = {}
+
+    def record_timing(self, step):
+
+        self.timings[step] = round(time.monotonic() - self.start_time, 1)
+        self.report_progress(step)
+
+    def report_progress(self, step):
+
+        if self.progress_callback is not None:
+            self.progress_callback(self, step)
+
+    def fail(self, error):
+
+        if self.status in ["COMPLETED", "FAILED"]:
+            return None
+        self.status = "FAILED"
+        self.error = error
+        self.record_timing("failed")
+        if self.callback is not None:
+            self.callback(self)
+
+    def start(self):
+        '''
+        Submits the creation of every boot and block volume from its replica. The volumes are
+        created with the names of the source volumes.
+        '''
+
+        self.start_time = time.monotonic()
+        self.status = "CREATING_VOLUMES"
+        self.report_progress("started")
+        try:
+            create_boot_volume_from_replica(
+                self.dr_storage_composite_client,
+                BootVolumeSourceFromBootVolumeReplicaDetails,
+                CreateBootVolumeDetails,
+                self.compartment_id,
+                self.availability_domain,
+                self.boot_volume.display_name,
+                self.boot_volume.size_in_gbs,
+                self.boot_volume.boot_volume_replicas[0].boot_volume_replica_id,
+                self.boot_volume.vpus_per_gb,
+                waiter = self.waiter,
+                callback = self.boot_volume_created
+            )
+            for block_volume in self.block_volumes:
+                create_volume_from_volume_replica(
+                    self.dr_storage_composite_client,
+                    CreateVolumeDetails,
+                    VolumeSourceFromBlockVolumeReplicaDetails,
+                    self.compartment_id,
+                    self.availability_domain,
+                    block_volume.display_name,
+                    block_volume.size_in_gbs,
+                    block_volume.block_volume_replicas[0].block_volume_replica_id,
+                    block_volume.vpus_per_gb,
+                    waiter = self.waiter,
+                    callback = self.block_volume_created
+                )
+        except Exception as error:
+            self.fail(error)
+
+    def boot_volume_created(self, dr_boot_volume):
+
+        if self.status == "FAILED":
+            return None
+        if dr_boot_volume.lifecycle_state != "AVAILABLE":
+            return self.fail("Boot volume " + dr_boot_volume.display_name + " is in a " + dr_boot_volume.lifecycle_state + " state")
+        self.dr_boot_volume = dr_boot_volume
+        self.record_timing("boot_volume_available")
+        self.status = "LAUNCHING"
+
+        shape_config = LaunchInstanceShapeConfigDetails(
+            ocpus = self.vm_instance.shape_config.ocpus,
+            vcpus = self.vm_instance.shape_config.vcpus,
+            memory_in_gbs = self.vm_instance.shape_config.memory_in_gbs,
+            baseline_ocpu_utilization = self.vm_instance.shape_config.baseline_ocpu_utilization
+        )
+        try:
+            launch_instance_from_boot_volume(
+                self.dr_compute_composite_client,
+                LaunchInstanceDetails,
+                CreateVnicDetails,
+                LaunchOptions,
+                InstanceSourceDetails,
+                InstanceSourceViaBootVolumeDetails,
+                self.availability_domain,
+                self.compartment_id,
+                self.vm_instance.shape,
+                self.vm_instance.display_name,
+                self.private_ip_address,
+                self.subnet_id,
+                shape_config,
+                dr_boot_volume.id,
+                waiter = self.waiter,
+                callback = self.instance_launched
+            )
+        except Exception as error:
+            self.fail(error)
+
+    def block_volume_created(self, dr_block_volume):
+
+        if self.status == "FAILED":
+            return None
+        if dr_block_volume.lifecycle_state != "AVAILABLE":
+            return self.fail("Volume " + dr_block_volume.display_name + " is in a " + dr_block_volume.lifecycle_state + " state")
+        self.dr_block_volumes.append(dr_block_volume)
+        self.volumes_to_attach.append(dr_block_volume)
+        if len(self.dr_block_volumes) == len(self.block_volumes):
+            self.record_timing("block_volumes_available")
+        self.attach_next_volume()
+
+    def instance_launched(self, dr_instance):
+
+        if self.status == "FAILED":
+            return None
+        if dr_instance.lifecycle_state != "RUNNING":
+            return self.fail("Virtual machine " + dr_instance.display_name + " failed to launch and is in a " + dr_instance.lifecycle_state + " state")
+        self.dr_instance = dr_instance
+        self.record_timing("instance_running")
+        self.status = "ATTACHING"
+        self.attach_next_volume()
+
+    def attach_next_volume(self):
+        '''
+        Attaches the next block volume that is ready. OCI permits one attach operation against
+        an instance at once, so the attachments are made one after the other. Once every block
+        volume is attached, the VM instance is restarted.
+        '''
+
+        if self.dr_instance is None or self.attach_in_progress or self.status == "FAILED":
+            return None
+        if len(self.volumes_to_attach) == 0:
+            if len(self.volume_attachments) == len(self.block_volumes):
+                self.restart_instance()
+            return None
+
+        dr_block_volume = self.volumes_to_attach.pop(0)
+        self.attach_in_progress = True
+        try:
+            attach_paravirtualized_volume(
+                self.dr_compute_composite_client,
+                AttachParavirtualizedVolumeDetails,
+                self.dr_instance.id,
+                dr_block_volume.id,
+                dr_block_volume.display_name + "vol_attachment",
+                waiter = self.waiter,
+                callback = self.volume_attached
+            )
+        except Exception as error:
+            self.fail(error)
+
+    def volume_attached(self, volume_attachment):
+
+        if self.status == "FAILED":
+            return None
+        if volume_attachment.lifecycle_state != "ATTACHED":
+            return self.fail("Volume attachment " + volume_attachment.display_name + " is in a " + volume_attachment.lifecycle_state + " state")
+        self.volume_attachments.append(volume_attachment)
+        self.attach_in_progress = False
+        if len(self.volume_attachments) == len(self.block_volumes):
+            self.record_timing("block_volumes_attached")
+        self.attach_next_volume()
+
+    def submit_instance_action(self, action, wait_for_state, callback):
+
+        try:
+            call_with_rate_limit(
+                self.dr_compute_client.instance_action,
+                instance_id = self.dr_instance.id,
+                action = action
+            )
+            self.waiter.add(
+                self.dr_instance.id,
+                "instance",
+                self.dr_compute_client.get_instance,
+                [wait_for_state],
+                failed_states = ["TERMINATING", "TERMINATED"],
+                callback = callback
+            )
+        except Exception as error:
+            self.fail(error)
+
+    def restart_instance(self):
+
+        self.status = "RESTARTING"
+        self.submit_instance_action("SOFTSTOP", "STOPPED", self.instance_stopped)
+
+    def instance_stopped(self, dr_instance):
+
+        if self.status == "FAILED":
+            return None
+        if dr_instance.lifecycle_state != "STOPPED":
+            return self.fail("Virtual machine " + dr_instance.display_name + " failed to stop and is in a " + dr_instance.lifecycle_state + " state")
+        self.submit_instance_action("START", "RUNNING", self.instance_started)
+
+    def instance_started(self, dr_instance):
+
+        if self.status == "FAILED":
+            return None
+        if dr_instance.lifecycle_state != "RUNNING":
+            return self.fail("Virtual machine " + dr_instance.display_name + " failed to start and is in a " + dr_instance.lifecycle_state + " state")
+        self.dr_instance = dr_instance
+        self.status = "COMPLETED"
+        self.record_timing("completed")
+        if self.callback is not None:
+            self.callback(self)
+
+    def return_timings(self):
+
+        return dict(self.timings)
+
+    def __str__(self):
+        return "Class setup to clone VM instance " + self.vm_instance.display_name + " from its volume replicas"
+
+# end class CloneVmFromReplicas
+
+class CloneVmScheduler:
+    '''
+    This class runs many CloneVmFromReplicas clones that share one waiter, keeping no more
+    than max_concurrent clones in flight at once, and no more than max_per_availability_domain
+    within any one target availability domain. A limit of None means no limit. Create each
+    clone with callback = scheduler.clone_finished, add() it, then call start_clones() and
+    wait() on the waiter, as in:
+
+        scheduler = CloneVmScheduler(max_concurrent = 4, max_per_availability_domain = 2)
+        for vm_instance in vm_instances:
+            scheduler.add(CloneVmFromReplicas(..., callback = scheduler.clone_finished))
+        scheduler.start_clones()
+        waiter.wait()
+
+    callback, if passed, is called with each clone as it completes or fails. Clones still
+    within queued or running once the waiter returns have timed out.
+    '''
+
+    def __init__(
+        self,
+        max_concurrent = DEFAULT_MAX_WORKERS,
+        max_per_availability_domain = None,
+        callback = None):
+
+        self.max_concurrent                 = max_concurrent
+        self.max_per_availability_domain    = max_per_availability_domain
+        self.callback                       = callback
+        self.queued                         = []
+        self.running                        = []
+        self.finished                       = []
+        self.running_per_ad                 = {}
+        self.scheduling                     = False
+
+    def add(self, dr_clone):
+
+        self.queued.append(dr_clone)
+
+    def can_start(self, dr_clone):
+
+        if self.max_concurrent is not None and len(self.running) >= self.max_concurrent:
+            return False
+        if self.max_per_availability_domain is not None:
+            if self.running_per_ad.get(dr_clone.availability_domain, 0) >= self.max_per_availability_domain:
+                return False
+        return True
+
+    def start_clones(self):
+        '''
+        Starts queued clones, in the order they were added, until a limit is reached. A
+        clone that cannot start because its availability domain is full does not hold back
+        the clones queued behind it for other availability domains.
+        '''
+
+        # a clone that fails within start() calls back to clone_finished(), which calls us
+        # again. The loop below picks up the freed slot, so the nested call has nothing to do.
+        if self.scheduling:
+            return None
+        self.scheduling = True
+        try:
+            clone_started = True
+            while clone_started:
+                clone_started = False
+                for dr_clone in list(self.queued):
+                    if not self.can_start(dr_clone):
+                        continue
+                    self.queued.remove(dr_clone)
+                    self.running.append(dr_clone)
+                    self.running_per_ad[dr_clone.availability_domain] = self.running_per_ad.get(dr_clone.availability_domain, 0) + 1
+                    dr_clone.start()
+                    clone_started = True
+        finally:
+            self.scheduling = False
+
+    def clone_finished(self, dr_clone):
+
+        if dr_clone in self.running:
+            self.running.remove(dr_clone)
+            self.running_per_ad[dr_clone.availability_domain] -= 1
+        self.finished.append(dr_clone)
+        if self.callback is not None:
+            self.callback(dr_clone)
+        self.start_clones()
+
+    def __str__(self):
+        return "Class setup to run " + str(len(self.queued) + len(self.running) + len(self.finished)) + " VM instance clones"
+
+# end class CloneVmScheduler
@@ -15,6 +15,7 @@
 
 from time import sleep
 import os.path
+from lib.pagination import list_all_results
 
 class GetExport:
     '''
@@ -41,9 +42,10 @@ class GetExport:
         if len(self.exports) != 0:
             return None
         else:
-            results = self.filesystem_client.list_exports(
+            results = list_all_results(
+                self.filesystem_client.list_exports,
                 compartment_id = self.compartment_id
-            ).data
+            )
             for export in results:
                 if export.lifecycle_state not in ["DELETING", "DELETED"]:
                     self.exports.append(export)
@@ -96,10 +98,11 @@ class GetFileSystem:
             return None
         else:
             for AD in self.availability_domains:
-                results = self.filesystem_client.list_file_systems(
+                results = list_all_results(
+                    self.filesystem_client.list_file_systems,
                     compartment_id = self.compartment_id,
                     availability_domain = AD.name
-                ).data
+                )
                 # returned as a list which has a length of 0 if no filesystems found
                 # we want to ignore results if empty
                 if len(results) != 0:
@@ -163,10 +166,11 @@ class GetMountTarget:
             return None
         else:
             for AD in self.availability_domains:
-                results = self.filesystem_client.list_mount_targets(
+                results = list_all_results(
+                    self.filesystem_client.list_mount_targets,
                     compartment_id = self.compartment_id,
                     availability_domain = AD.name
-                ).data
+                )
                 if len(results) != 0:
                     for mt in results:
                         if mt.lifecycle_state not in ["DELETED", "DELETING"]:
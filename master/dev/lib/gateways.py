@@ -14,6 +14,7 @@
 # file 'LICENSE.txt', which is part of this source code package.
 
 from oci.core import VirtualNetworkClient
+from lib.pagination import list_all_results
 
 class GetLocalPeeringGateway:
 
@@ -33,9 +34,10 @@ class GetLocalPeeringGateway:
         if len(self.local_peering_gateways) != 0:
             return None
         else:
-            results = self.network_client.list_local_peering_gateways(
+            results = list_all_results(
+                self.network_client.list_local_peering_gateways,
                 compartment_id = self.compartment_id
-            ).data
+            )
             
             for item in results:
                 if item.lifecycle_state != "TERMINATED":
@@ -147,11 +149,12 @@ class GetNatGateway:
             # VCN in which the NAT gateway was created within. So, if a client decides to
             # have more than 1 NAT gateway per compartment within the same region (aka not the
             # defaults) we can accommodate the condition without lots of code.
-            results = self.network_client.list_nat_gateways(
+            results = list_all_results(
+                self.network_client.list_nat_gateways,
                 compartment_id = self.compartment_id,
                 vcn_id = self.virtual_cloud_network_id
 
-            ).data
+            )
             # the API is TFUBAR, it returns each object as a list of a single object,
             # which is poor programming since it is inconsistent with other APIs that
             # do similar things. Since there can by default only be one NGW per compartment
@@ -250,9 +253,10 @@ class GetInternetGateway:
             # VCN in which the internet gateway was created within. So, if a client decides to
             # have more than 1 internet gateway per compartment within the same region (aka not the
             # defaults) we can accommodate the condition without lots of code.
-            results = self.network_client.list_internet_gateways(
+            results = list_all_results(
+                self.network_client.list_internet_gateways,
                 compartment_id = self.compartment_id
-            ).data
+            )
             # the API is TFUBAR, it returns each object as a list of a single object,
             # which is poor programming since it is inconsistent with other APIs that
             # do similar things. Since there can by default only be one IGW per compartment
@@ -341,9 +345,10 @@ class GetDynamicRouterGateway:
         if len(self.dynamic_router_gateways) != 0:
             return None
         else:
-            results = self.network_client.list_drgs(
+            results = list_all_results(
+                self.network_client.list_drgs,
                 compartment_id = self.compartment_id
-            ).data
+            )
             for item in results:
                 if item.lifecycle_state != "TERMINATED":
                     if item.lifecycle_state != "TERMINATING":
@@ -423,9 +428,10 @@ class GetDrgAttachment:
         if len(self.drg_attachments) != 0:
             return None
         else:
-            results = self.network_client.list_drg_attachments(
+            results = list_all_results(
+                self.network_client.list_drg_attachments,
                 compartment_id = self.compartment_id,
-                vcn_id = self.vcn_id).data
+                vcn_id = self.vcn_id)
             
             for item in results:
                 if item.lifecycle_state != "TERMINATED":
@@ -542,9 +548,10 @@ class GetDrgPeeringConnection:
         if len(self.rpc_connections) != 0:
             return None
         else:
-            results = self.network_client.list_remote_peering_connections(
+            results = list_all_results(
+                self.network_client.list_remote_peering_connections,
                 compartment_id = self.compartment_id
-            ).data
+            )
             
             for rpc in results:
                 if rpc.lifecycle_state not in ["TERMINATING", "TERMINATED"]:
@@ -16,6 +16,10 @@
 from time import sleep
 import os.path
 import platform
+from lib.pagination import list_all_results
+from lib.cache import invalidate_cached_resources
+from lib.cache import list_cached_resources
+from lib.ratelimit import call_with_rate_limit
 
 
 class GetAlarms:
@@ -43,25 +47,15 @@ class GetAlarms:
         if len(self.alarms) != 0:
             return False
         else:
-            list_alarms_response = self.monitoring_client.list_alarms(
+            results = list_all_results(
+                self.monitoring_client.list_alarms,
                 compartment_id = self.compartment_id,
                 sort_order = "ASC"
             )
             
-            for a in list_alarms_response.data:
+            for a in results:
                 if a.lifecycle_state == "ACTIVE":
                     self.alarms.append(a)
-            
-            while list_alarms_response.has_next_page:
-                list_alarms_response = self.monitoring_client.list_alarms(
-                    compartment_id = self.compartment_id,
-                    sort_order = "ASC"
-                )
-                results = list_alarms_response.data
-                if len(results) > 0:
-                    for a in results:
-                        if a.lifecycle_state == "ACTIVE":
-                            self.alarms.append(a)
                     
             return True
         
@@ -172,10 +166,11 @@ class GetNotificationItems:
         if len(self.notification_topics) != 0:
             return False
         else:
-            list_topics_response = self.ons_client.list_topics(
+            list_topics_response = list_all_results(
+                self.ons_client.list_topics,
                 compartment_id = self.compartment_id,
                 sort_order     = "ASC"
-            ).data
+            )
             
             for i in list_topics_response:
                 if i.lifecycle_state == "ACTIVE":
@@ -292,7 +287,8 @@ def get_availability_domains(
     
     '''
     
-    results = identity_client.list_availability_domains(
+    results = call_with_rate_limit(
+        identity_client.list_availability_domains,
         compartment_id = compartment_id).data
     
     return results
@@ -326,31 +322,107 @@ def get_protocol(
         return None
 # end function get_protocol()
 
+# The region catalog is fetched once per program run and kept here. When the local cache
+# is enabled (see lib/cache.py), it is also shared between programs for the TTL of the
+# "regions" and "region_subscriptions" resource types.
+region_catalog = {}
+
 def get_regions(
-    identity_client):
+    identity_client,
+    refresh = False):
+    '''
+    This function returns the list of OCI regions. The list is fetched from the REST service
+    only on the first call within a program run, or from the local cache if enabled. Pass
+    refresh = True to discard the catalog and fetch it again.
+    '''
 
-    results = identity_client.list_regions().data
+    if refresh:
+        region_catalog.pop("regions", None)
+        region_catalog.pop("region_names", None)
+        invalidate_cached_resources("regions", ())
 
-    return results
+    if "regions" not in region_catalog:
+        region_catalog["regions"], from_cache = list_cached_resources(
+            "regions",
+            (),
+            lambda: call_with_rate_limit(identity_client.list_regions).data
+        )
+
+    return region_catalog["regions"]
 
 # end function get_regions()
 
 def get_subscriber_regions(
     identity_client,
-    tenancy_id):
+    tenancy_id,
+    refresh = False):
     
     # this function gets a list of all regions the tenancy is subscribed to and returns it as a dictionary object.
     # it requires that the identity client be loaded. You must supply the tenancy OCID (root compartment).
     # If using the KENT code class GetParentCompartment(), the value compartment_id of the returned object
-    # contains the tenancy OCID
-    list_region_subscriptions_response = identity_client.list_region_subscriptions(
-        tenancy_id = tenancy_id
-    ).data
-    
-    return list_region_subscriptions_response
+    # contains the tenancy OCID. Like get_regions(), the list is only fetched once per program run unless
+    # refresh is True.
+    catalog_key = ("region_subscriptions", tenancy_id)
+
+    if refresh:
+        region_catalog.pop(catalog_key, None)
+        region_catalog.pop(("subscribed_region_names", tenancy_id), None)
+        invalidate_cached_resources("region_subscriptions", (tenancy_id,))
+
+    if catalog_key not in region_catalog:
+        region_catalog[catalog_key], from_cache = list_cached_resources(
+            "region_subscriptions",
+            (tenancy_id,),
+            lambda: call_with_rate_limit(
+                identity_client.list_region_subscriptions,
+                tenancy_id = tenancy_id
+            ).data
+        )
+
+    return region_catalog[catalog_key]
 
 # end function get_subscriber_regions
 
+def validate_region(
+    identity_client,
+    region):
+    '''
+    This function returns True if region is the name of an OCI region, as in "us-ashburn-1",
+    otherwise it returns False. It replaces looping through the results of get_regions(),
+    as in:
+
+        if not validate_region(identity_client, region):
+            raise RuntimeWarning("WARNING! INVALID REGION")
+    '''
+
+    if "region_names" not in region_catalog:
+        region_catalog["region_names"] = frozenset(
+            rg.name for rg in get_regions(identity_client)
+        )
+
+    return region in region_catalog["region_names"]
+
+# end function validate_region()
+
+def validate_subscribed_region(
+    identity_client,
+    tenancy_id,
+    region):
+    '''
+    This function returns True if the tenancy is subscribed to region, otherwise it returns
+    False.
+    '''
+
+    catalog_key = ("subscribed_region_names", tenancy_id)
+    if catalog_key not in region_catalog:
+        region_catalog[catalog_key] = frozenset(
+            rg.region_name for rg in get_subscriber_regions(identity_client, tenancy_id)
+        )
+
+    return region in region_catalog[catalog_key]
+
+# end function validate_subscribed_region()
+
 def is_int(my_input):
     '''
     Function returns true if the input value chars in the string are all numbers,
@@ -0,0 +1,156 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module is the paging engine used by every Get* class within the KENT codebase. The
+OCI REST service returns list results one page at a time. Each response carries the
+values has_next_page and next_page, and the next page must be requested by passing
+next_page back to the same list method with the same arguments. Hand rolling this
+logic in each class has proven to be error prone, so all classes call the functions
+below instead.
+
+DEFAULT_PAGE_SIZE is passed to the API as the value of limit when your code does not
+supply page_size. We leave it as None by default since the maximum value of limit
+differs between OCI services, and the REST service rejects a value that exceeds its
+maximum. Your code may pass page_size to any of the functions to request larger pages
+from a service that accepts them.
+
+Every page request is paced through lib/ratelimit.py, so a list call that is throttled
+by the REST service is retried rather than failing the program.
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+from lib.ratelimit import rate_limited
+
+
+DEFAULT_PAGE_SIZE = None
+
+
+def page_results(
+    list_method,
+    *args,
+    page_size = None,
+    prefetch = True,
+    **kwargs):
+    '''
+    This generator calls list_method and yields the data from each page of results
+    as a list. When prefetch is True, the request for the next page is submitted on a
+    background thread before the current page is yielded, so the round trip to the REST
+    service overlaps with your code processing the current page. Only one request is
+    ever in flight at a time.
+
+    Pass the OCI list method itself, not the result of calling it, along with the
+    arguments that the method expects. As in:
+
+        for page in page_results(
+            compute_client.list_instances,
+            compartment_id = compartment_id):
+            for instance in page:
+                print(instance.display_name)
+
+    The generator stops when the REST service reports no further pages.
+    '''
+
+    if page_size is None:
+        page_size = DEFAULT_PAGE_SIZE
+    if page_size is not None:
+        kwargs["limit"] = page_size
+    list_method = rate_limited(list_method)
+
+    response = list_method(*args, **kwargs)
+
+    if not prefetch:
+        while True:
+            yield response.data
+            if not response.has_next_page:
+                return
+            response = list_method(*args, page = response.next_page, **kwargs)
+
+    with ThreadPoolExecutor(max_workers = 1) as executor:
+        while True:
+            next_page_request = None
+            if response.has_next_page:
+                next_page_request = executor.submit(
+                    list_method,
+                    *args,
+                    page = response.next_page,
+                    **kwargs
+                )
+            yield response.data
+            if next_page_request is None:
+                return
+            response = next_page_request.result()
+
+# end function page_results()
+
+def iterate_results(
+    list_method,
+    *args,
+    page_size = None,
+    prefetch = True,
+    **kwargs):
+    '''
+    This generator works the same as page_results() except that it yields each
+    item from each page rather than the page. Use it when your code streams the
+    results and does not care about page boundaries.
+    '''
+
+    for page in page_results(
+        list_method,
+        *args,
+        page_size = page_size,
+        prefetch = prefetch,
+        **kwargs):
+        for item in page:
+            yield item
+
+# end function iterate_results()
+
+def list_all_results(
+    list_method,
+    *args,
+    page_size = None,
+    prefetch = True,
+    lifecycle_states_to_skip = None,
+    **kwargs):
+    '''
+    This function returns a list of every item from every page of results. If
+    lifecycle_states_to_skip is supplied, items with a lifecycle_state in that list
+    are omitted. Most Get* classes in the KENT codebase discard TERMINATED and
+    TERMINATING resources, as in:
+
+        results = list_all_results(
+            network_client.list_subnets,
+            compartment_id = compartment_id,
+            vcn_id = vcn_id,
+            lifecycle_states_to_skip = ["TERMINATED", "TERMINATING"]
+        )
+    '''
+
+    results = []
+    for item in iterate_results(
+        list_method,
+        *args,
+        page_size = page_size,
+        prefetch = prefetch,
+        **kwargs):
+        if lifecycle_states_to_skip is not None:
+            if getattr(item, "lifecycle_state", None) in lifecycle_states_to_skip:
+                continue
+        results.append(item)
+
+    return results
+
+# end function list_all_results()
@@ -0,0 +1,198 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module paces the calls the KENT codebase makes to the OCI REST service. Earlier
+releases slept for a fixed time between calls to stay clear of the HTTP 429 "Too many
+requests" error, which made every bulk job wait whether or not OCI was busy. Calls are
+now passed through a token bucket that starts out generous. Only when the REST service
+answers with HTTP 429 does the bucket slow down and the call is retried after an
+exponential backoff. The rate recovers gradually as calls succeed again.
+
+Wrap any SDK method with rate_limited() to pace it through the shared limiter, as in:
+
+    delete_alarm = rate_limited(monitoring_client.delete_alarm)
+    for alarm in alarm_list:
+        delete_alarm(alarm_id = alarm.id)
+
+or call it once through call_with_rate_limit(). The paging engine in lib/pagination.py and
+EndpointLimits in lib/concurrency.py already do this, so every list call made by the
+Get* classes is paced.
+'''
+
+import random
+import threading
+import time
+
+
+DEFAULT_MAX_RATE        = 20.0      # calls per second when OCI is not throttling us
+DEFAULT_MIN_RATE        = 0.5       # calls per second after repeated throttling
+DEFAULT_BURST           = 10        # calls that may be made at once from a full bucket
+RATE_RECOVERY           = 0.5       # calls per second added back after each success
+MAX_RETRIES             = 8         # retries of a throttled call before giving up
+BASE_BACKOFF            = 1.0       # seconds to wait after the first throttled call
+MAX_BACKOFF             = 60.0      # longest wait between retries in seconds
+THROTTLED_STATUS        = 429
+
+
+class RateLimiter:
+    '''
+    This class is a token bucket with an adaptive refill rate. Each call takes one token.
+    Tokens are added back at the current rate, up to burst tokens. report_throttled() halves
+    the rate and empties the bucket, report_success() raises the rate by RATE_RECOVERY up to
+    max_rate. One instance is shared by every thread within a program, see
+    default_rate_limiter below.
+    '''
+
+    def __init__(
+        self,
+        max_rate = DEFAULT_MAX_RATE,
+        min_rate = DEFAULT_MIN_RATE,
+        burst = DEFAULT_BURST,
+        max_retries = MAX_RETRIES):
+
+        self.max_rate       = max_rate
+        self.min_rate       = min_rate
+        self.burst          = burst
+        self.max_retries    = max_retries
+        self.rate           = max_rate
+        self.tokens         = float(burst)
+        self.last_refill    = time.monotonic()
+        self.throttled_calls = 0
+        self.lock           = threading.Lock()
+
+    def refill(self):
+        # must be called while holding self.lock
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self):
+        # blocks until a token is available and takes it
+
+        while True:
+            with self.lock:
+                self.refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return None
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    def report_throttled(self):
+
+        with self.lock:
+            self.refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            self.throttled_calls += 1
+
+    def report_success(self):
+
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + RATE_RECOVERY)
+
+    def call(self, method, *args, **kwargs):
+        '''
+        This method calls method once a token is available, retrying with exponential
+        backoff while the REST service answers with HTTP 429. Any other error, or a 429
+        after max_retries retries, is raised to your code.
+        '''
+
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                results = method(*args, **kwargs)
+            except Exception as error:
+                if not is_throttled_error(error) or attempt >= self.max_retries:
+                    raise
+                self.report_throttled()
+                time.sleep(return_backoff(attempt, error))
+                attempt += 1
+                continue
+            self.report_success()
+            return results
+
+    def __str__(self):
+        return "Class setup to pace REST calls at up to " + str(self.rate) + " calls per second"
+
+# end class RateLimiter
+
+default_rate_limiter = RateLimiter()
+
+
+def is_throttled_error(error):
+    '''
+    This function returns True if error is an oci.exceptions.ServiceError with a status of
+    HTTP 429. Only the status attribute is checked, so the OCI SDK need not be imported here.
+    '''
+
+    return getattr(error, "status", None) == THROTTLED_STATUS
+
+# end function is_throttled_error()
+
+def return_backoff(attempt, error = None):
+    '''
+    This function returns the number of seconds to wait before retry number attempt, counted
+    from 0. The wait doubles with each attempt up to MAX_BACKOFF, with random jitter so that
+    threads do not retry in lock step. A retry-after header sent by the REST service is
+    honoured when it asks for a longer wait.
+    '''
+
+    backoff = min(MAX_BACKOFF, BASE_BACKOFF * (2 ** attempt))
+    backoff = random.uniform(backoff / 2, backoff)
+
+    headers = getattr(error, "headers", None)
+    if headers:
+        try:
+            retry_after = float(headers.get("retry-after", headers.get("Retry-After", 0)))
+        except (TypeError, ValueError, AttributeError):
+            retry_after = 0
+        backoff = max(backoff, min(MAX_BACKOFF, retry_after))
+
+    return backoff
+
+# end function return_backoff()
+
+def call_with_rate_limit(method, *args, **kwargs):
+    '''
+    This function calls method with the supplied arguments through default_rate_limiter
+    and returns the results.
+    '''
+
+    return default_rate_limiter.call(method, *args, **kwargs)
+
+# end function call_with_rate_limit()
+
+def rate_limited(method):
+    '''
+    This function returns a function that calls method through default_rate_limiter. It
+    returns method unchanged if it has already been wrapped, so nesting wrappers does not
+    take two tokens for one call.
+    '''
+
+    if getattr(method, "rate_limited", False):
+        return method
+
+    def rate_limited_method(*args, **kwargs):
+        return default_rate_limiter.call(method, *args, **kwargs)
+
+    rate_limited_method.__name__ = getattr(method, "__name__", "rate_limited_method")
+    rate_limited_method.rate_limited = True
+    return rate_limited_method
+
+# end function rate_limited()
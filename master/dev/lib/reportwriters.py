@@ -0,0 +1,183 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module writes report rows one at a time as a program produces them. tabulate must be
+handed every row before it can size the columns, so a report of a large compartment prints
+nothing until all of its data has been gathered and held in memory. The writers below
+print each row the moment it is written, using fixed column widths for tables, as in:
+
+    report_writer = return_report_writer(
+        "TABLE",
+        ["VIRTUAL MACHINE", "BACKUP TYPE", "STATUS"],
+        column_widths = [32, 12, 12]
+    )
+    for vm in iterate_compartment_backup_data(...):
+        report_writer.write_row([vm["vm_name"], "BOOT VOLUME", bk.lifecycle_state])
+    report_writer.close()
+
+The field names used as JSON keys are made from the headers, so "BACKUP TYPE" becomes
+backup_type, unless your code passes fields.
+'''
+
+import csv
+import json
+import sys
+import textwrap
+
+
+REPORT_FORMATS          = ["TABLE", "CSV", "JSON"]
+DEFAULT_COLUMN_WIDTH    = 20
+
+
+def return_field_name(header):
+
+    return "_".join(header.lower().split())
+
+# end function return_field_name()
+
+class TableReportWriter:
+    '''
+    This class prints rows as a plain text table with fixed column widths. A header wider
+    than its column is wrapped over as many lines as it needs, and the column is widened to
+    fit the longest word of its header. A value wider than its column is printed in full and
+    pushes the rest of its row to the right.
+    '''
+
+    def __init__(
+        self,
+        headers,
+        column_widths = None,
+        output = None):
+
+        self.headers        = [" ".join(header.split()) for header in headers]
+        self.column_widths  = [
+            max([column_width] + [len(word) for word in header.split()])
+            for header, column_width in zip(self.headers, column_widths or [max(DEFAULT_COLUMN_WIDTH, len(header)) for header in self.headers])
+        ]
+        self.output         = output or sys.stdout
+        self.rows_written   = 0
+        self.write_headers()
+        self.write_line(["-" * column_width for column_width in self.column_widths])
+
+    def write_headers(self):
+
+        # wrapped headers are aligned on their last line, just above the dashes
+        header_lines = [textwrap.wrap(header, column_width) for header, column_width in zip(self.headers, self.column_widths)]
+        line_count = max([len(lines) for lines in header_lines] + [1])
+        for line_number in range(line_count):
+            self.write_line([
+                lines[line_number - line_count + len(lines)] if line_number >= line_count - len(lines) else ""
+                for lines in header_lines
+            ])
+
+    def write_line(self, values):
+
+        line = "  ".join(str(value).ljust(column_width) for value, column_width in zip(values, self.column_widths))
+        self.output.write(line.rstrip() + "\n")
+        self.output.flush()
+
+    def write_row(self, row):
+
+        self.write_line(["" if value is None else value for value in row])
+        self.rows_written += 1
+
+    def close(self):
+
+        return None
+
+# end class TableReportWriter
+
+class CsvReportWriter:
+    '''
+    This class prints rows as CSV with a header row.
+    '''
+
+    def __init__(
+        self,
+        headers,
+        output = None):
+
+        self.output         = output or sys.stdout
+        self.csv_writer     = csv.writer(self.output)
+        self.rows_written   = 0
+        self.csv_writer.writerow([" ".join(header.split()) for header in headers])
+
+    def write_row(self, row):
+
+        self.csv_writer.writerow(row)
+        self.output.flush()
+        self.rows_written += 1
+
+    def close(self):
+
+        return None
+
+# end class CsvReportWriter
+
+class JsonReportWriter:
+    '''
+    This class prints one JSON object per row, known as JSON lines, so that a report may be
+    read a row at a time by another program. write_record() prints a dict as is. Values that
+    are not JSON types, such as a datetime, are printed as strings.
+    '''
+
+    def __init__(
+        self,
+        headers,
+        fields = None,
+        output = None):
+
+        self.fields         = fields or [return_field_name(header) for header in headers]
+        self.output         = output or sys.stdout
+        self.rows_written   = 0
+
+    def write_record(self, record):
+
+        self.output.write(json.dumps(record, default = str) + "\n")
+        self.output.flush()
+        self.rows_written += 1
+
+    def write_row(self, row):
+
+        self.write_record(dict(zip(self.fields, row)))
+
+    def close(self):
+
+        return None
+
+# end class JsonReportWriter
+
+def return_report_writer(
+    report_format,
+    headers,
+    column_widths = None,
+    fields = None,
+    output = None):
+    '''
+    This function returns the writer for report_format, one of REPORT_FORMATS. It raises
+    RuntimeWarning for any other format.
+    '''
+
+    report_format = report_format.upper()
+    if report_format == "TABLE":
+        return TableReportWriter(headers, column_widths = column_widths, output = output)
+    elif report_format == "CSV":
+        return CsvReportWriter(headers, output = output)
+    elif report_format == "JSON":
+        return JsonReportWriter(headers, fields = fields, output = output)
+    raise RuntimeWarning("WARNING! Report format " + report_format + " is not one of " + ", ".join(REPORT_FORMATS))
+
+# end function return_report_writer()
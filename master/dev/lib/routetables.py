@@ -16,6 +16,7 @@
 from oci.core import VirtualNetworkClient
 from oci.core.models import RouteRule
 from oci.core.models import CreateRouteTableDetails
+from lib.pagination import list_all_results
 
 
 class GetRouteTable:
@@ -29,7 +30,10 @@ class GetRouteTable:
     def populate_route_tables(self):
         if len(self.route_tables) != 0:
             return None
-        results = self.network_client.list_route_tables(self.compartment_id).data
+        results = list_all_results(
+            self.network_client.list_route_tables,
+            self.compartment_id
+        )
         
         for item in results:
             if item.lifecycle_state != "TERMINATED":
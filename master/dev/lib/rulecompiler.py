@@ -0,0 +1,688 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module compiles the rows of a security rule CSV file, in the layout written by
+export_security_group_rules() and export_security_list_rules_to_csv(), into SDK rule objects.
+It is shared by Oci-ImportNetworkSecurityGroupRules.py and Oci-ImportSecurityList.py.
+
+compile_rule_rows() normalises each column of the file once, then classifies the rows by
+protocol and by direction. A row with both a source and a destination becomes an INGRESS and
+an EGRESS rule. Rows with a protocol other than TCP, UDP, ICMP or ALL, or with neither a
+source nor a destination, are skipped, as the importers always have. Bad values are collected
+as RuleError objects that carry the line number within the file, so every bad row is known
+before any REST call is made, as in:
+
+    csv_records = list(iterate_csv_records(security_rule_export_file))
+    rule_records, rule_errors = compile_rule_rows(csv_records)
+    if len(rule_errors) != 0:
+        raise RuntimeWarning("WARNING! - " + str(rule_errors[0]))
+    security_rules = build_security_group_rules(
+        rule_records,
+        AddSecurityRuleDetails,
+        IcmpOptions,
+        TcpOptions,
+        UdpOptions,
+        PortRange
+    )
+
+The SDK model classes are passed in by the importers, which build the rule objects within the
+program that calls oci.core.VirtualNetworkClient, see the notes within the importers.
+
+The importers call exit_if_validate_only() before they import the OCI SDK, so that
+--validate-only checks a rule file with lint_rule_rows() using only the standard library.
+'''
+
+import bisect
+import ipaddress
+import os.path
+import sys
+from lib.csvinput import iterate_csv_records
+
+
+# column positions within the CSV rule file
+DESCRIPTION_COLUMN                  = 0
+PROTOCOL_COLUMN                     = 1
+IS_STATELESS_COLUMN                 = 2
+SOURCE_COLUMN                       = 3
+SOURCE_TYPE_COLUMN                  = 4
+DESTINATION_COLUMN                  = 5
+DESTINATION_TYPE_COLUMN             = 6
+ICMP_TYPE_COLUMN                    = 7
+ICMP_CODE_COLUMN                    = 8
+TCP_SOURCE_MAX_COLUMN               = 9
+TCP_SOURCE_MIN_COLUMN               = 10
+TCP_DESTINATION_MAX_COLUMN          = 11
+TCP_DESTINATION_MIN_COLUMN          = 12
+UDP_SOURCE_MAX_COLUMN               = 13
+UDP_SOURCE_MIN_COLUMN               = 14
+UDP_DESTINATION_MAX_COLUMN          = 15
+UDP_DESTINATION_MIN_COLUMN          = 16
+RULE_COLUMN_COUNT                   = 17
+
+MIN_PORT            = 1
+MAX_PORT            = 65535
+MAX_ICMP_VALUE      = 255
+PROTOCOL_NUMBERS    = {"TCP" : "6", "UDP" : "17", "ICMP" : "1", "ALL" : "all"}
+PORT_COLUMNS        = {
+    "TCP" : {
+        "source_port_range"         : (TCP_SOURCE_MIN_COLUMN, TCP_SOURCE_MAX_COLUMN),
+        "destination_port_range"    : (TCP_DESTINATION_MIN_COLUMN, TCP_DESTINATION_MAX_COLUMN)
+    },
+    "UDP" : {
+        "source_port_range"         : (UDP_SOURCE_MIN_COLUMN, UDP_SOURCE_MAX_COLUMN),
+        "destination_port_range"    : (UDP_DESTINATION_MIN_COLUMN, UDP_DESTINATION_MAX_COLUMN)
+    }
+}
+TEXT_COLUMNS        = [
+    DESCRIPTION_COLUMN,
+    PROTOCOL_COLUMN,
+    IS_STATELESS_COLUMN,
+    SOURCE_COLUMN,
+    SOURCE_TYPE_COLUMN,
+    DESTINATION_COLUMN,
+    DESTINATION_TYPE_COLUMN
+]
+
+
+class RuleError:
+    '''
+    This class describes a bad value within the CSV rule file. line_number is the line of the
+    file that holds the value, counting the header as line 1.
+    '''
+
+    __slots__ = ["line_number", "message"]
+
+    def __init__(self, line_number, message):
+        self.line_number    = line_number
+        self.message        = message
+
+    def __str__(self):
+        return "Line " + str(self.line_number) + ": " + self.message
+
+# end class RuleError
+
+class RuleRecord:
+    '''
+    This class holds one compiled rule in one direction. address and address_type are the
+    source of an INGRESS rule or the destination of an EGRESS rule. The port ranges are
+    (min, max) tuples, or None when the range is not set. The options that do not apply to the
+    protocol are always None.
+    '''
+
+    __slots__ = [
+        "line_number",
+        "description",
+        "protocol",
+        "is_stateless",
+        "direction",
+        "address",
+        "address_type",
+        "icmp_type",
+        "icmp_code",
+        "source_port_range",
+        "destination_port_range"
+    ]
+
+    def __init__(
+        self,
+        line_number,
+        description,
+        protocol,
+        is_stateless,
+        direction,
+        address,
+        address_type,
+        icmp_type = None,
+        icmp_code = None,
+        source_port_range = None,
+        destination_port_range = None):
+
+        self.line_number            = line_number
+        self.description            = description
+        self.protocol               = protocol
+        self.is_stateless           = is_stateless
+        self.direction              = direction
+        self.address                = address
+        self.address_type           = address_type
+        self.icmp_type              = icmp_type
+        self.icmp_code              = icmp_code
+        self.source_port_range      = source_port_range
+        self.destination_port_range = destination_port_range
+
+    def __str__(self):
+        return "Line " + str(self.line_number) + " " + self.direction + " " + self.protocol + " rule for " + str(self.address)
+
+# end class RuleRecord
+
+def return_text(value):
+    '''
+    This function returns value as a stripped string, or None if it is blank. pandas reads a
+    blank field as the float nan, so str(value) of "nan" is also blank.
+    '''
+
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value == "" or value == "nan":
+        return None
+    return value
+
+# end function return_text()
+
+def return_whole_number(value):
+    '''
+    This function returns value as an int, or None if it is blank. pandas reads a numeric
+    column that holds blanks as floats, so 22.0 and "22.0" are both returned as 22. It raises
+    ValueError for any other value.
+    '''
+
+    text = return_text(value)
+    if text is None:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        number = float(text)
+        if not number.is_integer():
+            raise
+        return int(number)
+
+# end function return_whole_number()
+
+def normalize_rule_columns(csv_records):
+    '''
+    This function turns csv_records, a list of the (line number, record) tuples yielded by
+    lib.csvinput.iterate_csv_records(), into a list of columns. The text columns are stripped,
+    blanks become None, and the ICMP and port columns are converted to int. Each column is
+    normalised in one pass. It returns the columns, the line number of each row, and a list of
+    RuleError objects for the values that are not whole numbers.
+    '''
+
+    rule_errors = []
+    line_numbers = []
+    padded_rows = []
+    for line_number, row in csv_records:
+        row = list(row)[:RULE_COLUMN_COUNT]
+        line_numbers.append(line_number)
+        padded_rows.append(row + [None] * (RULE_COLUMN_COUNT - len(row)))
+    if len(padded_rows) == 0:
+        return [[] for column in range(RULE_COLUMN_COUNT)], line_numbers, rule_errors
+
+    columns = [list(column) for column in zip(*padded_rows)]
+    for column_number in range(RULE_COLUMN_COUNT):
+        if column_number in TEXT_COLUMNS:
+            columns[column_number] = [return_text(value) for value in columns[column_number]]
+            continue
+        numbers = []
+        for row_number, value in enumerate(columns[column_number]):
+            try:
+                numbers.append(return_whole_number(value))
+            except ValueError:
+                rule_errors.append(RuleError(
+                    line_numbers[row_number],
+                    "Value " + str(value) + " in column " + str(column_number + 1) + " is not a whole number"
+                ))
+                numbers.append(None)
+        columns[column_number] = numbers
+
+    return columns, line_numbers, rule_errors
+
+# end function normalize_rule_columns()
+
+def return_address_network(address, address_type):
+    '''
+    This function returns the ipaddress network of address when address_type is CIDR_BLOCK, or
+    is not set, since OCI reads a blank address type as CIDR_BLOCK. It returns None for the
+    other address types, and raises ValueError when the CIDR block is malformed.
+    '''
+
+    if address_type is not None and address_type.upper() != "CIDR_BLOCK":
+        return None
+    return ipaddress.ip_network(address, strict = False)
+
+# end function return_address_network()
+
+def compile_rule_columns(columns, line_numbers, rule_errors):
+    '''
+    This function does the work of compile_rule_rows() on the columns and line numbers returned
+    by normalize_rule_columns(). The errors found are appended to rule_errors.
+    '''
+
+    bad_lines = set(rule_error.line_number for rule_error in rule_errors)
+    protocols = [protocol.upper() if protocol is not None else None for protocol in columns[PROTOCOL_COLUMN]]
+    stateless_rules = [value is not None and value.upper() == "TRUE" for value in columns[IS_STATELESS_COLUMN]]
+
+    rule_records = []
+    for row_number, protocol in enumerate(protocols):
+        line_number = line_numbers[row_number]
+        if protocol not in PROTOCOL_NUMBERS or line_number in bad_lines:
+            continue
+
+        row_errors = []
+        options = {}
+        if protocol == "ICMP":
+            options["icmp_type"] = columns[ICMP_TYPE_COLUMN][row_number]
+            options["icmp_code"] = columns[ICMP_CODE_COLUMN][row_number]
+            if options["icmp_type"] is None and options["icmp_code"] is not None:
+                row_errors.append("ICMP code " + str(options["icmp_code"]) + " must always accompany an ICMP type")
+            for icmp_option in ["icmp_type", "icmp_code"]:
+                if options[icmp_option] is not None and not 0 <= options[icmp_option] <= MAX_ICMP_VALUE:
+                    row_errors.append("ICMP " + icmp_option[5:] + " " + str(options[icmp_option]) + " must be from 0 to " + str(MAX_ICMP_VALUE))
+        elif protocol in PORT_COLUMNS:
+            for port_range, (min_column, max_column) in PORT_COLUMNS[protocol].items():
+                port_min = columns[min_column][row_number]
+                port_max = columns[max_column][row_number]
+                if port_min is None and port_max is None:
+                    continue
+                if port_min is None or port_max is None:
+                    row_errors.append(protocol + " " + port_range + " must have both a minimum and a maximum port")
+                elif not MIN_PORT <= port_min <= port_max <= MAX_PORT:
+                    row_errors.append(
+                        protocol + " " + port_range + " " + str(port_min) + "-" + str(port_max) +
+                        " must be from " + str(MIN_PORT) + " to " + str(MAX_PORT) + " with the minimum port first"
+                    )
+                else:
+                    options[port_range] = (port_min, port_max)
+
+        row_records = []
+        for direction, address_column, address_type_column in [
+            ("INGRESS", SOURCE_COLUMN, SOURCE_TYPE_COLUMN),
+            ("EGRESS", DESTINATION_COLUMN, DESTINATION_TYPE_COLUMN)]:
+            if columns[address_column][row_number] is None:
+                continue
+            try:
+                return_address_network(columns[address_column][row_number], columns[address_type_column][row_number])
+            except ValueError:
+                row_errors.append(direction.lower() + " CIDR block " + columns[address_column][row_number] + " is malformed")
+                continue
+            row_records.append(RuleRecord(
+                line_number,
+                columns[DESCRIPTION_COLUMN][row_number],
+                PROTOCOL_NUMBERS[protocol],
+                stateless_rules[row_number],
+                direction,
+                columns[address_column][row_number],
+                columns[address_type_column][row_number],
+                **options
+            ))
+
+        # a row with an error is left out entirely, rather than importing half of it
+        if len(row_errors) == 0:
+            rule_records.extend(row_records)
+        for row_error in row_errors:
+            rule_errors.append(RuleError(line_number, row_error))
+
+    rule_errors.sort(key = lambda rule_error: rule_error.line_number)
+    return rule_records
+
+# end function compile_rule_columns()
+
+def compile_rule_rows(csv_records):
+    '''
+    This function compiles csv_records, a list of the (line number, record) tuples yielded by
+    lib.csvinput.iterate_csv_records(), into a list of RuleRecord objects in file order, with
+    the INGRESS rule of a row before its EGRESS rule. It returns the records along with a list
+    of RuleError objects. A row with an error is left out of the records.
+    '''
+
+    columns, line_numbers, rule_errors = normalize_rule_columns(csv_records)
+    rule_records = compile_rule_columns(columns, line_numbers, rule_errors)
+    return rule_records, rule_errors
+
+# end function compile_rule_rows()
+
+def return_protocol_options(
+    rule_record,
+    IcmpOptions,
+    TcpOptions,
+    UdpOptions,
+    PortRange):
+    '''
+    This function returns a dictionary object of the icmp_options, tcp_options or udp_options
+    argument for the SDK rule object of rule_record, which is empty when the rule has no options.
+    '''
+
+    if rule_record.icmp_type is not None:
+        icmp_options = {"type" : rule_record.icmp_type}
+        if rule_record.icmp_code is not None:
+            icmp_options["code"] = rule_record.icmp_code
+        return {"icmp_options" : IcmpOptions(**icmp_options)}
+
+    port_ranges = {}
+    for port_range in ["source_port_range", "destination_port_range"]:
+        if getattr(rule_record, port_range) is not None:
+            port_min, port_max = getattr(rule_record, port_range)
+            port_ranges[port_range] = PortRange(max = port_max, min = port_min)
+    if len(port_ranges) == 0:
+        return {}
+    if rule_record.protocol == PROTOCOL_NUMBERS["TCP"]:
+        return {"tcp_options" : TcpOptions(**port_ranges)}
+    return {"udp_options" : UdpOptions(**port_ranges)}
+
+# end function return_protocol_options()
+
+def build_security_group_rules(
+    rule_records,
+    AddSecurityRuleDetails,
+    IcmpOptions,
+    TcpOptions,
+    UdpOptions,
+    PortRange):
+    '''
+    This function returns a list of AddSecurityRuleDetails objects for rule_records, ready for
+    lib.securitygroups.add_security_group_rules(). is_stateless is not set, since the network
+    security group API does not return it, see the notes within lib/securitygroups.py.
+    '''
+
+    security_rules = []
+    for rule_record in rule_records:
+        if rule_record.direction == "INGRESS":
+            address = {"source" : rule_record.address, "source_type" : rule_record.address_type}
+        else:
+            address = {"destination" : rule_record.address, "destination_type" : rule_record.address_type}
+        security_rules.append(AddSecurityRuleDetails(
+            direction = rule_record.direction,
+            protocol = rule_record.protocol,
+            description = rule_record.description,
+            **address,
+            **return_protocol_options(rule_record, IcmpOptions, TcpOptions, UdpOptions, PortRange)
+        ))
+
+    return security_rules
+
+# end function build_security_group_rules()
+
+def build_security_list_rules(
+    rule_records,
+    IngressSecurityRule,
+    EgressSecurityRule,
+    IcmpOptions,
+    TcpOptions,
+    UdpOptions,
+    PortRange):
+    '''
+    This function returns lists of IngressSecurityRule and EgressSecurityRule objects for
+    rule_records, ready for UpdateSecurityListDetails.
+    '''
+
+    ingress_security_rules = []
+    egress_security_rules = []
+    for rule_record in rule_records:
+        protocol_options = return_protocol_options(rule_record, IcmpOptions, TcpOptions, UdpOptions, PortRange)
+        if rule_record.direction == "INGRESS":
+            ingress_security_rules.append(IngressSecurityRule(
+                description = rule_record.description,
+                is_stateless = rule_record.is_stateless,
+                protocol = rule_record.protocol,
+                source = rule_record.address,
+                source_type = rule_record.address_type,
+                **protocol_options
+            ))
+        else:
+            egress_security_rules.append(EgressSecurityRule(
+                description = rule_record.description,
+                is_stateless = rule_record.is_stateless,
+                protocol = rule_record.protocol,
+                destination = rule_record.address,
+                destination_type = rule_record.address_type,
+                **protocol_options
+            ))
+
+    return ingress_security_rules, egress_security_rules
+
+# end function build_security_list_rules()
+
+def return_rule_scope(rule_record):
+    '''
+    This function returns the parts of rule_record that decide which traffic it matches, in a
+    form that may be compared with another rule: the network or address, the ICMP type and code,
+    and the port ranges. A value of None matches everything.
+    '''
+
+    network = return_address_network(rule_record.address, rule_record.address_type)
+    return (
+        network if network is not None else rule_record.address,
+        rule_record.icmp_type,
+        rule_record.icmp_code,
+        rule_record.source_port_range,
+        rule_record.destination_port_range
+    )
+
+# end function return_rule_scope()
+
+class PortRangeIndex:
+    '''
+    This class holds the destination port ranges of earlier rules that share every other part of
+    their scope, and answers whether one of them covers a later range in O(log n) time. A range
+    that lies within another is dropped from the index, since the wider range covers anything
+    it would. The ranges left never nest, so when sorted by their minimum port their maximum
+    ports are sorted too, and the only range that can cover a later one is the last range that
+    starts at or below its minimum port.
+
+    A range of None, which matches every port, is held as ALL_PORTS.
+    '''
+
+    ALL_PORTS = (MIN_PORT - 1, MAX_PORT + 1)
+
+    def __init__(self):
+
+        self.port_mins      = []
+        self.port_maxes     = []
+        self.rule_records   = []
+
+    def return_covering_rule(self, port_range):
+
+        port_min, port_max = port_range or self.ALL_PORTS
+        position = bisect.bisect_right(self.port_mins, port_min) - 1
+        if position >= 0 and self.port_maxes[position] >= port_max:
+            return self.rule_records[position]
+        return None
+
+    def add_port_range(self, port_range, rule_record):
+        '''
+        This method adds port_range, which must not be covered by a range already held.
+        '''
+
+        port_min, port_max = port_range or self.ALL_PORTS
+        first = bisect.bisect_left(self.port_mins, port_min)
+        last = first
+        while last < len(self.port_maxes) and self.port_maxes[last] <= port_max:
+            last += 1
+        self.port_mins[first:last]      = [port_min]
+        self.port_maxes[first:last]     = [port_max]
+        self.rule_records[first:last]   = [rule_record]
+
+# end class PortRangeIndex
+
+def port_range_covers(broad_ports, narrow_ports):
+
+    if broad_ports is None:
+        return True
+    return narrow_ports is not None and broad_ports[0] <= narrow_ports[0] and narrow_ports[1] <= broad_ports[1]
+
+# end function port_range_covers()
+
+def return_covering_rule(port_range_indexes, index_keys, destination_ports):
+    '''
+    This function returns the first indexed rule that covers destination_ports within the
+    PortRangeIndex of any of index_keys, or None.
+    '''
+
+    for index_key in index_keys:
+        port_range_index = port_range_indexes.get(index_key)
+        if port_range_index is None:
+            continue
+        covering_record = port_range_index.return_covering_rule(destination_ports)
+        if covering_record is not None:
+            return covering_record
+    return None
+
+# end function return_covering_rule()
+
+def lint_rule_rows(csv_records):
+    '''
+    This function checks the CSV rule file without making any REST calls. It compiles
+    csv_records the same as compile_rule_rows() and returns the records, the errors, and a
+    list of RuleError objects that warn of:
+
+        rows that are skipped because the protocol is not TCP, UDP, ICMP or ALL, or because
+        they have neither a source nor a destination
+        rules that duplicate an earlier rule
+        rules that are shadowed by an earlier, broader rule, so that they never match any
+        traffic the earlier rule does not
+
+    Exact duplicates are found with a dict. For the shadow check, earlier rules are indexed by
+    their direction, statelessness, protocol, address, ICMP type and code and source port range,
+    and each index holds their destination port ranges in a PortRangeIndex. A later rule only
+    looks up the supernets of its CIDR block with a prefix length that some earlier rule has,
+    the ICMP values and source port ranges that could cover it, and the ALL protocol, so a large
+    file is checked without comparing every pair of rules. A rule that is shadowed is not
+    indexed, since the rule that covers it covers anything it would. The one lookup that grows
+    with the file is the scan of the distinct source port ranges, which are seldom set, since
+    the source port of a connection is chosen by the client.
+    '''
+
+    columns, line_numbers, rule_errors = normalize_rule_columns(csv_records)
+    rule_records = compile_rule_columns(columns, line_numbers, rule_errors)
+    rule_warnings = []
+
+    for row_number, protocol in enumerate(columns[PROTOCOL_COLUMN]):
+        line_number = line_numbers[row_number]
+        if protocol is None or protocol.upper() not in PROTOCOL_NUMBERS:
+            rule_warnings.append(RuleError(line_number, "Protocol " + str(protocol) + " is not supported, the row is skipped"))
+        elif columns[SOURCE_COLUMN][row_number] is None and columns[DESTINATION_COLUMN][row_number] is None:
+            rule_warnings.append(RuleError(line_number, "The row has neither a source nor a destination and is skipped"))
+
+    first_rules         = {}    # the first rule of each exact scope, for duplicates
+    port_range_indexes  = {}    # PortRangeIndex of the rules not shadowed, by the rest of their scope
+    prefix_lengths      = {}    # (IP version, prefix length) of the indexed CIDR blocks
+    source_port_ranges  = {}    # the source port ranges of the indexed rules other than None
+    for rule_record in rule_records:
+        rule_scope = return_rule_scope(rule_record)
+        address, icmp_type, icmp_code, source_ports, destination_ports = rule_scope
+        rule_group = (rule_record.direction, rule_record.is_stateless)
+
+        earlier_record = first_rules.get(rule_group + (rule_record.protocol, rule_scope))
+        if earlier_record is not None:
+            rule_warnings.append(RuleError(
+                rule_record.line_number,
+                rule_record.direction + " rule duplicates the rule on line " + str(earlier_record.line_number)
+            ))
+            continue
+        first_rules[rule_group + (rule_record.protocol, rule_scope)] = rule_record
+
+        if isinstance(address, str):
+            candidate_addresses = [address]
+        else:
+            candidate_addresses = [
+                address.supernet(new_prefix = prefix_length)
+                for version, prefix_length in prefix_lengths.get(rule_group, set())
+                if version == address.version and prefix_length <= address.prefixlen
+            ]
+        candidate_icmp_options = [(icmp_type, icmp_code)]
+        if icmp_code is not None:
+            candidate_icmp_options.append((icmp_type, None))
+        if icmp_type is not None:
+            candidate_icmp_options.append((None, None))
+        candidate_source_ports = [None] + [
+            port_range for port_range in source_port_ranges.get(rule_group, set())
+            if port_range_covers(port_range, source_ports)
+        ]
+
+        covering_record = return_covering_rule(
+            port_range_indexes,
+            [rule_group + (protocol, candidate_address, candidate_icmp_type, candidate_icmp_code, candidate_ports)
+                for protocol in set([rule_record.protocol, PROTOCOL_NUMBERS["ALL"]])
+                for candidate_address in candidate_addresses
+                for candidate_icmp_type, candidate_icmp_code in candidate_icmp_options
+                for candidate_ports in candidate_source_ports],
+            destination_ports
+        )
+        if covering_record is not None:
+            rule_warnings.append(RuleError(
+                rule_record.line_number,
+                rule_record.direction + " rule is shadowed by the broader rule on line " + str(covering_record.line_number)
+            ))
+            continue
+
+        port_range_indexes.setdefault(
+            rule_group + (rule_record.protocol, address, icmp_type, icmp_code, source_ports),
+            PortRangeIndex()
+        ).add_port_range(destination_ports, rule_record)
+        if not isinstance(address, str):
+            prefix_lengths.setdefault(rule_group, set()).add((address.version, address.prefixlen))
+        if source_ports is not None:
+            source_port_ranges.setdefault(rule_group, set()).add(source_ports)
+
+    rule_warnings.sort(key = lambda rule_warning: rule_warning.line_number)
+    return rule_records, rule_errors, rule_warnings
+
+# end function lint_rule_rows()
+
+def validate_rule_file(import_file):
+    '''
+    This function lints import_file with lint_rule_rows() and prints every error and
+    warning with its line number, followed by a summary. It returns the exit status of
+    --validate-only, which is 1 if any error or warning was found and 0 otherwise.
+    '''
+
+    if not os.path.isfile(import_file):
+        raise RuntimeWarning("WARNING! - File not found")
+
+    csv_records = list(iterate_csv_records(import_file))
+    rule_records, rule_errors, rule_warnings = lint_rule_rows(csv_records)
+    for rule_error in rule_errors:
+        print("ERROR! - {}".format(rule_error))
+    for rule_warning in rule_warnings:
+        print("WARNING! - {}".format(rule_warning))
+    print("\n\n{} records read from CSV file {}: {} valid rules, {} bad rows, {} warnings\n".format(
+        len(csv_records),
+        import_file,
+        len(rule_records),
+        len(rule_errors),
+        len(rule_warnings)
+    ))
+    if len(rule_errors) != 0 or len(rule_warnings) != 0:
+        return 1
+    print("CSV file {} is valid.\n\n".format(import_file))
+    return 0
+
+# end function validate_rule_file()
+
+def exit_if_validate_only():
+    '''
+    Call this function at the top of an import program, before importing the OCI SDK, as in:
+
+        from lib.rulecompiler import exit_if_validate_only
+        exit_if_validate_only()
+
+    If the program was started as either of:
+
+        <program> --validate-only <csv file>
+        <program> <the six positional arguments> --validate-only
+
+    the CSV file is checked with validate_rule_file() and this function exits with its
+    status, so that a rule file can be checked in CI without the OCI SDK, an OCI config or
+    the names of the resources it is imported into. Otherwise it returns None.
+    '''
+
+    if len(sys.argv) == 3 and sys.argv[1].upper() == "--VALIDATE-ONLY":
+        sys.exit(validate_rule_file(sys.argv[2]))
+    if len(sys.argv) == 8 and sys.argv[7].upper() == "--VALIDATE-ONLY":
+        sys.exit(validate_rule_file(sys.argv[6]))
+    return None
+
+# end function exit_if_validate_only()
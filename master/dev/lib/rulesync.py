@@ -0,0 +1,149 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module compares the security rules within a CSV file with the live rules of a network
+security group or security list, so that an import only sends the rules that changed. Both
+sets of rules are passed through prepare_csv_record() from lib/securitygroups.py or
+lib/securitylists.py, which reads any of the SDK rule types, and reduced to a hashable key.
+Rules with the same key are the same rule. A rule whose key matches but whose description
+differs is updated in place rather than removed and added again, as in:
+
+    rule_diff = diff_security_rules(
+        live_rules,
+        compiled_rules,
+        prepare_csv_record
+    )
+    print(rule_diff["add"], rule_diff["remove"], rule_diff["update"])
+'''
+
+import ipaddress
+
+
+def return_canonical_address(address, address_type):
+    '''
+    This function returns address in the form OCI stores it. CIDR blocks are normalised so
+    that "10.0.0.5/16" and "10.0.0.0/16" compare equal. Other types, such as service CIDR
+    labels or NSG OCIDs, are returned without surrounding whitespace.
+    '''
+
+    if address is None or address == "":
+        return ""
+    address = str(address).strip()
+    if address_type == "CIDR_BLOCK":
+        try:
+            return str(ipaddress.ip_network(address, strict = False))
+        except ValueError:
+            return address
+    return address
+
+# end function return_canonical_address()
+
+def return_blank_if_none(value):
+
+    if value is None or value == "" or str(value) == "nan":
+        return ""
+    return int(value) if isinstance(value, float) else value
+
+# end function return_blank_if_none()
+
+def return_rule_key(csv_record):
+    '''
+    This function returns a tuple that identifies the rule described by csv_record, the
+    dictionary object returned by prepare_csv_record(). The description is not part of the key.
+    is_stateless is read as False when it is None, which works around the API defect noted in
+    lib/securitygroups.py.
+    '''
+
+    if csv_record["source"] is not None and csv_record["source"] != "":
+        direction = "INGRESS"
+    else:
+        direction = "EGRESS"
+
+    port_ranges = []
+    for options in ["tcp_options", "udp_options"]:
+        for port_range in ["source_port_range", "destination_port_range"]:
+            port_ranges.append(return_blank_if_none(csv_record[options][port_range]["min"]))
+            port_ranges.append(return_blank_if_none(csv_record[options][port_range]["max"]))
+
+    return (
+        direction,
+        csv_record["protocol"],
+        csv_record["is_stateless"] is True,
+        return_canonical_address(csv_record["source"], csv_record["source_type"]),
+        return_blank_if_none(csv_record["source_type"]),
+        return_canonical_address(csv_record["destination"], csv_record["destination_type"]),
+        return_blank_if_none(csv_record["destination_type"]),
+        return_blank_if_none(csv_record["icmp_options"]["type"]),
+        return_blank_if_none(csv_record["icmp_options"]["code"])
+    ) + tuple(port_ranges)
+
+# end function return_rule_key()
+
+def diff_security_rules(
+    live_rules,
+    new_rules,
+    prepare_csv_record):
+    '''
+    This function compares live_rules, the rules presently within the network security group
+    or security list, with new_rules, the rules compiled from the CSV file. Both are lists of
+    SDK rule objects. It returns a dictionary object of:
+
+        add         rules within new_rules that are not live
+        remove      live rules that are not within new_rules, including duplicates of a live rule
+        update      (live rule, new rule) tuples for rules that only differ by description
+        unchanged   the number of live rules that are kept as is
+
+    Duplicate rules within new_rules are only added once.
+    '''
+
+    live_rules_by_key = {}
+    rule_diff = {
+        "add"       : [],
+        "remove"    : [],
+        "update"    : [],
+        "unchanged" : 0
+    }
+
+    for live_rule in live_rules:
+        rule_key = return_rule_key(prepare_csv_record(live_rule))
+        if rule_key in live_rules_by_key:
+            rule_diff["remove"].append(live_rule)
+        else:
+            live_rules_by_key[rule_key] = live_rule
+
+    new_rule_keys = set()
+    for new_rule in new_rules:
+        csv_record = prepare_csv_record(new_rule)
+        rule_key = return_rule_key(csv_record)
+        if rule_key in new_rule_keys:
+            continue
+        new_rule_keys.add(rule_key)
+        if rule_key not in live_rules_by_key:
+            rule_diff["add"].append(new_rule)
+            continue
+        live_rule = live_rules_by_key[rule_key]
+        if return_blank_if_none(live_rule.description) != return_blank_if_none(csv_record["description"]):
+            rule_diff["update"].append((live_rule, new_rule))
+        else:
+            rule_diff["unchanged"] += 1
+
+    for rule_key, live_rule in live_rules_by_key.items():
+        if rule_key not in new_rule_keys:
+            rule_diff["remove"].append(live_rule)
+
+    return rule_diff
+
+# end function diff_security_rules()
@@ -16,8 +16,13 @@
 import csv
 import os
 from lib.general import get_protocol
+from lib.pagination import list_all_results
+from lib.ratelimit import call_with_rate_limit
 from oci.core import VirtualNetworkClient
 
+
+MAX_SECURITY_RULES_PER_CALL = 25    # the most rules the add, update and remove security rule APIs accept at once
+
 class GetNetworkSecurityGroup:
     '''
     The APIs from Oracle for managing security groups are more disparate versus security lists. We try to consolidate
@@ -46,9 +51,10 @@ class GetNetworkSecurityGroup:
         if len(self.security_groups) != 0:
             return None
         else:
-            list_security_groups_response = self.network_client.list_network_security_groups(
+            list_security_groups_response = list_all_results(
+                self.network_client.list_network_security_groups,
                 compartment_id = self.compartment_id,
-                vcn_id = self.vcn_id).data
+                vcn_id = self.vcn_id)
             for item in list_security_groups_response:
                 if item.lifecycle_state != "TERMINATED":
                     if item.lifecycle_state != "TERMINATING":
@@ -59,9 +65,10 @@ class GetNetworkSecurityGroup:
         if len(self.security_groups) == 0:
             return None
         else:
-            results = self.network_client.list_network_security_group_security_rules(
+            results = list_all_results(
+                self.network_client.list_network_security_group_security_rules,
                 network_security_group_id = security_group_id
-            ).data
+            )
 
             if results is None:
                 return None
@@ -73,9 +80,10 @@ class GetNetworkSecurityGroup:
         if len(self.security_groups) == 0:
             return None
         else:
-            results = self.network_client.list_network_security_group_vnics(
+            results = list_all_results(
+                self.network_client.list_network_security_group_vnics,
                 network_security_group_id = network_security_group_id
-            ).data
+            )
             if results is None:
                 return None
             else:
@@ -175,6 +183,92 @@ def delete_vnic_from_network_security_group(
 
 # end function delete_vnic_from_network_security_group()
 
+def add_security_group_rules(
+    network_client,
+    AddNetworkSecurityGroupSecurityRulesDetails,
+    network_security_group_id,
+    security_rules,
+    batch_size = MAX_SECURITY_RULES_PER_CALL):
+    '''
+    This function adds security_rules, a list of AddSecurityRuleDetails objects, to the network
+    security group. The rules are sent batch_size at a time, which is one REST call per 25 rules
+    rather than one per rule. Each call is paced through lib/ratelimit.py, which only waits when
+    the REST service answers with HTTP 429. It returns the list of security rules OCI created, in
+    the same order as security_rules, along with the number of REST calls made.
+    '''
+
+    added_rules = []
+    rest_calls = 0
+    for first_rule in range(0, len(security_rules), batch_size):
+        results = call_with_rate_limit(
+            network_client.add_network_security_group_security_rules,
+            network_security_group_id = network_security_group_id,
+            add_network_security_group_security_rules_details = AddNetworkSecurityGroupSecurityRulesDetails(
+                security_rules = security_rules[first_rule:first_rule + batch_size]
+            )
+        ).data
+        added_rules.extend(results.security_rules)
+        rest_calls += 1
+
+    return added_rules, rest_calls
+
+# end function add_security_group_rules()
+
+def update_security_group_rules(
+    network_client,
+    UpdateNetworkSecurityGroupSecurityRulesDetails,
+    network_security_group_id,
+    security_rules,
+    batch_size = MAX_SECURITY_RULES_PER_CALL):
+    '''
+    This function updates security_rules, a list of UpdateSecurityRuleDetails objects that each
+    carry the ID of the live rule, within the network security group. The rules are sent in
+    batches the same as add_security_group_rules(), and the function returns the same values.
+    '''
+
+    updated_rules = []
+    rest_calls = 0
+    for first_rule in range(0, len(security_rules), batch_size):
+        results = call_with_rate_limit(
+            network_client.update_network_security_group_security_rules,
+            network_security_group_id = network_security_group_id,
+            update_network_security_group_security_rules_details = UpdateNetworkSecurityGroupSecurityRulesDetails(
+                security_rules = security_rules[first_rule:first_rule + batch_size]
+            )
+        ).data
+        updated_rules.extend(results.security_rules)
+        rest_calls += 1
+
+    return updated_rules, rest_calls
+
+# end function update_security_group_rules()
+
+def remove_security_group_rules(
+    network_client,
+    RemoveNetworkSecurityGroupSecurityRulesDetails,
+    network_security_group_id,
+    security_rule_ids,
+    batch_size = MAX_SECURITY_RULES_PER_CALL):
+    '''
+    This function removes the rules whose IDs are within security_rule_ids from the network
+    security group, batch_size at a time. It returns the number of REST calls made.
+    '''
+
+    rest_calls = 0
+    for first_rule in range(0, len(security_rule_ids), batch_size):
+        call_with_rate_limit(
+            network_client.remove_network_security_group_security_rules,
+            network_security_group_id = network_security_group_id,
+            remove_network_security_group_security_rules_details = RemoveNetworkSecurityGroupSecurityRulesDetails(
+                security_rule_ids = security_rule_ids[first_rule:first_rule + batch_size]
+            )
+        )
+        rest_calls += 1
+
+    return rest_calls
+
+# end function remove_security_group_rules()
+
 
 def prepare_csv_record(my_rule):
     
@@ -17,6 +17,7 @@ import csv
 import os
 from oci.core import VirtualNetworkClient
 from lib.general import get_protocol
+from lib.pagination import list_all_results
 
 class GetNetworkSecurityList:
     
@@ -31,9 +32,10 @@ class GetNetworkSecurityList:
         if len(self.security_lists) != 0:
             return None
         else:
-            results = self.network_client.list_security_lists(
+            results = list_all_results(
+                self.network_client.list_security_lists,
                 self.compartment_id
-            ).data
+            )
 
             for item in results:
                 if item.lifecycle_state != "TERMINATED":
@@ -15,6 +15,10 @@
 
 from oci.core import VirtualNetworkClient
 from oci.core.models import CreateSubnetDetails
+from lib.pagination import list_all_results
+from lib.cache import invalidate_cached_resources
+from lib.cache import list_cached_resources
+from lib.cache import return_client_region
 
 class GetDhcpOptions:
     
@@ -34,9 +38,10 @@ class GetDhcpOptions:
         if len(self.dhcp_options_resources) != 0:
             return None
         else:
-            results = self.network_client.list_dhcp_options(
+            results = list_all_results(
+                self.network_client.list_dhcp_options,
                 compartment_id = self.compartment_id
-            ).data
+            )
             
             for item in results:
                 if item.lifecycle_state != "TERMINATED" or item.lifecycle_state != "TERMINATING":
@@ -85,9 +90,10 @@ class GetPrivateIP:
         if len(self.ip_addresses) != 0:
             return None
         else:
-            results = self.network_client.list_private_ips(
+            results = list_all_results(
+                self.network_client.list_private_ips,
                 subnet_id = self.subnet_id
-            ).data
+            )
             for ip in results:
                 self.ip_addresses.append(ip)
                 
@@ -176,12 +182,12 @@ class GetPublicIpAddress:
                 # the keyword "scope" is undocumented at the python SDK reference. For this API it is best to go straight
                 # to the code at GitHub
 
-                results = self.network_client.list_public_ips(
+                results = list_all_results(
+                    self.network_client.list_public_ips,
                     compartment_id = self.compartment_id,
                     scope = "AVAILABILITY_DOMAIN",
                     availability_domain = ad.name
-
-                ).data
+                )
                 for ip in results:
                     self.public_ip_addresses.append(ip)
 
@@ -216,20 +222,39 @@ class GetSubnet:
         self.vcn_id = vcn_id
         self.subnet_name = subnet_name
         self.subnets = []
+        self.from_cache = False
     
     def populate_subnets(self):
         if len(self.subnets) != 0:
             return None
         else:
-            results = self.network_client.list_subnets(
-                compartment_id = self.compartment_id,
-                vcn_id = self.vcn_id
-            ).data
-            
-            for item in results:
-                if item.lifecycle_state != "TERMINATED":
-                    if item.lifecycle_state != "TERMINATING":
-                        self.subnets.append(item)
+            self.subnets, self.from_cache = list_cached_resources(
+                "subnets",
+                (return_client_region(self.network_client), self.compartment_id, self.vcn_id),
+                self.fetch_subnets
+            )
+
+    def fetch_subnets(self):
+        subnets = []
+        results = list_all_results(
+            self.network_client.list_subnets,
+            compartment_id = self.compartment_id,
+            vcn_id = self.vcn_id
+        )
+        
+        for item in results:
+            if item.lifecycle_state != "TERMINATED":
+                if item.lifecycle_state != "TERMINATING":
+                    subnets.append(item)
+        return subnets
+
+    def refresh_subnets(self):
+        invalidate_cached_resources(
+            "subnets",
+            (return_client_region(self.network_client), self.compartment_id, self.vcn_id)
+        )
+        self.subnets = []
+        self.populate_subnets()
     
     def return_all_subnets(self):
         if len(self.subnets) == 0:
@@ -244,6 +269,10 @@ class GetSubnet:
             for item in self.subnets:
                 if item.display_name == self.subnet_name:
                     return item
+            # a cached list may predate a subnet created by another tool, so look once more
+            if self.from_cache:
+                self.refresh_subnets()
+                return self.return_subnet()
             
     def __str__(self):
         return "Method setup for performing tasks against " + self.subnet_name
@@ -278,6 +307,10 @@ def add_subnet(
     results = network_client.create_subnet(
         create_subnet_details = subnet_details
     ).data
+    invalidate_cached_resources(
+        "subnets",
+        (return_client_region(network_client), compartment_id, vcn_id)
+    )
 
     # Your code must handle the exception if return type is None
     if results is not None:
@@ -286,11 +319,36 @@ def add_subnet(
         return None
 # end function add_subnets()
 
+def update_subnet(
+    network_client,
+    compartment_id,
+    vcn_id,
+    subnet_id,
+    update_subnet_details
+    ):
+    '''
+    This function applies update_subnet_details, an UpdateSubnetDetails object built by the
+    calling program, to the subnet and drops the cached subnets of its VCN. Without this, a
+    program run within the TTL of the cache would read the old route table and security lists.
+    '''
+
+    results = network_client.update_subnet(
+        subnet_id = subnet_id,
+        update_subnet_details = update_subnet_details
+    ).data
+    invalidate_cached_resources(
+        "subnets",
+        (return_client_region(network_client), compartment_id, vcn_id)
+    )
+    return results
+# end function update_subnet()
+
 def delete_subnet(
     network_client,
     subnet_id
     ):
     results = network_client.delete_subnet(subnet_id)
+    invalidate_cached_resources("subnets")
     return results
 # end function delete_subnet()
 
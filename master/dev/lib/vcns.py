@@ -15,6 +15,10 @@
 
 from oci import config
 import oci
+from lib.pagination import list_all_results
+from lib.cache import invalidate_cached_resources
+from lib.cache import list_cached_resources
+from lib.cache import return_client_region
 
 # config = oci.config.from_file()
 # network_client = oci.core.VirtualNetworkClient(config)
@@ -27,15 +31,36 @@ class GetVirtualCloudNetworks:
         self.compartment_id = compartment_id
         self.vcn_name = vcn_name
         self.virtual_cloud_networks = []
+        self.from_cache = False
 
         
     def populate_virtual_cloud_networks(self):
         if len(self.virtual_cloud_networks) == 0:
-            results = self.network_client.list_vcns(compartment_id = self.compartment_id)
-            for item in results.data:
-                if item.lifecycle_state != "TERMINATED":
-                    if item.lifecycle_state != "TERMINATING":
-                        self.virtual_cloud_networks.append(item)
+            self.virtual_cloud_networks, self.from_cache = list_cached_resources(
+                "vcns",
+                (return_client_region(self.network_client), self.compartment_id),
+                self.fetch_virtual_cloud_networks
+            )
+
+    def fetch_virtual_cloud_networks(self):
+        virtual_cloud_networks = []
+        results = list_all_results(
+            self.network_client.list_vcns,
+            compartment_id = self.compartment_id
+        )
+        for item in results:
+            if item.lifecycle_state != "TERMINATED":
+                if item.lifecycle_state != "TERMINATING":
+                    virtual_cloud_networks.append(item)
+        return virtual_cloud_networks
+
+    def refresh_virtual_cloud_networks(self):
+        invalidate_cached_resources(
+            "vcns",
+            (return_client_region(self.network_client), self.compartment_id)
+        )
+        self.virtual_cloud_networks = []
+        self.populate_virtual_cloud_networks()
             
     def return_all_virtual_networks(self):
         return self.virtual_cloud_networks
@@ -44,6 +69,10 @@ class GetVirtualCloudNetworks:
         for item in self.virtual_cloud_networks:
             if item.display_name == self.vcn_name:
                 return item
+        # a cached list may predate a VCN created by another tool, so look once more
+        if self.from_cache:
+            self.refresh_virtual_cloud_networks()
+            return self.return_virtual_cloud_network()
 
 # end class GetVirtualCloudNetworks
 
@@ -64,6 +93,10 @@ def add_virtual_cloud_network(
     results = network_client.create_vcn(
         create_vcn_details = vcn_details
     ).data
+    invalidate_cached_resources(
+        "vcns",
+        (return_client_region(network_client), compartment_id)
+    )
 
     # Your code must handle the exception if the return type is None
     if results is None:
@@ -75,6 +108,8 @@ def add_virtual_cloud_network(
 
 def delete_virtual_cloud_network(network_client, vcn_id):
     results = network_client.delete_vcn(vcn_id)
+    invalidate_cached_resources("vcns")
+    invalidate_cached_resources("subnets")
 
     if results is None:
         raise RuntimeError("EXCEPTION! VCN could not be found or deleted.")
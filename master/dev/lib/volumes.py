@@ -15,6 +15,16 @@
 
 import os
 import os.path
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.concurrency import run_in_parallel
+from lib.pagination import list_all_results
+from lib.ratelimit import call_with_rate_limit
+from lib.waiters import register_or_wait
+
+
+# the lifecycle states that KENT backup reports collect, in the order they are reported
+BACKUP_LIFECYCLE_STATES = ["AVAILABLE", "CREATING", "FAULTY", "TERMINATED", "TERMINATING"]
+
 
 class GetVolumeAttachment:
     
@@ -38,9 +48,10 @@ class GetVolumeAttachment:
         if len(self.volume_attachments) != 0:
             return None
         
-        results = self.compute_client.list_volume_attachments(
+        results = list_all_results(
+            self.compute_client.list_volume_attachments,
             compartment_id = self.compartment_id
-        ).data
+        )
 
         for va in results:
             if va.lifecycle_state == "ATTACHED":
@@ -90,9 +101,10 @@ class GetVolumes:
         else:
             # We have to walk down each availability domain to check for boot volumes
             for availability_domain in self.availability_domains:
-                results = self.block_storage_client.list_boot_volumes(
+                results = list_all_results(
+                    self.block_storage_client.list_boot_volumes,
                     availability_domain = availability_domain.name,
-                    compartment_id = self.compartment_id).data
+                    compartment_id = self.compartment_id)
                 for boot_volume in results:
                     if boot_volume.lifecycle_state != "TERMINATED":
                         if boot_volume.lifecycle_state != "TERMINATING":
@@ -105,9 +117,10 @@ class GetVolumes:
         else:
             # We have to walk down each availability domain to check for boot volumes
             for availability_domain in self.availability_domains:
-                results = self.block_storage_client.list_volumes(
+                results = list_all_results(
+                    self.block_storage_client.list_volumes,
                     availability_domain = availability_domain.name,
-                    compartment_id = self.compartment_id).data
+                    compartment_id = self.compartment_id)
                 for block_volume in results:
                     if block_volume.lifecycle_state != "TERMINATED":
                         if block_volume.lifecycle_state != "TERMINATING":
@@ -157,6 +170,23 @@ class GetVolumes:
 # end class GetVolumes
 
 class GetVolumeBackups:
+    '''
+    This class fetches all boot volume and block volume backups within a compartment with a
+    single paged listing per backup type, regardless of lifecycle state. The backups are then
+    partitioned locally by volume OCID and by lifecycle state so that your code never has to
+    call the REST service once per volume or once per lifecycle state.
+
+    Call populate_boot_volume_backups() and populate_block_volume_backups() to fetch the data.
+    return_boot_volume_backups_by_state() and return_block_volume_backups_by_state() return the
+    backups for a volume in the order of the lifecycle states passed to them, newest first
+    within each state.
+
+    The populate methods also build dict indexes keyed on the volume OCID. Each index holds the
+    backups of a volume sorted by time_created, newest first, along with the most recent backup
+    in an AVAILABLE state. The return methods look the volume up in these indexes rather than
+    scanning every backup in the compartment, so code that calls them once per volume, such as
+    Oci-RestoreVM.py, does not slow down as the number of retained backups grows.
+    '''
     
     def __init__(
         self,
@@ -167,84 +197,215 @@ class GetVolumeBackups:
         self.compartment_id = compartment_id
         self.block_volume_backups = []
         self.boot_volume_backups = []
+        self.block_volume_backups_by_volume = {}    # volume_id -> lifecycle_state -> list of backups
+        self.boot_volume_backups_by_volume = {}     # boot_volume_id -> lifecycle_state -> list of backups
+        self.block_volume_backup_index = {}         # volume_id -> list of backups, newest first
+        self.boot_volume_backup_index = {}          # boot_volume_id -> list of backups, newest first
+        self.most_recent_active_block_volume_backups = {}   # volume_id -> newest AVAILABLE backup
+        self.most_recent_active_boot_volume_backups = {}    # boot_volume_id -> newest AVAILABLE backup
         
     def populate_boot_volume_backups(self):
         
         if len(self.boot_volume_backups) != 0:
             return None
         else:
-            self.boot_volume_backups = self.block_volume_client.list_boot_volume_backups(
+            self.load_boot_volume_backups(list_all_results(
+                self.block_volume_client.list_boot_volume_backups,
                 compartment_id = self.compartment_id,
-                sort_by = "TIMECREATED").data
+                sort_by = "TIMECREATED"))
 
     def populate_block_volume_backups(self):
         
         if len(self.block_volume_backups) != 0:
             return None
         else:
-            self.block_volume_backups = self.block_volume_client.list_volume_backups(
+            self.load_block_volume_backups(list_all_results(
+                self.block_volume_client.list_volume_backups,
                 compartment_id = self.compartment_id,
-                sort_by = "TIMECREATED").data
+                sort_by = "TIMECREATED"))
+
+    def load_boot_volume_backups(self, boot_volume_backups):
+        '''
+        Builds the boot volume backup indexes from boot_volume_backups, a list fetched by
+        other means such as lib.backupsnapshot.BackupSnapshot, in place of listing them.
+        '''
+
+        self.boot_volume_backups = list(boot_volume_backups)
+        self.boot_volume_backup_index = index_volume_backups(
+            self.boot_volume_backups,
+            "boot_volume_id"
+        )
+        self.boot_volume_backups_by_volume = partition_volume_backups(
+            self.boot_volume_backup_index
+        )
+        self.most_recent_active_boot_volume_backups = index_most_recent_active_backups(
+            self.boot_volume_backup_index
+        )
+
+    def load_block_volume_backups(self, block_volume_backups):
+
+        self.block_volume_backups = list(block_volume_backups)
+        self.block_volume_backup_index = index_volume_backups(
+            self.block_volume_backups,
+            "volume_id"
+        )
+        self.block_volume_backups_by_volume = partition_volume_backups(
+            self.block_volume_backup_index
+        )
+        self.most_recent_active_block_volume_backups = index_most_recent_active_backups(
+            self.block_volume_backup_index
+        )
+
+    def return_block_volume_backups_by_state(
+        self,
+        volume_id,
+        lifecycle_states = BACKUP_LIFECYCLE_STATES):
+
+        return return_partitioned_backups(
+            self.block_volume_backups_by_volume,
+            volume_id,
+            lifecycle_states
+        )
+
+    def return_boot_volume_backups_by_state(
+        self,
+        boot_volume_id,
+        lifecycle_states = BACKUP_LIFECYCLE_STATES):
+
+        return return_partitioned_backups(
+            self.boot_volume_backups_by_volume,
+            boot_volume_id,
+            lifecycle_states
+        )
             
     def return_block_volume_backups(self, volume_id):
 
-        results = []
-        for block_volume_backup in self.block_volume_backups:
-            if block_volume_backup.volume_id == volume_id:
-                results.append(block_volume_backup)
-        
-        return results
+        # return a copy so that your code cannot alter the index
+        return list(self.block_volume_backup_index.get(volume_id, []))
     
     def return_most_recent_active_block_volume_backup(self, volume_id):
         
-        for block_volume_backup in self.block_volume_backups:
-            if block_volume_backup.volume_id == volume_id and block_volume_backup.lifecycle_state == "AVAILABLE":
-                
-                return(block_volume_backup)
-        
+        return self.most_recent_active_block_volume_backups.get(volume_id)
     
     def return_boot_volume_backups(self, boot_volume_id):
         
-        results = []
-        for boot_volume in self.boot_volume_backups:
-            #print(boot_volume.boot_volume_id)
-            if boot_volume.boot_volume_id == boot_volume_id:
-                results.append(boot_volume)
-                
-        return results
+        return list(self.boot_volume_backup_index.get(boot_volume_id, []))
     
     def return_most_recent_active_boot_volume_backup(self, boot_volume_id):
         
-        for boot_volume_backup in self.boot_volume_backups:
-            if boot_volume_backup.boot_volume_id == boot_volume_id and boot_volume_backup.lifecycle_state == "AVAILABLE":
-                return boot_volume_backup
+        return self.most_recent_active_boot_volume_backups.get(boot_volume_id)
 
     def return_backups_from_volume_id(self, volume_id, volume_type):
 
         if volume_type not in ["BOOT_VOLUME", "VOLUME"]:
             raise RuntimeError("EXCEPTION! volume_type must be BOOT_VOLUME or VOLUME")
         elif volume_type == "VOLUME":
-            list_block_volume_backups_response = self.block_volume_client.list_volume_backups(
+            list_block_volume_backups_response = list_all_results(
+                self.block_volume_client.list_volume_backups,
                 compartment_id = self.compartment_id,
                 volume_id = volume_id
-            ).data
+            )
         elif volume_type == "BOOT_VOLUME":
-            list_block_volume_backups_response = self.block_volume_client.list_boot_volume_backups(
+            list_block_volume_backups_response = list_all_results(
+                self.block_volume_client.list_boot_volume_backups,
                 compartment_id = self.compartment_id,
                 boot_volume_id = volume_id
-            ).data
+            )
 
         return list_block_volume_backups_response
 
 
 # end class GetVolumeBackups
 
+def index_volume_backups(
+    volume_backups,
+    volume_id_attribute):
+    '''
+    This function builds a dict keyed on the volume OCID from a list of boot volume or block
+    volume backups. Each value is the list of backups for that volume sorted by time_created,
+    newest first. Pass "boot_volume_id" as volume_id_attribute for boot volume backups or
+    "volume_id" for block volume backups.
+    '''
+
+    # The REST service already returns the backups newest first when sorted by TIMECREATED,
+    # in which case this sort is a single linear pass.
+    sorted_backups = sorted(
+        volume_backups,
+        key = lambda backup: backup.time_created,
+        reverse = True
+    )
+
+    backup_index = {}
+    for backup in sorted_backups:
+        backup_index.setdefault(getattr(backup, volume_id_attribute), []).append(backup)
+
+    return backup_index
+
+# end function index_volume_backups()
+
+def index_most_recent_active_backups(backup_index):
+    '''
+    This function returns a dict keyed on the volume OCID that holds the most recent backup
+    in an AVAILABLE state for each volume within backup_index, a dict built by
+    index_volume_backups(). Volumes without an AVAILABLE backup are left out.
+    '''
+
+    most_recent_active_backups = {}
+    for volume_id, volume_backups in backup_index.items():
+        for backup in volume_backups:
+            if backup.lifecycle_state == "AVAILABLE":
+                most_recent_active_backups[volume_id] = backup
+                break
+
+    return most_recent_active_backups
+
+# end function index_most_recent_active_backups()
+
+def partition_volume_backups(backup_index):
+    '''
+    This function partitions the backups within backup_index, a dict built by
+    index_volume_backups(), by lifecycle state. It returns a dict keyed on the volume OCID,
+    where each value is a dict keyed on lifecycle state that holds the list of backups in that
+    state, newest first.
+    '''
+
+    partitioned_backups = {}
+    for volume_id, volume_backups in backup_index.items():
+        volume_partition = partitioned_backups.setdefault(volume_id, {})
+        for backup in volume_backups:
+            volume_partition.setdefault(backup.lifecycle_state, []).append(backup)
+
+    return partitioned_backups
+
+# end function partition_volume_backups()
+
+def return_partitioned_backups(
+    partitioned_backups,
+    volume_id,
+    lifecycle_states):
+    '''
+    This function returns the backups of volume_id from a dict built by
+    partition_volume_backups(), ordered by the lifecycle states in lifecycle_states and newest
+    first within each state. An empty list is returned if no backups are found.
+    '''
+
+    results = []
+    volume_partition = partitioned_backups.get(volume_id, {})
+    for lifecycle_state in lifecycle_states:
+        results.extend(volume_partition.get(lifecycle_state, []))
+
+    return results
+
+# end function return_partitioned_backups()
+
 def attach_iscsi_volume(
     compute_composite_client,
     AttachIScsiVolumeDetails,
     instance_id,
     volume_id,
-    display_name
+    display_name,
+    waiter = None,
+    callback = None
     ):
     '''
     This function attaches a volume to a VM instance using the iSCSI protocol.
@@ -253,6 +414,10 @@ def attach_iscsi_volume(
     attachment.
     We have found iSCSI attaching can sometimes fail due to OCI issues. Your
     code must check the response to ensure the attachment is successful.
+
+    Pass a lib.waiters.ResourceWaiter as waiter to return as soon as the request has been
+    accepted, leaving the waiter to poll the new resource along with any others. callback,
+    if passed, is called with the finished resource object.
     '''
     
     attach_volume_details = AttachIScsiVolumeDetails(
@@ -264,10 +429,20 @@ def attach_iscsi_volume(
         is_shareable = False
     )
     
-    attach_volume_response = compute_composite_client.attach_volume_and_wait_for_state(
-        attach_volume_details = attach_volume_details,
-        wait_for_states = ["ATTACHED", "DETACHED", "UNKNOWN_ENUM_VALUE"]
+    attach_volume_response = call_with_rate_limit(
+        compute_composite_client.client.attach_volume,
+        attach_volume_details = attach_volume_details
     ).data
+    volume_attachment = register_or_wait(
+        waiter,
+        attach_volume_response.id,
+        "volume_attachment",
+        compute_composite_client.client.get_volume_attachment,
+        ["ATTACHED", "DETACHED", "UNKNOWN_ENUM_VALUE"],
+        callback = callback
+    )
+    if volume_attachment is not None:
+        attach_volume_response = volume_attachment
     
     return attach_volume_response
 
@@ -279,6 +454,8 @@ def attach_paravirtualized_volume(
     instance_id,
     volume_id,
     display_name,
+    waiter = None,
+    callback = None
     ):
     '''
     The purpose of this function is to attach a block volume to a
@@ -291,6 +468,10 @@ def attach_paravirtualized_volume(
     attachments, and has lower admin work on the host. The performance is lower.
     iSCSI attachments should be used when high performance is needed.
     Your code should check the response to ensure the attachment was successful.
+
+    Pass a lib.waiters.ResourceWaiter as waiter to return as soon as the request has been
+    accepted, leaving the waiter to poll the new resource along with any others. callback,
+    if passed, is called with the finished resource object.
     '''
     attach_volume_details = AttachParavirtualizedVolumeDetails(
         type = "paravirtualized",
@@ -301,15 +482,75 @@ def attach_paravirtualized_volume(
         is_shareable = False
     )
     
-    attach_volume_response = compute_composite_client.attach_volume_and_wait_for_state(
-        attach_volume_details = attach_volume_details,
-        wait_for_states = ["ATTACHED", "DETACHED", "UNKNOWN_ENUM_VALUE"]
+    attach_volume_response = call_with_rate_limit(
+        compute_composite_client.client.attach_volume,
+        attach_volume_details = attach_volume_details
     ).data
+    volume_attachment = register_or_wait(
+        waiter,
+        attach_volume_response.id,
+        "volume_attachment",
+        compute_composite_client.client.get_volume_attachment,
+        ["ATTACHED", "DETACHED", "UNKNOWN_ENUM_VALUE"],
+        callback = callback
+    )
+    if volume_attachment is not None:
+        attach_volume_response = volume_attachment
     
     return attach_volume_response
 
 # end function def attach_paravirtualized_volume
 
+def return_volume_replica_states(
+    dr_storage_client,
+    boot_volumes,
+    block_volumes,
+    max_workers = DEFAULT_MAX_WORKERS
+    ):
+    '''
+    This function returns a dictionary keyed on the OCID of each volume within boot_volumes
+    and block_volumes that holds the lifecycle_state of the volume's replica in the DR
+    region, or None if the volume is not replicated. The replicas of every volume are
+    fetched together with up to max_workers concurrent calls, so the volumes of many VM
+    instances may be checked in one batch. Only the first replica of each volume is
+    checked since we do not support volume concatenation.
+    '''
+
+    replicas_to_fetch = []
+    replica_states = {}
+    for bv in boot_volumes:
+        if not bv.boot_volume_replicas:
+            replica_states[bv.id] = None
+        else:
+            replicas_to_fetch.append((
+                bv.id,
+                dr_storage_client.get_boot_volume_replica,
+                bv.boot_volume_replicas[0].boot_volume_replica_id
+            ))
+    for v in block_volumes or []:
+        if not v.block_volume_replicas:
+            replica_states[v.id] = None
+        else:
+            replicas_to_fetch.append((
+                v.id,
+                dr_storage_client.get_block_volume_replica,
+                v.block_volume_replicas[0].block_volume_replica_id
+            ))
+
+    def fetch_replica_state(replica_to_fetch):
+        volume_id, get_method, replica_id = replica_to_fetch
+        return volume_id, call_with_rate_limit(get_method, replica_id).data.lifecycle_state
+
+    for volume_id, replica_state in run_in_parallel(
+        fetch_replica_state,
+        replicas_to_fetch,
+        max_workers = max_workers):
+        replica_states[volume_id] = replica_state
+
+    return replica_states
+
+# end function return_volume_replica_states()
+
 def check_vm_replica_status(
     dr_storage_client,
     boot_volumes,
@@ -328,17 +569,12 @@ def check_vm_replica_status(
     extract two lists. The list boot_volumes contains a simple list of object type
     BootVolume. The list block_volumes contains a simple list of object type Volumes.
     
-    The logic in the function will start by checking each object in boot_volumes to
-    ensure the list is not empty. Then we check each object in the list and make a
-    call to get_boot_volume_replica and check lifecycle_state for a state of
-    "AVAILABLE". We immediately return a state of False if any of the above
-    conditions are not met.
-    
-    We test to see if the count of block_volumes is > 0, if not we exit the logic since
-    a virtual machine may have no data disks. If the count is > 0, we repeat the same
-    logic used for boot_volumes.
+    Every volume in boot_volumes and block_volumes must have a replica with a
+    lifecycle_state of "AVAILABLE", otherwise we return a state of False. block_volumes
+    may be empty or None since a virtual machine may have no data disks.
     
-    If all goes well, the function ends by returning True.
+    If all goes well, the function ends by returning True. The replicas are fetched together
+    by return_volume_replica_states().
     
     NOTE: dr_storage_client is a dict. object created by oci.config.fromfile(). You
     must make a copy of config to dr_config and modify the data vault for the key
@@ -353,35 +589,14 @@ def check_vm_replica_status(
     
     '''
     
-    for bv in boot_volumes:  # boot_volumes cannot be empty since a VM cannot exist without at
-                             # least 1 boot boot volume. We are not concerned abpout the
-                             # source volume's lifecycle state since this function is used to
-                             # test a DR recovery scenario.
-        
-        if bv.boot_volume_replicas is None:
-            return False     # failed condition
-        else:
-            # we always check position 0 of the list since we do not support volume
-            # concatenation in OCI.
-            get_boot_volume_replica_response = dr_storage_client.get_boot_volume_replica(
-                boot_volume_replica_id = bv.boot_volume_replicas[0].boot_volume_replica_id
-            )
-            if get_boot_volume_replica_response.data.lifecycle_state != "AVAILABLE":
-                return False # failed condition
-    
-    if block_volumes is not None: # block volumes can be empty, if so we fall through to
-                                  # return True
-        for v in block_volumes:
-            if v.block_volume_replicas is None:
-                return False      # failed condition
-            else:
-                # we always check position 0 of the list since we do not support volume
-                # concatenation in OCI.
-                get_block_volume_replica_response = dr_storage_client.get_block_volume_replica(
-                    block_volume_replica_id = v.block_volume_replicas[0].block_volume_replica_id
-                )
-                if get_block_volume_replica_response.data.lifecycle_state != "AVAILABLE":
-                    return False  # failed condition
+    replica_states = return_volume_replica_states(
+        dr_storage_client,
+        boot_volumes,
+        block_volumes
+    )
+    for replica_state in replica_states.values():
+        if replica_state != "AVAILABLE":
+            return False # failed condition
     
     return True
 
@@ -396,7 +611,9 @@ def create_boot_volume_from_replica(
     display_name,
     size_in_gbs,
     boot_volume_replica_id,
-    vpus_per_gb
+    vpus_per_gb,
+    waiter = None,
+    callback = None
     ):
     
     '''
@@ -412,6 +629,10 @@ def create_boot_volume_from_replica(
     function. A failure to do so will result in boot volumes with duplicate
     names.
    
+    Pass a lib.waiters.ResourceWaiter as waiter to return as soon as the request has been
+    accepted, leaving the waiter to poll the new resource along with any others. callback,
+    if passed, is called with the finished resource object.
+
     '''
     
     create_boot_volume_details = CreateBootVolumeDetails(
@@ -426,10 +647,21 @@ def create_boot_volume_from_replica(
         vpus_per_gb = vpus_per_gb
     )
     
-    create_boot_volume_response = composite_storage_client.create_boot_volume_and_wait_for_state(
-        create_boot_volume_details = create_boot_volume_details,
-        wait_for_states = ["AVAILABLE", "TERMINATING", "TERMINATED", "FAULTY", "UNKNOWN_ENUM_VALUE"]
+    create_boot_volume_response = call_with_rate_limit(
+        composite_storage_client.client.create_boot_volume,
+        create_boot_volume_details = create_boot_volume_details
+    )
+    boot_volume = register_or_wait(
+        waiter,
+        create_boot_volume_response.data.id,
+        "boot_volume",
+        composite_storage_client.client.get_boot_volume,
+        ["AVAILABLE", "TERMINATING", "TERMINATED", "FAULTY", "UNKNOWN_ENUM_VALUE"],
+        callback = callback
     )
+    # the response is returned as before, holding the boot volume in its final state
+    if boot_volume is not None:
+        create_boot_volume_response.data = boot_volume
     
     return create_boot_volume_response
 
@@ -488,7 +720,8 @@ def create_bootvol_replica(
     same as the primary volume the replica spawns from. The volume AD is created
     from the primary volume AD name, the remote region key, the chars "-AD-",
     and the AD number that is derived from the primary volume AD number. This
-    string is prepared by the logic that calls this function.
+    string is prepared by the logic that calls this function. The call is paced by
+    lib/ratelimit.py so that many replicas may be enabled concurrently.
     '''
     update_boot_volume_details = UpdateBootVolumeDetails(
         display_name = boot_volume_display_name,
@@ -499,7 +732,8 @@ def create_bootvol_replica(
             )]
     )
     
-    update_boot_volume_response = storage_client.update_boot_volume(
+    update_boot_volume_response = call_with_rate_limit(
+        storage_client.update_boot_volume,
         boot_volume_id = boot_volume_id,
         update_boot_volume_details = update_boot_volume_details
     )
@@ -522,7 +756,8 @@ def create_vol_replica(
     same as the primary volume the replica spawns from. The volume AD is created
     from the primary volume AD name, the remote region key, the chars "-AD-",
     and the AD number that is derived from the primary volume AD number. This
-    string is prepared by the logic that calls this function.
+    string is prepared by the logic that calls this function. The call is paced by
+    lib/ratelimit.py so that many replicas may be enabled concurrently.
     '''
     update_volume_details = UpdateVolumeDetails(
         display_name = volume_display_name,
@@ -534,7 +769,8 @@ def create_vol_replica(
     )
     
     
-    update_volume_response = storage_client.update_volume(
+    update_volume_response = call_with_rate_limit(
+        storage_client.update_volume,
         volume_id = volume_id,
         update_volume_details = update_volume_details
     )
@@ -603,7 +839,9 @@ def create_volume_from_volume_replica(
     display_name,
     size_in_gbs,
     volume_replica_id,
-    vpus_per_gb
+    vpus_per_gb,
+    waiter = None,
+    callback = None
     ):
 
     '''
@@ -619,6 +857,10 @@ def create_volume_from_volume_replica(
     function. A failure to do so will result in volumes with duplicate
     names.
     
+    Pass a lib.waiters.ResourceWaiter as waiter to return as soon as the request has been
+    accepted, leaving the waiter to poll the new resource along with any others. callback,
+    if passed, is called with the finished resource object.
+
     '''
 
     create_volume_details = CreateVolumeDetails(
@@ -633,10 +875,21 @@ def create_volume_from_volume_replica(
         vpus_per_gb = vpus_per_gb
     )
 
-    create_volume_response = storage_composite_client.create_volume_and_wait_for_state(
-        create_volume_details = create_volume_details,
-        wait_for_states = ["AVAILABLE", "TERMINATING", "TERMINATED", "FAULTY", "UNKNOWN_ENUM_VALUE"]
+    create_volume_response = call_with_rate_limit(
+        storage_composite_client.client.create_volume,
+        create_volume_details = create_volume_details
+    )
+    volume = register_or_wait(
+        waiter,
+        create_volume_response.data.id,
+        "volume",
+        storage_composite_client.client.get_volume,
+        ["AVAILABLE", "TERMINATING", "TERMINATED", "FAULTY", "UNKNOWN_ENUM_VALUE"],
+        callback = callback
     )
+    # the response is returned as before, holding the volume in its final state
+    if volume is not None:
+        create_volume_response.data = volume
     
     return create_volume_response
 
@@ -662,7 +915,8 @@ def delete_bootvol_replica(
         boot_volume_replicas=[]
     )
     
-    update_boot_volume_response = storage_client.update_boot_volume(
+    update_boot_volume_response = call_with_rate_limit(
+        storage_client.update_boot_volume,
         boot_volume_id = boot_volume_id,
         update_boot_volume_details = update_boot_volume_details
     )
@@ -690,7 +944,8 @@ def delete_vol_replica(
         block_volume_replicas = []
     )
     
-    update_volume_response = storage_client.update_volume(
+    update_volume_response = call_with_rate_limit(
+        storage_client.update_volume,
         volume_id = volume_id,
         update_volume_details = update_volume_details
     )
@@ -758,7 +1013,9 @@ def restore_block_volume(
     availability_domain,
     compartment_id,
     size_in_gbs,
-    backup_source_id):
+    backup_source_id,
+    waiter = None,
+    callback = None):
     '''
     This function restores a block volume using the specified backup_source_id
     within the specified compartment. It waits for a state of AVAILABLE
@@ -766,6 +1023,10 @@ def restore_block_volume(
     returns the result to the calling code. Your code must handle avoiding
     creating boot volumes with duplicate display names. OCI does not
     enforce this.
+
+    Pass a lib.waiters.ResourceWaiter as waiter to return as soon as the request has been
+    accepted, leaving the waiter to poll the new resource along with any others. callback,
+    if passed, is called with the finished resource object.
     '''
     
     create_volume_details = CreateVolumeDetails(
@@ -778,10 +1039,20 @@ def restore_block_volume(
             id = backup_source_id
         )
     )
-    results = block_storage_composite_client.create_volume_and_wait_for_state(
-        create_volume_details = create_volume_details,
-        wait_for_states = ["AVAILABLE", "TERMINATED", "UNKNOWN_ENUM_VALUE"]
+    results = call_with_rate_limit(
+        block_storage_composite_client.client.create_volume,
+        create_volume_details = create_volume_details
     ).data
+    volume = register_or_wait(
+        waiter,
+        results.id,
+        "volume",
+        block_storage_composite_client.client.get_volume,
+        ["AVAILABLE", "TERMINATED", "UNKNOWN_ENUM_VALUE"],
+        callback = callback
+    )
+    if volume is not None:
+        results = volume
     
     return results
 
@@ -798,7 +1069,9 @@ def restore_boot_volume(
     availability_domain,
     compartment_id,
     size_in_gbs,
-    backup_source_id
+    backup_source_id,
+    waiter = None,
+    callback = None
     ):
     '''
     This function restores a boot volume using the specified backup_source_id
@@ -807,8 +1080,13 @@ def restore_boot_volume(
     returns the result to the calling code. Your code must handle avoiding
     creating boot volumes with duplicate display names. OCI does not
     enforce this.
+
+    Pass a lib.waiters.ResourceWaiter as waiter to return as soon as the request has been
+    accepted, leaving the waiter to poll the new resource along with any others. callback,
+    if passed, is called with the finished resource object.
     '''
-    create_boot_volume_response = block_storage_composite_client.create_boot_volume_and_wait_for_state(
+    create_boot_volume_response = call_with_rate_limit(
+        block_storage_composite_client.client.create_boot_volume,
         create_boot_volume_details = CreateBootVolumeDetails(
             availability_domain = availability_domain,
             compartment_id = compartment_id,
@@ -818,9 +1096,18 @@ def restore_boot_volume(
             ),
             display_name = new_boot_volume_name,
             size_in_gbs = size_in_gbs
-        ),
-        wait_for_states = ["AVAILABLE", "TERMINATED", "UNKNOWN_ENUM_VALUE"]
+        )
+    )
+    boot_volume = register_or_wait(
+        waiter,
+        create_boot_volume_response.data.id,
+        "boot_volume",
+        block_storage_composite_client.client.get_boot_volume,
+        ["AVAILABLE", "TERMINATED", "UNKNOWN_ENUM_VALUE"],
+        callback = callback
     )
+    if boot_volume is not None:
+        return boot_volume
     
     return create_boot_volume_response.data
 
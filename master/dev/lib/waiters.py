@@ -0,0 +1,338 @@
+# Copyright 2019 – 2022 David Kent Consulting, Inc.
+# All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of David Kent Consulting, Inc.; David Kent Cloud Solutions, Inc.;
+# and its affiliates (The Company). The intellectual and technical concepts contained
+# herein are proprietary to The Company and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from The Company.
+#
+# This file is subject to the terms and conditions defined in
+# file 'LICENSE.txt', which is part of this source code package.
+
+'''
+This module waits on OCI resources to reach a lifecycle state. The *_and_wait_for_state
+methods of the OCI composite clients block a thread while polling a single resource, so a
+program that creates eight volumes waits on them one after the other. ResourceWaiter
+instead polls every registered resource together, one round at a time, and calls back to
+your code as each one completes. As in:
+
+    waiter = ResourceWaiter()
+    for backup in volume_backups:
+        restore_block_volume(
+            ...,
+            waiter = waiter,
+            callback = attach_restored_volume
+        )
+    restored_volumes = waiter.wait()
+
+How often a resource is polled depends on how long that type of resource usually takes, as
+set within WAIT_PROFILES. A resource is polled every fifth of its expected duration until
+that duration has passed, and then less and less often the longer it overruns.
+
+An error fetching one resource never stops the waiter. A resource the REST service no longer
+finds, or rejects with any other HTTP 4xx status, is done and is handed to its callback as an
+UnavailableResource. Any other error, such as an HTTP 5xx status or a dropped connection, is
+taken as passing and the resource is polled again at its next interval.
+'''
+
+import time
+from lib.concurrency import DEFAULT_MAX_WORKERS
+from lib.concurrency import run_in_parallel
+from lib.ratelimit import call_with_rate_limit
+
+
+# seconds a request against each type of resource usually takes, and the bounds of its poll interval
+WAIT_PROFILES = {
+    "instance"          : {"expected_seconds" : 90, "min_interval" : 5, "max_interval" : 30},
+    "boot_volume"       : {"expected_seconds" : 60, "min_interval" : 5, "max_interval" : 30},
+    "volume"            : {"expected_seconds" : 30, "min_interval" : 3, "max_interval" : 20},
+    "volume_attachment" : {"expected_seconds" : 20, "min_interval" : 2, "max_interval" : 15},
+    "volume_replica"    : {"expected_seconds" : 600, "min_interval" : 15, "max_interval" : 120}
+}
+DEFAULT_WAIT_PROFILE        = {"expected_seconds" : 60, "min_interval" : 5, "max_interval" : 30}
+DEFAULT_MAX_WAIT_SECONDS    = 3600
+NOT_FOUND_STATUS            = 404
+
+
+def return_poll_interval(resource_type, elapsed_seconds):
+    '''
+    This function returns the number of seconds to wait before polling a resource of
+    resource_type again, elapsed_seconds after the wait began.
+    '''
+
+    profile = WAIT_PROFILES.get(resource_type, DEFAULT_WAIT_PROFILE)
+    interval = profile["expected_seconds"] / 5
+    if elapsed_seconds > profile["expected_seconds"]:
+        interval = interval * elapsed_seconds / profile["expected_seconds"]
+    return max(profile["min_interval"], min(profile["max_interval"], interval))
+
+# end function return_poll_interval()
+
+def is_permanent_error(error):
+    '''
+    This function returns True if error is an oci.exceptions.ServiceError with an HTTP 4xx
+    status, which polling again will not cure. HTTP 429 is retried by lib/ratelimit.py before
+    it gets here. Only the status attribute is checked, so the OCI SDK need not be imported.
+    '''
+
+    status = getattr(error, "status", None)
+    return isinstance(status, int) and 400 <= status < 500
+
+# end function is_permanent_error()
+
+class UnavailableResource:
+    '''
+    This class stands in for a resource that could not be fetched because of a permanent
+    error. lifecycle_state is NOT_FOUND for HTTP 404 and ERROR for any other status, so the
+    callbacks that check lifecycle_state treat it as failed. display_name is the name the
+    resource last had, or its OCID if it was never fetched.
+    '''
+
+    def __init__(self, resource_id, last_resource, error):
+
+        self.id                 = resource_id
+        self.display_name       = getattr(last_resource, "display_name", None) or resource_id
+        self.lifecycle_state    = "NOT_FOUND" if getattr(error, "status", None) == NOT_FOUND_STATUS else "ERROR"
+        self.error              = error
+
+    def __str__(self):
+        return "Resource " + self.display_name + " is unavailable: " + str(self.error)
+
+# end class UnavailableResource
+
+class ResourceWaiter:
+    '''
+    This class polls many OCI resources together until each one reaches a wanted or failed
+    lifecycle state. Call add() for each resource, then call wait() once. Resources may be
+    added from a callback while wait() is running, such as attaching a volume as soon as it
+    becomes available.
+
+    Each round, the resources that are due are fetched with up to max_workers concurrent get
+    calls, paced by lib/ratelimit.py. Pass list_function to add() to fetch a batch of
+    resources with one call instead, such as every instance within a compartment. Any
+    resource the list does not return is fetched with its get method.
+
+    Your code must check the lifecycle_state of each resource returned by wait(), since
+    resources that failed or timed out are returned in whatever state they were last seen in.
+    A resource that could not be fetched is returned as an UnavailableResource.
+    '''
+
+    def __init__(self, max_workers = DEFAULT_MAX_WORKERS):
+
+        self.max_workers    = max_workers
+        self.pending        = {}
+        self.resources      = {}
+        self.completed      = set()
+
+    def add(
+        self,
+        resource_id,
+        resource_type,
+        get_method,
+        wait_for_states,
+        failed_states = None,
+        callback = None,
+        list_function = None,
+        poll_interval_in_seconds = None):
+        '''
+        Registers resource_id with the waiter. get_method is the SDK get method for the
+        resource, such as storage_client.get_volume. callback, if passed, is called with the
+        resource object once it reaches a state within wait_for_states or failed_states.
+        Pass poll_interval_in_seconds to poll at a fixed interval rather than the interval
+        set for resource_type within WAIT_PROFILES.
+        '''
+
+        now = time.monotonic()
+        self.pending[resource_id] = {
+            "resource_type"     : resource_type,
+            "get_method"        : get_method,
+            "wait_for_states"   : wait_for_states,
+            "failed_states"     : failed_states or [],
+            "callback"          : callback,
+            "list_function"     : list_function,
+            "poll_interval"     : poll_interval_in_seconds,
+            "added"             : now,
+            "next_poll"         : now,
+            "error"             : None
+        }
+        self.completed.discard(resource_id)
+
+    def return_next_poll_time(self, entry, now):
+
+        if entry["poll_interval"] is not None:
+            return now + entry["poll_interval"]
+        return now + return_poll_interval(entry["resource_type"], now - entry["added"])
+
+    def fetch_resources(self, resource_ids):
+        '''
+        Returns a dict of resource OCIDs and (resource object, error) tuples for resource_ids,
+        where one of the two is None. Each list_function is called once, then the rest are
+        fetched with their get methods. A list_function that fails is skipped, leaving its
+        resources to their get methods.
+        '''
+
+        fetched_resources = {}
+        list_functions = {}
+        for resource_id in resource_ids:
+            list_function = self.pending[resource_id]["list_function"]
+            if list_function is not None:
+                list_functions[id(list_function)] = list_function
+        for list_function in list_functions.values():
+            try:
+                listed_resources = list_function()
+            except Exception:
+                continue
+            for resource in listed_resources:
+                if resource.id in resource_ids:
+                    fetched_resources[resource.id] = (resource, None)
+
+        def get_resource(resource_id):
+            try:
+                return call_with_rate_limit(self.pending[resource_id]["get_method"], resource_id).data, None
+            except Exception as error:
+                return None, error
+
+        ids_to_get = [resource_id for resource_id in resource_ids if resource_id not in fetched_resources]
+        for resource_id, fetched_resource in zip(
+            ids_to_get,
+            run_in_parallel(get_resource, ids_to_get, max_workers = self.max_workers)):
+            fetched_resources[resource_id] = fetched_resource
+
+        return fetched_resources
+
+    def poll(self):
+        '''
+        Fetches every pending resource that is due, fires the callbacks of those that are
+        done and schedules the next poll of the rest.
+        '''
+
+        now = time.monotonic()
+        due_ids = [resource_id for resource_id, entry in self.pending.items() if entry["next_poll"] <= now]
+        if len(due_ids) == 0:
+            return None
+
+        fetched_resources = self.fetch_resources(due_ids)
+        now = time.monotonic()
+        for resource_id in due_ids:
+            entry = self.pending[resource_id]
+            resource, error = fetched_resources[resource_id]
+            entry["error"] = error
+            if error is not None and is_permanent_error(error):
+                resource = UnavailableResource(resource_id, self.resources.get(resource_id), error)
+            elif error is not None:
+                # a passing error, poll again at the next interval
+                entry["next_poll"] = self.return_next_poll_time(entry, now)
+                continue
+            self.resources[resource_id] = resource
+            if isinstance(resource, UnavailableResource) or \
+                resource.lifecycle_state in entry["wait_for_states"] or \
+                resource.lifecycle_state in entry["failed_states"]:
+                del self.pending[resource_id]
+                self.completed.add(resource_id)
+                if entry["callback"] is not None:
+                    entry["callback"](resource)
+            else:
+                entry["next_poll"] = self.return_next_poll_time(entry, now)
+
+    def wait(self, max_wait_time_in_seconds = DEFAULT_MAX_WAIT_SECONDS):
+        '''
+        Polls until every resource is done or max_wait_time_in_seconds has passed, and returns
+        a dict of every resource OCID added to the waiter and the last resource object
+        fetched for it.
+        '''
+
+        deadline = time.monotonic() + max_wait_time_in_seconds
+        while len(self.pending) != 0:
+            self.poll()
+            if len(self.pending) == 0:
+                break
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            next_poll = min(entry["next_poll"] for entry in self.pending.values())
+            time.sleep(max(0, min(next_poll, deadline) - now))
+
+        return dict(self.resources)
+
+    def return_pending_ids(self):
+
+        return list(self.pending.keys())
+
+    def __str__(self):
+        return "Class setup to wait on " + str(len(self.pending)) + " OCI resources"
+
+# end class ResourceWaiter
+
+def wait_for_resource(
+    resource_id,
+    resource_type,
+    get_method,
+    wait_for_states,
+    failed_states = None,
+    max_wait_time_in_seconds = DEFAULT_MAX_WAIT_SECONDS):
+    '''
+    This function waits on a single resource and returns the resource object once it
+    reaches a state within wait_for_states or failed_states. It raises RuntimeError if the
+    resource has not done so within max_wait_time_in_seconds.
+    '''
+
+    waiter = ResourceWaiter()
+    waiter.add(
+        resource_id,
+        resource_type,
+        get_method,
+        wait_for_states,
+        failed_states = failed_states
+    )
+    results = waiter.wait(max_wait_time_in_seconds = max_wait_time_in_seconds)
+    if len(waiter.return_pending_ids()) != 0:
+        last_error = waiter.pending[resource_id]["error"]
+        raise RuntimeError(
+            "EXCEPTION! Timed out waiting on " + resource_type + " " + resource_id + " to reach a state of " + ", ".join(wait_for_states) +
+            ("" if last_error is None else ", the last poll failed with " + str(last_error))
+        )
+    return results[resource_id]
+
+# end function wait_for_resource()
+
+def register_or_wait(
+    waiter,
+    resource_id,
+    resource_type,
+    get_method,
+    wait_for_states,
+    failed_states = None,
+    callback = None):
+    '''
+    This function is used by the KENT functions that take an optional waiter. If waiter is
+    None, it waits on the resource and returns it. Otherwise it adds the resource to waiter
+    and returns None at once, leaving your code to call waiter.wait().
+    '''
+
+    if waiter is None:
+        resource = wait_for_resource(
+            resource_id,
+            resource_type,
+            get_method,
+            wait_for_states,
+            failed_states = failed_states
+        )
+        if callback is not None:
+            callback(resource)
+        return resource
+
+    waiter.add(
+        resource_id,
+        resource_type,
+        get_method,
+        wait_for_states,
+        failed_states = failed_states,
+        callback = callback
+    )
+    return None
+
+# end function register_or_wait()